@@ -0,0 +1,58 @@
+import json
+from hashlib import shake_128
+from typing import Any, Optional
+
+from django.utils.http import parse_etags, quote_etag
+
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.status import HTTP_304_NOT_MODIFIED
+
+from baserow.version import VERSION as BASEROW_VERSION
+
+
+def compute_etag(request: Request, *parts: Any) -> str:
+    """
+    Computes the ETag of the response to the request, based on the provided parts
+    that must change whenever the content of the response changes. The user, the
+    absolute URI including the query parameters and the accepted language are always
+    included because they influence the response as well.
+
+    :param request: The request the response is generated for.
+    :param parts: JSON serializable values identifying the state of the data the
+        response is based on.
+    :return: The quoted ETag.
+    """
+
+    payload = json.dumps(
+        [
+            BASEROW_VERSION,
+            getattr(request.user, "id", None),
+            request.build_absolute_uri(),
+            request.META.get("HTTP_ACCEPT_LANGUAGE"),
+            *parts,
+        ],
+        default=str,
+    )
+    return quote_etag(shake_128(payload.encode("utf-8")).hexdigest(16))
+
+
+def get_not_modified_response(request: Request, etag: str) -> Optional[Response]:
+    """
+    Returns a `304 Not Modified` response if the `If-None-Match` header of the
+    request matches the provided ETag. Weak ETags are compared as if they were strong
+    because a proxy compressing the response turns the ETag into a weak one.
+
+    :param request: The request that possibly contains the `If-None-Match` header.
+    :param etag: The quoted ETag of the current response.
+    :return: The not modified response or None if the response must be generated.
+    """
+
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if not if_none_match:
+        return None
+
+    etags = [tag.removeprefix("W/") for tag in parse_etags(if_none_match)]
+    if etag in etags or "*" in etags:
+        return Response(status=HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return None
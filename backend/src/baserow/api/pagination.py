@@ -1,8 +1,69 @@
+import base64
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, List, NamedTuple, Optional
+from uuid import UUID
+
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db.models import F, OrderBy, Q, QuerySet
+from django.utils.dateparse import parse_date, parse_datetime, parse_time
+from django.utils.functional import cached_property
+
 from rest_framework.exceptions import APIException, NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
 from rest_framework.pagination import (
     PageNumberPagination as RestFrameworkPageNumberPagination,
 )
+from rest_framework.response import Response
 from rest_framework.status import HTTP_400_BAD_REQUEST
+from rest_framework.utils.urls import replace_query_param
+
+
+class EstimatedCountPage(Page):
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+
+class EstimatedCountPaginator(DjangoPaginator):
+    """
+    A paginator that uses the `estimated_count` of the queryset instead of counting
+    all the rows. Because the count can be lower or higher than the real number of
+    rows, pages are never validated against the number of pages and one extra row
+    is fetched to know if there is a next page.
+    """
+
+    count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        count, self.count_is_estimate = self.object_list.estimated_count()
+        return count
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage("That page contains no results")
+
+        return EstimatedCountPage(
+            rows[: self.per_page], number, self, len(rows) > self.per_page
+        )
 
 
 class PageNumberPagination(RestFrameworkPageNumberPagination):
@@ -11,10 +72,26 @@ class PageNumberPagination(RestFrameworkPageNumberPagination):
     page_size = 100
     page_size_query_param = "size"
 
-    def __init__(self, limit_page_size=None, *args, **kwargs):
+    def __init__(self, limit_page_size=None, *args, estimate_count=False, **kwargs):
+        """
+        :param limit_page_size: The maximum page size that can be requested.
+        :param estimate_count: Whether the queryset's `estimated_count` must be used
+            instead of an exact count. The response will then contain a
+            `count_is_estimate` key.
+        """
+
         self.limit_page_size = limit_page_size
+        self.estimate_count = estimate_count
+        if estimate_count:
+            self.django_paginator_class = EstimatedCountPaginator
         super().__init__(*args, **kwargs)
 
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.estimate_count:
+            response.data["count_is_estimate"] = self.page.paginator.count_is_estimate
+        return response
+
     def get_page_size(self, request):
         page_size = super().get_page_size(request)
 
@@ -39,3 +116,281 @@ class PageNumberPagination(RestFrameworkPageNumberPagination):
             exception = APIException({"error": "ERROR_INVALID_PAGE", "detail": str(e)})
             exception.status_code = HTTP_400_BAD_REQUEST
             raise exception
+
+
+def _raise_invalid_cursor(detail: str):
+    exception = APIException({"error": "ERROR_INVALID_CURSOR", "detail": detail})
+    exception.status_code = HTTP_400_BAD_REQUEST
+    raise exception
+
+
+def _raise_unsupported_cursor_ordering():
+    exception = APIException(
+        {
+            "error": "ERROR_CURSOR_ORDERING_NOT_SUPPORTED",
+            "detail": "The rows can't be paginated with a cursor with this ordering. "
+            "Use the page or the limit and offset pagination instead.",
+        }
+    )
+    exception.status_code = HTTP_400_BAD_REQUEST
+    raise exception
+
+
+# The JSON values that are decoded with the same type as the sort key values.
+CURSOR_SCALAR_TYPES = (bool, int, float, str)
+
+
+class CountProvidedLimitOffsetPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination where the count is provided by a callable, for example
+    to serve it from a cache instead of executing a `COUNT(*)` query.
+    """
+
+    def __init__(self, get_count: Callable[[QuerySet], int]):
+        self._get_count = get_count
+
+    def get_count(self, queryset):
+        return self._get_count(queryset)
+
+
+class KeysetOrder(NamedTuple):
+    order_by: OrderBy
+    # False if the expression is a not nullable column, which can't contain null
+    # values that the seek filter must take into account.
+    nullable: bool
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginates a queryset by seeking past the sort key of the last row of the previous
+    page instead of using an offset. The cursor contains the values of all the order
+    by expressions of the queryset, which must end with unique columns like `order`
+    and `id`, so that the database can use the index matching the ordering to jump
+    directly to the next page, no matter how deep the page is.
+
+    The first page is requested with an empty `cursor` query parameter and the
+    response contains the `next` URL, which includes the cursor of the next page. The
+    total count is not computed.
+    """
+
+    page_size = 100
+    page_size_query_param = "size"
+    cursor_query_param = "cursor"
+    annotation_prefix = "keyset_cursor_"
+
+    def __init__(self, limit_page_size=None):
+        self.limit_page_size = limit_page_size
+        self.request = None
+        self.next_cursor = None
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param))
+        except (TypeError, ValueError):
+            return self.page_size
+
+        if page_size < 1:
+            return self.page_size
+
+        if self.limit_page_size and page_size > self.limit_page_size:
+            exception = APIException(
+                {
+                    "error": "ERROR_PAGE_SIZE_LIMIT",
+                    "detail": f"The page size is limited to {self.limit_page_size}.",
+                }
+            )
+            exception.status_code = HTTP_400_BAD_REQUEST
+            raise exception
+
+        return page_size
+
+    def get_order_bys(self, queryset: QuerySet) -> List[KeysetOrder]:
+        """
+        Normalizes the ordering of the queryset into a list of OrderBy expressions.
+        Plain column names keep the default null ordering, so that the ORDER BY
+        still matches the indexes on columns like `order` and `id`, and not nullable
+        model fields are marked as such, so that the seek filter doesn't have to
+        take null values into account for them.
+        """
+
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        orders = []
+        for order in ordering:
+            nullable = True
+            if isinstance(order, str):
+                descending = order.startswith("-")
+                name = order.lstrip("-")
+                try:
+                    nullable = queryset.model._meta.get_field(name).null
+                except Exception:
+                    nullable = True
+                order = F(name).desc() if descending else F(name).asc()
+            elif not isinstance(order, OrderBy):
+                order = order.asc()
+            orders.append(KeysetOrder(order, nullable))
+        return orders
+
+    @staticmethod
+    def _nulls_first_in_order(order_by: OrderBy) -> bool:
+        if order_by.nulls_first:
+            return True
+        if order_by.nulls_last:
+            return False
+        # The PostgreSQL default is to consider null values larger than any value.
+        return order_by.descending
+
+    def get_seek_filter(self, orders: List[KeysetOrder], values: List[Any]) -> Q:
+        """
+        Constructs the filter matching all the rows that come after the row having
+        the provided sort key values, respecting the direction and the position of
+        null values of every order by expression.
+        """
+
+        seek_filter = Q(pk__in=[])
+        equal_filter = Q()
+        for index, (order, value) in enumerate(zip(orders, values)):
+            name = f"{self.annotation_prefix}{index}"
+            nulls_first = self._nulls_first_in_order(order.order_by)
+            lookup = "lt" if order.order_by.descending else "gt"
+
+            if value is None:
+                after = Q(**{f"{name}__isnull": False}) if nulls_first else None
+                equal = Q(**{f"{name}__isnull": True})
+            else:
+                after = Q(**{f"{name}__{lookup}": value})
+                if order.nullable and not nulls_first:
+                    after |= Q(**{f"{name}__isnull": True})
+                equal = Q(**{name: value})
+
+            if after is not None:
+                seek_filter |= equal_filter & after
+            equal_filter &= equal
+
+        # Add a redundant condition on the first expression so that the database can
+        # start an index range scan at the right position.
+        if orders and values[0] is not None:
+            first_order_by = orders[0].order_by
+            if not orders[0].nullable or self._nulls_first_in_order(first_order_by):
+                lookup = "lte" if first_order_by.descending else "gte"
+                seek_filter &= Q(**{f"{self.annotation_prefix}0__{lookup}": values[0]})
+        elif orders and not self._nulls_first_in_order(orders[0].order_by):
+            seek_filter &= Q(**{f"{self.annotation_prefix}0__isnull": True})
+
+        return seek_filter
+
+    @staticmethod
+    def encode_cursor(values: List[Any]) -> str:
+        """
+        Encodes the sort key values into a cursor. Only scalar values can be encoded,
+        so that they're compared with the same type when the cursor is decoded.
+        Values like arrays would only be compared as text, so the ordering isn't
+        supported in that case.
+        """
+
+        encoded = []
+        for value in values:
+            if isinstance(value, Decimal):
+                encoded.append(["decimal", str(value)])
+            elif isinstance(value, datetime):
+                encoded.append(["datetime", value.isoformat()])
+            elif isinstance(value, date):
+                encoded.append(["date", value.isoformat()])
+            elif isinstance(value, time):
+                encoded.append(["time", value.isoformat()])
+            elif isinstance(value, UUID):
+                encoded.append(["uuid", str(value)])
+            elif value is None or isinstance(value, CURSOR_SCALAR_TYPES):
+                encoded.append(["value", value])
+            else:
+                _raise_unsupported_cursor_ordering()
+        return (
+            base64.urlsafe_b64encode(json.dumps(encoded).encode()).decode().rstrip("=")
+        )
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> List[Any]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            encoded = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values = []
+            for value_type, value in encoded:
+                if value_type == "decimal":
+                    value = Decimal(value)
+                elif value_type == "datetime":
+                    value = parse_datetime(value)
+                elif value_type == "date":
+                    value = parse_date(value)
+                elif value_type == "time":
+                    value = parse_time(value)
+                elif value_type == "uuid":
+                    value = UUID(value)
+                elif value_type != "value" or not (
+                    value is None or isinstance(value, CURSOR_SCALAR_TYPES)
+                ):
+                    raise ValueError("Unsupported cursor value.")
+                values.append(value)
+            return values
+        except (ValueError, TypeError, ArithmeticError):
+            _raise_invalid_cursor("The provided cursor is invalid.")
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request, view=None
+    ) -> Optional[List[Any]]:
+        self.request = request
+        page_size = self.get_page_size(request)
+        orders = self.get_order_bys(queryset)
+        order_bys = [order.order_by for order in orders]
+
+        queryset = queryset.annotate(
+            **{
+                f"{self.annotation_prefix}{index}": order_by.expression
+                for index, order_by in enumerate(order_bys)
+            }
+        ).order_by(*order_bys)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            values = self.decode_cursor(cursor)
+            if len(values) != len(order_bys):
+                _raise_invalid_cursor("The cursor does not match the ordering.")
+            queryset = queryset.filter(self.get_seek_filter(orders, values))
+
+        rows = list(queryset[: page_size + 1])
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if has_next:
+            last_row = rows[-1]
+            self.next_cursor = self.encode_cursor(
+                [
+                    getattr(last_row, f"{self.annotation_prefix}{index}")
+                    for index in range(len(order_bys))
+                ]
+            )
+
+        return rows
+
+    def get_next_link(self) -> Optional[str]:
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data) -> Response:
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": None,
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
@@ -0,0 +1,138 @@
+import json
+from typing import Any, Callable, Iterator, List, Optional, Type
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import QuerySet
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+
+from rest_framework.exceptions import APIException
+from rest_framework.serializers import Serializer
+from rest_framework.status import HTTP_400_BAD_REQUEST
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class StreamingLimitExceeded(Exception):
+    """Raised when more objects than the allowed maximum would be streamed."""
+
+
+def stream_serialized_results(
+    queryset: QuerySet,
+    serializer_class: Type[Serializer],
+    chunk_size: Optional[int] = None,
+    dumps: Optional[Callable[[List[Any]], bytes]] = None,
+    max_count: Optional[int] = None,
+) -> Iterator[bytes]:
+    """
+    Generates a JSON document in the form of `{"results": [...]}` containing all the
+    objects of the queryset. The objects are fetched using a server-side cursor and
+    serialized per chunk, so that only one chunk is kept in memory at any time.
+
+    :param queryset: The queryset containing the objects to serialize. Prefetched
+        relations are fetched per chunk.
+    :param serializer_class: The serializer class used to serialize the objects.
+    :param chunk_size: The number of objects fetched and serialized at once.
+    :param dumps: An optional faster function encoding a chunk of objects into a
+        JSON array. By default, the serializer class is used.
+    :param max_count: If provided, the maximum number of objects that can be
+        streamed.
+    :raises StreamingLimitExceeded: When the queryset contains more objects than
+        `max_count`.
+    :return: A generator of encoded JSON parts.
+    """
+
+    if chunk_size is None:
+        chunk_size = settings.BASEROW_STREAMING_CHUNK_SIZE
+
+    if dumps is None:
+
+        def dumps(objects):
+            return json.dumps(
+                serializer_class(objects, many=True).data,
+                cls=JSONEncoder,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ).encode("utf-8")
+
+    # The multi field prefetches are only applied when the queryset is evaluated as
+    # a whole, so they're applied to every chunk instead.
+    multi_field_prefetches = []
+    if hasattr(queryset, "get_multi_field_prefetches"):
+        multi_field_prefetches = queryset.get_multi_field_prefetches()
+
+    def encode_chunk(chunk, first):
+        for prefetch in multi_field_prefetches:
+            prefetch(queryset, chunk)
+        # Strip the brackets of the list because the chunks are joined in the
+        # same results array.
+        encoded = dumps(chunk)[1:-1]
+        return encoded if first else b"," + encoded
+
+    yield b'{"results":['
+    first = True
+    chunk = []
+    for count, obj in enumerate(queryset.iterator(chunk_size=chunk_size), start=1):
+        if max_count is not None and count > max_count:
+            raise StreamingLimitExceeded(
+                f"More than {max_count} objects can't be streamed."
+            )
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield encode_chunk(chunk, first)
+            first = False
+            chunk = []
+    if chunk:
+        yield encode_chunk(chunk, first)
+    yield b"]}"
+
+
+def get_streaming_results_response(
+    request: HttpRequest,
+    queryset: QuerySet,
+    serializer_class: Type[Serializer],
+    chunk_size: Optional[int] = None,
+    dumps: Optional[Callable[[List[Any]], bytes]] = None,
+) -> HttpResponse:
+    """
+    Returns a response streaming all the objects of the queryset with a constant
+    memory usage, no matter how many objects there are.
+
+    Django 4.1 iterates over the content of a streaming response directly on the
+    event loop when it's served by the ASGI handler, where the queryset can't be
+    evaluated. In that case, the same chunks are encoded while the view runs and
+    returned in a regular response instead. Because the whole response is then kept
+    in memory, at most `BASEROW_ASGI_STREAMING_MAX_ROWS` objects can be returned
+    and a bad request error is raised if there are more.
+
+    :param request: The request the response is for.
+    :param queryset: The queryset containing the objects to stream.
+    :param serializer_class: The serializer class used to serialize the objects.
+    :param chunk_size: The number of objects fetched and serialized at once.
+    :param dumps: An optional faster function encoding a chunk of objects into a
+        JSON array.
+    :raises APIException: When served by ASGI and the queryset contains more
+        objects than allowed.
+    :return: The streaming response, or a regular response when served by ASGI.
+    """
+
+    # The Django request is wrapped by the rest framework request.
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        max_count = settings.BASEROW_ASGI_STREAMING_MAX_ROWS
+        content = stream_serialized_results(
+            queryset, serializer_class, chunk_size, dumps, max_count=max_count
+        )
+        try:
+            return HttpResponse(b"".join(content), content_type="application/json")
+        except StreamingLimitExceeded:
+            exception = APIException(
+                {
+                    "error": "ERROR_STREAMING_LIMIT_EXCEEDED",
+                    "detail": f"At most {max_count} rows can be streamed at once "
+                    "by this server. Use the pagination instead.",
+                }
+            )
+            exception.status_code = HTTP_400_BAD_REQUEST
+            raise exception
+
+    content = stream_serialized_results(queryset, serializer_class, chunk_size, dumps)
+    return StreamingHttpResponse(content, content_type="application/json")
@@ -792,9 +792,42 @@ FROM_EMAIL = os.getenv("FROM_EMAIL", "no-reply@localhost")
 RESET_PASSWORD_TOKEN_MAX_AGE = 60 * 60 * 48  # 48 hours
 
 ROW_PAGE_SIZE_LIMIT = int(os.getenv("BASEROW_ROW_PAGE_SIZE_LIMIT", 200))
+# Prefetches the relationships of all the link row and multiple collaborators fields
+# of a page of rows with one query for all the fields, instead of one per field.
+BASEROW_COMBINED_MANY_TO_MANY_PREFETCH = str_to_bool(
+    os.getenv("BASEROW_COMBINED_MANY_TO_MANY_PREFETCH", "false")
+)
+# The number of rows fetched and serialized at once when all the rows are streamed
+# using the `stream` query parameter of the list rows endpoints.
+BASEROW_STREAMING_CHUNK_SIZE = int(os.getenv("BASEROW_STREAMING_CHUNK_SIZE", 1000))
+# The maximum number of rows that can be streamed when served by ASGI, where the
+# response is built in memory before it's sent.
+BASEROW_ASGI_STREAMING_MAX_ROWS = int(
+    os.getenv("BASEROW_ASGI_STREAMING_MAX_ROWS", 10000)
+)
 BATCH_ROWS_SIZE_LIMIT = int(
     os.getenv("BATCH_ROWS_SIZE_LIMIT", 200)
 )  # How many rows can be modified at once.
+# Inserts the rows of file imports and other batched row creations with
+# `COPY ... FROM STDIN` instead of `INSERT` statements.
+BASEROW_ROWS_BULK_INSERT_USE_COPY = str_to_bool(
+    os.getenv("BASEROW_ROWS_BULK_INSERT_USE_COPY", "false")
+)
+# Updates the rows of batch row updates with a single `UPDATE ... FROM (VALUES ...)`
+# statement instead of the `CASE WHEN` expressions generated by `bulk_update`.
+BASEROW_ROWS_BULK_UPDATE_USE_VALUES = str_to_bool(
+    os.getenv("BASEROW_ROWS_BULK_UPDATE_USE_VALUES", "false")
+)
+# When set, file imports having more rows than this value are split into chunks of
+# this amount of rows that are imported concurrently by separate celery tasks, each
+# in its own transaction. Disabled when 0.
+BASEROW_FILE_IMPORT_PARALLEL_CHUNK_SIZE = int(
+    os.getenv("BASEROW_FILE_IMPORT_PARALLEL_CHUNK_SIZE", 0)
+)
+# The number of rows trashed at once by the background delete rows job.
+BASEROW_DELETE_ROWS_JOB_CHUNK_SIZE = int(
+    os.getenv("BASEROW_DELETE_ROWS_JOB_CHUNK_SIZE", 1000)
+)
 
 TRASH_PAGE_SIZE_LIMIT = 200  # How many trash entries can be requested at once.
 
@@ -962,6 +995,36 @@ FILE_UPLOAD_PERMISSIONS = None
 
 MAX_FORMULA_STRING_LENGTH = 10000
 MAX_FIELD_REFERENCE_DEPTH = 1000
+# The maximum number of parsed formulas every process keeps in memory, so that the
+# same formulas are not parsed again and again. Set to 0 to disable the cache.
+BASEROW_FORMULA_CACHE_SIZE = int(os.getenv("BASEROW_FORMULA_CACHE_SIZE", 0))
+# If enabled, the field dependencies of a database are kept in memory and shared
+# between requests, instead of being queried recursively every time the dependants of
+# a field are needed.
+BASEROW_FIELD_DEPENDENCY_GRAPH_CACHE = str_to_bool(
+    os.getenv("BASEROW_FIELD_DEPENDENCY_GRAPH_CACHE", "false")
+)
+# The number of seconds the background recalculation of fields waits for, so that
+# the changes made in the meantime are recalculated together.
+BASEROW_DEFERRED_FIELD_UPDATES_DELAY_SECONDS = float(
+    os.getenv("BASEROW_DEFERRED_FIELD_UPDATES_DELAY_SECONDS", 1)
+)
+# The maximum number of deferred field updates executed in one transaction.
+BASEROW_DEFERRED_FIELD_UPDATES_BATCH_SIZE = int(
+    os.getenv("BASEROW_DEFERRED_FIELD_UPDATES_BATCH_SIZE", 100)
+)
+BASEROW_DEFERRED_FIELD_UPDATES_LOCK_EXPIRY = int(
+    os.getenv("BASEROW_DEFERRED_FIELD_UPDATES_LOCK_EXPIRY", 60 * 10)
+)
+# The number of times a failing deferred field update is executed before it's
+# discarded.
+BASEROW_DEFERRED_FIELD_UPDATES_MAX_ATTEMPTS = int(
+    os.getenv("BASEROW_DEFERRED_FIELD_UPDATES_MAX_ATTEMPTS", 3)
+)
+# The number of rows converted per transaction by the convert field type job.
+BASEROW_ONLINE_FIELD_CONVERSION_BATCH_SIZE = int(
+    os.getenv("BASEROW_ONLINE_FIELD_CONVERSION_BATCH_SIZE", 10000)
+)
 DONT_UPDATE_FORMULAS_AFTER_MIGRATION = bool(
     os.getenv("DONT_UPDATE_FORMULAS_AFTER_MIGRATION", "")
 )
@@ -975,6 +1038,11 @@ PERIODIC_FIELD_UPDATE_CRONTAB = get_crontab_from_env(
 PERIODIC_FIELD_UPDATE_QUEUE_NAME = os.getenv(
     "BASEROW_PERIODIC_FIELD_UPDATE_QUEUE_NAME", "export"
 )
+# If true, the periodic field update schedules a separate task per workspace instead
+# of updating all the workspaces one after the other in a single task.
+PERIODIC_FIELD_UPDATE_TASK_PER_WORKSPACE = (
+    os.getenv("BASEROW_PERIODIC_FIELD_UPDATE_TASK_PER_WORKSPACE", "false") == "true"
+)
 
 BASEROW_WEBHOOKS_MAX_CONSECUTIVE_TRIGGER_FAILURES = int(
     os.getenv("BASEROW_WEBHOOKS_MAX_CONSECUTIVE_TRIGGER_FAILURES", 8)
@@ -1150,6 +1218,45 @@ BASEROW_SYNC_TEMPLATES_TIME_LIMIT = int(
 APPEND_SLASH = False
 
 BASEROW_DISABLE_MODEL_CACHE = bool(os.getenv("BASEROW_DISABLE_MODEL_CACHE", ""))
+# The maximum number of fully generated table model classes every worker process keeps
+# in memory. Set to 0 to disable the in process model cache.
+BASEROW_IN_PROCESS_MODEL_CACHE_SIZE = int(
+    os.getenv("BASEROW_IN_PROCESS_MODEL_CACHE_SIZE", 0)
+)
+# The maximum number of generated row serializer classes every worker process keeps
+# in memory, per table version and fields. Set to 0 to disable the cache.
+BASEROW_ROW_SERIALIZER_CACHE_SIZE = int(
+    os.getenv("BASEROW_ROW_SERIALIZER_CACHE_SIZE", 256)
+)
+# Either `pickle` to store the generated model field attrs as is in the generated models
+# cache, or `snapshot` to only store a compact snapshot of the table's fields.
+BASEROW_GENERATED_MODEL_CACHE_FORMAT = os.getenv(
+    "BASEROW_GENERATED_MODEL_CACHE_FORMAT", "pickle"
+)
+BASEROW_GENERATED_MODEL_CACHE_COMPRESSION = str_to_bool(
+    os.getenv("BASEROW_GENERATED_MODEL_CACHE_COMPRESSION", "false")
+)
+# The number of most recently used tables of which the models are generated when a
+# gunicorn or celery worker process starts. Set to 0 to disable the warm-up. Celery
+# kills worker processes that do not start within 4 seconds by default, so keep the
+# time budget below that.
+BASEROW_MODEL_WARM_UP_TABLE_COUNT = int(
+    os.getenv("BASEROW_MODEL_WARM_UP_TABLE_COUNT", 0)
+)
+BASEROW_MODEL_WARM_UP_TIME_BUDGET_SECONDS = float(
+    os.getenv("BASEROW_MODEL_WARM_UP_TIME_BUDGET_SECONDS", 3)
+)
+# When estimated row counts are requested, the exact count is still computed if the
+# estimation is below this number of rows.
+BASEROW_ESTIMATED_COUNT_EXACT_THRESHOLD = int(
+    os.getenv("BASEROW_ESTIMATED_COUNT_EXACT_THRESHOLD", 10000)
+)
+# The number of seconds the exact row count of a view is cached. The cached count is
+# incremented or decremented when rows are created or deleted, so that opening a
+# busy view doesn't have to count all the rows again. Set to 0 to disable.
+BASEROW_VIEW_ROW_COUNT_CACHE_TIMEOUT = int(
+    os.getenv("BASEROW_VIEW_ROW_COUNT_CACHE_TIMEOUT", 0)
+)
 BASEROW_NOWAIT_FOR_LOCKS = not bool(
     os.getenv("BASEROW_WAIT_INSTEAD_OF_409_CONFLICT_ERROR", False)
 )
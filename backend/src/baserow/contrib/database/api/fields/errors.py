@@ -14,6 +14,11 @@ ERROR_FIELD_DOES_NOT_EXIST = (
 ERROR_CANNOT_DELETE_PRIMARY_FIELD = "ERROR_CANNOT_DELETE_PRIMARY_FIELD"
 ERROR_CANNOT_CHANGE_FIELD_TYPE = "ERROR_CANNOT_CHANGE_FIELD_TYPE"
 ERROR_CANNOT_CREATE_FIELD_TYPE = "ERROR_CANNOT_CREATE_FIELD_TYPE"
+ERROR_ONLINE_FIELD_TYPE_CONVERSION_NOT_SUPPORTED = (
+    "ERROR_ONLINE_FIELD_TYPE_CONVERSION_NOT_SUPPORTED",
+    HTTP_400_BAD_REQUEST,
+    "The field can't be converted to the new type in the background: {e}",
+)
 ERROR_LINK_ROW_TABLE_NOT_PROVIDED = (
     "ERROR_LINK_ROW_TABLE_NOT_PROVIDED",
     HTTP_400_BAD_REQUEST,
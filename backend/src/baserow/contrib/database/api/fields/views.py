@@ -12,6 +12,7 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from baserow.api.conditional import compute_etag, get_not_modified_response
 from baserow.api.decorators import (
     map_exceptions,
     validate_body,
@@ -182,6 +183,12 @@ class FieldsView(APIView):
             request, ["read", "create", "update"], table, False
         )
 
+        _, metadata_change_token = TableHandler().get_change_tokens(table.id)
+        etag = compute_etag(request, table.version, metadata_change_token)
+        not_modified_response = get_not_modified_response(request, etag)
+        if not_modified_response is not None:
+            return not_modified_response
+
         fields = specific_iterator(
             Field.objects.filter(table=table)
             .select_related("content_type")
@@ -192,7 +199,7 @@ class FieldsView(APIView):
             field_type_registry.get_serializer(field, FieldSerializer).data
             for field in fields
         ]
-        return Response(data)
+        return Response(data, headers={"ETag": etag})
 
     @extend_schema(
         parameters=[
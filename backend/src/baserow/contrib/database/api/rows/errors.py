@@ -11,3 +11,9 @@ ERROR_ROW_IDS_NOT_UNIQUE = (
     HTTP_400_BAD_REQUEST,
     "The provided row ids {e.ids} are not unique.",
 )
+
+ERROR_UPSERT_KEY_VALUES_NOT_UNIQUE = (
+    "ERROR_UPSERT_KEY_VALUES_NOT_UNIQUE",
+    HTTP_400_BAD_REQUEST,
+    "The provided rows have non unique key values {e.values}.",
+)
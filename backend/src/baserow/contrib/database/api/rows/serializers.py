@@ -1,11 +1,18 @@
+import threading
+from collections import OrderedDict
 from copy import deepcopy
-from typing import Dict, List
+from typing import Any, Dict, Hashable, List, Optional
 
 from django.conf import settings
 from django.db.models.base import ModelBase
+from django.db.models.manager import BaseManager
 
+import orjson
 from loguru import logger
 from rest_framework import serializers
+from rest_framework.fields import SkipField, is_simple_callable
+from rest_framework.relations import PKOnlyObject
+from rest_framework.utils.encoders import JSONEncoder
 
 from baserow.api.search.serializers import SearchQueryParamSerializer
 from baserow.api.utils import get_serializer_class
@@ -24,12 +31,113 @@ class RowSerializer(serializers.ModelSerializer):
 
 
 def serialize_rows_for_response(rows, model, user_field_names=False, many=True):
-    return get_row_serializer_class(
-        model,
-        RowSerializer,
-        is_response=True,
-        user_field_names=user_field_names,
-    )(rows, many=many).data
+    encoder = get_row_encoder(
+        get_row_serializer_class(
+            model,
+            RowSerializer,
+            is_response=True,
+            user_field_names=user_field_names,
+        )
+    )
+    return encoder.encode_many(rows) if many else encoder.encode(rows)
+
+
+class RowSerializerClassLRUCache:
+    """
+    A thread safe, bounded, per process cache of generated row serializer classes.
+    Generated table models are built again for every request unless the in process
+    model cache is enabled, so the serializer classes are not cached per model
+    class, but per table version and fields. The serializer classes of an older
+    table version simply become unreachable and are evicted eventually.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self._max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is None:
+            return settings.BASEROW_ROW_SERIALIZER_CACHE_SIZE
+        return self._max_size
+
+    @property
+    def enabled(self) -> bool:
+        # Without the model cache, the table version is never changed, so it can't
+        # be used to know if a serializer class is outdated.
+        return self.max_size > 0 and not settings.BASEROW_DISABLE_MODEL_CACHE
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            serializer_class = self._entries.get(key)
+            if serializer_class is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return serializer_class
+
+    def set(self, key: Hashable, serializer_class: Any):
+        with self._lock:
+            self._entries[key] = serializer_class
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+row_serializer_class_cache = RowSerializerClassLRUCache()
+
+
+def _freeze_serializer_cache_value(value: Any) -> Hashable:
+    """
+    Recursively converts the provided value into something hashable so that it can be
+    used in the serializer class cache key. Raises a TypeError if that's not possible.
+    """
+
+    if isinstance(value, dict):
+        return tuple(
+            sorted(
+                (key, _freeze_serializer_cache_value(val)) for key, val in value.items()
+            )
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_serializer_cache_value(val) for val in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze_serializer_cache_value(val) for val in value)
+    hash(value)
+    return value
+
+
+def _get_row_serializer_class_cache_key(model, **kwargs) -> Optional[Hashable]:
+    table = getattr(model, "baserow_table", None)
+    if table is None:
+        return None
+
+    try:
+        return (
+            table.id,
+            table.version,
+            # The fields can change within the transaction that changes the table
+            # version, so their types and names are part of the key as well.
+            tuple(
+                (field_id, field_object["type"].type, field_object["field"].name)
+                for field_id, field_object in model._field_objects.items()
+            ),
+            _freeze_serializer_cache_value(kwargs),
+        )
+    except TypeError:
+        # Some of the provided arguments are not hashable, the serializer class can't
+        # be cached in that case.
+        return None
 
 
 def get_row_serializer_class(
@@ -49,6 +157,10 @@ def get_row_serializer_class(
     a serializer field will be added via the `get_serializer_field` method of the field
     type.
 
+    The generated classes are cached per table version, fields and arguments,
+    because generating them is expensive for wide tables. If the arguments are not
+    hashable, a new class is generated every time.
+
     :param model: The model for which to generate a serializer.
     :type model: Model
     :param base_class: The base serializer class that will be extended when
@@ -80,6 +192,57 @@ def get_row_serializer_class(
     :rtype: ModelSerializer
     """
 
+    cache_key = _get_row_serializer_class_cache_key(
+        model,
+        base_class=base_class,
+        is_response=is_response,
+        field_ids=set(field_ids) if field_ids is not None else None,
+        field_names_to_include=(
+            set(field_names_to_include) if field_names_to_include is not None else None
+        ),
+        user_field_names=user_field_names,
+        field_kwargs=field_kwargs or None,
+        include_id=include_id,
+        required_fields=required_fields,
+    )
+
+    if not row_serializer_class_cache.enabled:
+        cache_key = None
+
+    if cache_key is not None:
+        cached = row_serializer_class_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    serializer_class = _generate_row_serializer_class(
+        model,
+        base_class=base_class,
+        is_response=is_response,
+        field_ids=field_ids,
+        field_names_to_include=field_names_to_include,
+        user_field_names=user_field_names,
+        field_kwargs=deepcopy(field_kwargs),
+        include_id=include_id,
+        required_fields=required_fields,
+    )
+
+    if cache_key is not None:
+        row_serializer_class_cache.set(cache_key, serializer_class)
+
+    return serializer_class
+
+
+def _generate_row_serializer_class(
+    model,
+    base_class=None,
+    is_response=False,
+    field_ids=None,
+    field_names_to_include=None,
+    user_field_names=False,
+    field_kwargs=None,
+    include_id=False,
+    required_fields=None,
+):
     if not field_kwargs:
         field_kwargs = {}
 
@@ -129,6 +292,105 @@ def get_row_serializer_class(
     )
 
 
+_json_encoder = JSONEncoder()
+
+
+class RowEncoder:
+    """
+    Serializes rows with the fields of a generated row serializer class, but without
+    the per field overhead of `Serializer.to_representation`. The attribute lookup of
+    every field is resolved once when the encoder is built, after which every row is
+    converted with a flat loop. The output is identical to the `data` of the
+    serializer, except that plain dicts are returned instead of `OrderedDict`s.
+    """
+
+    def __init__(self, serializer_class):
+        self._fields = []
+        serializer = serializer_class()
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            source_attrs = field.source_attrs
+            # When the field doesn't customize how the attribute is looked up, it can
+            # be replaced by a plain `getattr`.
+            attname = (
+                source_attrs[0]
+                if len(source_attrs) == 1
+                and type(field).get_attribute is serializers.Field.get_attribute
+                else None
+            )
+            self._fields.append((name, field, attname, field.to_representation))
+
+    def _get_attribute(self, field, row):
+        attribute = field.get_attribute(row)
+        if isinstance(attribute, PKOnlyObject):
+            return attribute, attribute.pk
+        return attribute, attribute
+
+    def encode(self, row) -> Dict[str, Any]:
+        """
+        Converts the provided row into a dict ready to be encoded as JSON.
+
+        :param row: The row instance of the serializer's model.
+        :return: The JSON ready dict.
+        """
+
+        data = {}
+        for name, field, attname, to_representation in self._fields:
+            try:
+                if attname is not None:
+                    attribute = check_for_none = getattr(row, attname)
+                    if is_simple_callable(attribute):
+                        attribute, check_for_none = self._get_attribute(field, row)
+                else:
+                    attribute, check_for_none = self._get_attribute(field, row)
+            except AttributeError:
+                try:
+                    attribute, check_for_none = self._get_attribute(field, row)
+                except SkipField:
+                    continue
+            except SkipField:
+                continue
+
+            if check_for_none is None:
+                data[name] = None
+            else:
+                data[name] = to_representation(attribute)
+        return data
+
+    def encode_many(self, rows) -> List[Dict[str, Any]]:
+        """
+        Converts the provided rows into a list of dicts ready to be encoded as JSON.
+        """
+
+        if isinstance(rows, BaseManager):
+            rows = rows.all()
+        return [self.encode(row) for row in rows]
+
+    def dumps(self, rows) -> bytes:
+        """
+        Encodes the provided rows straight into a JSON array using orjson. Values
+        that orjson doesn't support natively, like `Decimal`, are converted the same
+        way as the DRF JSON encoder does.
+        """
+
+        return orjson.dumps(self.encode_many(rows), default=_json_encoder.default)
+
+
+def get_row_encoder(serializer_class) -> RowEncoder:
+    """
+    Returns the `RowEncoder` of the provided row serializer class. The encoder is
+    built once and stored on the class, which is itself cached per table version by
+    `get_row_serializer_class`.
+    """
+
+    encoder = serializer_class.__dict__.get("_row_encoder")
+    if encoder is None:
+        encoder = RowEncoder(serializer_class)
+        serializer_class._row_encoder = encoder
+    return encoder
+
+
 def get_batch_row_serializer_class(row_serializer_class):
     class_name = "BatchRowSerializer"
 
@@ -346,6 +608,21 @@ class BatchCreateRowsQueryParamsSerializer(serializers.Serializer):
     before = serializers.IntegerField(required=False)
 
 
+class BatchUpsertRowsQueryParamsSerializer(serializers.Serializer):
+    key_field_id = serializers.IntegerField()
+
+
+class BatchUpsertRowsResponseSerializer(serializers.Serializer):
+    created_row_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        help_text="The ids of the rows that have been created.",
+    )
+    updated_row_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        help_text="The ids of the existing rows that have been updated.",
+    )
+
+
 class ListRowsQueryParamsSerializer(SearchQueryParamSerializer):
     user_field_names = serializers.BooleanField(required=False, default=False)
     order_by = serializers.CharField(required=False)
@@ -353,6 +630,7 @@ class ListRowsQueryParamsSerializer(SearchQueryParamSerializer):
     exclude = serializers.CharField(required=False)
     filter_type = serializers.CharField(required=False, default="")
     view_id = serializers.IntegerField(required=False)
+    stream = serializers.BooleanField(required=False, default=False)
 
 
 class BatchUpdateRowsSerializer(serializers.Serializer):
@@ -3,6 +3,7 @@ from django.urls import re_path
 from .views import (
     BatchDeleteRowsView,
     BatchRowsView,
+    BatchUpsertRowsView,
     RowAdjacentView,
     RowHistoryView,
     RowMoveView,
@@ -35,6 +36,11 @@ urlpatterns = [
         BatchDeleteRowsView.as_view(),
         name="batch-delete",
     ),
+    re_path(
+        r"table/(?P<table_id>[0-9]+)/batch-upsert/$",
+        BatchUpsertRowsView.as_view(),
+        name="batch-upsert",
+    ),
     re_path(
         r"table/(?P<table_id>[0-9]+)/(?P<row_id>[0-9]+)/move/$",
         RowMoveView.as_view(),
@@ -13,6 +13,7 @@ from rest_framework.response import Response
 from rest_framework.status import HTTP_204_NO_CONTENT
 from rest_framework.views import APIView
 
+from baserow.api.conditional import compute_etag, get_not_modified_response
 from baserow.api.decorators import (
     map_exceptions,
     validate_body,
@@ -30,17 +31,20 @@ from baserow.api.schemas import (
     get_error_schema,
 )
 from baserow.api.serializers import get_example_pagination_serializer_class
+from baserow.api.streaming import get_streaming_results_response
 from baserow.api.trash.errors import ERROR_CANNOT_DELETE_ALREADY_DELETED_ITEM
 from baserow.api.utils import validate_data
 from baserow.contrib.database.api.fields.errors import (
     ERROR_FIELD_DOES_NOT_EXIST,
     ERROR_FILTER_FIELD_NOT_FOUND,
+    ERROR_INCOMPATIBLE_FIELD,
     ERROR_ORDER_BY_FIELD_NOT_FOUND,
     ERROR_ORDER_BY_FIELD_NOT_POSSIBLE,
 )
 from baserow.contrib.database.api.rows.errors import (
     ERROR_ROW_DOES_NOT_EXIST,
     ERROR_ROW_IDS_NOT_UNIQUE,
+    ERROR_UPSERT_KEY_VALUES_NOT_UNIQUE,
 )
 from baserow.contrib.database.api.rows.serializers import GetRowAdjacentSerializer
 from baserow.contrib.database.api.tables.errors import ERROR_TABLE_DOES_NOT_EXIST
@@ -55,6 +59,7 @@ from baserow.contrib.database.api.views.errors import (
 from baserow.contrib.database.fields.exceptions import (
     FieldDoesNotExist,
     FilterFieldNotFound,
+    IncompatibleField,
     OrderByFieldNotFound,
     OrderByFieldNotPossible,
 )
@@ -65,8 +70,13 @@ from baserow.contrib.database.rows.actions import (
     DeleteRowsActionType,
     MoveRowActionType,
     UpdateRowsActionType,
+    UpsertRowsActionType,
+)
+from baserow.contrib.database.rows.exceptions import (
+    RowDoesNotExist,
+    RowIdsNotUnique,
+    UpsertKeyValuesNotUnique,
 )
-from baserow.contrib.database.rows.exceptions import RowDoesNotExist, RowIdsNotUnique
 from baserow.contrib.database.rows.handler import RowHandler
 from baserow.contrib.database.rows.history import RowHistoryHandler
 from baserow.contrib.database.rows.operations import (
@@ -103,6 +113,8 @@ from .schemas import row_names_response_schema
 from .serializers import (
     BatchCreateRowsQueryParamsSerializer,
     BatchDeleteRowsSerializer,
+    BatchUpsertRowsQueryParamsSerializer,
+    BatchUpsertRowsResponseSerializer,
     CreateRowQueryParamsSerializer,
     ListRowsQueryParamsSerializer,
     MoveRowQueryParamsSerializer,
@@ -111,6 +123,7 @@ from .serializers import (
     get_batch_row_serializer_class,
     get_example_batch_rows_serializer_class,
     get_example_row_serializer_class,
+    get_row_encoder,
     get_row_serializer_class,
 )
 
@@ -269,6 +282,18 @@ class RowsView(APIView):
                 type=OpenApiTypes.INT,
                 description="Includes all the filters and sorts of the provided view.",
             ),
+            OpenApiParameter(
+                name="stream",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.BOOL,
+                description=(
+                    "A flag query parameter which if provided streams all the rows "
+                    'matching the other parameters in one `{"results": [...]}` '
+                    "response instead of a page. The `page` and `size` parameters "
+                    "are then ignored. When the server runs with ASGI, at most "
+                    "`BASEROW_ASGI_STREAMING_MAX_ROWS` rows can be streamed."
+                ),
+            ),
             SEARCH_MODE_API_PARAM,
         ],
         tags=["Database table rows"],
@@ -295,6 +320,7 @@ class RowsView(APIView):
                     "ERROR_REQUEST_BODY_VALIDATION",
                     "ERROR_PAGE_SIZE_LIMIT",
                     "ERROR_INVALID_PAGE",
+                    "ERROR_STREAMING_LIMIT_EXCEEDED",
                     "ERROR_ORDER_BY_FIELD_NOT_FOUND",
                     "ERROR_ORDER_BY_FIELD_NOT_POSSIBLE",
                     "ERROR_FILTER_FIELD_NOT_FOUND",
@@ -355,29 +381,50 @@ class RowsView(APIView):
             table, include, exclude, user_field_names=user_field_names
         )
 
-        model = table.get_model(
-            fields=fields,
-            field_ids=[] if fields else None,
-        )
-        queryset = model.objects.all().enhance_by_fields()
-
+        view = None
+        view_handler = ViewHandler()
         if view_id:
-            view_handler = ViewHandler()
             view = view_handler.get_view_as_user(
                 request.user,
                 view_id,
-                base_queryset=View.objects.prefetch_related("viewsort_set"),
+                base_queryset=View.objects.prefetch_related(
+                    "viewsort_set", "viewfilter_set"
+                ),
             )
 
             if view.table_id != table.id:
                 raise ViewDoesNotExist()
 
-            queryset = view_handler.apply_filters(view, queryset)
-            queryset = view_handler.apply_sorting(view, queryset)
-
         adhoc_filters = AdHocFilters.from_request(
             request, user_field_names=user_field_names
         )
+
+        # The response can only be identified by the change tokens if the rows can't
+        # change without a row, field or view being changed.
+        etag = None
+        if (
+            not search
+            and not adhoc_filters.has_any_filters
+            and not (view and view_handler.view_filters_depend_on_current_time(view))
+        ):
+            etag = compute_etag(
+                request, table.version, *TableHandler().get_change_tokens(table.id)
+            )
+            not_modified_response = get_not_modified_response(request, etag)
+            if not_modified_response is not None:
+                return not_modified_response
+
+        model = table.get_model(
+            fields=fields,
+            field_ids=[] if fields else None,
+            projected=bool(fields),
+        )
+        queryset = model.objects.all().enhance_by_fields()
+
+        if view:
+            queryset = view_handler.apply_filters(view, queryset)
+            queryset = view_handler.apply_sorting(view, queryset)
+
         if adhoc_filters.has_any_filters:
             queryset = adhoc_filters.apply_to_queryset(model, queryset)
 
@@ -387,14 +434,26 @@ class RowsView(APIView):
         if order_by:
             queryset = queryset.order_by_fields_string(order_by, user_field_names)
 
-        paginator = PageNumberPagination(limit_page_size=settings.ROW_PAGE_SIZE_LIMIT)
-        page = paginator.paginate_queryset(queryset, request, self)
         serializer_class = get_row_serializer_class(
             model, RowSerializer, is_response=True, user_field_names=user_field_names
         )
-        serializer = serializer_class(page, many=True)
 
-        return paginator.get_paginated_response(serializer.data)
+        row_encoder = get_row_encoder(serializer_class)
+
+        if query_params.get("stream"):
+            response = get_streaming_results_response(
+                request, queryset, serializer_class, dumps=row_encoder.dumps
+            )
+        else:
+            paginator = PageNumberPagination(
+                limit_page_size=settings.ROW_PAGE_SIZE_LIMIT
+            )
+            page = paginator.paginate_queryset(queryset, request, self)
+            response = paginator.get_paginated_response(row_encoder.encode_many(page))
+
+        if etag:
+            response["ETag"] = etag
+        return response
 
     @extend_schema(
         parameters=[
@@ -1294,6 +1353,126 @@ class BatchDeleteRowsView(APIView):
         return Response(status=204)
 
 
+class BatchUpsertRowsView(APIView):
+    authentication_classes = APIView.authentication_classes + [TokenAuthentication]
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="table_id",
+                location=OpenApiParameter.PATH,
+                type=OpenApiTypes.INT,
+                description="Creates or updates the rows in the table.",
+            ),
+            OpenApiParameter(
+                name="key_field_id",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.INT,
+                description="The id of the field whose value is used to match the "
+                "provided rows with the existing rows of the table.",
+            ),
+            OpenApiParameter(
+                name="user_field_names",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.BOOL,
+                description=(
+                    "A flag query parameter which if provided this endpoint will "
+                    "expect the user specified field names instead of internal "
+                    "Baserow field names (field_123 etc)."
+                ),
+            ),
+            CLIENT_SESSION_ID_SCHEMA_PARAMETER,
+            CLIENT_UNDO_REDO_ACTION_GROUP_ID_SCHEMA_PARAMETER,
+        ],
+        tags=["Database table rows"],
+        operation_id="batch_upsert_database_table_rows",
+        description=(
+            "Creates or updates rows in the table if the user has access to the "
+            "related table's workspace. Every provided row is matched with the "
+            "existing row having the same value for the field provided in the "
+            "`key_field_id` query parameter. The matched rows are updated and the "
+            "other ones are created, in a single transaction. The accepted body "
+            "fields are the same as for the **batch_create_database_table_rows** "
+            "endpoint. If multiple existing rows have the same key value, the one "
+            "with the lowest id is updated."
+        ),
+        request=get_example_batch_rows_serializer_class(
+            example_type="post", user_field_names=True
+        ),
+        responses={
+            200: BatchUpsertRowsResponseSerializer,
+            400: get_error_schema(
+                [
+                    "ERROR_USER_NOT_IN_GROUP",
+                    "ERROR_REQUEST_BODY_VALIDATION",
+                    "ERROR_QUERY_PARAMETER_VALIDATION",
+                    "ERROR_INCOMPATIBLE_FIELD",
+                    "ERROR_UPSERT_KEY_VALUES_NOT_UNIQUE",
+                ]
+            ),
+            401: get_error_schema(["ERROR_NO_PERMISSION_TO_TABLE"]),
+            404: get_error_schema(
+                ["ERROR_TABLE_DOES_NOT_EXIST", "ERROR_FIELD_DOES_NOT_EXIST"]
+            ),
+        },
+    )
+    @transaction.atomic
+    @map_exceptions(
+        {
+            UserNotInWorkspace: ERROR_USER_NOT_IN_GROUP,
+            TableDoesNotExist: ERROR_TABLE_DOES_NOT_EXIST,
+            FieldDoesNotExist: ERROR_FIELD_DOES_NOT_EXIST,
+            IncompatibleField: ERROR_INCOMPATIBLE_FIELD,
+            UpsertKeyValuesNotUnique: ERROR_UPSERT_KEY_VALUES_NOT_UNIQUE,
+            NoPermissionToTable: ERROR_NO_PERMISSION_TO_TABLE,
+        }
+    )
+    @validate_query_parameters(BatchUpsertRowsQueryParamsSerializer)
+    def post(self, request: Request, table_id: int, query_params) -> Response:
+        """
+        Creates or updates the provided rows for the given table_id depending on
+        whether a row with the same key field value already exists.
+        """
+
+        table = TableHandler().get_table(table_id)
+        TokenHandler().check_table_permissions(request, "create", table, False)
+        TokenHandler().check_table_permissions(request, "update", table, False)
+        model = table.get_model()
+
+        key_field_object = model._field_objects.get(query_params["key_field_id"])
+        if key_field_object is None:
+            raise FieldDoesNotExist(
+                f"The field {query_params['key_field_id']} does not exist."
+            )
+
+        user_field_names = "user_field_names" in request.GET
+        row_validation_serializer = get_row_serializer_class(
+            model, user_field_names=user_field_names
+        )
+        validation_serializer = get_batch_row_serializer_class(
+            row_validation_serializer
+        )
+        data = validate_data(
+            validation_serializer, request.data, partial=True, return_validated=True
+        )
+
+        try:
+            created_rows, updated_rows = action_type_registry.get_by_type(
+                UpsertRowsActionType
+            ).do(request.user, table, data["items"], key_field_object["field"], model)
+        except ValidationError as exc:
+            raise RequestBodyValidationException(detail=exc.message)
+
+        response_serializer = BatchUpsertRowsResponseSerializer(
+            {
+                "created_row_ids": [row.id for row in created_rows],
+                "updated_row_ids": [row.id for row in updated_rows],
+            }
+        )
+        return Response(response_serializer.data)
+
+
 class RowAdjacentView(APIView):
     permission_classes = (IsAuthenticated,)
 
@@ -115,3 +115,23 @@ def extract_field_ids_from_string(value):
 
     ids = [get_field_id_from_field_key(v, False) for v in value.split(",")]
     return [_id for _id in ids if _id is not None]
+
+
+def get_count_response_data(queryset, estimate_count=False, get_count=None):
+    """
+    Returns the response data of the endpoints that can count the rows of a table
+    model queryset, optionally using an estimation.
+
+    :param queryset: The table model queryset to count.
+    :param estimate_count: Whether the count can be estimated for large querysets.
+    :param get_count: An optional callable returning the exact count of the
+        queryset, for example from a cache.
+    :return: A dict containing the count and if estimated, whether it's approximate.
+    """
+
+    if not estimate_count:
+        count = get_count(queryset) if get_count else queryset.count()
+        return {"count": count}
+
+    count, count_is_estimate = queryset.estimated_count()
+    return {"count": count, "count_is_estimate": count_is_estimate}
@@ -1,4 +1,5 @@
 from decimal import Decimal
+from functools import partial
 
 from drf_spectacular.openapi import OpenApiParameter, OpenApiTypes
 from drf_spectacular.utils import extend_schema
@@ -8,6 +9,7 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from baserow.api.conditional import compute_etag, get_not_modified_response
 from baserow.api.decorators import (
     allowed_includes,
     map_exceptions,
@@ -15,10 +17,15 @@ from baserow.api.decorators import (
     validate_query_parameters,
 )
 from baserow.api.errors import ERROR_USER_NOT_IN_GROUP
-from baserow.api.pagination import PageNumberPagination
+from baserow.api.pagination import (
+    CountProvidedLimitOffsetPagination,
+    KeysetPagination,
+    PageNumberPagination,
+)
 from baserow.api.schemas import get_error_schema
 from baserow.api.search.serializers import SearchQueryParamSerializer
 from baserow.api.serializers import get_example_pagination_serializer_class
+from baserow.api.streaming import get_streaming_results_response
 from baserow.contrib.database.api.constants import SEARCH_MODE_API_PARAM
 from baserow.contrib.database.api.fields.errors import (
     ERROR_FIELD_DOES_NOT_EXIST,
@@ -31,9 +38,13 @@ from baserow.contrib.database.api.rows.serializers import (
     RowSerializer,
     get_example_row_metadata_field_serializer,
     get_example_row_serializer_class,
+    get_row_encoder,
     get_row_serializer_class,
 )
-from baserow.contrib.database.api.utils import get_include_exclude_field_ids
+from baserow.contrib.database.api.utils import (
+    get_count_response_data,
+    get_include_exclude_field_ids,
+)
 from baserow.contrib.database.api.views.errors import (
     ERROR_AGGREGATION_TYPE_DOES_NOT_EXIST,
     ERROR_NO_AUTHORIZATION_TO_PUBLICLY_SHARED_VIEW,
@@ -58,6 +69,7 @@ from baserow.contrib.database.fields.exceptions import (
 from baserow.contrib.database.fields.handler import FieldHandler
 from baserow.contrib.database.fields.utils import get_field_id_from_field_key
 from baserow.contrib.database.rows.registries import row_metadata_registry
+from baserow.contrib.database.table.handler import TableHandler
 from baserow.contrib.database.table.operations import ListRowsDatabaseTableOperationType
 from baserow.contrib.database.views.exceptions import (
     AggregationTypeDoesNotExist,
@@ -128,6 +140,36 @@ class GridViewView(APIView):
                     " includes extra row specific data on a per row basis."
                 ),
             ),
+            OpenApiParameter(
+                name="estimate_count",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.NONE,
+                description="If provided, the `count` is estimated based on the "
+                "table statistics or the query planner instead of counting all the "
+                "rows, which is much faster for large views. The response then "
+                "contains `count_is_estimate`, indicating whether the count is "
+                "approximate. Small counts are always exact. Leave out this "
+                "parameter to get the exact count.",
+            ),
+            OpenApiParameter(
+                name="cursor",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.STR,
+                description="Enables the cursor pagination if provided. An empty "
+                "value returns the first page and the `next` URL of the response "
+                "contains the cursor of the next page. The `size` parameter defines "
+                "how many rows are returned.",
+            ),
+            OpenApiParameter(
+                name="stream",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.NONE,
+                description="If provided, all the rows of the view are streamed in "
+                'one `{"results": [...]}` response instead of a page. The pagination '
+                "parameters and the `include` parameter are then ignored. When the "
+                "server runs with ASGI, at most `BASEROW_ASGI_STREAMING_MAX_ROWS` "
+                "rows can be streamed.",
+            ),
             OpenApiParameter(
                 name="limit",
                 location=OpenApiParameter.QUERY,
@@ -257,8 +299,11 @@ class GridViewView(APIView):
         description=(
             "Lists the requested rows of the view's table related to the provided "
             "`view_id` if the authorized user has access to the database's workspace. "
-            "The response is paginated either by a limit/offset or page/size style. "
-            "The style depends on the provided GET parameters. The properties of the "
+            "The response is paginated either by a limit/offset, page/size or "
+            "cursor/size style. The style depends on the provided GET parameters. "
+            "The cursor style, started by providing an empty `cursor` parameter, "
+            "does not include the count and keeps a constant speed when paging deep "
+            "into large views. The properties of the "
             "returned rows depends on which fields the table has. For a complete "
             "overview of fields use the **list_database_table_fields** endpoint to "
             "list them all. In the example all field types are listed, but normally "
@@ -335,7 +380,7 @@ class GridViewView(APIView):
             view_id,
             GridView,
             base_queryset=GridView.objects.prefetch_related(
-                "viewsort_set", "viewgroupby_set"
+                "viewsort_set", "viewgroupby_set", "viewfilter_set"
             ),
         )
         view_type = view_type_registry.get_by_model(view)
@@ -351,6 +396,26 @@ class GridViewView(APIView):
             view.table, include_fields, exclude_fields
         )
 
+        # The response can only be identified by the change tokens if the rows can't
+        # change without a row, field or view being changed. The row metadata, like
+        # the comment count, isn't tracked by the change tokens.
+        etag = None
+        if (
+            not query_params.get("search")
+            and not adhoc_filters.has_any_filters
+            and not row_metadata
+            and not view_handler.view_filters_depend_on_current_time(view)
+        ):
+            etag = compute_etag(
+                request,
+                view.table.version,
+                *TableHandler().get_change_tokens(view.table_id),
+            )
+            not_modified_response = get_not_modified_response(request, etag)
+            if not_modified_response is not None:
+                return not_modified_response
+        etag_headers = {"ETag": etag} if etag else None
+
         model = view.table.get_model()
         queryset = view_handler.get_queryset(
             view,
@@ -367,13 +432,43 @@ class GridViewView(APIView):
         if adhoc_filters.has_any_filters:
             queryset = adhoc_filters.apply_to_queryset(model, queryset)
 
+        get_count = None
+        if not query_params.get("search") and not adhoc_filters.has_any_filters:
+            # The queryset contains exactly the rows of the view, so the cached row
+            # count of the view can be used.
+            get_count = partial(view_handler.get_view_row_count, view)
+
+        estimate_count = "estimate_count" in request.GET
         if "count" in request.GET:
-            return Response({"count": queryset.count()})
+            return Response(
+                get_count_response_data(queryset, estimate_count, get_count),
+                headers=etag_headers,
+            )
 
-        if LimitOffsetPagination.limit_query_param in request.GET:
-            paginator = LimitOffsetPagination()
+        if "stream" in request.GET:
+            serializer_class = get_row_serializer_class(
+                model, RowSerializer, is_response=True, field_ids=field_ids
+            )
+            response = get_streaming_results_response(
+                request,
+                queryset,
+                serializer_class,
+                dumps=get_row_encoder(serializer_class).dumps,
+            )
+            if etag:
+                response["ETag"] = etag
+            return response
+
+        if KeysetPagination.cursor_query_param in request.GET:
+            paginator = KeysetPagination()
+        elif LimitOffsetPagination.limit_query_param in request.GET:
+            paginator = (
+                CountProvidedLimitOffsetPagination(get_count)
+                if get_count
+                else LimitOffsetPagination()
+            )
         else:
-            paginator = PageNumberPagination()
+            paginator = PageNumberPagination(estimate_count=estimate_count)
 
         page = paginator.paginate_queryset(queryset, request, self)
         serializer_class = get_row_serializer_class(
@@ -382,9 +477,10 @@ class GridViewView(APIView):
             is_response=True,
             field_ids=field_ids,
         )
-        serializer = serializer_class(page, many=True)
 
-        response = paginator.get_paginated_response(serializer.data)
+        response = paginator.get_paginated_response(
+            get_row_encoder(serializer_class).encode_many(page)
+        )
 
         if view_type.can_group_by and view.viewgroupby_set.all():
             group_by_fields = [
@@ -412,6 +508,9 @@ class GridViewView(APIView):
             )
             response.data.update(row_metadata=row_metadata)
 
+        if etag:
+            response["ETag"] = etag
+
         view_loaded.send(
             sender=self,
             table=view.table,
@@ -949,6 +1048,26 @@ class PublicGridViewRowsView(APIView):
                     "example the field's width is included in here."
                 ),
             ),
+            OpenApiParameter(
+                name="estimate_count",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.NONE,
+                description="If provided, the `count` is estimated based on the "
+                "table statistics or the query planner instead of counting all the "
+                "rows, which is much faster for large views. The response then "
+                "contains `count_is_estimate`, indicating whether the count is "
+                "approximate. Small counts are always exact. Leave out this "
+                "parameter to get the exact count.",
+            ),
+            OpenApiParameter(
+                name="cursor",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.STR,
+                description="Enables the cursor pagination if provided. An empty "
+                "value returns the first page and the `next` URL of the response "
+                "contains the cursor of the next page. The `size` parameter defines "
+                "how many rows are returned.",
+            ),
             OpenApiParameter(
                 name="limit",
                 location=OpenApiParameter.QUERY,
@@ -1086,8 +1205,11 @@ class PublicGridViewRowsView(APIView):
         description=(
             "Lists the requested rows of the view's table related to the provided "
             "`slug` if the grid view is public."
-            "The response is paginated either by a limit/offset or page/size style. "
-            "The style depends on the provided GET parameters. The properties of the "
+            "The response is paginated either by a limit/offset, page/size or "
+            "cursor/size style. The style depends on the provided GET parameters. "
+            "The cursor style, started by providing an empty `cursor` parameter, "
+            "does not include the count and keeps a constant speed when paging deep "
+            "into large views. The properties of the "
             "returned rows depends on which fields the table has. For a complete "
             "overview of fields use the **list_database_table_fields** endpoint to "
             "list them all. In the example all field types are listed, but normally "
@@ -1170,7 +1292,15 @@ class PublicGridViewRowsView(APIView):
             authorization_token=get_public_view_authorization_token(request),
         )
         view_type = view_type_registry.get_by_model(view)
-        model = view.table.get_model()
+        # Only the publicly visible fields and the fields that the view is filtered
+        # on are needed to compute the rows, so there is no need to generate the
+        # hidden fields.
+        model = view.table.get_model(
+            field_ids=view_handler.get_public_view_field_ids_to_generate(
+                view, view_type
+            ),
+            projected=True,
+        )
 
         (
             queryset,
@@ -1189,20 +1319,36 @@ class PublicGridViewRowsView(APIView):
             view_type=view_type,
         )
 
+        get_count = None
+        if not search and not adhoc_filters.has_any_filters:
+            # The queryset contains exactly the rows of the view, so the cached row
+            # count of the view can be used.
+            get_count = partial(view_handler.get_view_row_count, view)
+
+        estimate_count = "estimate_count" in request.GET
         if count:
-            return Response({"count": queryset.count()})
+            return Response(
+                get_count_response_data(queryset, estimate_count, get_count)
+            )
 
-        if LimitOffsetPagination.limit_query_param in request.GET:
-            paginator = LimitOffsetPagination()
+        if KeysetPagination.cursor_query_param in request.GET:
+            paginator = KeysetPagination()
+        elif LimitOffsetPagination.limit_query_param in request.GET:
+            paginator = (
+                CountProvidedLimitOffsetPagination(get_count)
+                if get_count
+                else LimitOffsetPagination()
+            )
         else:
-            paginator = PageNumberPagination()
+            paginator = PageNumberPagination(estimate_count=estimate_count)
 
         page = paginator.paginate_queryset(queryset, request, self)
         serializer_class = get_row_serializer_class(
             model, RowSerializer, is_response=True, field_ids=field_ids
         )
-        serializer = serializer_class(page, many=True)
-        response = paginator.get_paginated_response(serializer.data)
+        response = paginator.get_paginated_response(
+            get_row_encoder(serializer_class).encode_many(page)
+        )
 
         if field_options:
             context = {"field_options": publicly_visible_field_options}
@@ -14,6 +14,7 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from baserow.api.conditional import compute_etag, get_not_modified_response
 from baserow.api.decorators import (
     allowed_includes,
     map_exceptions,
@@ -285,6 +286,14 @@ class ViewsView(APIView):
             context=table,
         )
 
+        _, metadata_change_token = TableHandler().get_change_tokens(table.id)
+        # The name and the order of the table are included because the table is
+        # serialized together with every view.
+        etag = compute_etag(request, table.name, table.order, metadata_change_token)
+        not_modified_response = get_not_modified_response(request, etag)
+        if not_modified_response is not None:
+            return not_modified_response
+
         views = ViewHandler().list_views(
             request.user,
             table,
@@ -312,7 +321,7 @@ class ViewsView(APIView):
                 group_bys=group_bys,
                 many=True,
             ).data
-        return Response(serialized_views)
+        return Response(serialized_views, headers={"ETag": etag})
 
     @extend_schema(
         parameters=[
@@ -86,6 +86,7 @@ class DatabaseConfig(AppConfig):
             MoveRowActionType,
             UpdateRowActionType,
             UpdateRowsActionType,
+            UpsertRowsActionType,
         )
 
         action_type_registry.register(CreateRowActionType())
@@ -96,6 +97,7 @@ class DatabaseConfig(AppConfig):
         action_type_registry.register(MoveRowActionType())
         action_type_registry.register(UpdateRowActionType())
         action_type_registry.register(UpdateRowsActionType())
+        action_type_registry.register(UpsertRowsActionType())
 
         from baserow.contrib.database.views.actions import (
             CreateDecorationActionType,
@@ -518,14 +520,17 @@ class DatabaseConfig(AppConfig):
         from baserow.core.jobs.registries import job_type_registry
 
         from .airtable.job_types import AirtableImportJobType
-        from .fields.job_types import DuplicateFieldJobType
+        from .fields.job_types import ConvertFieldTypeJobType, DuplicateFieldJobType
         from .file_import.job_types import FileImportJobType
+        from .rows.job_types import DeleteRowsJobType
         from .table.job_types import DuplicateTableJobType
 
         job_type_registry.register(AirtableImportJobType())
         job_type_registry.register(FileImportJobType())
         job_type_registry.register(DuplicateTableJobType())
         job_type_registry.register(DuplicateFieldJobType())
+        job_type_registry.register(DeleteRowsJobType())
+        job_type_registry.register(ConvertFieldTypeJobType())
 
         post_migrate.connect(safely_update_formula_versions, sender=self)
         pre_migrate.connect(clear_generated_model_cache_receiver, sender=self)
@@ -794,6 +799,7 @@ class DatabaseConfig(AppConfig):
         pre_migrate.connect(clear_generated_model_cache_receiver, sender=self)
 
         import baserow.contrib.database.fields.tasks  # noqa: F401
+        import baserow.contrib.database.file_import.tasks  # noqa: F401
         import baserow.contrib.database.rows.history  # noqa: F401
         import baserow.contrib.database.rows.tasks  # noqa: F401
         import baserow.contrib.database.search.tasks  # noqa: F401
@@ -19,3 +19,42 @@ sql_create_try_cast = """
     $FUNCTION$
     language plpgsql;
 """
+
+# The permanent counterpart of `try_cast`, used by the trigger that converts the
+# values of the rows written while a field is converted online.
+sql_create_online_conversion_function = """
+    create or replace function %(function)s(
+        p_in text,
+        p_default int default null
+    )
+        returns %(type)s
+    as
+    $FUNCTION$
+    begin
+        begin
+            %(alter_column_prepare_old_value)s
+            %(alter_column_prepare_new_value)s
+            return p_in::%(type)s;
+        exception when others then
+            return p_default;
+        end;
+    end;
+    $FUNCTION$
+    language plpgsql;
+"""
+sql_create_online_conversion_trigger = """
+    create or replace function %(trigger_function)s()
+        returns trigger
+    as
+    $FUNCTION$
+    begin
+        new.%(shadow_column)s := %(converted_value)s;
+        return new;
+    end;
+    $FUNCTION$
+    language plpgsql;
+
+    create trigger %(trigger)s
+        before insert or update of %(column)s on %(table)s
+        for each row execute function %(trigger_function)s();
+"""
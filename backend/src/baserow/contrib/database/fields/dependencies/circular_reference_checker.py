@@ -24,6 +24,9 @@
 
 from django.conf import settings
 
+from baserow.contrib.database.fields.dependencies.graph import (
+    get_field_dependency_graph_for_table,
+)
 from baserow.contrib.database.fields.dependencies.models import FieldDependency
 
 
@@ -34,6 +37,10 @@ def will_cause_circular_dep(from_field, to_field):
 def get_all_field_dependencies(field):
     from baserow.contrib.database.fields.models import Field
 
+    graph = get_field_dependency_graph_for_table(field.table_id)
+    if graph is not None:
+        return graph.get_all_dependencies(field.pk, settings.MAX_FIELD_REFERENCE_DEPTH)
+
     query_parameters = {
         "pk": field.pk,
         "max_depth": settings.MAX_FIELD_REFERENCE_DEPTH,
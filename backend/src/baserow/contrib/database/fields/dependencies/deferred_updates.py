@@ -0,0 +1,193 @@
+from collections import defaultdict
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from loguru import logger
+
+from baserow.contrib.database.fields.field_cache import FieldCache
+from baserow.contrib.database.fields.models import Field, LinkRowField
+from baserow.contrib.database.fields.registries import field_type_registry
+from baserow.contrib.database.search.handler import SearchHandler
+from baserow.contrib.database.table.models import Table
+from baserow.core.db import specific_iterator
+
+from .models import DeferredFieldUpdate
+from .update_collector import FieldUpdateCollector
+
+# Contains a field id and the ids of the link row fields that lead back to the
+# starting table.
+DeferredFieldPath = Tuple[int, Tuple[int, ...]]
+
+
+def defer_field_updates(
+    starting_table: Table,
+    starting_row_ids: List[int],
+    deleted_m2m_rels_per_link_field: Optional[Dict[int, Set[int]]],
+    field_paths: Iterable[DeferredFieldPath],
+):
+    """
+    Stores the field updates that must happen in the background for the starting
+    rows and schedules the task that executes them once the transaction commits.
+
+    :param starting_table: The table where the rows have changed.
+    :param starting_row_ids: The ids of the rows that have changed.
+    :param deleted_m2m_rels_per_link_field: For every link row field id, the ids of
+        the rows whose relations with the starting rows have been deleted.
+    :param field_paths: The ids of the fields to recalculate and the ids of the link
+        row fields leading back to the starting table.
+    """
+
+    from baserow.contrib.database.fields.tasks import schedule_deferred_field_updates
+
+    deleted_m2m_rels_per_link_field = deleted_m2m_rels_per_link_field or {}
+    DeferredFieldUpdate.objects.create(
+        starting_table=starting_table,
+        starting_row_ids=list(starting_row_ids),
+        deleted_m2m_rels_per_link_field={
+            str(link_field_id): list(row_ids)
+            for link_field_id, row_ids in deleted_m2m_rels_per_link_field.items()
+        },
+        field_paths=[[field_id, list(via_ids)] for field_id, via_ids in field_paths],
+    )
+    schedule_deferred_field_updates()
+
+
+def run_deferred_field_updates_batch(
+    batch_size: Optional[int] = None,
+) -> int:
+    """
+    Executes the oldest deferred field updates. The updates of the same starting
+    table are merged, so that every affected field is recalculated once for all the
+    changed rows. The updates that have failed are kept to be executed again, until
+    they have failed `BASEROW_DEFERRED_FIELD_UPDATES_MAX_ATTEMPTS` times.
+
+    :param batch_size: The maximum number of deferred updates to execute.
+    :return: The number of deferred updates that have been executed.
+    """
+
+    if batch_size is None:
+        batch_size = settings.BASEROW_DEFERRED_FIELD_UPDATES_BATCH_SIZE
+
+    with transaction.atomic():
+        deferred_updates = list(
+            DeferredFieldUpdate.objects.select_for_update(skip_locked=True)
+            .select_related("starting_table")
+            .order_by("id")[:batch_size]
+        )
+        failed_updates = []
+        for _, updates in groupby(
+            sorted(deferred_updates, key=lambda u: (u.starting_table_id, u.id)),
+            key=lambda u: u.starting_table_id,
+        ):
+            updates = list(updates)
+            starting_table = updates[0].starting_table
+            # noinspection PyBroadException
+            try:
+                with transaction.atomic():
+                    _run_deferred_field_updates_for_table(starting_table, updates)
+            except Exception:
+                logger.exception(
+                    "Failed to run the deferred field updates of table {table_id}.",
+                    table_id=starting_table.id,
+                )
+                failed_updates.extend(updates)
+
+        max_attempts = settings.BASEROW_DEFERRED_FIELD_UPDATES_MAX_ATTEMPTS
+        updates_to_retry = [
+            update.id
+            for update in failed_updates
+            if update.failed_attempts + 1 < max_attempts
+        ]
+        DeferredFieldUpdate.objects.filter(id__in=updates_to_retry).update(
+            failed_attempts=F("failed_attempts") + 1
+        )
+        DeferredFieldUpdate.objects.filter(
+            id__in=[deferred_update.id for deferred_update in deferred_updates]
+        ).exclude(id__in=updates_to_retry).delete()
+
+    return len(deferred_updates)
+
+
+def _run_deferred_field_updates_for_table(
+    starting_table: Table, deferred_updates: List[DeferredFieldUpdate]
+):
+    if starting_table.trashed:
+        return
+
+    starting_row_ids = sorted(
+        {row_id for update in deferred_updates for row_id in update.starting_row_ids}
+    )
+    deleted_m2m_rels_per_link_field = defaultdict(set)
+    field_paths: Set[DeferredFieldPath] = set()
+    for update in deferred_updates:
+        for link_field_id, row_ids in update.deleted_m2m_rels_per_link_field.items():
+            deleted_m2m_rels_per_link_field[int(link_field_id)].update(row_ids)
+        for field_id, via_ids in update.field_paths:
+            field_paths.add((field_id, tuple(via_ids)))
+
+    field_ids = {field_id for field_id, via_ids in field_paths} | {
+        via_id for _, via_ids in field_paths for via_id in via_ids
+    }
+    fields_by_id = {
+        field.id: field
+        for field in specific_iterator(
+            Field.objects.filter(id__in=field_ids).select_related("table")
+        )
+    }
+
+    field_cache = FieldCache()
+    model = field_cache.get_model(starting_table)
+    starting_rows = list(model.objects.filter(id__in=starting_row_ids))
+    update_collector = FieldUpdateCollector(
+        starting_table,
+        starting_row_ids=starting_row_ids,
+        deleted_m2m_rels_per_link_field=deleted_m2m_rels_per_link_field,
+        defer_background_recalculations=False,
+    )
+
+    updated_fields = []
+    visited_paths = set()
+
+    def recalculate(field: Field, via_path: List[LinkRowField]):
+        path = (field.id, tuple(link_field.id for link_field in via_path))
+        if path in visited_paths:
+            return
+        visited_paths.add(path)
+
+        field_type = field_type_registry.get_by_model(field)
+        field_type.row_of_dependency_updated(
+            field, starting_rows, update_collector, field_cache, via_path
+        )
+        updated_fields.append(field)
+
+        # The dependants have been updated with the previous values of the field,
+        # so they must be recalculated as well.
+        for (
+            dependant_field,
+            _,
+            dependant_via_path,
+        ) in field.dependant_fields_with_types(field_cache, via_path):
+            recalculate(dependant_field, dependant_via_path or [])
+
+    for field_id, via_ids in sorted(field_paths):
+        field = fields_by_id.get(field_id)
+        via_path = [fields_by_id.get(via_id) for via_id in via_ids]
+        if field is None or None in via_path:
+            # The field or the relationship has been deleted in the meantime.
+            continue
+        recalculate(field_cache.cache_field(field), via_path)
+
+    updated_fields_in_starting_table = (
+        update_collector.apply_updates_and_get_updated_fields(field_cache)
+    )
+    if updated_fields_in_starting_table:
+        SearchHandler.field_value_updated_or_created(starting_table)
+
+    from baserow.contrib.database.views.handler import ViewHandler
+
+    ViewHandler().field_value_updated(updated_fields)
+    update_collector.send_force_refresh_signals_for_all_updated_tables()
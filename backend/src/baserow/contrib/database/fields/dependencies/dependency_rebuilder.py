@@ -11,6 +11,9 @@ from baserow.contrib.database.fields.dependencies.circular_reference_checker imp
 from baserow.contrib.database.fields.dependencies.exceptions import (
     CircularFieldDependencyError,
 )
+from baserow.contrib.database.fields.dependencies.graph import (
+    invalidate_field_dependency_graph_for_table,
+)
 from baserow.contrib.database.fields.dependencies.models import FieldDependency
 from baserow.contrib.database.fields.field_cache import FieldCache
 
@@ -29,6 +32,7 @@ def break_dependencies_for_field(field):
     field.dependants.update(dependency=None, broken_reference_field_name=field.name)
     if isinstance(field, LinkRowField):
         field.vias.all().delete()
+    invalidate_field_dependency_graph_for_table(field.table_id)
 
 
 def update_fields_with_broken_references(field: "field_models.Field"):
@@ -59,6 +63,8 @@ def update_fields_with_broken_references(field: "field_models.Field"):
     FieldDependency.objects.bulk_update(
         updated_deps, ["dependency", "broken_reference_field_name"]
     )
+    if updated_deps:
+        invalidate_field_dependency_graph_for_table(field.table_id)
 
     return len(updated_deps) > 0
 
@@ -112,4 +118,6 @@ def rebuild_field_dependencies(
     # remaining ones are old dependencies which should no longer exist. Delete them.
     delete_ids = [dep.id for dep in current_deps_by_str.values()]
     FieldDependency.objects.filter(pk__in=delete_ids).delete()
+    if new_dependencies or delete_ids:
+        invalidate_field_dependency_graph_for_table(field_instance.table_id)
     return new_dependencies
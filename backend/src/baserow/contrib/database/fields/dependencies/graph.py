@@ -0,0 +1,369 @@
+"""
+This file is responsible for the per process, in-memory cache of the field dependency
+graph of every database. The graph contains all the `FieldDependency` rows of a
+database, and answers the same questions as the recursive queries of the
+`FieldDependencyHandler` and the `circular_reference_checker` without querying the
+database.
+
+Every database has a version stored in the Django cache:
+    `field_dependency_graph_version_{database_id}`
+
+When we need the graph of a database we:
+1. Get the version of the database graph from the Django cache.
+2. Check if the graph in the memory of the process has been built for that version.
+3. If they differ, re-query all the dependencies of the database and keep the graph
+   in memory for that version.
+
+Every change of the dependencies bumps the version once when it happens, and once
+again when the transaction commits, so that a graph built by another process from
+the previously committed dependencies doesn't survive the commit. The transaction
+that changed the dependencies of a database doesn't use the graph of that database
+anymore, because it can't be shared with the other processes.
+"""
+
+import itertools
+import threading
+import uuid
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from .models import FieldDependency
+
+MAX_CACHED_GRAPHS = 256
+
+# Contains the id, the path of via link row field ids and the content type id of a
+# dependant field.
+FieldDependantPath = Tuple[int, List[int], int]
+
+
+def field_dependency_graph_version_key(database_id: int) -> str:
+    return f"field_dependency_graph_version_{database_id}"
+
+
+class FieldDependencyEdge(NamedTuple):
+    dependant_id: int
+    dependency_id: Optional[int]
+    via_id: Optional[int]
+
+
+class FieldDependencyGraph:
+    """
+    The adjacency lists of all the field dependencies of a database.
+    """
+
+    def __init__(self, rows: Iterable[Tuple]):
+        """
+        :param rows: For every dependency, the dependant id, dependency id, via id,
+            table id of the dependant, content type id of the dependant, table id of
+            the dependency and the related field id of the via field.
+        """
+
+        self.edges_by_dependency: Dict[int, List[FieldDependencyEdge]] = defaultdict(
+            list
+        )
+        self.edges_by_dependant: Dict[int, List[FieldDependencyEdge]] = defaultdict(
+            list
+        )
+        self.edges_by_via: Dict[int, List[FieldDependencyEdge]] = defaultdict(list)
+        self.edges_by_via_related_field: Dict[
+            int, List[FieldDependencyEdge]
+        ] = defaultdict(list)
+        self.table_ids: Dict[int, int] = {}
+        self.content_type_ids: Dict[int, int] = {}
+
+        for (
+            dependant_id,
+            dependency_id,
+            via_id,
+            dependant_table_id,
+            dependant_content_type_id,
+            dependency_table_id,
+            via_related_field_id,
+        ) in rows:
+            edge = FieldDependencyEdge(dependant_id, dependency_id, via_id)
+            self.edges_by_dependant[dependant_id].append(edge)
+            self.table_ids[dependant_id] = dependant_table_id
+            self.content_type_ids[dependant_id] = dependant_content_type_id
+            if dependency_id is not None:
+                self.edges_by_dependency[dependency_id].append(edge)
+                self.table_ids[dependency_id] = dependency_table_id
+            if via_id is not None:
+                self.edges_by_via[via_id].append(edge)
+            if via_related_field_id is not None:
+                self.edges_by_via_related_field[via_related_field_id].append(edge)
+
+    def get_all_dependants(
+        self,
+        table_id: int,
+        field_ids: Iterable[int],
+        associated_relations_changed: bool,
+        max_depth: int,
+    ) -> List[FieldDependantPath]:
+        """
+        Returns the dependants of the provided fields recursively, like the query of
+        `FieldDependencyHandler.get_all_dependent_fields_with_type`. Every dependant
+        is returned once per unique path of via fields, ordered by the maximum
+        depth at which it has been found.
+
+        :param table_id: The table that the provided field_ids are all part of.
+        :param field_ids: The field ids for which we need to find the dependants.
+        :param associated_relations_changed: If true, the dependants via the
+            relations of the provided fields are returned as well.
+        :param max_depth: The maximum depth of the returned dependants.
+        :return: The dependant field ids, their via paths and content type ids.
+        """
+
+        field_ids = set(field_ids)
+        first_edges = [
+            edge
+            for field_id in field_ids
+            for edge in self.edges_by_dependency.get(field_id, [])
+        ]
+        if associated_relations_changed:
+            first_edges += [
+                edge
+                for field_id in field_ids
+                for edge in itertools.chain(
+                    self.edges_by_via.get(field_id, []),
+                    self.edges_by_via_related_field.get(field_id, []),
+                )
+                if edge.dependant_id not in field_ids
+            ]
+
+        frontier = set()
+        for edge in first_edges:
+            # Only the vias that are a join required to get from the dependant cell
+            # to the dependency are part of the path.
+            via_is_join = edge.via_id is not None and (
+                self.table_ids.get(edge.dependant_id) != table_id
+                or (
+                    edge.dependency_id is not None
+                    and self.table_ids.get(edge.dependency_id) == table_id
+                )
+            )
+            frontier.add((edge.dependant_id, (edge.via_id,) if via_is_join else ()))
+
+        max_depth_by_path = {}
+        depth = 1
+        while frontier and depth <= max_depth:
+            next_frontier = set()
+            for path in frontier:
+                max_depth_by_path[path] = depth
+                dependant_id, via_ids = path
+                for edge in self.edges_by_dependency.get(dependant_id, []):
+                    next_via_ids = (
+                        via_ids + (edge.via_id,) if edge.via_id is not None else via_ids
+                    )
+                    next_frontier.add((edge.dependant_id, next_via_ids))
+            frontier = next_frontier
+            depth += 1
+
+        return [
+            (dependant_id, list(via_ids), self.content_type_ids[dependant_id])
+            for (dependant_id, via_ids), _ in sorted(
+                max_depth_by_path.items(),
+                key=lambda item: (item[1], item[0][0], item[0][1]),
+            )
+        ]
+
+    def get_all_dependencies(self, field_id: int, max_depth: int) -> Set[int]:
+        """
+        Returns the ids of all the fields that the provided field depends on
+        recursively, like the query of `get_all_field_dependencies`.
+
+        :param field_id: The field to get the dependencies for.
+        :param max_depth: The maximum depth of the returned dependencies.
+        :return: The ids of the dependencies.
+        """
+
+        dependencies = set()
+        frontier = {field_id}
+        depth = 1
+        while frontier and depth <= max_depth:
+            frontier = {
+                edge.dependency_id
+                for dependant_id in frontier
+                for edge in self.edges_by_dependant.get(dependant_id, [])
+                if edge.dependency_id is not None
+            }
+            dependencies |= frontier
+            depth += 1
+        return dependencies
+
+
+class FieldDependencyGraphCache:
+    """
+    A thread safe, bounded, per process cache of the field dependency graphs, keyed
+    by database id. Every graph is stored together with the version it has been built
+    for.
+    """
+
+    def __init__(self, max_size: int = MAX_CACHED_GRAPHS):
+        self._max_size = max_size
+        self._graphs: OrderedDict = OrderedDict()
+        self._database_ids_by_table_id: Dict[int, int] = {}
+        self._lock = threading.RLock()
+
+    def get_database_id(self, table_id: int) -> int:
+        """
+        Returns the id of the database of the table. Tables never move to another
+        database, so the result is kept in memory forever.
+        """
+
+        from baserow.contrib.database.table.models import Table
+
+        database_id = self._database_ids_by_table_id.get(table_id)
+        if database_id is None:
+            database_id = (
+                Table.objects_and_trash.filter(id=table_id)
+                .values_list("database_id", flat=True)
+                .get()
+            )
+            self._database_ids_by_table_id[table_id] = database_id
+        return database_id
+
+    def get_graph(self, database_id: int) -> Optional[FieldDependencyGraph]:
+        """
+        Returns the up-to-date dependency graph of the database, or None if the graph
+        can't be used in the current transaction and the dependencies must be queried
+        instead.
+
+        :param database_id: The database to get the graph for.
+        :return: The graph or None.
+        """
+
+        if not settings.BASEROW_FIELD_DEPENDENCY_GRAPH_CACHE:
+            return None
+
+        if database_id in get_dirty_database_ids():
+            return None
+
+        version_key = field_dependency_graph_version_key(database_id)
+        version = cache.get(version_key)
+        if version is None:
+            version = str(uuid.uuid4())
+            cache.add(version_key, version, timeout=None)
+            version = cache.get(version_key, version)
+
+        with self._lock:
+            entry = self._graphs.get(database_id)
+            if entry is not None and entry[0] == version:
+                self._graphs.move_to_end(database_id)
+                return entry[1]
+
+        graph = self._build_graph(database_id)
+        # A graph built from a snapshot taken before the version was read could miss
+        # committed changes, so it's only kept if every statement sees the latest
+        # committed data.
+        if self._sees_latest_committed_data():
+            with self._lock:
+                self._graphs[database_id] = (version, graph)
+                self._graphs.move_to_end(database_id)
+                while len(self._graphs) > self._max_size:
+                    self._graphs.popitem(last=False)
+        return graph
+
+    def invalidate(self, database_id: int):
+        """
+        Bumps the version of the graph of the database now, and again once the
+        current transaction commits. The graph is not used by the current transaction
+        anymore.
+
+        :param database_id: The database whose dependencies have changed.
+        """
+
+        version_key = field_dependency_graph_version_key(database_id)
+        cache.set(version_key, str(uuid.uuid4()), timeout=None)
+        with self._lock:
+            self._graphs.pop(database_id, None)
+
+        if connection.in_atomic_block:
+            dirty_database_ids = get_dirty_database_ids()
+            if not dirty_database_ids:
+                transaction.on_commit(dirty_database_ids.clear)
+            dirty_database_ids.add(database_id)
+            transaction.on_commit(
+                lambda: cache.set(version_key, str(uuid.uuid4()), timeout=None)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._graphs.clear()
+
+    def _build_graph(self, database_id: int) -> FieldDependencyGraph:
+        rows = FieldDependency.objects.filter(
+            dependant__table__database_id=database_id
+        ).values_list(
+            "dependant_id",
+            "dependency_id",
+            "via_id",
+            "dependant__table_id",
+            "dependant__content_type_id",
+            "dependency__table_id",
+            "via__link_row_related_field_id",
+        )
+        return FieldDependencyGraph(rows)
+
+    def _sees_latest_committed_data(self) -> bool:
+        if not connection.in_atomic_block:
+            return True
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT current_setting('transaction_isolation')")
+            return cursor.fetchone()[0] == "read committed"
+
+
+def get_dirty_database_ids() -> Set[int]:
+    """
+    Returns the ids of the databases whose dependencies have been changed by the
+    current transaction of the connection. The set is emptied when the transaction
+    commits, or when it's requested outside of a transaction after a rollback.
+    """
+
+    dirty_database_ids = connection.__dict__.setdefault(
+        "_baserow_field_dependency_dirty_database_ids", set()
+    )
+    if dirty_database_ids and not connection.in_atomic_block:
+        dirty_database_ids.clear()
+    return dirty_database_ids
+
+
+field_dependency_graph_cache = FieldDependencyGraphCache()
+
+
+def get_field_dependency_graph_for_table(
+    table_id: int,
+) -> Optional[FieldDependencyGraph]:
+    """
+    Returns the dependency graph of the database of the table if it can be used.
+    """
+
+    if not settings.BASEROW_FIELD_DEPENDENCY_GRAPH_CACHE:
+        return None
+
+    return field_dependency_graph_cache.get_graph(
+        field_dependency_graph_cache.get_database_id(table_id)
+    )
+
+
+def invalidate_field_dependency_graph_for_table(table_id: int):
+    """
+    Invalidates the dependency graph of the database of the table.
+    """
+
+    from baserow.contrib.database.table.models import Table
+
+    if not settings.BASEROW_FIELD_DEPENDENCY_GRAPH_CACHE:
+        return
+
+    try:
+        database_id = field_dependency_graph_cache.get_database_id(table_id)
+    except Table.DoesNotExist:
+        # The whole table is being deleted together with its dependencies.
+        return
+
+    field_dependency_graph_cache.invalidate(database_id)
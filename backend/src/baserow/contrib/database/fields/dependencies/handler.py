@@ -18,6 +18,7 @@ from baserow.core.handler import CoreHandler
 from baserow.core.models import Workspace
 from baserow.core.types import PermissionCheck
 
+from .graph import FieldDependantPath, get_field_dependency_graph_for_table
 from .models import FieldDependency
 
 FieldDependants = List[Tuple[Field, FieldType, List[LinkRowField]]]
@@ -94,6 +95,118 @@ class FieldDependencyHandler:
         if len(field_ids) == 0:
             return []
 
+        graph = get_field_dependency_graph_for_table(table_id)
+        if graph is not None:
+            dependant_paths = graph.get_all_dependants(
+                table_id,
+                field_ids,
+                associated_relations_changed,
+                settings.MAX_FIELD_REFERENCE_DEPTH,
+            )
+        else:
+            dependant_paths = cls._query_all_dependant_paths(
+                table_id, field_ids, associated_relations_changed
+            )
+
+        link_row_field_content_type = ContentType.objects.get_for_model(LinkRowField)
+        fields_to_fetch = []
+
+        # Adds the dependant field ids and the link row via fields to the
+        # `fields_to_fetch` list, so that we can later query efficiently fetch the
+        # specific objects.
+        for dependant_id, via_ids, content_type_id in dependant_paths:
+            field = Field(id=dependant_id, content_type_id=content_type_id)
+            if field not in fields_to_fetch:
+                fields_to_fetch.append(field)
+
+            for via_id in via_ids:
+                link_row_field = Field(
+                    id=via_id, content_type_id=link_row_field_content_type.id
+                )
+                if link_row_field not in fields_to_fetch:
+                    fields_to_fetch.append(link_row_field)
+
+        # This hook is called for every unique field type in the specific_iterator of
+        # the fields. The `table` and `link_row_table` references are later needed,
+        # so we're prefetching them here based on the type.
+        from baserow.contrib.database.fields.field_types import LinkRowFieldType
+
+        link_row_field_model = field_type_registry.get(
+            LinkRowFieldType.type
+        ).model_class
+
+        def queryset_hook(model, queryset):
+            queryset = queryset.select_related("table")
+            if model == link_row_field_model:
+                queryset = queryset.select_related("link_row_table")
+            return queryset
+
+        # Creates an object of specific field types, so that we don't have to execute
+        # unnecessary queries later on.
+        specific_fields = {
+            field.id: field
+            for field in specific_iterator(
+                fields_to_fetch,
+                base_model=Field,
+                per_content_type_queryset_hook=queryset_hook,
+            )
+        }
+
+        result: FieldDependants = []
+        for dependant_id, via_ids, _ in dependant_paths:
+            dependant = specific_fields.get(dependant_id)
+            if dependant is None or any(
+                via_id not in specific_fields for via_id in via_ids
+            ):
+                # The dependant or a link row field of the path has been deleted
+                # after the dependency graph has been built, so there is nothing to
+                # update.
+                continue
+            dependant_field = field_cache.lookup_specific(dependant)
+            if dependant_field is None:
+                # If somehow the dependant is trashed it will be None. We can't really
+                # trigger any updates for it so ignore it.
+                continue
+            dependant_field_type = field_type_registry.get_by_model(dependant_field)
+
+            # The dependant paths contain a path of link row fields that lead back to
+            # the original table so that we can later efficiently update the correct
+            # rows.
+            #
+            # We only want to add via's to the path which are valid joins required to
+            # get from the dependant cell to the dependency. The queryset can return
+            # dependencies with via's for dependants in the same row, which don't need
+            # a join, so we filter those out here.
+            via_path_to_starting_table = [
+                field_cache.lookup_specific(specific_fields[via_id])
+                for via_id in via_ids
+            ] or None
+
+            result.append(
+                (dependant_field, dependant_field_type, via_path_to_starting_table)
+            )
+
+        return result
+
+    @classmethod
+    def _query_all_dependant_paths(
+        cls,
+        table_id: int,
+        field_ids: Iterable[int],
+        associated_relations_changed: bool,
+    ) -> List[FieldDependantPath]:
+        """
+        Queries the field dependants recursively.
+
+        :param table_id: The table that the provided field_ids are all part of.
+        :param field_ids: The field ids for which we need to find the dependent fields.
+        :param associated_relations_changed: If true, the dependants on the relations
+            of the provided fields are returned as well.
+        :return: A list containing the dependant field ids, the ids of the link row
+            fields that lead back to the starting table and the dependant content type
+            ids.
+        """
+
         query_parameters = {
             "pks": tuple(field_ids),
             "max_depth": settings.MAX_FIELD_REFERENCE_DEPTH,
@@ -180,85 +293,14 @@ class FieldDependencyHandler:
         """  # nosec b608
 
         queryset = FieldDependency.objects.raw(raw_query, query_parameters)
-        link_row_field_content_type = ContentType.objects.get_for_model(LinkRowField)
-        fields_to_fetch = []
-
-        # Unpacks the dependant field id, the link row via fields, and adds them to the
-        # `fields_to_fetch` list, so that we can later query efficiently fetch the
-        # specific objects.
-        for dependency in queryset:
-            if dependency.via_ids:
-                dependency.via_ids = [
-                    int(v) for v in dependency.via_ids.split("|") if v
-                ]
-            else:
-                dependency.via_ids = []
-
-            field = Field(id=dependency.id, content_type_id=dependency.content_type_id)
-            if field not in fields_to_fetch:
-                fields_to_fetch.append(field)
-
-            for via_id in dependency.via_ids:
-                link_row_field = Field(
-                    id=via_id, content_type_id=link_row_field_content_type.id
-                )
-                if link_row_field not in fields_to_fetch:
-                    fields_to_fetch.append(link_row_field)
-
-        # This hook is called for every unique field type in the specific_iterator of
-        # the fields. The `table` and `link_row_table` references are later needed,
-        # so we're prefetching them here based on the type.
-        from baserow.contrib.database.fields.field_types import LinkRowFieldType
-
-        link_row_field_model = field_type_registry.get(
-            LinkRowFieldType.type
-        ).model_class
-
-        def queryset_hook(model, queryset):
-            queryset = queryset.select_related("table")
-            if model == link_row_field_model:
-                queryset = queryset.select_related("link_row_table")
-            return queryset
-
-        # Creates an object of specific field types, so that we don't have to execute
-        # unnecessary queries later on.
-        specific_fields = {
-            field.id: field
-            for field in specific_iterator(
-                fields_to_fetch,
-                base_model=Field,
-                per_content_type_queryset_hook=queryset_hook,
-            )
-        }
-
-        result: FieldDependants = []
-        for dependency in queryset:
-            dependant = specific_fields[dependency.id]
-            dependant_field = field_cache.lookup_specific(dependant)
-            if dependant_field is None:
-                # If somehow the dependant is trashed it will be None. We can't really
-                # trigger any updates for it so ignore it.
-                continue
-            dependant_field_type = field_type_registry.get_by_model(dependant_field)
-
-            # The first raw query has constructed a path of link row fields that lead
-            # back to the original table so that we can later efficiently update the
-            # correct rows.
-            #
-            # We only want to add via's to the path which are valid joins required to
-            # get from the dependant cell to the dependency. The queryset can return
-            # dependencies with via's for dependants in the same row, which don't need
-            # a join, so we filter those out here.
-            via_path_to_starting_table = [
-                field_cache.lookup_specific(specific_fields[via_id])
-                for via_id in dependency.via_ids
-            ] or None
-
-            result.append(
-                (dependant_field, dependant_field_type, via_path_to_starting_table)
+        return [
+            (
+                dependency.id,
+                [int(v) for v in (dependency.via_ids or "").split("|") if v],
+                dependency.content_type_id,
             )
-
-        return result
+            for dependency in queryset
+        ]
 
     @classmethod
     def get_dependant_fields_with_type(
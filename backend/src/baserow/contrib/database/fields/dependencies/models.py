@@ -1,3 +1,4 @@
+from django.contrib.postgres.fields import ArrayField
 from django.db import models
 
 
@@ -49,3 +50,39 @@ class FieldDependency(models.Model):
         """
 
         return f"{self.dependant_id}__{self._dependency_postfix()}"
+
+
+class DeferredFieldUpdate(models.Model):
+    """
+    The update statements of fields that must be recalculated in the background,
+    postponed when rows have changed in another table. The statements are executed
+    again later by the `run_deferred_field_updates` task for the starting rows.
+    """
+
+    starting_table = models.ForeignKey(
+        "database.Table",
+        on_delete=models.CASCADE,
+        related_name="+",
+        help_text="The table where the rows have changed.",
+    )
+    starting_row_ids = ArrayField(
+        models.PositiveIntegerField(),
+        help_text="The ids of the rows that have changed in the starting table.",
+    )
+    deleted_m2m_rels_per_link_field = models.JSONField(
+        default=dict,
+        help_text="For every link row field id, the ids of the rows whose relations "
+        "with the starting rows have been deleted.",
+    )
+    field_paths = models.JSONField(
+        help_text="A list of the field ids and the ids of the link row fields that "
+        "lead back to the starting table.",
+    )
+    failed_attempts = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="The number of times the execution of the update has failed.",
+    )
+    created_on = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("id",)
@@ -265,6 +265,7 @@ class FieldUpdateCollector:
         starting_table: Table,
         starting_row_ids: StartingRowIdsType = None,
         deleted_m2m_rels_per_link_field: Optional[Dict[int, Set[int]]] = None,
+        defer_background_recalculations: bool = True,
     ):
         """
 
@@ -272,6 +273,9 @@ class FieldUpdateCollector:
         :param starting_row_ids: If the update starts from specific rows in the
             starting table set this and all update statements executed by this collector
             will only update rows which join back to these starting rows.
+        :param defer_background_recalculations: If true, the update statements of
+            fields in other tables that must be recalculated in the background are
+            postponed until after the transaction instead of executed.
         """
 
         self._updated_fields_per_table: Dict[
@@ -281,6 +285,10 @@ class FieldUpdateCollector:
         self._starting_row_ids = starting_row_ids
         self._starting_table = starting_table
         self._deleted_m2m_rels_per_link_field = deleted_m2m_rels_per_link_field
+        self._defer_background_recalculations = defer_background_recalculations
+        self._deferred_field_paths: Set[Tuple[int, Tuple[int, ...]]] = set()
+        # The total number of rows updated by all the `apply_updates` calls.
+        self.updated_rows = 0
 
         self._update_statement_collector = PathBasedUpdateStatementCollector(
             self._starting_table, connection_here=None, connection_is_broken=False
@@ -307,6 +315,11 @@ class FieldUpdateCollector:
             starting rows via this path are updated.
         """
 
+        if self._must_be_deferred(field, via_path_to_starting_table):
+            path = tuple(link_field.id for link_field in via_path_to_starting_table)
+            self._deferred_field_paths.add((field.id, path))
+            return
+
         # noinspection PyTypeChecker
         self._updated_fields_per_table[field.table_id][field.id] = UpdatedField(field)
         if field.table_id not in self._updated_tables:
@@ -353,11 +366,27 @@ class FieldUpdateCollector:
         update queries as possible and return the number of updated rows.
         """
 
-        return self._update_statement_collector.execute_all(
+        updated_rows = self._update_statement_collector.execute_all(
             field_cache,
             self._starting_row_ids,
             deleted_m2m_rels_per_link_field=self._deleted_m2m_rels_per_link_field,
         )
+        self.updated_rows += updated_rows
+
+        if self._deferred_field_paths:
+            from baserow.contrib.database.fields.dependencies.deferred_updates import (
+                defer_field_updates,
+            )
+
+            defer_field_updates(
+                self._starting_table,
+                self._starting_row_ids,
+                self._deleted_m2m_rels_per_link_field,
+                self._deferred_field_paths,
+            )
+            self._deferred_field_paths = set()
+
+        return updated_rows
 
     def apply_updates_and_get_updated_fields(
         self, field_cache: FieldCache, skip_search_updates=False
@@ -412,6 +441,24 @@ class FieldUpdateCollector:
         for table in self._updated_tables.values():
             table_updated.send(self, table=table, user=None, force_table_refresh=True)
 
+    def _must_be_deferred(
+        self,
+        field: Field,
+        via_path_to_starting_table: Optional[List[LinkRowField]],
+    ) -> bool:
+        """
+        Only the cells that change because specific rows in another table have
+        changed can be recalculated later. Updates of entire columns, after a field
+        change for example, always happen right away.
+        """
+
+        return (
+            self._defer_background_recalculations
+            and self._starting_row_ids is not None
+            and bool(via_path_to_starting_table)
+            and getattr(field, "recalculate_in_background", False)
+        )
+
     def _get_updated_fields_to_send_signals_for_per_table(
         self,
     ) -> List[Tuple[Field, List[Field]]]:
@@ -39,6 +39,13 @@ class CannotChangeFieldType(Exception):
     """Raised if the field type cannot be altered."""
 
 
+class OnlineFieldTypeConversionNotSupported(Exception):
+    """
+    Raised if the field can't be converted to the new type without altering the
+    column in place.
+    """
+
+
 class CannotCreateFieldType(Exception):
     """Raised if the field type cannot be created at the moment."""
 
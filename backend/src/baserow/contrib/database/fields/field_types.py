@@ -38,6 +38,7 @@ from django.db.models.functions import Coalesce, RowNumber
 from dateutil import parser
 from dateutil.parser import ParserError
 from loguru import logger
+from opentelemetry import metrics
 from rest_framework import serializers
 
 from baserow.contrib.database.api.fields.errors import (
@@ -100,6 +101,7 @@ from baserow.core.formula.parser.exceptions import FormulaFunctionTypeDoesNotExi
 from baserow.core.handler import CoreHandler
 from baserow.core.models import UserFile, WorkspaceUser
 from baserow.core.registries import ImportExportConfig
+from baserow.core.telemetry.utils import add_baserow_trace_attrs
 from baserow.core.user_files.exceptions import UserFileDoesNotExist
 from baserow.core.user_files.handler import UserFileHandler
 from baserow.core.utils import list_to_comma_separated_string
@@ -206,6 +208,14 @@ from .utils.duration import (
 
 User = get_user_model()
 
+meter = metrics.get_meter(__name__)
+periodic_field_update_rows_counter = meter.create_counter(
+    "baserow.periodic_field_update_rows",
+    unit="1",
+    description="The number of rows updated by the periodic update of the fields "
+    "depending on the current time.",
+)
+
 if TYPE_CHECKING:
     from baserow.contrib.database.fields.dependencies.update_collector import (
         FieldUpdateCollector,
@@ -1990,13 +2000,25 @@ class LinkRowFieldType(ManyToManyFieldTypeSerializeToInputValueMixin, FieldType)
 
     def enhance_queryset(self, queryset, field, name):
         """
-        Makes sure that the related rows are prefetched by Django. We also want to
-        enhance the primary field of the related queryset. If for example the primary
-        field is a single select field then the dropdown options need to be
-        prefetched in order to prevent many queries.
+        Makes sure that the related rows are prefetched by Django.
+        """
+
+        related_queryset = self.get_combined_prefetch_queryset(
+            queryset.model, field, name
+        )
+        return queryset.prefetch_related(
+            models.Prefetch(name, queryset=related_queryset)
+        )
+
+    def get_combined_prefetch_queryset(self, model, field, name):
+        """
+        Returns the queryset to fetch the related rows. We also want to enhance the
+        primary field of the related queryset. If for example the primary field is a
+        single select field then the dropdown options need to be prefetched in order
+        to prevent many queries.
         """
 
-        remote_model = queryset.model._meta.get_field(name).remote_field.model
+        remote_model = model._meta.get_field(name).remote_field.model
         related_queryset = remote_model.objects.all()
 
         try:
@@ -2019,9 +2041,7 @@ class LinkRowFieldType(ManyToManyFieldTypeSerializeToInputValueMixin, FieldType)
             # need to enhance the queryset.
             pass
 
-        return queryset.prefetch_related(
-            models.Prefetch(name, queryset=related_queryset)
-        )
+        return related_queryset
 
     def prepare_value_for_db(self, instance, value):
         return self.prepare_value_for_db_in_bulk(
@@ -2354,6 +2374,7 @@ class LinkRowFieldType(ManyToManyFieldTypeSerializeToInputValueMixin, FieldType)
                 related_model = instance.link_row_table.get_model(
                     manytomany_models=model.baserow_models,
                     app_label=model._meta.app_label,
+                    projected=getattr(model, "_projected_model", False),
                 )
                 model.baserow_models[related_model_name] = related_model
 
@@ -4197,6 +4218,7 @@ class FormulaFieldType(ReadOnlyFieldType):
     CORE_FORMULA_FIELDS = [
         "formula",
         "formula_type",
+        "recalculate_in_background",
     ]
     allowed_fields = BASEROW_FORMULA_TYPE_ALLOWED_FIELDS + CORE_FORMULA_FIELDS
     serializer_field_names = BASEROW_FORMULA_TYPE_ALLOWED_FIELDS + CORE_FORMULA_FIELDS
@@ -4422,6 +4444,16 @@ class FormulaFieldType(ReadOnlyFieldType):
             table__database__workspace__trashed=False,
         )
 
+    def can_skip_periodic_update(
+        self, field: FormulaField, previous_now: Optional[datetime], now: datetime
+    ) -> bool:
+        return (
+            previous_now is not None
+            and previous_now.astimezone(timezone.utc).date()
+            == now.astimezone(timezone.utc).date()
+            and FormulaHandler.only_needs_periodic_update_when_the_date_changes(field)
+        )
+
     def run_periodic_update(
         self,
         field: Field,
@@ -4481,6 +4513,8 @@ class FormulaFieldType(ReadOnlyFieldType):
         if is_root_update_call:
             update_collector.apply_updates_and_get_updated_fields(field_cache)
             update_collector.send_force_refresh_signals_for_all_updated_tables()
+            periodic_field_update_rows_counter.add(update_collector.updated_rows)
+            add_baserow_trace_attrs(updated_rows=update_collector.updated_rows)
 
         return new_all_updated_fields
 
@@ -4723,10 +4757,12 @@ class CountFieldType(FormulaFieldType):
     can_get_unique_values = False
     allowed_fields = BASEROW_FORMULA_TYPE_ALLOWED_FIELDS + [
         "through_field_id",
+        "recalculate_in_background",
     ]
     serializer_field_names = BASEROW_FORMULA_TYPE_ALLOWED_FIELDS + [
         "through_field_id",
         "formula_type",
+        "recalculate_in_background",
     ]
     serializer_field_overrides = {
         "through_field_id": serializers.IntegerField(
@@ -4841,12 +4877,14 @@ class RollupFieldType(FormulaFieldType):
         "through_field_id",
         "target_field_id",
         "rollup_function",
+        "recalculate_in_background",
     ]
     serializer_field_names = BASEROW_FORMULA_TYPE_ALLOWED_FIELDS + [
         "through_field_id",
         "target_field_id",
         "rollup_function",
         "formula_type",
+        "recalculate_in_background",
     ]
     serializer_field_overrides = {
         "through_field_id": serializers.IntegerField(
@@ -4996,6 +5034,7 @@ class LookupFieldType(FormulaFieldType):
         "through_field_name",
         "target_field_id",
         "target_field_name",
+        "recalculate_in_background",
     ]
     serializer_field_names = BASEROW_FORMULA_TYPE_ALLOWED_FIELDS + [
         "through_field_id",
@@ -5003,6 +5042,7 @@ class LookupFieldType(FormulaFieldType):
         "target_field_id",
         "target_field_name",
         "formula_type",
+        "recalculate_in_background",
     ]
     serializer_field_overrides = {
         "through_field_name": serializers.CharField(
@@ -5447,6 +5487,9 @@ class MultipleCollaboratorsFieldType(
     def enhance_queryset(self, queryset, field, name):
         return queryset.prefetch_related(name)
 
+    def get_combined_prefetch_queryset(self, model, field, name):
+        return model._meta.get_field(name).remote_field.model.objects.all()
+
     def get_export_serialized_value(self, row, field_name, cache, files_zip, storage):
         cache_entry = f"{field_name}_relations_export"
         if cache_entry not in cache:
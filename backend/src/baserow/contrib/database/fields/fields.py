@@ -341,10 +341,13 @@ class IntegerFieldWithSequence(models.IntegerField):
 
     db_returning = True
 
+    def get_sequence_name(self) -> str:
+        return f"{self.name}_seq"
+
     def pre_save(self, model_instance, add):
         if add and not getattr(model_instance, self.name):
             return RawSQL(  # nosec
-                f"nextval('{self.name}_seq'::regclass)",
+                f"nextval('{self.get_sequence_name()}'::regclass)",
                 (),
             )
         else:
@@ -66,6 +66,7 @@ from baserow.core.utils import (
 from ..search.handler import SearchHandler
 from ..table.cache import invalidate_table_in_model_cache
 from .backup_handler import FieldDataBackupHandler
+from .dependencies.graph import invalidate_field_dependency_graph_for_table
 from .dependencies.handler import FieldDependencyHandler
 from .dependencies.update_collector import FieldUpdateCollector
 from .exceptions import (
@@ -441,6 +442,7 @@ class FieldHandler(metaclass=baserow_trace_methods(tracer)):
         after_schema_change_callback: Optional[
             Callable[[SpecificFieldForUpdate], None]
         ] = None,
+        column_already_converted: bool = False,
         **kwargs,
     ) -> Union[SpecificFieldForUpdate, Tuple[SpecificFieldForUpdate, List[Field]]]:
         """
@@ -460,6 +462,9 @@ class FieldHandler(metaclass=baserow_trace_methods(tracer)):
         :param after_schema_change_callback: If specified this callback is called
             after the field has had it's schema updated but before any dependant
             fields have been updated.
+        :param column_already_converted: Indicates that the values in the database
+            column have already been converted to the new type, by an online field
+            type conversion for example, so the column must not be altered anymore.
         :param kwargs: The field values that need to be updated
         :raises ValueError: When the provided field is not an instance of Field.
         :raises CannotChangeFieldType: When the database server responds with an
@@ -507,6 +512,9 @@ class FieldHandler(metaclass=baserow_trace_methods(tracer)):
             )
             new_model_class = to_field_type.model_class
             field.change_polymorphic_type_to(new_model_class)
+            # The content type of the field changes without a `Field` post_delete,
+            # so the cached dependency graph must not resolve it with the old one.
+            invalidate_field_dependency_graph_for_table(field.table_id)
 
         else:
             dependants_broken_due_to_type_change = []
@@ -580,7 +588,7 @@ class FieldHandler(metaclass=baserow_trace_methods(tracer)):
                 user,
                 connection,
             )
-        else:
+        elif not column_already_converted:
             if baserow_field_type_changed:
                 # If the baserow type has changed we always want to force run any alter
                 # column SQL as otherwise it might not run if the two baserow fields
@@ -1,17 +1,43 @@
+import contextlib
+from datetime import datetime
+
+from loguru import logger
 from rest_framework import serializers
 
 from baserow.api.errors import ERROR_GROUP_DOES_NOT_EXIST, ERROR_USER_NOT_IN_GROUP
+from baserow.api.utils import validate_data_custom_fields
+from baserow.contrib.database.api.fields.errors import (
+    ERROR_CANNOT_CHANGE_FIELD_TYPE,
+    ERROR_FIELD_DOES_NOT_EXIST,
+    ERROR_ONLINE_FIELD_TYPE_CONVERSION_NOT_SUPPORTED,
+)
 from baserow.contrib.database.api.fields.serializers import (
     FieldSerializer,
     FieldSerializerWithRelatedFields,
+    UpdateFieldSerializer,
 )
 from baserow.contrib.database.db.atomic import (
     read_repeatable_read_single_table_transaction,
 )
 from baserow.contrib.database.fields.actions import DuplicateFieldActionType
+from baserow.contrib.database.fields.exceptions import (
+    CannotChangeFieldType,
+    FieldDoesNotExist,
+    OnlineFieldTypeConversionNotSupported,
+)
 from baserow.contrib.database.fields.handler import FieldHandler
-from baserow.contrib.database.fields.models import DuplicateFieldJob
-from baserow.contrib.database.fields.operations import DuplicateFieldOperationType
+from baserow.contrib.database.fields.models import (
+    ConvertFieldTypeJob,
+    DuplicateFieldJob,
+)
+from baserow.contrib.database.fields.online_type_conversion import (
+    OnlineFieldTypeConversion,
+)
+from baserow.contrib.database.fields.operations import (
+    DuplicateFieldOperationType,
+    UpdateFieldOperationType,
+)
+from baserow.contrib.database.fields.registries import field_type_registry
 from baserow.core.action.registries import action_type_registry
 from baserow.core.exceptions import UserNotInWorkspace, WorkspaceDoesNotExist
 from baserow.core.handler import CoreHandler
@@ -81,3 +107,115 @@ class DuplicateFieldJobType(JobType):
         job.save(update_fields=("duplicated_field",))
 
         return new_field_clone, updated_fields
+
+
+class ConvertFieldTypeJobType(JobType):
+    """
+    Converts a field to another type in the background, without locking the table
+    for the whole conversion. The existing values are converted by batches, while
+    the rows can still be read and written. See `OnlineFieldTypeConversion`.
+    """
+
+    type = "convert_field_type"
+    model_class = ConvertFieldTypeJob
+    max_count = 1
+
+    api_exceptions_map = {
+        UserNotInWorkspace: ERROR_USER_NOT_IN_GROUP,
+        WorkspaceDoesNotExist: ERROR_GROUP_DOES_NOT_EXIST,
+        FieldDoesNotExist: ERROR_FIELD_DOES_NOT_EXIST,
+        CannotChangeFieldType: ERROR_CANNOT_CHANGE_FIELD_TYPE,
+        OnlineFieldTypeConversionNotSupported: (
+            ERROR_ONLINE_FIELD_TYPE_CONVERSION_NOT_SUPPORTED
+        ),
+    }
+
+    request_serializer_field_names = ["field_id", "new_field_type", "field_values"]
+
+    request_serializer_field_overrides = {
+        "field_id": serializers.IntegerField(
+            help_text="The ID of the field to convert.",
+        ),
+        "new_field_type": serializers.CharField(
+            help_text="The type that the field must be converted to.",
+        ),
+        "field_values": serializers.DictField(
+            default=dict,
+            help_text="The other values of the field that must be updated, like "
+            "when the field is updated directly.",
+        ),
+    }
+
+    serializer_field_names = ["field"]
+    serializer_field_overrides = {
+        "field": FieldSerializer(read_only=True),
+    }
+
+    def transaction_atomic_context(self, job: ConvertFieldTypeJob):
+        """
+        The conversion commits every batch of converted rows separately, so that the
+        table is never locked for long.
+        """
+
+        return contextlib.nullcontext()
+
+    def prepare_values(self, values, user):
+        field = FieldHandler().get_field(values["field_id"]).specific
+        CoreHandler().check_permissions(
+            user,
+            UpdateFieldOperationType.type,
+            workspace=field.table.database.workspace,
+            context=field,
+        )
+
+        new_field_type = values["new_field_type"]
+        field_values = validate_data_custom_fields(
+            new_field_type,
+            field_type_registry,
+            {**values.get("field_values", {}), "type": new_field_type},
+            base_serializer_class=UpdateFieldSerializer,
+        )
+        field_values.pop("type", None)
+        OnlineFieldTypeConversion(
+            user, field, new_field_type, field_values
+        ).check_supported()
+
+        return {
+            "field": field,
+            "new_field_type": new_field_type,
+            "field_values": field_values,
+        }
+
+    def run(self, job, progress):
+        if job.field is None:
+            raise FieldDoesNotExist("The field has been deleted in the meantime.")
+
+        conversion = OnlineFieldTypeConversion(
+            job.user, job.field.specific, job.new_field_type, job.field_values
+        )
+        conversion.check_supported()
+        return conversion.run(progress)
+
+    def before_jobs_expire(self, limit_date: datetime):
+        """
+        A conversion removes its shadow column, trigger and functions when it fails,
+        but not when the worker running it is killed. They are removed here for the
+        conversions that haven't finished before expiring, so that they don't stay
+        on the table and slow down every write.
+        """
+
+        for job in (
+            ConvertFieldTypeJob.objects.filter(
+                created_on__lte=limit_date, field__isnull=False
+            )
+            .is_pending_or_running()
+            .select_related("field__table")
+        ):
+            # noinspection PyBroadException
+            try:
+                OnlineFieldTypeConversion.remove_leftovers_of_field(job.field)
+            except Exception:
+                logger.exception(
+                    "Failed to clean up the conversion of field {field_id}.",
+                    field_id=job.field_id,
+                )
@@ -513,6 +513,11 @@ class FormulaField(Field):
         default=False,
         help_text="Indicates if the field needs to be periodically updated.",
     )
+    recalculate_in_background = models.BooleanField(
+        default=False,
+        help_text="Indicates if the cell values that change because of row changes in "
+        "other tables are recalculated in the background instead of right away.",
+    )
 
     @cached_property
     def cached_untyped_expression(self):
@@ -766,4 +771,24 @@ class DuplicateFieldJob(
     )
 
 
+class ConvertFieldTypeJob(
+    JobWithUserIpAddress, JobWithWebsocketId, JobWithUndoRedoIds, Job
+):
+    field = models.ForeignKey(
+        Field,
+        null=True,
+        related_name="convert_field_type_jobs",
+        on_delete=models.SET_NULL,
+        help_text="The Baserow field to convert.",
+    )
+    new_field_type = models.CharField(
+        max_length=255,
+        help_text="The type that the field must be converted to.",
+    )
+    field_values = models.JSONField(
+        default=dict,
+        help_text="The other values of the field that must be updated.",
+    )
+
+
 SpecificFieldForUpdate = NewType("SpecificFieldForUpdate", Field)
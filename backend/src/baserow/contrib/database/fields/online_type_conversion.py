@@ -0,0 +1,416 @@
+from copy import deepcopy
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth.models import AbstractUser
+from django.db import connection, transaction
+
+from baserow.contrib.database.db.sql_queries import (
+    sql_create_online_conversion_function,
+    sql_create_online_conversion_trigger,
+)
+from baserow.core.utils import Progress, extract_allowed, set_allowed_attrs
+
+from .exceptions import CannotChangeFieldType, OnlineFieldTypeConversionNotSupported
+from .handler import FieldHandler
+from .models import Field
+from .registries import field_converter_registry, field_type_registry
+
+
+class OnlineFieldTypeConversion:
+    """
+    Converts the values of a field to another type without altering the column in
+    place. Altering the column rewrites the whole table while holding an exclusive
+    lock on it, which blocks all the reads and writes of large tables for minutes.
+    Instead:
+
+    1. A shadow column of the new type is added, together with a trigger that
+       converts the values of the rows that are inserted or updated from now on.
+    2. The values of the existing rows are converted by batches of ids, every batch
+       in its own transaction.
+    3. The columns are swapped and the field is updated in one short transaction.
+
+    The values are converted exactly like the lenient schema editor does, so the
+    result is the same as updating the field with the `FieldHandler`.
+    """
+
+    def __init__(
+        self,
+        user: AbstractUser,
+        field: Field,
+        new_field_type_name: str,
+        field_values: Dict[str, Any],
+    ):
+        """
+        :param user: The user on whose behalf the field is converted.
+        :param field: The specific field instance that must be converted.
+        :param new_field_type_name: The type that the field must be converted to.
+        :param field_values: The other values of the field that must be updated.
+        """
+
+        self.user = user
+        self.field = field
+        self.from_field_type = field_type_registry.get_by_model(field)
+        self.to_field_type = field_type_registry.get(new_field_type_name)
+        self.field_values = field_values
+        self._set_database_object_names(field)
+
+        self.new_field = self._get_new_field()
+        self.from_model_field = self.from_field_type.get_model_field(self.field)
+        self.to_model_field = self.to_field_type.get_model_field(self.new_field)
+        self.to_db_type = self.to_model_field.db_parameters(connection=connection)[
+            "type"
+        ]
+
+    def _set_database_object_names(self, field: Field):
+        """
+        Sets the names of the column, functions, trigger and constraint that are
+        created in the database during the conversion of the field.
+        """
+
+        self.table = field.table
+        self.column = field.db_column
+        self.db_table = self.table.get_database_table_name()
+        self.shadow_column = f"{self.column}_conversion"
+        self.convert_function = f"baserow_convert_field_{field.id}"
+        self.trigger_function = f"baserow_sync_field_{field.id}_conversion"
+        self.trigger = f"field_{field.id}_conversion"
+        self.not_null_constraint = f"field_{field.id}_conversion_not_null"
+
+    @classmethod
+    def remove_leftovers_of_field(cls, field: Field):
+        """
+        Removes the shadow column, the trigger and the functions that a conversion of
+        the field has left behind because it was interrupted, for example when the
+        worker running it has been killed. The type the field was converted to
+        doesn't have to be known.
+
+        :param field: The field of which the conversion was interrupted.
+        """
+
+        conversion = cls.__new__(cls)
+        conversion._set_database_object_names(field)
+        conversion.remove_shadow_column()
+
+    def _get_new_field(self) -> Field:
+        """
+        Returns an unsaved instance of the field after the conversion, which is only
+        used to figure out how the values must be converted.
+        """
+
+        new_field = self.to_field_type.model_class(
+            **{
+                model_field.attname: getattr(self.field, model_field.attname)
+                for model_field in Field._meta.concrete_fields
+            }
+        )
+        new_field.table = self.table
+        allowed_fields = ["name", "description"] + self.to_field_type.allowed_fields
+        field_values = self.to_field_type.prepare_values(
+            extract_allowed(deepcopy(self.field_values), allowed_fields), self.user
+        )
+        return set_allowed_attrs(field_values, allowed_fields, new_field)
+
+    def check_supported(self):
+        """
+        Checks if the field can be converted online. That's only the case if the
+        values are converted by altering the column, and if the conversion doesn't
+        depend on other objects that are only created or deleted when the field
+        itself is updated, like select options.
+
+        :raises OnlineFieldTypeConversionNotSupported: If the field can only be
+            converted by altering the column in place.
+        """
+
+        from_field_type, to_field_type = self.from_field_type, self.to_field_type
+
+        if from_field_type.type == to_field_type.type:
+            raise OnlineFieldTypeConversionNotSupported(
+                "The field already has this type."
+            )
+        if self.field.primary and not to_field_type.can_be_primary_field:
+            raise OnlineFieldTypeConversionNotSupported(
+                f"The field type {to_field_type.type} is not compatible with the "
+                f"primary field."
+            )
+        if from_field_type.read_only or to_field_type.read_only:
+            raise OnlineFieldTypeConversionNotSupported(
+                "The values of read only fields are not stored in the table."
+            )
+        if (
+            from_field_type.can_have_select_options
+            or to_field_type.can_have_select_options
+        ):
+            raise OnlineFieldTypeConversionNotSupported(
+                "Fields with select options depend on the options that are created "
+                "while the field is updated."
+            )
+
+        from_model = self.table.get_model(field_ids=[], fields=[self.field])
+        if field_converter_registry.find_applicable_converter(
+            from_model, self.field, self.new_field
+        ):
+            raise OnlineFieldTypeConversionNotSupported(
+                f"The values of {from_field_type.type} fields can't be converted to "
+                f"{to_field_type.type} values by the database."
+            )
+
+        if (
+            self.from_model_field.db_parameters(connection=connection)["type"] is None
+            or self.to_db_type is None
+        ):
+            raise OnlineFieldTypeConversionNotSupported(
+                "The values of the field are not stored in a column of the table."
+            )
+
+    def run(self, progress: Optional[Progress] = None) -> Tuple[Field, List[Field]]:
+        """
+        Converts the field. The shadow column, the trigger and the functions are
+        removed again if anything goes wrong, leaving the field as it was.
+
+        :param progress: Optionally a progress instance, of which 90% is used to
+            report the progress of the conversion of the existing rows.
+        :return: The converted field and the other fields that have been updated
+            as a result.
+        """
+
+        try:
+            self.add_shadow_column()
+            # All the rows inserted from now on are converted by the trigger.
+            max_row_id = self._get_max_row_id()
+            batch_size = settings.BASEROW_ONLINE_FIELD_CONVERSION_BATCH_SIZE
+            batches_progress = None
+            if progress:
+                batches_progress = progress.create_child(
+                    90, max_row_id // batch_size + 1
+                )
+            self.convert_existing_rows(max_row_id, batches_progress)
+            field, updated_fields = self.swap_columns_and_update_field()
+        except Exception:
+            self.remove_shadow_column()
+            raise
+
+        if progress:
+            progress.increment(by=10)
+        return field, updated_fields
+
+    def add_shadow_column(self):
+        """
+        Adds the shadow column of the new type, and the trigger that keeps it in sync
+        with the original column from now on.
+        """
+
+        with transaction.atomic():
+            self.remove_shadow_column()
+
+            variables = {}
+            prepare_values = []
+            for prepare_value in [
+                self.from_field_type.get_alter_column_prepare_old_value(
+                    connection, self.field, self.new_field
+                ),
+                self.to_field_type.get_alter_column_prepare_new_value(
+                    connection, self.field, self.new_field
+                ),
+            ]:
+                if isinstance(prepare_value, tuple):
+                    prepare_value, v = prepare_value
+                    variables = {**variables, **v}
+                prepare_values.append(prepare_value or "")
+            for key, value in variables.items():
+                variables[key] = value.replace("$FUNCTION$", "")
+
+            qn = connection.ops.quote_name
+            column = f"new.{qn(self.column)}"
+            converted_value = f"{qn(self.convert_function)}({column}::text)"
+            if not self.to_model_field.null:
+                converted_value = (
+                    f"coalesce({converted_value}, %(online_conversion_default)s)"
+                )
+
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"ALTER TABLE {qn(self.db_table)} "
+                    f"ADD COLUMN {qn(self.shadow_column)} {self.to_db_type} NULL"
+                )
+                cursor.execute(
+                    sql_create_online_conversion_function
+                    % {
+                        "function": qn(self.convert_function),
+                        "type": self.to_db_type,
+                        "alter_column_prepare_old_value": prepare_values[0],
+                        "alter_column_prepare_new_value": prepare_values[1],
+                    },
+                    variables,
+                )
+                cursor.execute(
+                    sql_create_online_conversion_trigger
+                    % {
+                        "trigger_function": qn(self.trigger_function),
+                        "shadow_column": qn(self.shadow_column),
+                        "converted_value": converted_value,
+                        "trigger": qn(self.trigger),
+                        "column": qn(self.column),
+                        "table": qn(self.db_table),
+                    },
+                    {"online_conversion_default": self._get_default_value()},
+                )
+                if not self.to_model_field.null:
+                    # The constraint is only validated once all the existing rows have
+                    # been converted, so that the column can then be made NOT NULL
+                    # without scanning the table again while it's locked.
+                    cursor.execute(
+                        f"ALTER TABLE {qn(self.db_table)} "
+                        f"ADD CONSTRAINT {qn(self.not_null_constraint)} "
+                        f"CHECK ({qn(self.shadow_column)} IS NOT NULL) NOT VALID"
+                    )
+
+    def convert_existing_rows(
+        self, max_row_id: int, progress: Optional[Progress] = None
+    ):
+        """
+        Converts the values of the rows that existed before the trigger was created,
+        by batches of `BASEROW_ONLINE_FIELD_CONVERSION_BATCH_SIZE` ids. Every batch is
+        committed separately, so the rows are only locked for the duration of a batch.
+        The rows written by other transactions in the meantime are converted by the
+        trigger.
+
+        :param max_row_id: The highest id of the rows that existed before the trigger
+            was created.
+        :param progress: Optionally a progress instance incremented for every batch.
+        """
+
+        qn = connection.ops.quote_name
+        batch_size = settings.BASEROW_ONLINE_FIELD_CONVERSION_BATCH_SIZE
+        converted_value = f"{qn(self.convert_function)}({qn(self.column)}::text)"
+        if not self.to_model_field.null:
+            converted_value = f"coalesce({converted_value}, %(default)s)"
+
+        for start in range(0, max_row_id + 1, batch_size):
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {qn(self.db_table)} "
+                    f"SET {qn(self.shadow_column)} = {converted_value} "
+                    f"WHERE id >= %(start)s AND id < %(end)s",
+                    {
+                        "start": start,
+                        "end": start + batch_size,
+                        "default": self._get_default_value(),
+                    },
+                )
+            if progress:
+                progress.increment()
+
+        if not self.to_model_field.null:
+            # Validating doesn't block the writes to the table.
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"ALTER TABLE {qn(self.db_table)} "
+                    f"VALIDATE CONSTRAINT {qn(self.not_null_constraint)}"
+                )
+
+    def swap_columns_and_update_field(self) -> Tuple[Field, List[Field]]:
+        """
+        Replaces the original column with the converted shadow column and updates the
+        field, without altering the column again, in one transaction.
+
+        :raises CannotChangeFieldType: If the field has been changed since the
+            conversion started.
+        :return: The converted field and the other fields that have been updated
+            as a result.
+        """
+
+        qn = connection.ops.quote_name
+        with transaction.atomic():
+            field = FieldHandler().get_specific_field_for_update(self.field.id)
+            if (
+                field_type_registry.get_by_model(field).type
+                != self.from_field_type.type
+            ):
+                raise CannotChangeFieldType(
+                    "The field has been changed while it was being converted."
+                )
+
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DROP TRIGGER {qn(self.trigger)} ON {qn(self.db_table)}"
+                )
+                cursor.execute(f"DROP FUNCTION {qn(self.trigger_function)}()")
+                cursor.execute(
+                    f"ALTER TABLE {qn(self.db_table)} DROP COLUMN {qn(self.column)}"
+                )
+                cursor.execute(
+                    f"ALTER TABLE {qn(self.db_table)} "
+                    f"RENAME COLUMN {qn(self.shadow_column)} TO {qn(self.column)}"
+                )
+                if not self.to_model_field.null:
+                    cursor.execute(
+                        f"ALTER TABLE {qn(self.db_table)} "
+                        f"ALTER COLUMN {qn(self.column)} SET NOT NULL, "
+                        f"DROP CONSTRAINT {qn(self.not_null_constraint)}"
+                    )
+                cursor.execute(f"DROP FUNCTION {qn(self.convert_function)}(text, int)")
+
+            self._reschedule_view_indexes()
+
+            return FieldHandler().update_field(
+                self.user,
+                field,
+                self.to_field_type.type,
+                return_updated_fields=True,
+                column_already_converted=True,
+                **self.field_values,
+            )
+
+    def _reschedule_view_indexes(self):
+        """
+        Dropping the original column has dropped the indexes of the views sorted by
+        the field. Their index name is cleared, so that the indexes aren't
+        considered to exist because another view uses them, and they are created
+        again in the background once the transaction commits.
+        """
+
+        from baserow.contrib.database.views.handler import ViewIndexingHandler
+        from baserow.contrib.database.views.models import View
+
+        views = list(
+            View.objects.filter(
+                viewsort__field_id=self.field.id, db_index_name__isnull=False
+            ).distinct()
+        )
+        View.objects.filter(id__in=[view.id for view in views]).update(
+            db_index_name=None
+        )
+        for view in views:
+            ViewIndexingHandler.schedule_index_update(view)
+
+    def remove_shadow_column(self):
+        """
+        Removes the shadow column, the trigger and the functions of the conversion if
+        they exist.
+        """
+
+        qn = connection.ops.quote_name
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"DROP TRIGGER IF EXISTS {qn(self.trigger)} ON {qn(self.db_table)}"
+            )
+            cursor.execute(f"DROP FUNCTION IF EXISTS {qn(self.trigger_function)}()")
+            cursor.execute(
+                f"ALTER TABLE {qn(self.db_table)} "
+                f"DROP COLUMN IF EXISTS {qn(self.shadow_column)}"
+            )
+            cursor.execute(
+                f"DROP FUNCTION IF EXISTS {qn(self.convert_function)}(text, int)"
+            )
+
+    def _get_default_value(self) -> Any:
+        return self.to_model_field.get_db_prep_save(
+            self.to_model_field.get_default(), connection
+        )
+
+    def _get_max_row_id(self) -> int:
+        qn = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT coalesce(max(id), 0) FROM {qn(self.db_table)}")
+            return cursor.fetchone()[0]
@@ -1,4 +1,15 @@
-from typing import TYPE_CHECKING, Any, Dict, List, NoReturn, Optional, Tuple, Union
+from datetime import datetime
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    NoReturn,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 from zipfile import ZipFile
 
 from django.contrib.auth.models import AbstractUser
@@ -298,6 +309,25 @@ class FieldType(
             )
         return queryset
 
+    def get_combined_prefetch_queryset(
+        self, model: Type["GeneratedTableModel"], field: Field, name: str
+    ) -> Optional[QuerySet]:
+        """
+        Field types storing their value in a many to many relationship can return the
+        queryset used to fetch the related instances here. If they do, the
+        relationships of all those fields in the table can be prefetched with a
+        `CombinedManyToManyMultipleFieldPrefetch` in one query, instead of one query
+        per field with the `enhance_queryset` method.
+
+        :param model: The model containing the field.
+        :param field: The related field's instance.
+        :param name: The name of the field.
+        :return: The queryset used to fetch the related instances, or None if the
+            field can't be prefetched in the combined query.
+        """
+
+        return None
+
     def empty_query(
         self,
         field_name: str,
@@ -1195,6 +1225,23 @@ class FieldType(
 
         return None
 
+    def can_skip_periodic_update(
+        self, field: Field, previous_now: Optional[datetime], now: datetime
+    ) -> bool:
+        """
+        Called before the periodic update of the field, so that fields whose cell
+        values can't have changed since the previous periodic update don't have to
+        be recalculated.
+
+        :param field: The field that is going to be periodically updated.
+        :param previous_now: The time used by the previous periodic update of the
+            workspace, if known.
+        :param now: The time that is going to be used by this periodic update.
+        :return: True if the field doesn't have to be updated.
+        """
+
+        return False
+
     def run_periodic_update(
         self,
         field: Field,
@@ -1,6 +1,9 @@
 from django.db.models.signals import post_delete
 from django.dispatch import Signal, receiver
 
+from baserow.contrib.database.fields.dependencies.graph import (
+    invalidate_field_dependency_graph_for_table,
+)
 from baserow.contrib.database.fields.models import Field
 
 field_created = Signal()
@@ -13,3 +16,10 @@ before_field_deleted = Signal()
 @receiver(post_delete, sender=Field)
 def invalidate_model_cache_when_field_deleted(sender, instance, **kwargs):
     instance.invalidate_table_model_cache()
+
+
+@receiver(post_delete, sender=Field)
+def invalidate_field_dependency_graph_when_field_deleted(sender, instance, **kwargs):
+    # The dependencies of the field are deleted by the cascade without passing by
+    # the dependency rebuilder.
+    invalidate_field_dependency_graph_for_table(instance.table_id)
@@ -4,10 +4,12 @@ from itertools import groupby
 from typing import Optional
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 from django.db.models import QuerySet
 from django.utils import timezone
 
+from celery_singleton import DuplicateTaskError, Singleton
 from loguru import logger
 from opentelemetry import trace
 
@@ -20,6 +22,10 @@ from baserow.core.telemetry.utils import add_baserow_trace_attrs, baserow_trace
 
 tracer = trace.get_tracer(__name__)
 
+# A failed field can only be skipped until the date changes, so there is no need
+# to remember it for longer than a day.
+PERIODIC_UPDATE_FAILED_FIELDS_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 def filter_distinct_workspace_ids_per_fields(
     queryset: QuerySet, workspace_id: Optional[int] = None
@@ -51,9 +57,39 @@ def run_periodic_fields_updates(
 ):
     """
     Refreshes all the fields that need to be updated periodically for all
-    workspaces.
+    workspaces. If `PERIODIC_FIELD_UPDATE_TASK_PER_WORKSPACE` is enabled and no
+    workspace is provided, a separate task is scheduled for every workspace instead,
+    so that the workspaces are updated independently by the available workers.
+    """
+
+    if workspace_id is None and settings.PERIODIC_FIELD_UPDATE_TASK_PER_WORKSPACE:
+        _schedule_periodic_fields_updates_per_workspace(update_now)
+        return
+
+    _run_periodic_fields_updates(workspace_id, update_now)
+
+
+@app.task(
+    base=Singleton,
+    unique_on=["workspace_id"],
+    queue=settings.PERIODIC_FIELD_UPDATE_QUEUE_NAME,
+    soft_time_limit=settings.PERIODIC_FIELD_UPDATE_TIMEOUT_MINUTES * 60,
+    lock_expiry=settings.PERIODIC_FIELD_UPDATE_TIMEOUT_MINUTES * 60,
+)
+def run_periodic_fields_updates_for_workspace(workspace_id: int, update_now: bool):
+    """
+    Refreshes the fields that need to be updated periodically of one workspace. Only
+    one task per workspace can be scheduled or running, so that the workspaces that
+    haven't been updated yet when the next periodic run starts aren't scheduled
+    again.
     """
 
+    _run_periodic_fields_updates(workspace_id, update_now)
+
+
+def _run_periodic_fields_updates(
+    workspace_id: Optional[int] = None, update_now: bool = True
+):
     for field_type_instance in field_type_registry.get_all():
         field_qs = field_type_instance.get_fields_needing_periodic_update()
         if field_qs is None:
@@ -67,6 +103,33 @@ def run_periodic_fields_updates(
             )
 
 
+def _schedule_periodic_fields_updates_per_workspace(update_now: bool = True):
+    # A dict keeps the order of the workspace ids while removing the duplicates.
+    workspace_ids = {}
+    for field_type_instance in field_type_registry.get_all():
+        field_qs = field_type_instance.get_fields_needing_periodic_update()
+        if field_qs is None:
+            continue
+
+        workspace_qs = filter_distinct_workspace_ids_per_fields(field_qs)
+        workspace_ids.update(dict.fromkeys(workspace_qs.values_list("id", flat=True)))
+
+    # The workspaces updated the longest time ago are scheduled first. The tasks of
+    # the workspaces still scheduled or running are not duplicated.
+    for workspace_id in workspace_ids:
+        run_periodic_fields_updates_for_workspace.delay(
+            workspace_id=workspace_id, update_now=update_now
+        )
+
+
+def get_periodic_update_failed_fields_cache_key(
+    field_type_instance, workspace_id: int
+) -> str:
+    return (
+        f"periodic_field_update_failed_fields:{field_type_instance.type}:{workspace_id}"
+    )
+
+
 @baserow_trace(tracer)
 def _run_periodic_field_type_update_per_workspace(
     field_type_instance, workspace: Workspace, update_now=True
@@ -75,11 +138,21 @@ def _run_periodic_field_type_update_per_workspace(
     if qs is None:
         return
 
+    previous_now = workspace.now
     if update_now:
         workspace.refresh_now()
     add_baserow_trace_attrs(update_now=update_now, workspace_id=workspace.id)
 
+    # The fields that failed during the previous update are never skipped, because
+    # they haven't been updated with the previous `now`.
+    failed_fields_cache_key = get_periodic_update_failed_fields_cache_key(
+        field_type_instance, workspace.id
+    )
+    previously_failed_field_ids = cache.get(failed_fields_cache_key, set())
+    failed_field_ids = set()
+
     all_updated_fields = []
+    skipped_fields = 0
 
     for field in qs.filter(
         table__database__workspace_id=workspace.id,
@@ -88,6 +161,18 @@ def _run_periodic_field_type_update_per_workspace(
     ):
         # noinspection PyBroadException
         try:
+            # Without a new `now`, the fields are recalculated anyway because the
+            # update has been requested explicitly.
+            if (
+                update_now
+                and field.id not in previously_failed_field_ids
+                and field_type_instance.can_skip_periodic_update(
+                    field, previous_now, workspace.now
+                )
+            ):
+                skipped_fields += 1
+                continue
+
             all_updated_fields = _run_periodic_field_update(
                 field, field_type_instance, all_updated_fields
             )
@@ -98,8 +183,24 @@ def _run_periodic_field_type_update_per_workspace(
                 field_id=field.id,
                 tb=tb,
             )
+            failed_field_ids.add(field.id)
             continue
 
+    if failed_field_ids:
+        cache.set(
+            failed_fields_cache_key,
+            failed_field_ids,
+            timeout=PERIODIC_UPDATE_FAILED_FIELDS_CACHE_TIMEOUT,
+        )
+    elif previously_failed_field_ids:
+        cache.delete(failed_fields_cache_key)
+
+    add_baserow_trace_attrs(
+        updated_fields=len(all_updated_fields),
+        skipped_fields=skipped_fields,
+        failed_fields=len(failed_field_ids),
+    )
+
     # After a successful periodic update of all fields, we would need to update the
     # search index for all of them in one function per table to avoid ending up in a
     # deadlock because rows are updated simultaneously.
@@ -118,6 +219,84 @@ def delete_mentions_marked_for_deletion(self):
     ).delete()
 
 
+@app.task(
+    base=Singleton,
+    queue="export",
+    lock_expiry=settings.BASEROW_DEFERRED_FIELD_UPDATES_LOCK_EXPIRY,
+    raise_on_duplicate=True,
+)
+def run_deferred_field_updates():
+    """
+    Recalculates the cells of the fields that must be recalculated in the background,
+    in batches, until no deferred update is left.
+    """
+
+    from baserow.contrib.database.fields.dependencies.deferred_updates import (
+        run_deferred_field_updates_batch,
+    )
+
+    try:
+        while run_deferred_field_updates_batch():
+            pass
+    finally:
+        # Check for any deferred updates committed after the last batch and
+        # schedule them out of this singleton task.
+        _check_for_pending_deferred_field_updates.delay()
+
+
+@app.task(queue="export")
+def _check_for_pending_deferred_field_updates():
+    """
+    Schedules `run_deferred_field_updates` again if deferred updates are left in the
+    table. Because the table itself is checked, the updates deferred while the
+    previous task was draining it can't be missed.
+    """
+
+    from baserow.contrib.database.fields.dependencies.models import DeferredFieldUpdate
+
+    if not DeferredFieldUpdate.objects.exists():
+        return
+
+    try:
+        run_deferred_field_updates.apply_async(
+            countdown=settings.BASEROW_DEFERRED_FIELD_UPDATES_DELAY_SECONDS
+        )
+    except DuplicateTaskError:
+        # The task that scheduled this check might still hold the lock, so check
+        # again later. If another task is scheduled instead, it drains the table.
+        _check_for_pending_deferred_field_updates.apply_async(
+            countdown=settings.BASEROW_DEFERRED_FIELD_UPDATES_DELAY_SECONDS
+        )
+
+
+def _schedule_deferred_field_updates():
+    try:
+        # The countdown gives the next changes the chance to be executed together
+        # with the ones that scheduled the task.
+        run_deferred_field_updates.apply_async(
+            countdown=settings.BASEROW_DEFERRED_FIELD_UPDATES_DELAY_SECONDS
+        )
+    except DuplicateTaskError:
+        # The scheduled or running task checks the table once it has been drained,
+        # so the new updates are executed by it or by the task it schedules.
+        pass
+    except Exception as exc:  # nosec
+        logger.error(
+            "Failed to schedule the deferred field updates because of {e}", e=str(exc)
+        )
+        traceback.print_exc()
+
+
+def schedule_deferred_field_updates():
+    """
+    Schedules the task that runs the deferred field updates once the current
+    transaction commits. If the task is already scheduled, it will re-schedule itself
+    when it finishes as long as deferred updates are left.
+    """
+
+    transaction.on_commit(_schedule_deferred_field_updates)
+
+
 @baserow_trace(tracer)
 def _run_periodic_field_update(field, field_type_instance, all_updated_fields):
     add_baserow_trace_attrs(field_id=field.id)
@@ -1,8 +1,13 @@
 import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List
 
+from django.conf import settings
 from django.core.files.base import ContentFile
 from django.db import transaction
 
+from loguru import logger
 from rest_framework import serializers
 
 from baserow.contrib.database.api.fields.errors import (
@@ -24,15 +29,26 @@ from baserow.contrib.database.fields.exceptions import (
     ReservedBaserowFieldNameException,
 )
 from baserow.contrib.database.rows.actions import ImportRowsActionType
+from baserow.contrib.database.rows.constants import (
+    ROW_IMPORT_CHUNKS,
+    ROW_IMPORT_FINALIZING,
+)
 from baserow.contrib.database.rows.exceptions import ReportMaxErrorCountExceeded
+from baserow.contrib.database.rows.handler import RowHandler
+from baserow.contrib.database.search.handler import SearchHandler
 from baserow.contrib.database.table.actions import CreateTableActionType
 from baserow.contrib.database.table.exceptions import (
     InitialTableDataDuplicateName,
     InitialTableDataLimitExceeded,
     InvalidInitialTableData,
 )
+from baserow.contrib.database.table.handler import TableHandler
+from baserow.contrib.database.table.signals import table_updated
 from baserow.core.action.registries import action_type_registry
+from baserow.core.db import get_highest_order_of_queryset
+from baserow.core.jobs.constants import JOB_FAILED, JOB_FINISHED
 from baserow.core.jobs.registries import JobType
+from baserow.core.utils import Progress
 
 from .models import FileImportJob
 from .serializers import ReportSerializer
@@ -127,6 +143,14 @@ class FileImportJobType(JobType):
 
         return read_committed_single_table_transaction(job.table_id)
 
+    def finishes_asynchronously(self, job: FileImportJob) -> bool:
+        """
+        The job is finished by the last chunk task when the data has been split into
+        chunks. See `.run_in_chunks()`.
+        """
+
+        return job.state == ROW_IMPORT_CHUNKS
+
     def run(self, job, progress):
         """
         Fills the provided table with the normalized data that needs to be created upon
@@ -136,6 +160,10 @@ class FileImportJobType(JobType):
         with job.data_file.open("r") as fin:
             data = json.load(fin)
 
+        chunk_size = settings.BASEROW_FILE_IMPORT_PARALLEL_CHUNK_SIZE
+        if chunk_size and len(data) > chunk_size:
+            return self.run_in_chunks(job, progress, data, chunk_size)
+
         if job.table is None:
             new_table, error_report = action_type_registry.get_by_type(
                 CreateTableActionType
@@ -169,3 +197,282 @@ class FileImportJobType(JobType):
             job.save(update_fields=("report", "data_file"))
 
         transaction.on_commit(after_commit)
+
+    def run_in_chunks(
+        self,
+        job: FileImportJob,
+        progress: Progress,
+        data: List[List[Any]],
+        chunk_size: int,
+    ):
+        """
+        Imports the first `chunk_size` rows in the job transaction, creating the table
+        if needed, and dispatches the remaining rows by chunks of `chunk_size` rows to
+        `import_file_import_chunk` tasks once the transaction is committed. Those
+        tasks import their chunk concurrently, each in its own transaction, and the
+        last one to complete finalizes the job. Every chunk gets its own range of row
+        orders, so that the rows keep the order of the file. The fields depending on
+        the fields of an existing table are only updated once all the chunks have
+        been imported, see `.finalize_chunks()`.
+
+        :param job: The file import job.
+        :param progress: The progress of the job.
+        :param data: All the rows of the file, including the header.
+        :param chunk_size: The maximum amount of rows of a chunk.
+        """
+
+        from .tasks import import_file_import_chunk
+
+        first_chunk_progress = progress.create_child(
+            max(1, 100 * chunk_size // len(data)), 100
+        )
+
+        if job.table is None:
+            fields, rows = TableHandler().normalize_initial_table_data(
+                data, first_row_header=job.first_row_header
+            )
+            # The normalized field names are passed as header, so that the table
+            # has all the fields required by the other chunks.
+            table, error_report = action_type_registry.get_by_type(
+                CreateTableActionType
+            ).do(
+                job.user,
+                job.database,
+                name=job.name,
+                data=[[name for name, _, _ in fields]] + rows[:chunk_size],
+                first_row_header=True,
+                progress=first_chunk_progress,
+            )
+            job.table = table
+            # Undoing the creation of the table already removes all the rows.
+            row_ids = None
+        else:
+            table, rows = job.table, data
+            created_rows, error_report = RowHandler().import_rows(
+                job.user,
+                table,
+                rows[:chunk_size],
+                progress=first_chunk_progress,
+                send_realtime_update=False,
+                skip_search_update=True,
+                skip_dependant_fields_update=True,
+            )
+            row_ids = [row.id for row in created_rows]
+
+        remaining_rows = rows[chunk_size:]
+        first_order = get_highest_order_of_queryset(table.get_model().objects)[0]
+
+        # The data file is replaced by one file per chunk containing the normalized
+        # rows of the chunk, so that every chunk task only has to read its own rows.
+        storage = job.data_file.storage
+        job.data_file.delete(save=False)
+        chunks = []
+        for index, start in enumerate(range(0, len(remaining_rows), chunk_size)):
+            end = min(start + chunk_size, len(remaining_rows))
+            chunk_data = json.dumps(remaining_rows[start:end], ensure_ascii=False)
+            chunk_file = storage.save(
+                f"user_{job.user_id}/file_import/job__{job.id}_chunk_{index}.json",
+                ContentFile(chunk_data.encode("utf8")),
+            )
+            chunks.append((chunk_file, start, end))
+
+        job.report = {
+            "failing_rows": error_report,
+            "chunks": {
+                "files": [chunk_file for chunk_file, _, _ in chunks],
+                "pending": len(chunks),
+                "offset": chunk_size,
+                "total_rows": len(rows),
+                "imported_rows": chunk_size,
+                "row_ids": row_ids,
+                "error": None,
+                "human_readable_error": None,
+            },
+        }
+        job.save(update_fields=("table", "data_file", "report"))
+        progress.set_progress(progress.progress, state=ROW_IMPORT_CHUNKS)
+
+        def dispatch_chunks():
+            # The header row can make the data fit in the first chunk after all.
+            if not chunks:
+                FileImportJob.objects.filter(id=job.id).update(
+                    state=ROW_IMPORT_FINALIZING
+                )
+                self.finalize_chunks(FileImportJob.objects.get(id=job.id))
+
+            for chunk_file, start, end in chunks:
+                import_file_import_chunk.delay(
+                    job.id, chunk_file, start, end, str(first_order + start)
+                )
+
+        transaction.on_commit(dispatch_chunks)
+
+    def run_chunk(
+        self,
+        job: FileImportJob,
+        chunk_file: str,
+        start: int,
+        end: int,
+        first_order: Decimal,
+    ):
+        """
+        Imports the rows of a chunk of a job that has been split by
+        `.run_in_chunks()` in a transaction of its own. The outcome is merged into
+        the job while it's locked and, if it was the last chunk, the job is marked as
+        finalizing in the same transaction, so that only this task finalizes it.
+        Nothing is imported if the job has failed in the meantime.
+
+        :param job: The file import job.
+        :param chunk_file: The name of the file containing the rows of the chunk.
+        :param start: The index of the first row of the chunk in the rows remaining
+            after the first chunk.
+        :param end: The index after the last row of the chunk.
+        :param first_order: The order of the first row of the chunk.
+        """
+
+        storage = job.data_file.storage
+        if job.state != ROW_IMPORT_CHUNKS:
+            storage.delete(chunk_file)
+            return
+
+        row_ids, error_report, error = [], {}, None
+        try:
+            with storage.open(chunk_file, "r") as fin:
+                rows = json.load(fin)
+
+            with read_committed_single_table_transaction(job.table_id):
+                created_rows, error_report = RowHandler().import_rows(
+                    job.user,
+                    job.table,
+                    rows,
+                    send_realtime_update=False,
+                    skip_search_update=True,
+                    first_order=first_order,
+                    skip_dependant_fields_update=True,
+                )
+            row_ids = [row.id for row in created_rows]
+        except ReportMaxErrorCountExceeded as exc:
+            error, error_report = exc, exc.report
+        except Exception as exc:
+            logger.exception(exc)
+            error = exc
+
+        with transaction.atomic():
+            job = FileImportJob.objects.select_for_update().get(id=job.id)
+            if job.state != ROW_IMPORT_CHUNKS:
+                # The job has been failed by `.before_jobs_expire()` in the meantime.
+                storage.delete(chunk_file)
+                return
+
+            chunks = job.report["chunks"]
+            chunks["files"].remove(chunk_file)
+            chunks["pending"] -= 1
+            chunks["imported_rows"] += end - start
+            if chunks["row_ids"] is not None:
+                chunks["row_ids"] += row_ids
+            if error is not None and chunks["error"] is None:
+                chunks["error"] = str(error)
+                chunks["human_readable_error"] = self._get_human_readable_error(error)
+            job.report["failing_rows"].update(
+                {
+                    str(chunks["offset"] + start + int(index)): errors
+                    for index, errors in error_report.items()
+                }
+            )
+            # The job is only at 100% once it has been finalized.
+            job.progress_percentage = max(
+                job.progress_percentage,
+                min(99, 100 * chunks["imported_rows"] // chunks["total_rows"]),
+            )
+            finalize = chunks["pending"] == 0
+            if finalize:
+                job.state = ROW_IMPORT_FINALIZING
+            job.save(update_fields=("state", "report", "progress_percentage"))
+
+        storage.delete(chunk_file)
+        if finalize:
+            self.finalize_chunks(job)
+
+    def before_jobs_expire(self, limit_date: datetime):
+        """
+        Fails the jobs split into chunks that are about to expire, because a chunk
+        task stopped before merging its outcome for example. The rows imported so far
+        are kept and the files of the remaining chunks are deleted. A job that a chunk
+        task is already finalizing is left to that task.
+        """
+
+        for job_id in FileImportJob.objects.filter(
+            state=ROW_IMPORT_CHUNKS, created_on__lte=limit_date
+        ).values_list("id", flat=True):
+            with transaction.atomic():
+                job = FileImportJob.objects.select_for_update().get(id=job_id)
+                if job.state != ROW_IMPORT_CHUNKS:
+                    continue
+
+                chunks = job.report["chunks"]
+                if chunks["error"] is None:
+                    chunks["error"] = "The chunks haven't been imported in time."
+                    chunks[
+                        "human_readable_error"
+                    ] = f"Something went wrong during the {self.type} job execution."
+                job.state = ROW_IMPORT_FINALIZING
+                job.save(update_fields=("state", "report"))
+
+            self.finalize_chunks(job)
+
+    def finalize_chunks(self, job: FileImportJob):
+        """
+        Runs what only has to happen once after all the chunks of a job have been
+        imported: the fields depending on the fields of an existing table are updated
+        for all the imported rows, the search data of the table is updated, the
+        clients are asked to refresh the table, the import of rows in an existing
+        table is registered as one undoable action and the job gets its final state.
+        Must only be called by the task that marked the job as finalizing.
+
+        :param job: The file import job of which all the chunks have been imported.
+        """
+
+        chunks = job.report.pop("chunks")
+        table = job.table
+
+        if table is not None:
+            if chunks["row_ids"]:
+                with read_committed_single_table_transaction(table.id):
+                    RowHandler().update_dependant_fields_of_created_rows(
+                        table, chunks["row_ids"]
+                    )
+            SearchHandler.field_value_updated_or_created(table)
+            table_updated.send(
+                self, table=table, user=job.user, force_table_refresh=True
+            )
+            if chunks["row_ids"] is not None:
+                ImportRowsActionType.register_imported_rows(
+                    job.user, table, chunks["row_ids"]
+                )
+
+        job.data_file.delete(save=False)
+        for chunk_file in chunks["files"]:
+            job.data_file.storage.delete(chunk_file)
+        if chunks["error"] is None:
+            job.state = JOB_FINISHED
+            job.progress_percentage = 100
+        else:
+            job.state = JOB_FAILED
+            job.error = chunks["error"]
+            job.human_readable_error = chunks["human_readable_error"]
+        job.save(
+            update_fields=(
+                "state",
+                "progress_percentage",
+                "error",
+                "human_readable_error",
+                "report",
+                "data_file",
+            )
+        )
+
+    def _get_human_readable_error(self, error: Exception) -> str:
+        for exception, error_message in self.job_exceptions_map.items():
+            if isinstance(error, exception):
+                return error_message.format(e=error)
+        return f"Something went wrong during the {self.type} job execution."
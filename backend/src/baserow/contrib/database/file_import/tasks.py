@@ -0,0 +1,27 @@
+from django.conf import settings
+
+from baserow.config.celery import app
+
+
+@app.task(
+    bind=True,
+    queue="export",
+    soft_time_limit=settings.BASEROW_JOB_SOFT_TIME_LIMIT,
+)
+def import_file_import_chunk(
+    self, job_id: int, chunk_file: str, start: int, end: int, first_order: str
+):
+    """
+    Imports a chunk of the rows of a file import job that has been split into chunks
+    by the `FileImportJobType`.
+    """
+
+    from decimal import Decimal
+
+    from baserow.core.jobs.registries import job_type_registry
+
+    from .models import FileImportJob
+
+    job = FileImportJob.objects.get(id=job_id)
+    job_type = job_type_registry.get_by_model(job)
+    job_type.run_chunk(job, chunk_file, start, end, Decimal(first_order))
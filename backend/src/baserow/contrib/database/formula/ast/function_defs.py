@@ -1607,6 +1607,9 @@ class BaserowNow(ZeroArgumentBaserowFunction):
 class BaserowToday(ZeroArgumentBaserowFunction):
     type = "today"
     needs_periodic_update = True
+    # The result only changes at midnight UTC, so the periodic update can be skipped
+    # as long as the date hasn't changed.
+    periodic_update_only_when_the_date_changes = True
 
     def type_function(
         self, func_call: BaserowFunctionCall[UnTyped]
@@ -629,3 +629,8 @@ class BaserowFunctionDefinition(Instance, abc.ABC):
 
     def __hash__(self):
         return hash(self.type)
+
+    def __deepcopy__(self, memo):
+        # The function definitions are registered once and shared by all the
+        # expressions calling them.
+        return self
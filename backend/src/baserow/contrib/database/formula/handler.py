@@ -57,6 +57,19 @@ def _needs_periodic_update(expression: BaserowExpression):
     return any(getattr(f, "needs_periodic_update", False) for f in functions_used)
 
 
+def _only_needs_periodic_update_when_the_date_changes(expression: BaserowExpression):
+    functions_used: Set[BaserowFunctionDefinition] = expression.accept(
+        FunctionsUsedVisitor()
+    )
+    periodic_functions = [
+        f for f in functions_used if getattr(f, "needs_periodic_update", False)
+    ]
+    return bool(periodic_functions) and all(
+        getattr(f, "periodic_update_only_when_the_date_changes", False)
+        for f in periodic_functions
+    )
+
+
 def _expression_requires_refresh_after_insert(expression: BaserowExpression):
     """
     WARNING: This function is directly used by migration code. Please ensure
@@ -352,6 +365,21 @@ class FormulaHandler(metaclass=baserow_trace_methods(tracer)):
         formula_field.requires_refresh_after_insert = refresh_after_insert
         return expression
 
+    @classmethod
+    def only_needs_periodic_update_when_the_date_changes(
+        cls, formula_field: "FormulaField"
+    ) -> bool:
+        """
+        :param formula_field: A formula field that needs to be periodically updated.
+        :return: True if the cell values of the formula field only depend on the
+            current date and not on the current time, like `today()`, meaning that
+            they can't change until the date changes.
+        """
+
+        return _only_needs_periodic_update_when_the_date_changes(
+            formula_field.cached_typed_internal_expression
+        )
+
     @classmethod
     def get_parse_tree_for_formula(cls, formula: str):
         """
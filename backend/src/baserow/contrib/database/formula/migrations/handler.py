@@ -1,10 +1,14 @@
+import json
 import math
+import multiprocessing
+import time
 import traceback
 import typing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from copy import deepcopy
-from typing import Set
+from typing import Dict, List, NamedTuple, Optional, Set
 
-from django.db import transaction
+from django.db import connections, transaction
 from django.db.models import Min, Q, QuerySet
 
 from loguru import logger
@@ -28,12 +32,21 @@ if typing.TYPE_CHECKING:
 DEFAULT_FORMULA_MIGRATION_BATCH_SIZE = 100
 
 
+class DatabaseFormulaMigrationResult(NamedTuple):
+    database_id: int
+    seconds: float
+    # The seconds spent recalculating the formulas of every table.
+    seconds_per_table: Dict[int, float]
+    error: Optional[str] = None
+
+
 def _recalculate_formula_metadata_dependencies_first_order(
     field: "Field",
     field_cache: FieldCache,
     recalculate_cell_values: bool,
     force_recreate_columns: bool,
     already_recalculated: Set[int],
+    seconds_per_table: Optional[Dict[int, float]] = None,
 ):
     """
     Initially follows the field dependency tree recursively from the provided field
@@ -46,6 +59,8 @@ def _recalculate_formula_metadata_dependencies_first_order(
         fields also and not just their metadata.
     :param already_recalculated: A set of field ids which have already been recalculated
         which will used to skip recalculating them again if encountered again.
+    :param seconds_per_table: If provided, the time spent recalculating the field,
+        excluding its dependencies, is added to the time of its table.
     """
 
     from baserow.contrib.database.fields.models import FormulaField
@@ -60,8 +75,10 @@ def _recalculate_formula_metadata_dependencies_first_order(
             recalculate_cell_values,
             force_recreate_columns,
             already_recalculated,
+            seconds_per_table,
         )
 
+    start = time.perf_counter()
     field = field_cache.lookup_specific(field)
 
     if isinstance(field, FormulaField):
@@ -89,6 +106,44 @@ formula {field.formula}. Marking the formula as invalid. The error was caused by
                 )
         already_recalculated.add(field.id)
 
+    if seconds_per_table is not None:
+        _add_seconds_to_table(seconds_per_table, field.table_id, start)
+
+
+def _add_seconds_to_table(
+    seconds_per_table: Dict[int, float], table_id: int, start: float
+):
+    seconds = time.perf_counter() - start
+    seconds_per_table[table_id] = seconds_per_table.get(table_id, 0.0) + seconds
+
+
+def _migrate_formulas_of_database(
+    database_id: int, batch_size: int
+) -> DatabaseFormulaMigrationResult:
+    """
+    Migrates the formulas of a single database to the latest version. This is the
+    function executed by the worker processes of a parallel formula migration.
+    """
+
+    seconds_per_table = {}
+    start = time.perf_counter()
+    error = None
+    try:
+        FormulaMigrationHandler.migrate_formulas(
+            FORMULA_MIGRATIONS,
+            batch_size,
+            database_id=database_id,
+            seconds_per_table=seconds_per_table,
+            show_progress_bar=False,
+        )
+    except Exception as e:
+        logger.exception(f"Failed to migrate the formulas of database {database_id}.")
+        error = "".join(traceback.format_exception_only(type(e), e)).strip()
+
+    return DatabaseFormulaMigrationResult(
+        database_id, time.perf_counter() - start, seconds_per_table, error
+    )
+
 
 class FormulaMigrationHandler:
     @classmethod
@@ -127,19 +182,136 @@ class FormulaMigrationHandler:
 
         cls.migrate_formulas(FORMULA_MIGRATIONS, batch_size)
 
+    @classmethod
+    def migrate_formulas_per_database(
+        cls,
+        batch_size: int = DEFAULT_FORMULA_MIGRATION_BATCH_SIZE,
+        workers: int = 1,
+        progress_log_path: Optional[str] = None,
+    ) -> List[DatabaseFormulaMigrationResult]:
+        """
+        Migrates all formulas to the latest formula version like
+        `migrate_formulas_to_latest_version`, but database by database. The formulas
+        of a database only depend on the fields of the same database, so the
+        databases are migrated in parallel by a pool of worker processes if more than
+        one worker is requested. Every transaction only contains the formulas of a
+        single database.
+
+        :param batch_size: The number of formulas migrated per transaction.
+        :param workers: The number of processes migrating databases in parallel.
+        :param progress_log_path: Optionally the path of a file where a JSON line is
+            appended for every migrated database. The databases that have already
+            been migrated to the latest version according to this file are skipped,
+            so that an interrupted migration can be resumed.
+        :return: The result of every database that has been migrated.
+        """
+
+        from baserow.contrib.database.fields.models import FormulaField
+
+        latest_version = FORMULA_MIGRATIONS.get_latest_version()
+        already_migrated_database_ids = set()
+        if progress_log_path:
+            already_migrated_database_ids = cls._read_migrated_database_ids(
+                progress_log_path, latest_version
+            )
+
+        database_ids = sorted(
+            set(
+                FormulaField.objects.filter(~Q(version=latest_version))
+                .exclude(table__database_id__in=already_migrated_database_ids)
+                .values_list("table__database_id", flat=True)
+            )
+        )
+        logger.info(
+            f"Found {len(database_ids)} databases with formulas to migrate to "
+            f"{latest_version}, skipping {len(already_migrated_database_ids)} "
+            f"already migrated databases."
+        )
+
+        def log_progress(result: DatabaseFormulaMigrationResult):
+            logger.info(
+                f"Migrated the formulas of database {result.database_id} in "
+                f"{result.seconds:.2f} seconds."
+                + (f" The migration failed: {result.error}" if result.error else "")
+            )
+            if progress_log_path:
+                with open(progress_log_path, "a") as progress_log:
+                    progress_log.write(
+                        json.dumps({"version": latest_version, **result._asdict()})
+                        + "\n"
+                    )
+
+        results = []
+        if workers > 1 and len(database_ids) > 1:
+            # The connections can't be shared with the forked worker processes, so
+            # they're closed and every process opens its own connections.
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("fork")
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        _migrate_formulas_of_database, database_id, batch_size
+                    )
+                    for database_id in database_ids
+                ]
+                for future in as_completed(futures):
+                    result = future.result()
+                    log_progress(result)
+                    results.append(result)
+        else:
+            for database_id in database_ids:
+                result = _migrate_formulas_of_database(database_id, batch_size)
+                log_progress(result)
+                results.append(result)
+
+        return sorted(results)
+
+    @classmethod
+    def _read_migrated_database_ids(
+        cls, progress_log_path: str, version: int
+    ) -> Set[int]:
+        try:
+            with open(progress_log_path) as progress_log:
+                entries = [json.loads(line) for line in progress_log if line.strip()]
+        except FileNotFoundError:
+            return set()
+
+        return {
+            entry["database_id"]
+            for entry in entries
+            if entry["version"] == version and not entry.get("error")
+        }
+
     @classmethod
     def migrate_formulas(
         cls,
         migrations: FormulaMigrations,
         batch_size: int = DEFAULT_FORMULA_MIGRATION_BATCH_SIZE,
+        database_id: Optional[int] = None,
+        seconds_per_table: Optional[Dict[int, float]] = None,
+        show_progress_bar: bool = True,
     ):
+        """
+        :param migrations: All formula migrations available.
+        :param batch_size: The number of formulas migrated per transaction.
+        :param database_id: If provided, only the formulas of this database are
+            migrated.
+        :param seconds_per_table: If provided, the time spent recalculating the
+            formulas of every table is added to this dict.
+        :param show_progress_bar: Whether to print a progress bar.
+        """
+
         from baserow.contrib.database.fields.models import FormulaField
 
-        oldest_version_in_db_currently = FormulaField.objects.aggregate(
-            min=Min("version")
-        )["min"]
+        formula_fields = FormulaField.objects.all()
+        if database_id is not None:
+            formula_fields = formula_fields.filter(table__database_id=database_id)
+
+        aggregates = formula_fields.aggregate(min=Min("version"))
+        oldest_version_in_db_currently = aggregates["min"]
 
-        total_out_of_date_formulas = FormulaField.objects.filter(
+        total_out_of_date_formulas = formula_fields.filter(
             ~Q(version=migrations.get_latest_version())
         ).count()
         max_number_of_batches = math.ceil(total_out_of_date_formulas / batch_size)
@@ -151,7 +323,7 @@ class FormulaMigrationHandler:
             # as otherwise they will often cause each other to crash due to deadlocks
             # if actually running concurrently.
             locked_formula_ids = (
-                FormulaField.objects.filter(~Q(version=migrations[-1].version))
+                formula_fields.filter(~Q(version=migrations[-1].version))
                 .order_by("id")
                 .select_for_update()[0:batch_size]
             )
@@ -170,7 +342,9 @@ class FormulaMigrationHandler:
             f"{migrations.get_latest_version()}."
         )
 
-        with tqdm(total=total_out_of_date_formulas) as progress_bar:
+        with tqdm(
+            total=total_out_of_date_formulas, disable=not show_progress_bar
+        ) as progress_bar:
             current_batch = 0
 
             def progress_updated(percentage, state):
@@ -207,6 +381,7 @@ class FormulaMigrationHandler:
                             progress.create_child_builder(
                                 represents_progress=batch_size
                             ),
+                            seconds_per_table,
                         )
             progress_bar.set_description("Finished migrating formulas")
 
@@ -217,6 +392,7 @@ class FormulaMigrationHandler:
         current_version: int,
         migrations: FormulaMigrations,
         child_progress_builder: ChildProgressBuilder,
+        seconds_per_table: Optional[Dict[int, float]] = None,
     ):
         (
             formulas_to_rebuild_dependencies_for,
@@ -233,6 +409,7 @@ class FormulaMigrationHandler:
             formulas_to_only_update_attributes_for,
             formulas_to_force_recreate_columns_for,
             child_progress_builder,
+            seconds_per_table,
         )
 
         locked_formula_batch.update(version=migrations.get_latest_version())
@@ -316,6 +493,7 @@ class FormulaMigrationHandler:
         formulas_to_only_recalculate_attributes_for: QuerySet,
         formulas_to_force_recreate_columns_for: QuerySet,
         child_progress_builder: ChildProgressBuilder,
+        seconds_per_table: Optional[Dict[int, float]] = None,
     ):
         from baserow.contrib.database.fields.dependencies.handler import (
             FieldDependencyHandler,
@@ -340,6 +518,7 @@ class FormulaMigrationHandler:
         # dependencies differently than the old version.
 
         for field in formulas_to_rebuild_dependencies_for.iterator():
+            start = time.perf_counter()
             try:
                 FieldDependencyHandler.rebuild_dependencies(field, field_cache)
             except Exception as e:
@@ -351,6 +530,8 @@ class FormulaMigrationHandler:
                     f"The error was caused by: "
                     f"{traceback.format_exception_only(type(e), e)}"
                 )
+            if seconds_per_table is not None:
+                _add_seconds_to_table(seconds_per_table, field.table_id, start)
             progress.increment(1, "Rebuilding field dependencies")
 
         # Now the dependency graph is correct we can starting from the dependencies
@@ -364,6 +545,7 @@ class FormulaMigrationHandler:
                 recalculate_cell_values=True,
                 force_recreate_columns=False,
                 already_recalculated=already_recalculated,
+                seconds_per_table=seconds_per_table,
             )
             progress.increment(1, "Recalculating metadata and data")
 
@@ -374,6 +556,7 @@ class FormulaMigrationHandler:
                 recalculate_cell_values=False,
                 force_recreate_columns=False,
                 already_recalculated=already_recalculated,
+                seconds_per_table=seconds_per_table,
             )
             progress.increment(1, "Recalculating only metadata")
 
@@ -384,5 +567,6 @@ class FormulaMigrationHandler:
                 recalculate_cell_values=False,
                 force_recreate_columns=True,
                 already_recalculated=set(),
+                seconds_per_table=seconds_per_table,
             )
             progress.increment(1, "Fully recreating formulas")
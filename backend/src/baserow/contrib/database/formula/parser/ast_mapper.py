@@ -1,3 +1,4 @@
+from copy import deepcopy
 from decimal import Decimal
 
 from baserow.contrib.database.formula.ast.tree import (
@@ -11,6 +12,7 @@ from baserow.contrib.database.formula.ast.tree import (
 )
 from baserow.contrib.database.formula.registries import formula_function_registry
 from baserow.contrib.database.formula.types.formula_type import UnTyped
+from baserow.core.formula.cache import FormulaLRUCache
 from baserow.core.formula.parser.exceptions import (
     BaserowFormulaSyntaxError,
     FieldByIdReferencesAreDeprecated,
@@ -45,11 +47,34 @@ def raw_formula_to_untyped_expression(
     """
 
     try:
-        tree = get_parse_tree_for_formula(formula)
-        return BaserowFormulaToBaserowASTMapper().visit(tree)
+        expression = untyped_expression_cache.get_or_compile(
+            formula, lambda: _map_formula_to_untyped_expression(formula)
+        )
     except RecursionError:
         raise MaximumFormulaSizeError()
 
+    if not untyped_expression_cache.enabled:
+        return expression
+
+    # The expressions are modified while they are typed, so every caller gets its
+    # own copy of the cached expression.
+    try:
+        return deepcopy(expression)
+    except RecursionError:
+        # Copying needs more stack than mapping, so very deep formulas are mapped
+        # again instead.
+        return _map_formula_to_untyped_expression(formula)
+
+
+# Contains the untyped expressions of the most recently used formulas. The cached
+# expressions are never returned directly, only copies of them.
+untyped_expression_cache = FormulaLRUCache("untyped_expression")
+
+
+def _map_formula_to_untyped_expression(formula: str) -> BaserowExpression[UnTyped]:
+    tree = get_parse_tree_for_formula(formula)
+    return BaserowFormulaToBaserowASTMapper().visit(tree)
+
 
 class BaserowFormulaToBaserowASTMapper(BaserowFormulaVisitor):
     """
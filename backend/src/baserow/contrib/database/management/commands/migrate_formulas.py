@@ -1,10 +1,15 @@
-from django.core.management.base import BaseCommand
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
 
 from baserow.contrib.database.formula.migrations.handler import (
     DEFAULT_FORMULA_MIGRATION_BATCH_SIZE,
     FormulaMigrationHandler,
 )
 from baserow.contrib.database.table.cache import clear_generated_model_cache
+from baserow.contrib.database.table.models import Table
+
+SLOWEST_TABLES_IN_SUMMARY = 20
 
 
 class Command(BaseCommand):
@@ -30,12 +35,68 @@ class Command(BaseCommand):
             help="Formulas will be updated in batches of size according to this "
             "parameter.",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="The number of processes migrating the formulas of different "
+            "databases in parallel. With more than one worker or with a progress log, "
+            "the formulas are migrated database by database and a summary of the "
+            "time spent per table is printed.",
+        )
+        parser.add_argument(
+            "--progress-log",
+            type=str,
+            default=None,
+            help="The path of a file where the migrated databases are logged. "
+            "Running the command again with the same file skips the databases that "
+            "have already been migrated.",
+        )
 
     def handle(self, *args, **options):
         dont_clear_model_cache = options.get("dont_clear_model_cache", False)
         batch_size = options.get("batch_size")
+        workers = options.get("workers") or 1
+        progress_log = options.get("progress_log")
 
         if not dont_clear_model_cache:
             clear_generated_model_cache()
 
-        FormulaMigrationHandler.migrate_formulas_to_latest_version(batch_size)
+        if workers == 1 and not progress_log:
+            FormulaMigrationHandler.migrate_formulas_to_latest_version(batch_size)
+            return
+
+        results = FormulaMigrationHandler.migrate_formulas_per_database(
+            batch_size, workers, progress_log
+        )
+        self.print_summary(results)
+
+        failed_database_ids = [str(r.database_id) for r in results if r.error]
+        if failed_database_ids:
+            raise CommandError(
+                f"Failed to migrate the formulas of the databases "
+                f"{', '.join(failed_database_ids)}."
+            )
+
+    def print_summary(self, results):
+        seconds_per_table = defaultdict(float)
+        for result in results:
+            for table_id, seconds in result.seconds_per_table.items():
+                seconds_per_table[table_id] += seconds
+
+        self.stdout.write(
+            f"Migrated the formulas of {len(results)} databases in "
+            f"{sum(r.seconds for r in results):.2f} seconds of work."
+        )
+        slowest_tables = sorted(
+            seconds_per_table.items(), key=lambda item: item[1], reverse=True
+        )[:SLOWEST_TABLES_IN_SUMMARY]
+        tables = Table.objects_and_trash.in_bulk(
+            [table_id for table_id, _ in slowest_tables]
+        )
+        for table_id, seconds in slowest_tables:
+            table = tables.get(table_id)
+            database_id = table.database_id if table else None
+            self.stdout.write(
+                f"{seconds:10.2f}s table {table_id} of database {database_id}"
+            )
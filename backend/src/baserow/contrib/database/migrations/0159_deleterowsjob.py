@@ -0,0 +1,90 @@
+# Generated by Django 4.1.13 on 2026-10-17 12:00
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0087_userprofile_completed_onboarding"),
+        ("database", "0158_field_description"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeleteRowsJob",
+            fields=[
+                (
+                    "job_ptr",
+                    models.OneToOneField(
+                        auto_created=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        parent_link=True,
+                        primary_key=True,
+                        serialize=False,
+                        to="core.job",
+                    ),
+                ),
+                (
+                    "user_ip_address",
+                    models.GenericIPAddressField(
+                        help_text="The user IP address.", null=True
+                    ),
+                ),
+                (
+                    "user_websocket_id",
+                    models.CharField(
+                        help_text="The user websocket uuid needed to manage signals sent correctly.",
+                        max_length=36,
+                        null=True,
+                    ),
+                ),
+                (
+                    "user_session_id",
+                    models.CharField(
+                        help_text="The user session uuid needed for undo/redo functionality.",
+                        max_length=36,
+                        null=True,
+                    ),
+                ),
+                (
+                    "user_action_group_id",
+                    models.CharField(
+                        help_text="The user session uuid needed for undo/redo action group functionality.",
+                        max_length=36,
+                        null=True,
+                    ),
+                ),
+                (
+                    "row_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.PositiveIntegerField(),
+                        help_text="The ids of the rows that must be deleted.",
+                        size=None,
+                    ),
+                ),
+                (
+                    "deleted_rows_count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="The number of rows that have been deleted by the job.",
+                    ),
+                ),
+                (
+                    "table",
+                    models.ForeignKey(
+                        help_text="The table where the rows must be deleted.",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="delete_rows_jobs",
+                        to="database.table",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+            bases=("core.job", models.Model),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 4.1.13 on 2026-10-17 12:00
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("database", "0159_deleterowsjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="formulafield",
+            name="recalculate_in_background",
+            field=models.BooleanField(
+                default=False,
+                help_text="Indicates if the cell values that change because of row changes in other tables are recalculated in the background instead of right away.",
+            ),
+        ),
+        migrations.CreateModel(
+            name="DeferredFieldUpdate",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "starting_row_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.PositiveIntegerField(),
+                        help_text="The ids of the rows that have changed in the starting table.",
+                        size=None,
+                    ),
+                ),
+                (
+                    "deleted_m2m_rels_per_link_field",
+                    models.JSONField(
+                        default=dict,
+                        help_text="For every link row field id, the ids of the rows whose relations with the starting rows have been deleted.",
+                    ),
+                ),
+                (
+                    "field_paths",
+                    models.JSONField(
+                        help_text="A list of the field ids and the ids of the link row fields that lead back to the starting table."
+                    ),
+                ),
+                (
+                    "failed_attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0,
+                        help_text="The number of times the execution of the update has failed.",
+                    ),
+                ),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                (
+                    "starting_table",
+                    models.ForeignKey(
+                        help_text="The table where the rows have changed.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="database.table",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("id",),
+            },
+        ),
+    ]
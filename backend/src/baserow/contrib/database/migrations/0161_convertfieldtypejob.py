@@ -0,0 +1,88 @@
+# Generated by Django 4.1.13 on 2026-10-17 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0087_userprofile_completed_onboarding"),
+        ("database", "0160_deferredfieldupdate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConvertFieldTypeJob",
+            fields=[
+                (
+                    "job_ptr",
+                    models.OneToOneField(
+                        auto_created=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        parent_link=True,
+                        primary_key=True,
+                        serialize=False,
+                        to="core.job",
+                    ),
+                ),
+                (
+                    "user_ip_address",
+                    models.GenericIPAddressField(
+                        help_text="The user IP address.", null=True
+                    ),
+                ),
+                (
+                    "user_websocket_id",
+                    models.CharField(
+                        help_text="The user websocket uuid needed to manage signals sent correctly.",
+                        max_length=36,
+                        null=True,
+                    ),
+                ),
+                (
+                    "user_session_id",
+                    models.CharField(
+                        help_text="The user session uuid needed for undo/redo functionality.",
+                        max_length=36,
+                        null=True,
+                    ),
+                ),
+                (
+                    "user_action_group_id",
+                    models.CharField(
+                        help_text="The user session uuid needed for undo/redo action group functionality.",
+                        max_length=36,
+                        null=True,
+                    ),
+                ),
+                (
+                    "new_field_type",
+                    models.CharField(
+                        help_text="The type that the field must be converted to.",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "field_values",
+                    models.JSONField(
+                        default=dict,
+                        help_text="The other values of the field that must be updated.",
+                    ),
+                ),
+                (
+                    "field",
+                    models.ForeignKey(
+                        help_text="The Baserow field to convert.",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="convert_field_type_jobs",
+                        to="database.field",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+            bases=("core.job", models.Model),
+        ),
+    ]
@@ -1,4 +1,7 @@
-from baserow.contrib.database.fields.dependencies.models import FieldDependency
+from baserow.contrib.database.fields.dependencies.models import (
+    DeferredFieldUpdate,
+    FieldDependency,
+)
 from baserow.core.models import Application
 
 from .fields.models import (
@@ -62,6 +65,7 @@ __all__ = [
     "TableWebhookHeader",
     "TableWebhookCall",
     "FieldDependency",
+    "DeferredFieldUpdate",
 ]
 
 
@@ -10,6 +10,7 @@ from baserow.contrib.database.action.scopes import (
     TABLE_ACTION_CONTEXT,
     TableActionScopeType,
 )
+from baserow.contrib.database.fields.models import Field
 from baserow.contrib.database.rows.handler import (
     GeneratedTableModelForUpdate,
     RowHandler,
@@ -242,20 +243,36 @@ class ImportRowsActionType(UndoableActionType):
             user, table, data, progress=progress
         )
 
+        cls.register_imported_rows(user, table, [row.id for row in created_rows])
+
+        return created_rows, error_report
+
+    @classmethod
+    def register_imported_rows(
+        cls, user: AbstractUser, table: Table, row_ids: List[int]
+    ):
+        """
+        Registers the action for rows that have already been imported, for example
+        by the concurrent tasks of a chunked file import. Undoing it trashes all the
+        provided rows.
+
+        :param user: The user of whose behalf the rows have been imported.
+        :param table: The table in which the rows have been imported.
+        :param row_ids: The ids of the imported rows.
+        """
+
         workspace = table.database.workspace
         params = cls.Params(
             table.id,
             table.name,
             table.database.id,
             table.database.name,
-            [row.id for row in created_rows],
+            row_ids,
         )
         cls.register_action(
             user, params, scope=cls.scope(table.id), workspace=workspace
         )
 
-        return created_rows, error_report
-
     @classmethod
     def scope(cls, table_id) -> ActionScopeStr:
         return TableActionScopeType.value(table_id)
@@ -371,6 +388,7 @@ class DeleteRowsActionType(UndoableActionType):
         table: Table,
         row_ids: List[int],
         model: Optional[Type[GeneratedTableModel]] = None,
+        send_realtime_update: bool = True,
     ):
         """
         Deletes rows of the given table with the given row_ids.
@@ -383,10 +401,18 @@ class DeleteRowsActionType(UndoableActionType):
         :param row_ids: The id of the row that must be deleted.
         :param model: If the correct model has already been generated, it can be
             provided so that it does not have to be generated for a second time.
+        :param send_realtime_update: Whether a realtime update with the deleted rows
+            must be sent.
         :raises RowDoesNotExist: When the row with the provided id does not exist.
         """
 
-        trashed_rows_entry = RowHandler().delete_rows(user, table, row_ids, model=model)
+        trashed_rows_entry = RowHandler().delete_rows(
+            user,
+            table,
+            row_ids,
+            model=model,
+            send_realtime_update=send_realtime_update,
+        )
 
         workspace = table.database.workspace
         params = cls.Params(
@@ -423,6 +449,125 @@ class DeleteRowsActionType(UndoableActionType):
         action_being_redone.params = params
 
 
+class UpsertRowsActionType(UndoableActionType):
+    type = "upsert_rows"
+    description = ActionTypeDescription(
+        _("Upsert rows"),
+        _("Rows (%(created_row_ids)s) created and rows (%(row_ids)s) updated"),
+        TABLE_ACTION_CONTEXT,
+    )
+    analytics_params = [
+        "table_id",
+        "database_id",
+    ]
+
+    @dataclasses.dataclass
+    class Params:
+        table_id: int
+        table_name: str
+        database_id: int
+        database_name: str
+        created_row_ids: List[int]
+        row_ids: List[int]
+        row_values: List[Dict[str, Any]]
+        original_rows_values_by_id: Dict[int, Dict[str, Any]]
+        updated_fields_metadata_by_row_id: Dict[int, Dict[str, Any]]
+        trashed_rows_entry_id: Optional[int] = None
+
+    @classmethod
+    def do(
+        cls,
+        user: AbstractUser,
+        table: Table,
+        rows_values: List[Dict[str, Any]],
+        key_field: Field,
+        model: Optional[Type[GeneratedTableModel]] = None,
+    ) -> Tuple[List[GeneratedTableModel], List[GeneratedTableModelForUpdate]]:
+        """
+        Updates the rows matching the provided rows values on the value of the key
+        field and creates the other ones.
+        See the baserow.contrib.database.rows.handler.RowHandler.upsert_rows
+        for more information.
+        Undoing this action trashes the created rows and restores the original values
+        of the updated rows. Redoing restores the created rows and sets the new
+        values again.
+
+        :param user: The user of whose behalf the change is made.
+        :param table: The table for which the rows must be created or updated.
+        :param rows_values: The values of the rows that must be created or updated.
+        :param key_field: The field whose value is used to match the existing rows.
+        :param model: If the correct model has already been generated it can be
+            provided so that it does not have to be generated for a second time.
+        :return: The created rows and the updated rows.
+        """
+
+        created_rows, updated_rows_values, update_result = RowHandler().upsert_rows(
+            user, table, rows_values, key_field, model=model
+        )
+        updated_rows = update_result.updated_rows
+
+        workspace = table.database.workspace
+        params = cls.Params(
+            table.id,
+            table.name,
+            table.database.id,
+            table.database.name,
+            [row.id for row in created_rows],
+            [row.id for row in updated_rows],
+            updated_rows_values,
+            update_result.original_rows_values_by_id,
+            update_result.updated_fields_metadata_by_row_id,
+        )
+        cls.register_action(user, params, cls.scope(table.id), workspace=workspace)
+
+        return created_rows, updated_rows
+
+    @classmethod
+    def serialized_to_params(cls, serialized_params: Any) -> Any:
+        """
+        Converts the row id keys back into integers. See
+        `UpdateRowsActionType.serialized_to_params`.
+        """
+
+        for key in ["original_rows_values_by_id", "updated_fields_metadata_by_row_id"]:
+            serialized_params[key] = {
+                int(row_id): row_values
+                for row_id, row_values in serialized_params[key].items()
+            }
+
+        return cls.Params(**deepcopy(serialized_params))
+
+    @classmethod
+    def scope(cls, table_id) -> ActionScopeStr:
+        return TableActionScopeType.value(table_id)
+
+    @classmethod
+    def undo(cls, user: AbstractUser, params: Params, action_being_undone: Action):
+        table = TableHandler().get_table(params.table_id)
+        if params.original_rows_values_by_id:
+            original_rows_values = list(params.original_rows_values_by_id.values())
+            RowHandler().update_rows(user, table, original_rows_values)
+        if params.created_row_ids:
+            trashed_rows_trash_entry = RowHandler().delete_rows(
+                user, table, params.created_row_ids
+            )
+            params.trashed_rows_entry_id = trashed_rows_trash_entry.id
+            action_being_undone.params = params
+
+    @classmethod
+    def redo(cls, user: AbstractUser, params: Params, action_being_redone: Action):
+        if params.trashed_rows_entry_id is not None:
+            TrashHandler.restore_item(
+                user,
+                "rows",
+                params.trashed_rows_entry_id,
+                parent_trash_item_id=params.table_id,
+            )
+        if params.row_values:
+            table = TableHandler().get_table(params.table_id)
+            RowHandler().update_rows(user, table, params.row_values)
+
+
 def get_rows_displacement(
     model: Type[GeneratedTableModel],
     original_row_order: Decimal,
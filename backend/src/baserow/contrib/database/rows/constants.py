@@ -1,2 +1,4 @@
 ROW_IMPORT_VALIDATION = "row-import-validation"
 ROW_IMPORT_CREATION = "row-import-creation"
+ROW_IMPORT_CHUNKS = "row-import-chunks"
+ROW_IMPORT_FINALIZING = "row-import-finalizing"
@@ -16,6 +16,14 @@ class RowIdsNotUnique(Exception):
         super().__init__(*args, **kwargs)
 
 
+class UpsertKeyValuesNotUnique(Exception):
+    """Raised when multiple upserted rows have the same key value."""
+
+    def __init__(self, values, *args, **kwargs):
+        self.values = values
+        super().__init__(*args, **kwargs)
+
+
 class ReportMaxErrorCountExceeded(Exception):
     """
     Raised when a the report raises too many error.
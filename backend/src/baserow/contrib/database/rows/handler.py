@@ -17,6 +17,7 @@ from typing import (
     cast,
 )
 
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
 from django.db import connection, transaction
@@ -33,8 +34,13 @@ from baserow.contrib.database.fields.dependencies.update_collector import (
     FieldUpdateCollector,
 )
 from baserow.contrib.database.fields.field_cache import FieldCache
+from baserow.contrib.database.fields.fields import (
+    BaserowExpressionField,
+    IntegerFieldWithSequence,
+)
 from baserow.contrib.database.fields.registries import FieldType, field_type_registry
 from baserow.contrib.database.fields.utils import get_field_id_from_field_key
+from baserow.contrib.database.formula import FormulaHandler
 from baserow.contrib.database.table.models import GeneratedTableModel, Table
 from baserow.contrib.database.table.operations import (
     CreateRowDatabaseTableOperationType,
@@ -43,9 +49,14 @@ from baserow.contrib.database.table.operations import (
 from baserow.contrib.database.table.signals import table_updated
 from baserow.contrib.database.trash.models import TrashedRows
 from baserow.core.db import (
+    copy_bulk_create,
+    fetch_sequence_values,
     get_highest_order_of_queryset,
+    get_primary_key_sequence_name,
     get_unique_orders_before_item,
+    rebalance_orders_around_item,
     recalculate_full_orders,
+    values_bulk_update,
 )
 from baserow.core.exceptions import CannotCalculateIntermediateOrder
 from baserow.core.handler import CoreHandler
@@ -61,7 +72,7 @@ from ..table.constants import (
 )
 from .constants import ROW_IMPORT_CREATION, ROW_IMPORT_VALIDATION
 from .error_report import RowErrorReport
-from .exceptions import RowDoesNotExist, RowIdsNotUnique
+from .exceptions import RowDoesNotExist, RowIdsNotUnique, UpsertKeyValuesNotUnique
 from .operations import (
     DeleteDatabaseRowOperationType,
     MoveRowDatabaseRowOperationType,
@@ -91,6 +102,10 @@ RowsForUpdate = NewType("RowsForUpdate", QuerySet)
 
 BATCH_SIZE = 1024
 
+# When the orders before a row get closer than this to each other, the orders around
+# the row are spread in the background, long before no intermediate order is left.
+ROW_ORDER_REBALANCE_MIN_GAP = Decimal("1e-10")
+
 meter = metrics.get_meter(__name__)
 rows_created_counter = meter.create_counter(
     "baserow.rows_created",
@@ -102,6 +117,12 @@ rows_updated_counter = meter.create_counter(
     unit="1",
     description="The number of rows updated in user tables.",
 )
+row_order_rebalances_counter = meter.create_counter(
+    "baserow.row_order_rebalances",
+    unit="1",
+    description="The number of times the row orders of a table have been rebalanced "
+    "because the intermediate orders were running out, by scope (window or table).",
+)
 rows_deleted_counter = meter.create_counter(
     "baserow.rows_deleted",
     unit="1",
@@ -149,6 +170,12 @@ class UpdatedRowsWithOldValuesAndMetadata(NamedTuple):
     updated_fields_metadata_by_row_id: Dict[RowId, FieldsMetadata]
 
 
+class UpsertedRows(NamedTuple):
+    created_rows: List[GeneratedTableModel]
+    updated_rows_values: List[Dict[str, Any]]
+    update_result: UpdatedRowsWithOldValuesAndMetadata
+
+
 class RowM2MChangeTracker:
     def __init__(self):
         self._deleted_m2m_rels: Dict[
@@ -387,8 +414,10 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
         provided `before_row` or at the end of the table, depending on whether the
         `before_row` value is provided.
 
-        Note that this method can trigger an update of all the rows in the table in
-        the event all the orders must be recalculated.
+        When the orders before the `before_row` are getting close to each other, the
+        orders around it are spread in the background. Note that this method can
+        still rebalance the orders around the row, or trigger an update of all the
+        rows in the table, if no intermediate order is left when it's called.
 
         :param before_row: The row instance where the before orders must be
             calculated for. If `None`, then it's assumed that the orders are for
@@ -403,21 +432,28 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
 
         if before_row:
             try:
-                return get_unique_orders_before_item(
+                orders = get_unique_orders_before_item(
                     before_row, queryset, amount=amount
                 )
             except CannotCalculateIntermediateOrder:
                 # If the `find_intermediate_order` fails with a
                 # `CannotCalculateIntermediateOrder`, it means that it's not possible
-                # calculate an intermediate fraction. Therefore, must reset all the
-                # orders of the table (while respecting their original order),
+                # calculate an intermediate fraction. Therefore, must reset the
+                # orders around the row (while respecting their original order),
                 # so that we can then can find the fraction any many more after.
-                self.recalculate_row_orders(model.baserow_table, model)
+                self.rebalance_row_orders(model.baserow_table, before_row, model)
                 # Refresh the row element as its order might have changed
                 before_row.refresh_from_db()
                 return get_unique_orders_before_item(
                     before_row, queryset, amount=amount
                 )
+
+            if before_row.order - orders[-1] < ROW_ORDER_REBALANCE_MIN_GAP or any(
+                next_order - order < ROW_ORDER_REBALANCE_MIN_GAP
+                for order, next_order in zip(orders, orders[1:])
+            ):
+                self.schedule_row_orders_rebalance(model.baserow_table, before_row)
+            return orders
         else:
             # If no `before` is provided, we can just find the highest value and
             # add one to it.
@@ -1058,6 +1094,9 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
         send_webhook_events: bool = True,
         generate_error_report: bool = False,
         skip_search_update: bool = False,
+        use_copy: bool = False,
+        orders: Optional[List[Decimal]] = None,
+        skip_dependant_fields_update: bool = False,
     ) -> List[GeneratedTableModel]:
         """
         Creates new rows for a given table if the user
@@ -1076,6 +1115,14 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
         :param skip_search_update: If you want to to instead
             trigger the search handler cells update later on after many create_rows
             calls then set this to True but make sure you trigger it eventually.
+        :param use_copy: Inserts the rows and their relations with `COPY` instead of
+            `INSERT` statements, which is faster for large amounts of rows.
+        :param orders: Optionally the orders of the new rows. If not provided, they
+            are calculated based on the `before_row`.
+        :param skip_dependant_fields_update: If you want to instead update the fields
+            depending on the fields of this table later on after many create_rows
+            calls then set this to True, but make sure you call
+            `update_dependant_fields_of_created_rows` eventually.
         :return: The created row instances.
         """
 
@@ -1090,9 +1137,10 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
         if model is None:
             model = table.get_model()
 
-        unique_orders = self.get_unique_orders_before_row(
-            before_row, model, amount=len(rows_values)
-        )
+        if orders is None:
+            orders = self.get_unique_orders_before_row(
+                before_row, model, amount=len(rows_values)
+            )
 
         report = {}
         prepared_rows_values, errors = self.prepare_rows_in_bulk(
@@ -1107,7 +1155,7 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
             prepared_rows_values, start=-len(prepared_rows_values)
         ):
             row_values, manytomany_values = self.extract_manytomany_values(row, model)
-            row_values["order"] = unique_orders[index]
+            row_values["order"] = orders[index]
 
             if getattr(model, CREATED_BY_COLUMN_NAME, None):
                 row_values[CREATED_BY_COLUMN_NAME] = user if user.id else None
@@ -1130,9 +1178,15 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
             # saved.
             instance._m2m_values = relations
 
-        inserted_rows = model.objects.bulk_create(
-            [row for (row, _) in rows_relationships]
-        )
+        expression_fields = []
+        if use_copy:
+            inserted_rows, expression_fields = self._copy_insert_rows(
+                model, [row for (row, _) in rows_relationships]
+            )
+        else:
+            inserted_rows = model.objects.bulk_create(
+                [row for (row, _) in rows_relationships]
+            )
         rows_created_counter.add(len(rows_relationships))
 
         many_to_many = defaultdict(list)
@@ -1153,13 +1207,20 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
 
         for field_name, values in many_to_many.items():
             through = getattr(model, field_name).through
-            through.objects.bulk_create(values)
+            if use_copy:
+                copy_bulk_create(through, values)
+            else:
+                through.objects.bulk_create(values)
 
         update_collector = FieldUpdateCollector(
             table, starting_row_ids=[row.id for row in inserted_rows]
         )
         field_cache = FieldCache()
         field_cache.cache_model(model)
+
+        # The formula values that would have been computed by the insert statement
+        # are computed for all the new rows at once, now that the relations exist.
+        self._add_formula_update_statements(model, expression_fields, update_collector)
         field_ids = []
         for field_object in model._field_objects.values():
             field_type = field_object["type"]
@@ -1171,23 +1232,9 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
             )
 
         dependant_fields = []
-        for (
-            dependant_field,
-            dependant_field_type,
-            path_to_starting_table,
-        ) in FieldDependencyHandler.get_all_dependent_fields_with_type(
-            table.id,
-            field_ids,
-            field_cache,
-            associated_relations_changed=True,
-        ):
-            dependant_fields.append(dependant_field)
-            dependant_field_type.row_of_dependency_created(
-                dependant_field,
-                inserted_rows,
-                update_collector,
-                field_cache,
-                path_to_starting_table,
+        if not skip_dependant_fields_update:
+            dependant_fields = self._add_dependant_fields_of_created_rows_updates(
+                table, field_ids, inserted_rows, update_collector, field_cache
             )
         update_collector.apply_updates_and_get_updated_fields(field_cache)
 
@@ -1229,6 +1276,99 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
             return inserted_rows, report
         return rows_to_return
 
+    def _copy_insert_rows(
+        self, model: Type[GeneratedTableModel], rows: List[GeneratedTableModel]
+    ) -> Tuple[List[GeneratedTableModel], List[BaserowExpressionField]]:
+        """
+        Inserts the provided rows with `COPY`. Because nothing is returned by the
+        database, the ids and the autonumber values are reserved from their
+        sequences beforehand. The formula columns are left empty because their
+        insert value is an SQL expression, so they must be computed afterwards.
+
+        :param model: The model of the table.
+        :param rows: The unsaved row instances.
+        :return: The inserted rows and the model fields of the formula columns that
+            must still be computed.
+        """
+
+        row_ids = fetch_sequence_values(get_primary_key_sequence_name(model), len(rows))
+        for row, row_id in zip(rows, row_ids):
+            row.id = row_id
+
+        expression_fields = []
+        for model_field in model._meta.local_concrete_fields:
+            if isinstance(model_field, BaserowExpressionField):
+                expression_fields.append(model_field)
+            elif isinstance(model_field, IntegerFieldWithSequence):
+                rows_without_value = [
+                    row for row in rows if not getattr(row, model_field.attname)
+                ]
+                values = fetch_sequence_values(
+                    model_field.get_sequence_name(), len(rows_without_value)
+                )
+                for row, value in zip(rows_without_value, values):
+                    setattr(row, model_field.attname, value)
+
+        copy_bulk_create(
+            model, rows, exclude=[model_field.name for model_field in expression_fields]
+        )
+        return rows, expression_fields
+
+    def _values_update_rows(
+        self,
+        model: Type[GeneratedTableModel],
+        rows: List[GeneratedTableModel],
+        field_names: List[str],
+    ) -> List[BaserowExpressionField]:
+        """
+        Updates the provided fields of the rows with a single
+        `UPDATE ... FROM (VALUES ...)` statement. The formula columns are left out
+        because their update value is an SQL expression, so they must be computed
+        afterwards.
+
+        :param model: The model of the table.
+        :param rows: The row instances having the new values.
+        :param field_names: The names of the fields that must be updated.
+        :return: The model fields of the formula columns that must still be
+            computed.
+        """
+
+        expression_fields, value_field_names = [], []
+        for field_name in field_names:
+            model_field = model._meta.get_field(field_name)
+            if isinstance(model_field, BaserowExpressionField):
+                expression_fields.append(model_field)
+            else:
+                value_field_names.append(field_name)
+
+        values_bulk_update(model, rows, value_field_names)
+        return expression_fields
+
+    def _add_formula_update_statements(
+        self,
+        model: Type[GeneratedTableModel],
+        expression_fields: List[BaserowExpressionField],
+        update_collector: FieldUpdateCollector,
+    ):
+        """
+        Adds a statement computing the formula for all the starting rows of the
+        update collector for each of the provided formula columns.
+
+        :param model: The model of the table.
+        :param expression_fields: The model fields of the formula columns.
+        :param update_collector: The update collector of the starting rows.
+        """
+
+        for model_field in expression_fields:
+            if model_field.expression is not None:
+                update_collector.add_field_with_pending_update_statement(
+                    model.get_field_object(model_field.name)["field"],
+                    FormulaHandler.baserow_expression_to_update_django_expression(
+                        model_field.expression, model
+                    ),
+                    via_path_to_starting_table=[],
+                )
+
     def _prepare_m2m_field_related_objects(
         self, row: GeneratedTableModel, field_name: str, value: List[Any]
     ) -> Tuple[List[Type[Model]], str]:
@@ -1326,6 +1466,91 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
 
         return report
 
+    def _add_dependant_fields_of_created_rows_updates(
+        self,
+        table: Table,
+        field_ids: List[int],
+        rows: List[GeneratedTableModel],
+        update_collector: FieldUpdateCollector,
+        field_cache: FieldCache,
+    ) -> List["Field"]:
+        """
+        Adds the updates of the fields depending on the provided fields of the table
+        for the newly created rows to the update collector.
+
+        :param table: The table in which the rows have been created.
+        :param field_ids: The ids of the fields of the table.
+        :param rows: The created rows.
+        :param update_collector: The collector of which the `starting_row_ids` are
+            the ids of the created rows.
+        :param field_cache: A field cache containing the model of the table.
+        :return: The dependant fields.
+        """
+
+        dependant_fields = []
+        for (
+            dependant_field,
+            dependant_field_type,
+            path_to_starting_table,
+        ) in FieldDependencyHandler.get_all_dependent_fields_with_type(
+            table.id,
+            field_ids,
+            field_cache,
+            associated_relations_changed=True,
+        ):
+            dependant_fields.append(dependant_field)
+            dependant_field_type.row_of_dependency_created(
+                dependant_field,
+                rows,
+                update_collector,
+                field_cache,
+                path_to_starting_table,
+            )
+        return dependant_fields
+
+    def update_dependant_fields_of_created_rows(
+        self,
+        table: Table,
+        row_ids: List[int],
+        model: Optional[Type[GeneratedTableModel]] = None,
+    ):
+        """
+        Updates the fields depending on the fields of the table for rows that have
+        been created with `skip_dependant_fields_update`. The rows are processed by
+        batches of `BATCH_SIZE` rows.
+
+        :param table: The table in which the rows have been created.
+        :param row_ids: The ids of the created rows.
+        :param model: Optional model to prevent recomputing table model.
+        """
+
+        if not row_ids:
+            return
+
+        if model is None:
+            model = table.get_model()
+
+        field_cache = FieldCache()
+        field_cache.cache_model(model)
+        field_ids = [o["field"].id for o in model._field_objects.values()]
+
+        dependant_fields = {}
+        for batch_row_ids in grouper(BATCH_SIZE, row_ids):
+            rows = list(model.objects.filter(id__in=batch_row_ids))
+            update_collector = FieldUpdateCollector(
+                table, starting_row_ids=[row.id for row in rows]
+            )
+            for field in self._add_dependant_fields_of_created_rows_updates(
+                table, field_ids, rows, update_collector, field_cache
+            ):
+                dependant_fields[field.id] = field
+            update_collector.apply_updates_and_get_updated_fields(field_cache)
+
+        if dependant_fields:
+            from baserow.contrib.database.views.handler import ViewHandler
+
+            ViewHandler().field_value_updated(list(dependant_fields.values()))
+
     def create_rows_by_batch(
         self,
         user: AbstractUser,
@@ -1333,6 +1558,9 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
         rows: List[Dict[str, Any]],
         progress: Optional[Progress] = None,
         model: Optional[Type[GeneratedTableModel]] = None,
+        skip_search_update: bool = False,
+        first_order: Optional[Decimal] = None,
+        skip_dependant_fields_update: bool = False,
     ) -> Tuple[List[GeneratedTableModel], Dict[str, Dict[str, Any]]]:
         """
         Creates rows by batch and generates an error report instead of failing on first
@@ -1343,6 +1571,14 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
         :param rows: List of rows values for rows that need to be created.
         :param progress: Give a progress instance to track the progress of the import.
         :param model: Optional model to prevent recomputing table model.
+        :param skip_search_update: Set to True if the caller triggers the search
+            update of the table itself once all the rows have been created.
+        :param first_order: Optionally the order of the first row. The following rows
+            get consecutive orders. If not provided, the rows are added at the end of
+            the table.
+        :param skip_dependant_fields_update: Set to True if the caller updates the
+            fields depending on the fields of the table itself once all the rows
+            have been created.
         :return: The created rows and the error report.
         """
 
@@ -1359,6 +1595,11 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
         all_created_rows = []
         for count, chunk in enumerate(grouper(BATCH_SIZE, rows)):
             row_start_index = count * BATCH_SIZE
+            orders = (
+                [first_order + row_start_index + i for i in range(len(chunk))]
+                if first_order is not None
+                else None
+            )
             created_rows, creation_report = self.create_rows(
                 user=user,
                 table=table,
@@ -1370,6 +1611,9 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
                 # Don't trigger loads of search updates for every batch of rows we
                 # create but instead a single one for this entire table at the end.
                 skip_search_update=True,
+                use_copy=settings.BASEROW_ROWS_BULK_INSERT_USE_COPY,
+                orders=orders,
+                skip_dependant_fields_update=skip_dependant_fields_update,
             )
 
             for valid_index, field_errors in creation_report.items():
@@ -1382,7 +1626,8 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
 
             all_created_rows += created_rows
 
-        SearchHandler.field_value_updated_or_created(table)
+        if not skip_search_update:
+            SearchHandler.field_value_updated_or_created(table)
 
         return all_created_rows, report
 
@@ -1394,6 +1639,9 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
         validate: bool = True,
         progress: Optional[Progress] = None,
         send_realtime_update: bool = True,
+        skip_search_update: bool = False,
+        first_order: Optional[Decimal] = None,
+        skip_dependant_fields_update: bool = False,
     ) -> Tuple[List[GeneratedTableModel], Dict[str, Dict[str, Any]]]:
         """
         Creates new rows for a given table if the user belongs to the related
@@ -1411,6 +1659,13 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
             import.
         :param send_realtime_update: The parameter passed to the rows_created
             signal indicating if a realtime update should be send.
+        :param skip_search_update: Set to True if the caller triggers the search
+            update of the table itself once all the rows have been imported.
+        :param first_order: Optionally the order of the first imported row. If not
+            provided, the rows are added at the end of the table.
+        :param skip_dependant_fields_update: Set to True if the caller updates the
+            fields depending on the fields of the table itself once all the rows
+            have been imported.
 
         :return: The created row instances and the error report.
         """
@@ -1488,7 +1743,14 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
         )
 
         created_rows, creation_report = self.create_rows_by_batch(
-            user, table, valid_rows, progress=creation_sub_progress, model=model
+            user,
+            table,
+            valid_rows,
+            progress=creation_sub_progress,
+            model=model,
+            skip_search_update=skip_search_update,
+            first_order=first_order,
+            skip_dependant_fields_update=skip_dependant_fields_update,
         )
 
         # Add errors to global report
@@ -1761,8 +2023,14 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
             if not_m2m and getattr(model_field, "valid_for_bulk_update", True):
                 bulk_update_fields.append(field_name)
 
+        expression_fields = []
         if len(bulk_update_fields) > 0:
-            model.objects.bulk_update(rows_to_update, bulk_update_fields)
+            if settings.BASEROW_ROWS_BULK_UPDATE_USE_VALUES:
+                expression_fields = self._values_update_rows(
+                    model, rows_to_update, bulk_update_fields
+                )
+            else:
+                model.objects.bulk_update(rows_to_update, bulk_update_fields)
             rows_updated_counter.add(len(rows_to_update))
 
         update_collector = FieldUpdateCollector(
@@ -1772,6 +2040,7 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
         )
         field_cache = FieldCache()
         field_cache.cache_model(model)
+        self._add_formula_update_statements(model, expression_fields, update_collector)
 
         dependant_fields = []
         for (
@@ -1824,6 +2093,110 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
             fields_metadata_by_row_id,
         )
 
+    def upsert_rows(
+        self,
+        user: AbstractUser,
+        table: Table,
+        rows_values: List[Dict[str, Any]],
+        key_field: "Field",
+        model: Optional[Type[GeneratedTableModel]] = None,
+    ) -> UpsertedRows:
+        """
+        Updates the rows having the same value for the `key_field` as the provided
+        rows values and creates the other rows. The existing rows are matched with a
+        single query, and the rows are then created and updated in bulk. If multiple
+        existing rows have the same key value, the one with the lowest id is updated.
+        Must be called in a transaction, which holds a lock preventing concurrent
+        upserts with the same key field until it ends.
+
+        :param user: The user of whose behalf the change is made.
+        :param table: The table for which the rows must be created or updated.
+        :param rows_values: The values of the rows. The keys must be the field names
+            like in `create_rows` and `update_rows`, without the row id.
+        :param key_field: The field whose value is used to match the existing rows.
+        :param model: If the correct model has already been generated it can be
+            provided so that it does not have to be generated for a second time.
+        :raises IncompatibleField: When the key field can't be used to match rows.
+        :raises UpsertKeyValuesNotUnique: When multiple rows values have the same
+            key value.
+        :return: The created rows, the values of the matched rows including their id
+            and the result of their update.
+        """
+
+        from baserow.contrib.database.fields.exceptions import IncompatibleField
+
+        if model is None:
+            model = table.get_model()
+
+        if key_field.id not in model._field_objects:
+            raise IncompatibleField("The key field doesn't belong to the table.")
+
+        field_object = model._field_objects[key_field.id]
+        key_field_name = field_object["name"]
+        if field_object["type"].read_only or isinstance(
+            model._meta.get_field(key_field_name), ManyToManyField
+        ):
+            raise IncompatibleField(
+                f"The {field_object['type'].type} field can't be used as upsert key."
+            )
+
+        def normalize_key(value):
+            return getattr(value, "pk", value)
+
+        keys_by_index = field_object["type"].prepare_value_for_db_in_bulk(
+            field_object["field"],
+            {
+                index: row_values[key_field_name]
+                for index, row_values in enumerate(rows_values)
+                if row_values.get(key_field_name) not in (None, "")
+            },
+        )
+        keys_by_index = {
+            index: normalize_key(key) for index, key in keys_by_index.items()
+        }
+
+        non_unique_keys = get_non_unique_values(list(keys_by_index.values()))
+        if len(non_unique_keys) > 0:
+            raise UpsertKeyValuesNotUnique(non_unique_keys)
+
+        # Concurrent upserts using the same key field must be serialized, otherwise
+        # they could both not find a key value and both create a row for it. The
+        # lock is released when the transaction ends.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(%s, %s)", [table.id, key_field.id]
+            )
+
+        row_ids_by_key = {}
+        existing_rows = (
+            model.objects.filter(**{f"{key_field_name}__in": keys_by_index.values()})
+            .order_by("-id")
+            .values_list(key_field_name, "id")
+        )
+        for key, row_id in existing_rows:
+            row_ids_by_key[normalize_key(key)] = row_id
+
+        rows_values_to_create, rows_values_to_update = [], []
+        for index, row_values in enumerate(rows_values):
+            row_id = row_ids_by_key.get(keys_by_index.get(index))
+            if row_id is None:
+                rows_values_to_create.append(row_values)
+            else:
+                rows_values_to_update.append({**row_values, "id": row_id})
+
+        created_rows = (
+            self.create_rows(user, table, rows_values_to_create, model=model)
+            if rows_values_to_create
+            else []
+        )
+        update_result = (
+            self.update_rows(user, table, rows_values_to_update, model=model)
+            if rows_values_to_update
+            else UpdatedRowsWithOldValuesAndMetadata([], {}, {})
+        )
+
+        return UpsertedRows(created_rows, rows_values_to_update, update_result)
+
     def get_rows(
         self, model: GeneratedTableModel, row_ids: List[int]
     ) -> List[GeneratedTableModel]:
@@ -2076,6 +2449,7 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
         table: Table,
         row_ids: List[int],
         model: Optional[Type[GeneratedTableModel]] = None,
+        send_realtime_update: bool = True,
     ) -> TrashedRows:
         """
         Trashes existing rows of the given table based on row_ids.
@@ -2083,9 +2457,11 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
         :param user: The user of whose behalf the change is made.
         :param table: The table for which the row must be deleted.
         :param row_ids: The ids of the rows that must be deleted.
-        :param model:
         :param model: If the correct model has already been generated, it can be
             provided so that it does not have to be generated for a second time.
+        :param send_realtime_update: The parameter passed to the before_rows_delete
+            and rows_deleted signals indicating if a realtime update should be sent
+            with the deleted rows.
         :raises RowDoesNotExist: When the row with the provided id does not exist.
         """
 
@@ -2111,7 +2487,12 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
             raise RowDoesNotExist(sorted(list(set(row_ids) - set(db_rows_ids))))
 
         before_return = before_rows_delete.send(
-            self, rows=rows, user=user, table=table, model=model
+            self,
+            rows=rows,
+            user=user,
+            table=table,
+            model=model,
+            send_realtime_update=send_realtime_update,
         )
 
         trashed_rows = TrashedRows.objects.create(row_ids=row_ids, table=table)
@@ -2167,10 +2548,54 @@ class RowHandler(metaclass=baserow_trace_methods(tracer)):
             table=table,
             model=model,
             before_return=before_return,
+            send_realtime_update=send_realtime_update,
         )
 
         return trashed_rows
 
+    def schedule_row_orders_rebalance(self, table: Table, row: GeneratedTableModel):
+        """
+        Schedules a background task that spreads the orders of the rows around the
+        provided row once the current transaction is committed.
+
+        :param table: The table object for which the rows orders must be rebalanced.
+        :param row: The row around which the orders must be rebalanced.
+        """
+
+        from .tasks import rebalance_row_orders_around_row
+
+        table_id, row_id = table.id, row.id
+        transaction.on_commit(
+            lambda: rebalance_row_orders_around_row.delay(table_id, row_id)
+        )
+
+    def rebalance_row_orders(
+        self,
+        table: Table,
+        row: GeneratedTableModel,
+        model: Optional[GeneratedTableModel] = None,
+    ):
+        """
+        Spreads the orders of the rows around the provided row, so that intermediate
+        orders can be calculated again before it. Only if there is no room left
+        around the row, the orders of all the rows of the table are recalculated,
+        which is a lot slower for big tables.
+
+        :param table: The table object for which the rows orders must be rebalanced.
+        :param row: The row around which the orders must be rebalanced.
+        :param model: The already generated model if any.
+        """
+
+        if model is None:
+            model = table.get_model()
+
+        if rebalance_orders_around_item(row, model.objects):
+            row_order_rebalances_counter.add(1, {"scope": "window"})
+            row_orders_recalculated.send(self, table=table)
+        else:
+            row_order_rebalances_counter.add(1, {"scope": "table"})
+            self.recalculate_row_orders(table, model)
+
     def recalculate_row_orders(self, table: Table, model: GeneratedTableModel = None):
         """
         Recalculates the order to whole numbers of all rows based on the existing
@@ -9,7 +9,10 @@ from django.dispatch import receiver
 from opentelemetry import trace
 
 from baserow.contrib.database.fields.registries import field_type_registry
-from baserow.contrib.database.rows.actions import UpdateRowsActionType
+from baserow.contrib.database.rows.actions import (
+    UpdateRowsActionType,
+    UpsertRowsActionType,
+)
 from baserow.contrib.database.rows.models import RowHistory
 from baserow.contrib.database.rows.registries import change_row_history_registry
 from baserow.contrib.database.rows.signals import rows_history_updated
@@ -131,6 +134,51 @@ class RowHistoryHandler:
         action_command_type: ActionCommandType,
     ):
         params = UpdateRowsActionType.serialized_to_params(action_params)
+        cls._record_history_from_updated_rows_params(
+            user,
+            action_uuid,
+            params,
+            UpdateRowsActionType.type,
+            action_timestamp,
+            action_command_type,
+        )
+
+    @classmethod
+    @baserow_trace(tracer)
+    def record_history_from_upsert_rows_action(
+        cls,
+        user: AbstractBaseUser,
+        action_uuid: str,
+        action_params: Dict[str, Any],
+        action_timestamp: datetime,
+        action_command_type: ActionCommandType,
+    ):
+        params = UpsertRowsActionType.serialized_to_params(action_params)
+        cls._record_history_from_updated_rows_params(
+            user,
+            action_uuid,
+            params,
+            UpsertRowsActionType.type,
+            action_timestamp,
+            action_command_type,
+        )
+
+    @classmethod
+    def _record_history_from_updated_rows_params(
+        cls,
+        user: AbstractBaseUser,
+        action_uuid: str,
+        params: Any,
+        action_type: str,
+        action_timestamp: datetime,
+        action_command_type: ActionCommandType,
+    ):
+        """
+        Records the history of the rows updated by an action whose params contain
+        the `row_values`, `original_rows_values_by_id` and
+        `updated_fields_metadata_by_row_id` of the updated rows.
+        """
+
         after_values = params.row_values
         before_values = [
             params.original_rows_values_by_id[r["id"]] for r in after_values
@@ -161,7 +209,7 @@ class RowHistoryHandler:
                 row_id,
                 diff.changed_field_names,
                 changed_fields_metadata,
-                UpdateRowsActionType.type,
+                action_type,
                 action_uuid,
                 action_timestamp,
                 action_command_type,
@@ -212,6 +260,7 @@ class RowHistoryHandler:
 
 ROW_HISTORY_ACTIONS = {
     UpdateRowsActionType.type: RowHistoryHandler.record_history_from_update_rows_action,
+    UpsertRowsActionType.type: RowHistoryHandler.record_history_from_upsert_rows_action,
 }
 
 
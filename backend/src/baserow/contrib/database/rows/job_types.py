@@ -0,0 +1,137 @@
+import contextlib
+import uuid
+
+from django.conf import settings
+
+from rest_framework import serializers
+
+from baserow.api.errors import ERROR_GROUP_DOES_NOT_EXIST, ERROR_USER_NOT_IN_GROUP
+from baserow.api.sessions import get_client_undo_redo_action_group_id
+from baserow.contrib.database.api.tables.errors import ERROR_TABLE_DOES_NOT_EXIST
+from baserow.contrib.database.db.atomic import read_committed_single_table_transaction
+from baserow.contrib.database.rows.actions import DeleteRowsActionType
+from baserow.contrib.database.rows.models import DeleteRowsJob
+from baserow.contrib.database.rows.operations import DeleteDatabaseRowOperationType
+from baserow.contrib.database.table.exceptions import TableDoesNotExist
+from baserow.contrib.database.table.handler import TableHandler
+from baserow.contrib.database.table.signals import table_updated
+from baserow.core.action.registries import action_type_registry
+from baserow.core.exceptions import UserNotInWorkspace, WorkspaceDoesNotExist
+from baserow.core.handler import CoreHandler
+from baserow.core.jobs.registries import JobType
+
+
+class DeleteRowsJobType(JobType):
+    """
+    Trashes a large amount of rows in the background, by chunks of
+    `BASEROW_DELETE_ROWS_JOB_CHUNK_SIZE` rows, so that the request doesn't time out.
+    A single `table_updated` realtime event is sent once all the rows have been
+    trashed, instead of the serialized rows of every chunk.
+    """
+
+    type = "delete_rows"
+    model_class = DeleteRowsJob
+    max_count = 1
+
+    api_exceptions_map = {
+        UserNotInWorkspace: ERROR_USER_NOT_IN_GROUP,
+        WorkspaceDoesNotExist: ERROR_GROUP_DOES_NOT_EXIST,
+        TableDoesNotExist: ERROR_TABLE_DOES_NOT_EXIST,
+    }
+
+    request_serializer_field_names = ["table_id", "row_ids"]
+
+    request_serializer_field_overrides = {
+        "table_id": serializers.IntegerField(
+            help_text="The ID of the table where the rows must be deleted.",
+        ),
+        "row_ids": serializers.ListField(
+            child=serializers.IntegerField(min_value=1),
+            allow_empty=False,
+            help_text="The ids of the rows that must be deleted.",
+        ),
+    }
+
+    serializer_field_names = ["table_id", "deleted_rows_count"]
+    serializer_field_overrides = {
+        "table_id": serializers.IntegerField(
+            help_text="The ID of the table where the rows are deleted.",
+        ),
+        "deleted_rows_count": serializers.IntegerField(
+            help_text="The number of rows that have been deleted.",
+        ),
+    }
+
+    def transaction_atomic_context(self, job: DeleteRowsJob):
+        """
+        Every chunk of rows is deleted and committed in its own transaction, so that
+        the table and the fields are never locked for the whole job.
+        """
+
+        return contextlib.nullcontext()
+
+    def prepare_values(self, values, user):
+        table = TableHandler().get_table(values["table_id"])
+
+        CoreHandler().check_permissions(
+            user,
+            DeleteDatabaseRowOperationType.type,
+            workspace=table.database.workspace,
+            context=table,
+        )
+
+        return {
+            "table": table,
+            "row_ids": values["row_ids"],
+            # Every chunk registers its own delete rows action. They're all part of
+            # the same action group, so that they're undone together.
+            "user_action_group_id": (
+                get_client_undo_redo_action_group_id(user) or str(uuid.uuid4())
+            ),
+        }
+
+    def run(self, job, progress):
+        table = job.table
+        if table is None:
+            raise TableDoesNotExist("The table has been deleted in the meantime.")
+
+        row_ids = sorted(set(job.row_ids))
+        chunk_size = settings.BASEROW_DELETE_ROWS_JOB_CHUNK_SIZE
+        chunks_progress = progress.create_child(progress.total, len(row_ids))
+        delete_rows_action_type = action_type_registry.get_by_type(DeleteRowsActionType)
+
+        deleted_rows_count = 0
+        for start in range(0, len(row_ids), chunk_size):
+            chunk_row_ids = row_ids[start : start + chunk_size]
+            # Protects the table and the fields from modifications while the rows of
+            # the chunk are deleted.
+            with read_committed_single_table_transaction(table.id):
+                model = table.get_model()
+                # Rows that have been deleted in the meantime are ignored.
+                existing_row_ids = list(
+                    model.objects.filter(
+                        id__gte=chunk_row_ids[0],
+                        id__lte=chunk_row_ids[-1],
+                        id__in=chunk_row_ids,
+                    ).values_list("id", flat=True)
+                )
+                if existing_row_ids:
+                    delete_rows_action_type.do(
+                        job.user,
+                        table,
+                        existing_row_ids,
+                        model=model,
+                        send_realtime_update=False,
+                    )
+                    deleted_rows_count += len(existing_row_ids)
+            chunks_progress.increment(len(chunk_row_ids))
+
+        job.deleted_rows_count = deleted_rows_count
+        job.save(update_fields=("deleted_rows_count",))
+
+        if deleted_rows_count:
+            table_updated.send(
+                self, table=table, user=job.user, force_table_refresh=True
+            )
+
+        return deleted_rows_count
@@ -3,6 +3,12 @@ from django.db import models
 
 from baserow.core.action.signals import ActionCommandType
 from baserow.core.encoders import JSONEncoderSupportingDataClasses
+from baserow.core.jobs.mixins import (
+    JobWithUndoRedoIds,
+    JobWithUserIpAddress,
+    JobWithWebsocketId,
+)
+from baserow.core.jobs.models import Job
 
 
 class RowHistory(models.Model):
@@ -60,3 +66,21 @@ class RowHistory(models.Model):
     class Meta:
         ordering = ("-action_timestamp", "-id")
         indexes = [models.Index(fields=["table", "row_id", "-action_timestamp", "-id"])]
+
+
+class DeleteRowsJob(JobWithUserIpAddress, JobWithWebsocketId, JobWithUndoRedoIds, Job):
+    table = models.ForeignKey(
+        "database.Table",
+        null=True,
+        related_name="delete_rows_jobs",
+        on_delete=models.SET_NULL,
+        help_text="The table where the rows must be deleted.",
+    )
+    row_ids = ArrayField(
+        models.PositiveIntegerField(),
+        help_text="The ids of the rows that must be deleted.",
+    )
+    deleted_rows_count = models.PositiveIntegerField(
+        default=0,
+        help_text="The number of rows that have been deleted by the job.",
+    )
@@ -0,0 +1,159 @@
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple, Type
+
+from django.db import transaction
+
+from opentelemetry import metrics
+
+from baserow.contrib.database.table.models import GeneratedTableModel, Table
+
+meter = metrics.get_meter(__name__)
+row_mutation_consumer_duration = meter.create_histogram(
+    "baserow.row_mutation_consumer_duration",
+    unit="ms",
+    description="The time spent by each consumer of the row mutations once the "
+    "transaction has been committed.",
+)
+
+
+class RowsMutation:
+    """
+    The rows changed by a single row signal. The same instance is shared by all
+    the consumers of the signal, so that the rows are only serialized once.
+    """
+
+    def __init__(
+        self,
+        table: Table,
+        model: Type[GeneratedTableModel],
+        rows: List[GeneratedTableModel],
+    ):
+        self.table = table
+        self.model = model
+        self.rows = rows
+        self._serialized_rows: Dict[bool, List[Dict[str, Any]]] = {}
+
+    @property
+    def row_ids(self) -> List[int]:
+        return [row.id for row in self.rows]
+
+    def get_serialized_rows(self, user_field_names: bool = False) -> List[Dict]:
+        """
+        Returns the rows serialized like in the API responses. The serialization
+        only happens the first time it's requested.
+
+        :param user_field_names: Whether the field names or the `field_{id}` keys
+            must be used.
+        :return: The serialized rows.
+        """
+
+        from baserow.contrib.database.api.rows.serializers import (
+            serialize_rows_for_response,
+        )
+
+        if user_field_names not in self._serialized_rows:
+            self._serialized_rows[user_field_names] = serialize_rows_for_response(
+                self.rows, self.model, user_field_names=user_field_names
+            )
+        return self._serialized_rows[user_field_names]
+
+
+class RowMutationBuffer:
+    """
+    Collects the consumers of consecutive row mutations of a transaction, or of a
+    savepoint within it, and dispatches all of them in a single `on_commit`
+    callback. A new buffer is started as soon as another `on_commit` callback is
+    registered, so that the consumers run in the same order relative to the other
+    callbacks as if they had registered their own. The duration of every consumer
+    is recorded in the `baserow.row_mutation_consumer_duration` histogram.
+    """
+
+    def __init__(self, immediate: bool = False, savepoint_ids: Tuple[str, ...] = ()):
+        """
+        :param immediate: Runs the consumers as soon as they're added, because
+            there is no transaction to wait for.
+        :param savepoint_ids: The ids of the savepoints the buffer belongs to.
+        """
+
+        self.immediate = immediate
+        self.savepoint_ids = savepoint_ids
+        self.mutations: List[RowsMutation] = []
+        self.consumers: List[Tuple[str, Callable[[], Any]]] = []
+
+    def get_mutation(
+        self,
+        table: Table,
+        model: Type[GeneratedTableModel],
+        rows: List[GeneratedTableModel],
+    ) -> RowsMutation:
+        """
+        Returns the mutation of the provided rows, which is the same for all the
+        receivers of a signal because they get the same list of rows.
+        """
+
+        for mutation in self.mutations:
+            if mutation.rows is rows:
+                return mutation
+
+        mutation = RowsMutation(table, model, rows)
+        self.mutations.append(mutation)
+        return mutation
+
+    def add_consumer(self, name: str, consumer: Callable[[], Any]):
+        """
+        Adds a function that must be called once the transaction has been
+        committed.
+
+        :param name: The name of the consumer used in the recorded durations.
+        :param consumer: The function to call.
+        """
+
+        if self.immediate:
+            self._run_consumer(name, consumer)
+        else:
+            self.consumers.append((name, consumer))
+
+    def flush(self):
+        consumers, self.consumers, self.mutations = self.consumers, [], []
+        for name, consumer in consumers:
+            self._run_consumer(name, consumer)
+
+    def _run_consumer(self, name: str, consumer: Callable[[], Any]):
+        start = perf_counter()
+        try:
+            consumer()
+        finally:
+            row_mutation_consumer_duration.record(
+                (perf_counter() - start) * 1000, {"consumer": name}
+            )
+
+
+def get_row_mutation_buffer() -> RowMutationBuffer:
+    """
+    Returns the buffer of the current savepoint of the transaction. The buffer is
+    stored on the connection and is only reused while its `flush` is still the last
+    registered `on_commit` callback of the same savepoint. Its consumers are
+    therefore discarded together with the savepoint when it's rolled back, and they
+    never run after a callback registered after them.
+
+    :return: The buffer collecting the consumers until the transaction commits.
+    """
+
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return RowMutationBuffer(immediate=True)
+
+    savepoint_ids = tuple(connection.savepoint_ids)
+    buffer = getattr(connection, "row_mutation_buffer", None)
+    if (
+        buffer is not None
+        and buffer.savepoint_ids == savepoint_ids
+        and connection.run_on_commit
+        and connection.run_on_commit[-1][1] == buffer.flush
+    ):
+        return buffer
+
+    buffer = RowMutationBuffer(savepoint_ids=savepoint_ids)
+    transaction.on_commit(buffer.flush)
+    connection.row_mutation_buffer = buffer
+    return buffer
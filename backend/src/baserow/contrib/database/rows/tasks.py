@@ -1,8 +1,11 @@
 from datetime import datetime, time, timedelta
 
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 
+from celery_singleton import Singleton
+
 from baserow.config.celery import app
 
 
@@ -20,6 +23,34 @@ def clean_up_row_history_entries(self):
     RowHistoryHandler.delete_entries_older_than(cutoff_datetime)
 
 
+@app.task(base=Singleton, queue="export", lock_expiry=60)
+def rebalance_row_orders_around_row(table_id: int, row_id: int):
+    """
+    Spreads the orders of the rows around the provided row, so that the intermediate
+    orders before it don't run out. Nothing happens if the table or the row has been
+    deleted in the meantime.
+
+    :param table_id: The id of the table of the row.
+    :param row_id: The id of the row around which the orders must be spread.
+    """
+
+    from baserow.contrib.database.table.exceptions import TableDoesNotExist
+    from baserow.contrib.database.table.handler import TableHandler
+
+    from .handler import RowHandler
+
+    with transaction.atomic():
+        try:
+            table = TableHandler().get_table(table_id)
+        except TableDoesNotExist:
+            return
+
+        model = table.get_model()
+        row = model.objects.filter(id=row_id).first()
+        if row is not None:
+            RowHandler().rebalance_row_orders(table, row, model)
+
+
 @app.on_after_finalize.connect
 def setup_periodic_tasks(sender, **kwargs):
     every = timedelta(minutes=settings.BASEROW_ROW_HISTORY_CLEANUP_INTERVAL_MINUTES)
@@ -4,6 +4,7 @@ from baserow.contrib.database.api.rows.serializers import (
     remap_serialized_rows_to_user_field_names,
     serialize_rows_for_response,
 )
+from baserow.contrib.database.rows.mutations import get_row_mutation_buffer
 from baserow.contrib.database.webhooks.registries import WebhookEventType
 from baserow.contrib.database.ws.rows.signals import serialize_rows_values
 
@@ -19,9 +20,33 @@ class RowsEventType(WebhookEventType):
             user_field_names=webhook.use_user_field_names,
         )
 
-    def get_payload(self, event_id, webhook, model, table, rows, **kwargs):
+    def listener(self, **kwargs: dict):
+        """
+        Calls the webhooks in the row mutation pipeline once the transaction has
+        been committed, sharing the serialized rows with the other consumers.
+        """
+
+        buffer = get_row_mutation_buffer()
+        rows_mutation = buffer.get_mutation(
+            kwargs["table"], kwargs["model"], kwargs["rows"]
+        )
+        buffer.add_consumer(
+            f"webhook_{self.type}",
+            lambda: self.listener_after_commit(rows_mutation=rows_mutation, **kwargs),
+        )
+
+    def get_payload(
+        self, event_id, webhook, model, table, rows, rows_mutation=None, **kwargs
+    ):
         payload = super().get_payload(event_id, webhook, **kwargs)
-        payload["items"] = self.get_row_serializer(webhook, model)(rows, many=True).data
+        if rows_mutation is not None:
+            payload["items"] = rows_mutation.get_serialized_rows(
+                webhook.use_user_field_names
+            )
+        else:
+            payload["items"] = self.get_row_serializer(webhook, model)(
+                rows, many=True
+            ).data
         return payload
 
 
@@ -119,6 +144,11 @@ class RowsDeletedEventType(WebhookEventType):
     type = "rows.deleted"
     signal = rows_deleted
 
+    def listener(self, **kwargs: dict):
+        get_row_mutation_buffer().add_consumer(
+            f"webhook_{self.type}", lambda: self.listener_after_commit(**kwargs)
+        )
+
     def get_payload(self, event_id, webhook, rows, **kwargs):
         payload = super().get_payload(event_id, webhook, **kwargs)
         payload["row_ids"] = [row.id for row in rows]
@@ -12,48 +12,325 @@ When we construct a model we:
 3. Check if the version in the cache matches the latest table version in the db.
 4. If they differ, re-query for all the fields and save them in the cache.
 5. If they are the same use the cached field attrs.
+
+Depending on the `BASEROW_GENERATED_MODEL_CACHE_FORMAT` setting the field attrs are
+either pickled as is (`pickle`), or only a compact snapshot of the field instances is
+stored (`snapshot`). The snapshot contains the content type and the concrete column
+values of every field and is optionally compressed. The Django model fields are then
+generated again locally from the rehydrated field instances, which keeps the cache
+entries small for wide tables.
+
+On top of that every worker process can keep a bounded in-memory LRU of the fully
+built model classes (see `GeneratedModelLRUCache`). Its keys contain the table version,
+so any version bump made by `invalidate_table_in_model_cache` automatically makes the
+old entries unreachable in every process, and the process that bumps the version also
+evicts them eagerly.
 """
+import itertools
+import pickle  # nosec
+import threading
+import time
 import typing
 import uuid
-from typing import Any, Dict, Optional
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Type
 
 from django.conf import settings
 from django.core.cache import caches
 from django.core.exceptions import ImproperlyConfigured
 
+from loguru import logger
+from opentelemetry import trace
+
 from baserow.version import VERSION as BASEROW_VERSION
 
 if typing.TYPE_CHECKING:
-    from baserow.contrib.database.table.models import Table
+    from baserow.contrib.database.fields.models import Field
+    from baserow.contrib.database.table.models import GeneratedTableModel, Table
 
 generated_models_cache = caches[settings.GENERATED_MODEL_CACHE_NAME]
 
+FIELD_ATTRS_SNAPSHOT_VERSION = 1
+SNAPSHOT_CACHE_FORMAT = "snapshot"
+SNAPSHOT_UNCOMPRESSED_PREFIX = b"r"
+SNAPSHOT_COMPRESSED_PREFIX = b"z"
+
 
 def table_model_cache_entry_key(table_id: int) -> str:
     return f"full_table_model_{table_id}_{BASEROW_VERSION}"
 
 
+def encode_field_attrs_snapshot(
+    field_attrs: Dict[str, Any], compress: bool = False
+) -> bytes:
+    """
+    Encodes the fields of the provided field attrs into a compact binary snapshot
+    containing only the content type and the concrete column values of every field,
+    instead of the deconstructed Django model fields.
+
+    :param field_attrs: The field attrs generated by the table.
+    :param compress: Whether the snapshot must be compressed.
+    :return: The encoded snapshot.
+    """
+
+    fields = [
+        (
+            field_object["field"].content_type_id,
+            [
+                getattr(field_object["field"], model_field.attname)
+                for model_field in field_object["field"]._meta.concrete_fields
+            ],
+        )
+        for field_object in itertools.chain(
+            field_attrs["_field_objects"].values(),
+            field_attrs["_trashed_field_objects"].values(),
+        )
+    ]
+    blob = pickle.dumps(
+        (FIELD_ATTRS_SNAPSHOT_VERSION, fields), protocol=pickle.HIGHEST_PROTOCOL
+    )
+
+    if compress:
+        return SNAPSHOT_COMPRESSED_PREFIX + zlib.compress(blob)
+    return SNAPSHOT_UNCOMPRESSED_PREFIX + blob
+
+
+def decode_field_attrs_snapshot(blob: bytes) -> Optional[List["Field"]]:
+    """
+    Rehydrates the specific field instances from a snapshot created by
+    `encode_field_attrs_snapshot` without querying the database.
+
+    :param blob: The encoded snapshot.
+    :return: The specific field instances or None if the snapshot has been created
+        by an incompatible version.
+    """
+
+    from django.contrib.contenttypes.models import ContentType
+
+    prefix, blob = blob[:1], blob[1:]
+    if prefix == SNAPSHOT_COMPRESSED_PREFIX:
+        blob = zlib.decompress(blob)
+
+    version, fields = pickle.loads(blob)  # nosec
+    if version != FIELD_ATTRS_SNAPSHOT_VERSION:
+        return None
+
+    field_instances = []
+    for content_type_id, values in fields:
+        model_class = ContentType.objects.get_for_id(content_type_id).model_class()
+        field_names = [f.attname for f in model_class._meta.concrete_fields]
+        field_instances.append(model_class.from_db(None, field_names, values))
+    return field_instances
+
+
 def get_cached_model_field_attrs(table: "Table") -> Optional[Dict[str, Any]]:
     cache_key = table_model_cache_entry_key(table.id)
     cache_entry = generated_models_cache.get(cache_key)
 
-    if cache_entry and cache_entry["version"] == table.version:
+    if not cache_entry or cache_entry["version"] != table.version:
+        return None
+
+    if "snapshot" not in cache_entry:
         return cache_entry["field_attrs"]
-    else:
+
+    start = time.perf_counter()
+    fields = decode_field_attrs_snapshot(cache_entry["snapshot"])
+    if fields is None:
         return None
 
+    field_attrs = table._fetch_and_generate_field_attrs(
+        add_dependencies=True,
+        attribute_names=False,
+        field_ids=[],
+        field_names=None,
+        fields=fields,
+        filtered=False,
+    )
+    decode_time = time.perf_counter() - start
+
+    span = trace.get_current_span()
+    span.set_attribute(
+        "baserow.generated_model_cache.blob_size", len(cache_entry["snapshot"])
+    )
+    span.set_attribute("baserow.generated_model_cache.decode_time", decode_time)
+    logger.debug(
+        "Rehydrated {} fields of table {} from a {} bytes snapshot in {:.4f}s.",
+        len(fields),
+        table.id,
+        len(cache_entry["snapshot"]),
+        decode_time,
+    )
+    return field_attrs
+
 
 def set_cached_model_field_attrs(table: "Table", field_attrs: Dict[str, Any]):
     cache_key = table_model_cache_entry_key(table.id)
-    generated_models_cache.set(
-        cache_key,
-        {"field_attrs": field_attrs, "version": table.version},
-        timeout=None,
-    )
+
+    if settings.BASEROW_GENERATED_MODEL_CACHE_FORMAT == SNAPSHOT_CACHE_FORMAT:
+        snapshot = encode_field_attrs_snapshot(
+            field_attrs, compress=settings.BASEROW_GENERATED_MODEL_CACHE_COMPRESSION
+        )
+        trace.get_current_span().set_attribute(
+            "baserow.generated_model_cache.blob_size", len(snapshot)
+        )
+        cache_entry = {"snapshot": snapshot, "version": table.version}
+    else:
+        cache_entry = {"field_attrs": field_attrs, "version": table.version}
+
+    generated_models_cache.set(cache_key, cache_entry, timeout=None)
+
+
+class GeneratedModelLRUCache:
+    """
+    A thread safe, bounded, per process cache of generated table model classes. Every
+    entry is stored together with the versions of all the tables whose models were
+    generated while building it (the table itself and the related tables of link row
+    fields), so that an entry can be validated against the database before it's
+    returned.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self._max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is None:
+            return settings.BASEROW_IN_PROCESS_MODEL_CACHE_SIZE
+        return self._max_size
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(
+        self, key: Hashable
+    ) -> Optional[Tuple[Type["GeneratedTableModel"], Dict[int, str]]]:
+        """
+        Returns the cached model and the table versions it has been built with, or
+        None if the key is not in the cache.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(
+        self,
+        key: Hashable,
+        model: Type["GeneratedTableModel"],
+        table_versions: Dict[int, str],
+    ):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[key] = (model, table_versions)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self.evictions += 1
+                logger.debug("Evicted generated model {} from the LRU.", evicted_key)
+
+    def discard(self, key: Hashable):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def invalidate_table(self, table_id: int):
+        """
+        Removes all the models of the provided table and all the models that
+        contain a related model of the provided table.
+        """
+
+        with self._lock:
+            for key, (_, table_versions) in list(self._entries.items()):
+                if table_id in table_versions:
+                    del self._entries[key]
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+local_generated_models_cache = GeneratedModelLRUCache()
+
+
+def get_local_cached_model(
+    table: "Table", key: Hashable
+) -> Optional[Type["GeneratedTableModel"]]:
+    """
+    Returns the model class from the in process LRU if all the tables it has been
+    generated with still have the same version. The `table.version` must be up to
+    date when calling this function.
+
+    :param table: The table that the model must be returned for.
+    :param key: The key identifying the model, must include the table version.
+    :return: The cached model or None if there is no valid cached model.
+    """
+
+    if settings.BASEROW_DISABLE_MODEL_CACHE or not local_generated_models_cache.enabled:
+        return None
+
+    entry = local_generated_models_cache.get(key)
+    if entry is None:
+        return None
+
+    model, table_versions = entry
+    related_table_ids = [
+        table_id for table_id in table_versions.keys() if table_id != table.id
+    ]
+    if related_table_ids:
+        from baserow.contrib.database.table.models import Table
+
+        current_versions = dict(
+            Table.objects_and_trash.filter(id__in=related_table_ids).values_list(
+                "id", "version"
+            )
+        )
+        current_versions[table.id] = table.version
+        if current_versions != table_versions:
+            local_generated_models_cache.discard(key)
+            return None
+
+    return model
+
+
+def set_local_cached_model(
+    key: Hashable, model: Type["GeneratedTableModel"], table_versions: Dict[int, str]
+):
+    if settings.BASEROW_DISABLE_MODEL_CACHE:
+        return
+
+    local_generated_models_cache.set(key, model, table_versions)
 
 
 def clear_generated_model_cache():
     print("Clearing Baserow's internal generated model cache...")
+    local_generated_models_cache.clear()
     if hasattr(generated_models_cache, "delete_pattern"):
         generated_models_cache.delete_pattern("full_table_model_*")
     elif settings.TESTS:
@@ -70,6 +347,8 @@ def invalidate_table_in_model_cache(table_id: int):
     if settings.BASEROW_DISABLE_MODEL_CACHE:
         return None
 
+    local_generated_models_cache.invalidate_table(table_id)
+
     new_version = str(uuid.uuid4())
     # Make sure to invalidate ourselves and any directly connected tables.
     from baserow.contrib.database.table.models import Table
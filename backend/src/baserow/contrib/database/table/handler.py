@@ -1,14 +1,18 @@
+import time
 import traceback
-from typing import Any, Dict, List, NewType, Optional, Tuple, cast
+import uuid
+from typing import Any, Dict, Iterable, List, NewType, Optional, Tuple, cast
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.core.cache import cache
 from django.db import DatabaseError, transaction
 from django.db.models import F, Q, QuerySet, Sum
-from django.db.models.functions import Coalesce, Now
+from django.db.models.functions import Coalesce, Greatest, Now
 from django.utils import translation
 from django.utils.translation import gettext as _
 
+from loguru import logger
 from opentelemetry import trace
 
 from baserow.contrib.database.db.schema import safe_django_schema_editor
@@ -315,6 +319,96 @@ class TableHandler(metaclass=baserow_trace_methods(tracer)):
             database__workspace__trashed=False,
         )
 
+    def get_recently_used_tables(self, count: int) -> QuerySet[Table]:
+        """
+        Returns the tables that have most recently been used. The most recent row
+        change tracked by the table usage, the last row count update and the last
+        modification of the table itself are considered as activity. Bigger tables
+        come first in case of a tie.
+
+        :param count: The maximum number of tables to return.
+        :return: A queryset containing the most recently used tables.
+        """
+
+        return (
+            self.get_tables()
+            .filter(database__workspace__template__isnull=True)
+            .annotate(
+                last_activity=Greatest(
+                    "usage_update__timestamp",
+                    "usage__row_count_updated_at",
+                    "updated_on",
+                )
+            )
+            .order_by(
+                F("last_activity").desc(nulls_last=True),
+                F("usage__row_count").desc(nulls_last=True),
+                "id",
+            )[:count]
+        )
+
+    def warm_up_models(
+        self, count: Optional[int] = None, time_budget: Optional[float] = None
+    ) -> Tuple[int, float]:
+        """
+        Generates the models and the row response serializers of the most recently
+        used tables, so that they're available in the model caches before the first
+        request hits the worker. The warm-up is skipped if the in process model cache
+        is disabled, because the generated models wouldn't be kept.
+
+        :param count: The maximum number of tables to warm up. Defaults to the
+            `BASEROW_MODEL_WARM_UP_TABLE_COUNT` setting.
+        :param time_budget: The maximum number of seconds to spend. The table
+            currently being warmed up is always finished. Defaults to the
+            `BASEROW_MODEL_WARM_UP_TIME_BUDGET_SECONDS` setting.
+        :return: The number of warmed up tables and the time it took in seconds.
+        """
+
+        from baserow.contrib.database.api.rows.serializers import (
+            RowSerializer,
+            get_row_serializer_class,
+        )
+        from baserow.contrib.database.table.cache import local_generated_models_cache
+
+        if count is None:
+            count = settings.BASEROW_MODEL_WARM_UP_TABLE_COUNT
+        if time_budget is None:
+            time_budget = settings.BASEROW_MODEL_WARM_UP_TIME_BUDGET_SECONDS
+
+        if count <= 0:
+            return 0, 0.0
+
+        if not local_generated_models_cache.enabled:
+            logger.warning(
+                "Skipping the table models warm-up because the in process model cache "
+                "is disabled. Set BASEROW_IN_PROCESS_MODEL_CACHE_SIZE to enable it."
+            )
+            return 0, 0.0
+
+        start = time.perf_counter()
+        warmed_up = 0
+        for table in self.get_recently_used_tables(count):
+            if time.perf_counter() - start > time_budget:
+                break
+
+            try:
+                model = table.get_model()
+                for user_field_names in [False, True]:
+                    get_row_serializer_class(
+                        model,
+                        RowSerializer,
+                        is_response=True,
+                        user_field_names=user_field_names,
+                    )
+            except Exception:  # nosec
+                logger.exception(f"Failed to warm up the model of table {table.id}.")
+                continue
+            warmed_up += 1
+
+        duration = time.perf_counter() - start
+        logger.info("Warmed up {} table models in {:.2f} seconds.", warmed_up, duration)
+        return warmed_up, duration
+
     def list_workspace_tables(
         self, user: AbstractUser, workspace, include_trashed=False, base_queryset=None
     ) -> QuerySet[Table]:
@@ -398,6 +492,67 @@ class TableHandler(metaclass=baserow_trace_methods(tracer)):
             else:
                 raise e
 
+    def _get_change_token_cache_key(self, table_id: int, kind: str) -> str:
+        """
+        Returns the cache key of the change token of the specified kind.
+        """
+
+        return f"table_{kind}_change_token__{table_id}"
+
+    def get_change_tokens(self, table_id: int) -> Tuple[str, str]:
+        """
+        Returns the rows and the metadata change tokens of the table. The rows token
+        changes every time the rows of the table change and the metadata token every
+        time a field or a view of the table changes. Together with the table version,
+        they can be used to find out if a response based on the table has changed.
+
+        A missing token is replaced by a new random one instead of a counter, so that
+        a token evicted from the cache never matches a previously returned one.
+
+        :param table_id: The id of the table to get the tokens for.
+        :return: A tuple containing the rows and the metadata change token.
+        """
+
+        keys = [
+            self._get_change_token_cache_key(table_id, kind)
+            for kind in ("rows", "metadata")
+        ]
+        tokens = cache.get_many(keys)
+        for key in keys:
+            if key not in tokens:
+                token = uuid.uuid4().hex
+                if not cache.add(key, token, timeout=None):
+                    token = cache.get(key, token)
+                tokens[key] = token
+        return tokens[keys[0]], tokens[keys[1]]
+
+    def bump_change_tokens(
+        self, table_ids: Iterable[int], rows: bool = True, metadata: bool = False
+    ):
+        """
+        Replaces the change tokens of the provided tables, so that responses computed
+        before the change are not considered up to date anymore. Must be called after
+        the transaction making the change has been committed, otherwise a concurrent
+        request could still compute a response based on the old data with the new
+        token.
+
+        :param table_ids: The ids of the tables that have changed.
+        :param rows: Whether the rows change token must be replaced.
+        :param metadata: Whether the metadata change token must be replaced.
+        """
+
+        kinds = [
+            kind for kind, bump in (("rows", rows), ("metadata", metadata)) if bump
+        ]
+        cache.set_many(
+            {
+                self._get_change_token_cache_key(table_id, kind): uuid.uuid4().hex
+                for table_id in set(table_ids)
+                for kind in kinds
+            },
+            timeout=None,
+        )
+
     def get_tables_order(self, database: Database) -> List[int]:
         """
         Returns the tables in the database ordered by the order field.
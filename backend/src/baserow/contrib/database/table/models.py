@@ -1,9 +1,10 @@
 import itertools
+import json
 import re
 import uuid
 from collections import defaultdict
 from types import MethodType
-from typing import Generator, Iterable, List, Optional, Type, TypedDict
+from typing import Generator, Iterable, List, Optional, Tuple, Type, TypedDict
 
 from django.apps import apps
 from django.conf import settings
@@ -11,7 +12,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.postgres.indexes import GinIndex
 from django.contrib.postgres.search import SearchQuery, SearchVectorField
 from django.core.exceptions import FieldDoesNotExist as DjangoFieldDoesNotExist
-from django.db import models
+from django.db import connection, models
 from django.db.models import Field as DjangoModelFieldClass
 from django.db.models import JSONField, Q, QuerySet, Value
 
@@ -40,7 +41,10 @@ from baserow.contrib.database.fields.utils import get_field_id_from_field_key
 from baserow.contrib.database.search.handler import SearchHandler, SearchModes
 from baserow.contrib.database.table.cache import (
     get_cached_model_field_attrs,
+    get_local_cached_model,
+    local_generated_models_cache,
     set_cached_model_field_attrs,
+    set_local_cached_model,
 )
 from baserow.contrib.database.table.constants import (
     CREATED_BY_COLUMN_NAME,
@@ -51,7 +55,11 @@ from baserow.contrib.database.table.constants import (
 )
 from baserow.contrib.database.views.exceptions import ViewFilterTypeNotAllowedForField
 from baserow.contrib.database.views.registries import view_filter_type_registry
-from baserow.core.db import MultiFieldPrefetchQuerysetMixin, specific_iterator
+from baserow.core.db import (
+    CombinedManyToManyMultipleFieldPrefetch,
+    MultiFieldPrefetchQuerysetMixin,
+    specific_iterator,
+)
 from baserow.core.fields import AutoTrueBooleanField
 from baserow.core.jobs.mixins import (
     JobWithUndoRedoIds,
@@ -160,7 +168,67 @@ class TableModelQuerySet(MultiFieldPrefetchQuerysetMixin, models.QuerySet):
         with cachalot_enabled():
             return super().count()
 
-    def enhance_by_fields(self):
+    def estimated_count(
+        self, exact_threshold: Optional[int] = None
+    ) -> Tuple[int, bool]:
+        """
+        Returns an estimation of the number of rows in the queryset, without scanning
+        the table. If the queryset isn't filtered, the maintained table usage row
+        count or the Postgres statistics of the table are used. Otherwise, the number
+        of rows estimated by the query planner is used. If the estimation is lower
+        than the `exact_threshold`, the exact count is cheap enough to be computed.
+
+        :param exact_threshold: Below this number of estimated rows, the exact count
+            is returned. Defaults to `BASEROW_ESTIMATED_COUNT_EXACT_THRESHOLD`.
+        :return: A tuple containing the count and whether it's an estimation.
+        """
+
+        if exact_threshold is None:
+            exact_threshold = settings.BASEROW_ESTIMATED_COUNT_EXACT_THRESHOLD
+
+        if self.query.where == self.model.objects.all().query.where:
+            estimate = self._get_unfiltered_row_count_estimate()
+        else:
+            estimate = self._get_planner_row_count_estimate()
+
+        if estimate is None or estimate < exact_threshold:
+            return self.count(), False
+
+        return estimate, True
+
+    def _get_unfiltered_row_count_estimate(self) -> Optional[int]:
+        table_usage = TableUsage.objects.filter(
+            table_id=self.model.baserow_table_id
+        ).first()
+        if table_usage is not None and table_usage.row_count is not None:
+            return table_usage.row_count
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [self.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+
+        # A negative value means that the table has never been analyzed.
+        if row is None or row[0] < 0:
+            return None
+        return row[0]
+
+    def _get_planner_row_count_estimate(self) -> Optional[int]:
+        sql, params = self.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)  # nosec
+            plan = cursor.fetchone()[0]
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        try:
+            return int(plan[0]["Plan"]["Plan Rows"])
+        except (IndexError, KeyError, TypeError, ValueError):
+            return None
+
+    def enhance_by_fields(self, combine_many_to_many_prefetches=None):
         """
         Enhances the queryset based on the `enhance_queryset_in_bulk` for each unique
         field type used in the table. This one will eventually call the
@@ -168,13 +236,35 @@ class TableModelQuerySet(MultiFieldPrefetchQuerysetMixin, models.QuerySet):
         field adds the `prefetch_related` to prevent N queries per row. This helper
         should only be used when multiple rows are going to be fetched.
 
+        :param combine_many_to_many_prefetches: If True, the relationships of all the
+            fields supporting it, like the `link_row` fields, are prefetched in one
+            query instead of one query per field. Defaults to the
+            `BASEROW_COMBINED_MANY_TO_MANY_PREFETCH` setting.
         :return: The enhanced queryset.
         :rtype: QuerySet
         """
 
+        if combine_many_to_many_prefetches is None:
+            combine_many_to_many_prefetches = (
+                settings.BASEROW_COMBINED_MANY_TO_MANY_PREFETCH
+            )
+
         by_type = defaultdict(list)
+        combined_prefetch = None
         for field_object in self.model._field_objects.values():
             field_type = field_object["type"]
+            if combine_many_to_many_prefetches:
+                target_queryset = field_type.get_combined_prefetch_queryset(
+                    self.model, field_object["field"], field_object["name"]
+                )
+                if target_queryset is not None:
+                    if combined_prefetch is None:
+                        combined_prefetch = CombinedManyToManyMultipleFieldPrefetch()
+                        self = self.multi_field_prefetch(combined_prefetch)
+                    combined_prefetch.add_field_name(
+                        field_object["name"], target_queryset
+                    )
+                    continue
             by_type[field_type].append(field_object)
         for field_type, field_objects in by_type.items():
             self = field_type.enhance_queryset_in_bulk(self, field_objects)
@@ -927,6 +1017,7 @@ class Table(
         use_cache=True,
         force_add_tsvectors: bool = False,
         app_label: Optional[str] = None,
+        projected: bool = False,
     ) -> Type[GeneratedTableModel]:
         """
         Generates a temporary Django model based on available fields that belong to
@@ -965,10 +1056,44 @@ class Table(
             have the same app_label. If passed along in this parameter, then the
             generated model will use that one instead of generating a unique one.
         :type app_label: Optional[String]
+        :param projected: Indicates that the caller only needs to read the fields
+            provided via `field_ids` or `field_names`. The related models of link row
+            fields will then only contain their primary field, because that's the
+            only value needed to prefetch and serialize the relationships. If no
+            `field_ids` and `field_names` are provided, only the primary field is
+            added to the model.
+        :type projected: bool
         :return: The generated model.
         :rtype: Model
         """
 
+        # Fully built models can only be reused when they're not part of another
+        # model generation process and don't depend on runtime provided fields.
+        local_cache_key = None
+        version_refreshed = False
+        if (
+            use_cache
+            and not fields
+            and not manytomany_models
+            and app_label is None
+            and local_generated_models_cache.enabled
+            and not settings.BASEROW_DISABLE_MODEL_CACHE
+        ):
+            self.refresh_from_db(fields=["version"])
+            version_refreshed = True
+            local_cache_key = self._get_local_model_cache_key(
+                field_ids,
+                field_names,
+                attribute_names,
+                add_dependencies,
+                managed,
+                force_add_tsvectors,
+                projected,
+            )
+            model = get_local_cached_model(self, local_cache_key)
+            if model is not None:
+                return model
+
         if app_label is None:
             # Generate a unique app_label to make the generation of the model thread
             # safe. Related fields generate pending operations in the `apps`
@@ -977,7 +1102,7 @@ class Table(
             # executed in a wrong order. A unique app_label isolated in that case.
             app_label = str(uuid.uuid4()) + "_database_table"
 
-        filtered = field_names is not None or field_ids is not None
+        filtered = field_names is not None or field_ids is not None or projected
         model_name = self.get_table_model_name(self.pk)
 
         if fields is None:
@@ -1028,6 +1153,9 @@ class Table(
             "__module__": "database.models",
             # An indication that the model is a generated table model.
             "_generated_table_model": True,
+            # Indicates that the model and its related models only contain the fields
+            # needed to read the projected fields.
+            "_projected_model": projected,
             "baserow_table": self,
             "baserow_table_id": self.id,
             "baserow_models": apps.baserow_models,
@@ -1042,13 +1170,15 @@ class Table(
             use_cache
             and len(fields) == 0
             and field_ids is None
+            and not projected
             and add_dependencies is True
             and attribute_names is False
             and not settings.BASEROW_DISABLE_MODEL_CACHE
         )
 
         if use_cache:
-            self.refresh_from_db(fields=["version"])
+            if not version_refreshed:
+                self.refresh_from_db(fields=["version"])
             field_attrs = get_cached_model_field_attrs(self)
         else:
             field_attrs = None
@@ -1061,6 +1191,7 @@ class Table(
                 field_names,
                 fields,
                 filtered,
+                projected,
             )
 
             if use_cache:
@@ -1128,8 +1259,45 @@ class Table(
         if not manytomany_models:
             self._after_model_generation(attrs, model)
 
+        if local_cache_key is not None:
+            table_versions = {
+                m.baserow_table_id: m.baserow_table.version
+                for m in apps.baserow_models.values()
+                if getattr(m, "baserow_table_id", None) is not None
+            }
+            table_versions[self.id] = self.version
+            set_local_cached_model(local_cache_key, model, table_versions)
+
         return model
 
+    def _get_local_model_cache_key(
+        self,
+        field_ids,
+        field_names,
+        attribute_names,
+        add_dependencies,
+        managed,
+        force_add_tsvectors,
+        projected,
+    ) -> tuple:
+        """
+        Returns the key used to store the generated model in the in process LRU
+        cache. It contains the table version so that a changed table never resolves
+        to a stale model.
+        """
+
+        return (
+            self.id,
+            self.version,
+            tuple(sorted(field_ids)) if field_ids is not None else None,
+            tuple(sorted(field_names)) if field_names is not None else None,
+            attribute_names,
+            add_dependencies,
+            managed,
+            force_add_tsvectors,
+            projected,
+        )
+
     def _add_search_tsvector_fields_to_model(self, field_attrs, indexes, force_add):
         field_objects = field_attrs["_field_objects"]
         trashed_field_objects = field_attrs["_trashed_field_objects"]
@@ -1200,6 +1368,7 @@ class Table(
         field_names,
         fields,
         filtered,
+        projected=False,
     ):
         field_attrs = {
             "_primary_field_id": -1,
@@ -1234,6 +1403,11 @@ class Table(
             else:
                 fields_query = fields_query.filter(name__in=field_names)
 
+        # A projection without any explicitly requested fields only needs the
+        # primary field, for example to serialize the value of a link row field.
+        if projected and field_ids is None and field_names is None:
+            fields_query = fields_query.filter(primary=True)
+
         if isinstance(fields_query, QuerySet):
             fields_query = specific_iterator(fields_query)
 
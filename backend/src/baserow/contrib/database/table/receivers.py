@@ -3,31 +3,48 @@ from django.dispatch import receiver
 
 from baserow.contrib.database.application_types import DatabaseApplicationType
 from baserow.contrib.database.fields.models import FileField
-from baserow.contrib.database.fields.signals import field_deleted, field_restored
+from baserow.contrib.database.fields.signals import (
+    field_created,
+    field_deleted,
+    field_restored,
+    field_updated,
+)
+from baserow.contrib.database.rows.mutations import get_row_mutation_buffer
 from baserow.contrib.database.rows.signals import (
+    before_rows_delete,
+    row_orders_recalculated,
     rows_created,
     rows_deleted,
     rows_updated,
 )
-from baserow.contrib.database.table.signals import table_created, table_deleted
+from baserow.contrib.database.table.signals import (
+    table_created,
+    table_deleted,
+    table_updated,
+)
+from baserow.contrib.database.views import signals as view_signals
+from baserow.contrib.database.views.handler import ViewHandler
 from baserow.core.registries import application_type_registry
 from baserow.core.signals import application_created
 
+from .handler import TableHandler
 from .tasks import create_tables_usage_for_new_database, update_table_usage
 
 
 # Rows signals for row count
 @receiver(rows_created)
 def on_rows_created(sender, rows, before, user, table, **kwargs):
-    transaction.on_commit(
-        lambda: update_table_usage.delay(table.id, row_count=len(rows))
+    get_row_mutation_buffer().add_consumer(
+        "table_usage",
+        lambda: update_table_usage.delay(table.id, row_count=len(rows)),
     )
 
 
 @receiver(rows_deleted)
 def on_rows_deleted(sender, rows, user, table, **kwargs):
-    transaction.on_commit(
-        lambda: update_table_usage.delay(table.id, row_count=-len(rows))
+    get_row_mutation_buffer().add_consumer(
+        "table_usage",
+        lambda: update_table_usage.delay(table.id, row_count=-len(rows)),
     )
 
 
@@ -41,10 +58,135 @@ def on_rows_updated(
     for field_object in model.get_field_objects():
         field = field_object["field"]
         if isinstance(field, FileField) and field.id in updated_field_ids:
-            transaction.on_commit(lambda: update_table_usage.delay(table.id))
+            get_row_mutation_buffer().add_consumer(
+                "table_usage", lambda: update_table_usage.delay(table.id)
+            )
             break
 
 
+# Rows signals for the cached view row counts
+@receiver(rows_created)
+def on_rows_created_adjust_view_row_counts(
+    sender, rows, before, user, table, model, **kwargs
+):
+    view_handler = ViewHandler()
+    matches = view_handler.get_cached_view_row_count_matches(table, model, rows)
+    if matches:
+        get_row_mutation_buffer().add_consumer(
+            "view_row_counts",
+            lambda: view_handler.adjust_view_row_counts(matches, 1),
+        )
+
+
+@receiver(before_rows_delete)
+def on_before_rows_delete_match_view_row_counts(
+    sender, rows, user, table, model, **kwargs
+):
+    # The rows must be checked against the view filters before they're trashed.
+    return ViewHandler().get_cached_view_row_count_matches(table, model, rows)
+
+
+@receiver(rows_deleted)
+def on_rows_deleted_adjust_view_row_counts(
+    sender, rows, user, table, model, before_return, **kwargs
+):
+    matches = dict(before_return).get(on_before_rows_delete_match_view_row_counts)
+    if matches:
+        get_row_mutation_buffer().add_consumer(
+            "view_row_counts",
+            lambda: ViewHandler().adjust_view_row_counts(matches, -1),
+        )
+
+
+@receiver(rows_updated)
+def on_rows_updated_clear_view_row_counts(
+    sender, rows, user, table, model, before_return, updated_field_ids, **kwargs
+):
+    # Rows might have entered or left the views filtering on the updated fields.
+    updated_fields = [
+        field_object["field"]
+        for field_object in model.get_field_objects()
+        if field_object["field"].id in updated_field_ids
+    ]
+    if updated_fields:
+        get_row_mutation_buffer().add_consumer(
+            "view_row_counts",
+            lambda: ViewHandler().clear_view_row_count_cache_for_fields(updated_fields),
+        )
+
+
+# Signals for the change tokens used in the ETags
+@receiver([rows_created, rows_updated, rows_deleted, row_orders_recalculated])
+def on_rows_changed_bump_change_tokens(sender, table, **kwargs):
+    get_row_mutation_buffer().add_consumer(
+        "change_tokens", lambda: TableHandler().bump_change_tokens([table.id])
+    )
+
+
+@receiver(table_updated)
+def on_table_updated_bump_change_tokens(
+    sender, table, force_table_refresh=False, **kwargs
+):
+    # A forced refresh means that the cell values of the table have changed, for
+    # example because of a periodic update of a formula.
+    if force_table_refresh:
+        transaction.on_commit(lambda: TableHandler().bump_change_tokens([table.id]))
+
+
+@receiver([field_created, field_updated, field_deleted, field_restored])
+def on_field_changed_bump_change_tokens(sender, field, related_fields=None, **kwargs):
+    # The related fields can be in other tables, where cell values might have
+    # changed as well.
+    table_ids = [field.table_id] + [f.table_id for f in related_fields or []]
+    transaction.on_commit(
+        lambda: TableHandler().bump_change_tokens(table_ids, metadata=True)
+    )
+
+
+@receiver(
+    [
+        view_signals.view_created,
+        view_signals.view_updated,
+        view_signals.view_deleted,
+        view_signals.views_reordered,
+        view_signals.view_field_options_updated,
+        view_signals.view_filter_created,
+        view_signals.view_filter_updated,
+        view_signals.view_filter_deleted,
+        view_signals.view_filter_group_created,
+        view_signals.view_filter_group_updated,
+        view_signals.view_filter_group_deleted,
+        view_signals.view_sort_created,
+        view_signals.view_sort_updated,
+        view_signals.view_sort_deleted,
+        view_signals.view_group_by_created,
+        view_signals.view_group_by_updated,
+        view_signals.view_group_by_deleted,
+        view_signals.view_decoration_created,
+        view_signals.view_decoration_updated,
+        view_signals.view_decoration_deleted,
+    ]
+)
+def on_view_changed_bump_change_tokens(sender, **kwargs):
+    if "table" in kwargs:
+        table_id = kwargs["table"].id
+    elif "view" in kwargs:
+        table_id = kwargs["view"].table_id
+    else:
+        # The other view signals are about an object related to a view, like a
+        # `view_filter` or a `view_sort`.
+        view_object = next(
+            value
+            for name, value in kwargs.items()
+            if name.startswith("view_") and hasattr(value, "view")
+        )
+        table_id = view_object.view.table_id
+
+    transaction.on_commit(
+        lambda: TableHandler().bump_change_tokens([table_id], rows=False, metadata=True)
+    )
+
+
 # Table signals for row count
 @receiver(table_created)
 def on_table_created(sender, table, user, **kwargs):
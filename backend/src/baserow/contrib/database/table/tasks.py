@@ -1,7 +1,9 @@
 from collections import defaultdict
 
-from django.db import transaction
+from django.conf import settings
+from django.db import connections, transaction
 
+from celery.signals import worker_process_init
 from loguru import logger
 
 from baserow.config.celery import app
@@ -185,3 +187,14 @@ def create_tables_usage_for_new_database(self, database_id: int):
     from baserow.contrib.database.table.handler import TableUsageHandler
 
     TableUsageHandler.create_tables_usage_for_new_database(database_id)
+
+
+@worker_process_init.connect
+def warm_up_table_models(**kwargs):
+    if settings.BASEROW_MODEL_WARM_UP_TABLE_COUNT > 0:
+        from baserow.contrib.database.table.handler import TableHandler
+
+        TableHandler().warm_up_models()
+        # The connections opened during the warm-up must not be shared with the
+        # threads handling the actual work.
+        connections.close_all()
@@ -466,6 +466,11 @@ class RowsTrashableItemType(TrashableItemType):
             # Use table signal here instead of row signal because we don't want
             # to send too many ids in the signal
             table_updated.send(self, table=table, user=None, force_table_refresh=True)
+            # Without the rows created signal the cached view row counts can't be
+            # adjusted, so they're recomputed instead.
+            ViewHandler().clear_view_row_count_cache(
+                table.view_set.values_list("id", flat=True)
+            )
 
     def trash(self, item_to_trash, requesting_user, trash_entry: TrashEntry):
         """
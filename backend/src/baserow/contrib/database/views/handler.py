@@ -31,7 +31,7 @@ from baserow.contrib.database.fields.field_filters import (
     FilterBuilder,
 )
 from baserow.contrib.database.fields.field_sortings import OptionallyAnnotatedOrderBy
-from baserow.contrib.database.fields.models import Field
+from baserow.contrib.database.fields.models import Field, LinkRowField
 from baserow.contrib.database.fields.operations import ReadFieldOperationType
 from baserow.contrib.database.fields.registries import field_type_registry
 from baserow.contrib.database.rows.handler import RowHandler
@@ -114,6 +114,7 @@ from .exceptions import (
     ViewFilterDoesNotExist,
     ViewFilterGroupDoesNotExist,
     ViewFilterNotSupported,
+    ViewFilterTypeDoesNotExist,
     ViewFilterTypeNotAllowedForField,
     ViewGroupByDoesNotExist,
     ViewGroupByFieldAlreadyExist,
@@ -1304,6 +1305,10 @@ class ViewHandler(metaclass=baserow_trace_methods(tracer)):
         for view_type in view_type_registry.get_all():
             view_type.after_field_value_update(updated_fields)
 
+        self.clear_view_row_count_cache_for_fields(
+            updated_fields, only_indirectly_updated=True
+        )
+
     def field_updated(self, updated_fields: Union[Iterable[Field], Field]):
         """
         Called for each field modification. This include indirect modification when
@@ -1321,6 +1326,8 @@ class ViewHandler(metaclass=baserow_trace_methods(tracer)):
         for view_type in view_type_registry.get_all():
             view_type.after_field_update(updated_fields)
 
+        self.clear_view_row_count_cache_for_fields(updated_fields)
+
         for field in updated_fields:
             field_type = field_type_registry.get_by_model(field.specific_class)
             # Check whether the updated field is still compatible with the group by.
@@ -2645,6 +2652,226 @@ class ViewHandler(metaclass=baserow_trace_methods(tracer)):
                 # No cache key, we create one
                 cache.set(cache_key, 2)
 
+    def _get_row_count_version_cache_key(self, view_id: int) -> str:
+        """
+        Returns the row count version cache key for the specified view id.
+        """
+
+        return f"view_row_count_version__{view_id}"
+
+    def _get_row_count_value_cache_key(
+        self, view: View, version: int, filters_signature: str
+    ) -> str:
+        """
+        Returns the row count value cache key for the specified view, version and
+        filters signature. The signature is part of the key so that the cached count
+        is automatically ignored when the filters of the view change.
+        """
+
+        return f"view_row_count_value__{view.pk}_{version}_{filters_signature}"
+
+    def view_filters_depend_on_current_time(self, view: View) -> bool:
+        """
+        Returns whether the rows matching the filters of the view can change only
+        because time passes, for example because a filter compares with today. Unknown
+        filter types are considered to depend on the current time.
+        """
+
+        if view.filters_disabled:
+            return False
+
+        for view_filter in view.viewfilter_set.all():
+            try:
+                filter_type = view_filter_type_registry.get(view_filter.type)
+            except ViewFilterTypeDoesNotExist:
+                return True
+            if filter_type.depends_on_current_time:
+                return True
+        return False
+
+    def _get_row_count_filters_signature(self, view: View) -> Optional[str]:
+        """
+        Returns a short hash of the filters of the view, or None if the row count
+        of the view can't be cached because one of the filters depends on the
+        current time.
+        """
+
+        if view.filters_disabled:
+            return "all"
+
+        if self.view_filters_depend_on_current_time(view):
+            return None
+
+        signature = [view.filter_type]
+        for view_filter in view.viewfilter_set.all():
+            signature.append(
+                (
+                    view_filter.group_id,
+                    view_filter.field_id,
+                    view_filter.type,
+                    view_filter.value,
+                )
+            )
+        for filter_group in view.filter_groups.all():
+            signature.append(
+                (
+                    filter_group.id,
+                    filter_group.filter_type,
+                    filter_group.parent_group_id,
+                )
+            )
+
+        return shake_128(repr(signature).encode("utf-8")).hexdigest(8)
+
+    def get_view_row_count(self, view: View, queryset: QuerySet) -> int:
+        """
+        Returns the number of rows in the provided queryset. The count is cached per
+        view and kept up to date when rows are created or deleted, so that it doesn't
+        have to be recomputed every time a busy view is opened. The queryset must
+        contain exactly the rows of the view, so without search or adhoc filters.
+
+        :param view: The view the queryset is based on.
+        :param queryset: The filtered queryset of the view.
+        :return: The number of rows in the view.
+        """
+
+        timeout = settings.BASEROW_VIEW_ROW_COUNT_CACHE_TIMEOUT
+        signature = None
+        if timeout > 0:
+            signature = self._get_row_count_filters_signature(view)
+
+        if signature is None:
+            return queryset.count()
+
+        version = cache.get(self._get_row_count_version_cache_key(view.pk), 1)
+        value_cache_key = self._get_row_count_value_cache_key(view, version, signature)
+        count = cache.get(value_cache_key)
+        if count is None:
+            count = queryset.count()
+            cache.add(value_cache_key, count, timeout=timeout)
+
+        return count
+
+    def get_cached_view_row_count_matches(
+        self, table: Table, model: GeneratedTableModel, rows: List[Any]
+    ) -> Dict[str, int]:
+        """
+        Checks for every view of the table having a cached row count how many of the
+        provided rows match the filters of the view. The result can be passed to
+        `adjust_view_row_counts` once the rows have been created or deleted.
+
+        :param table: The table the rows belong to.
+        :param model: The model of the table including all fields.
+        :param rows: The rows that are created or about to be deleted.
+        :return: A dict where the key is the row count value cache key and the value
+            the number of rows matching the filters of the view.
+        """
+
+        if settings.BASEROW_VIEW_ROW_COUNT_CACHE_TIMEOUT <= 0 or len(rows) == 0:
+            return {}
+
+        views = list(
+            table.view_set.prefetch_related("viewfilter_set", "filter_groups").all()
+        )
+        versions = cache.get_many(
+            [self._get_row_count_version_cache_key(view.pk) for view in views]
+        )
+        value_cache_keys = {}
+        for view in views:
+            signature = self._get_row_count_filters_signature(view)
+            if signature is None:
+                continue
+            version = versions.get(self._get_row_count_version_cache_key(view.pk), 1)
+            value_cache_keys[view] = self._get_row_count_value_cache_key(
+                view, version, signature
+            )
+
+        cached = cache.get_many(list(value_cache_keys.values()))
+        row_ids = [row.id for row in rows]
+        matches = {}
+        for view, value_cache_key in value_cache_keys.items():
+            # Views without a cached count will be counted when they're requested.
+            if value_cache_key not in cached:
+                continue
+
+            if view.filters_disabled or len(view.viewfilter_set.all()) == 0:
+                matches[value_cache_key] = len(row_ids)
+            else:
+                filter_qs = self.apply_filters(view, model.objects)
+                matches[value_cache_key] = filter_qs.filter(id__in=row_ids).count()
+
+        return matches
+
+    def adjust_view_row_counts(self, matches: Dict[str, int], sign: int):
+        """
+        Increments or decrements the cached view row counts by the number of matching
+        rows computed by `get_cached_view_row_count_matches`.
+
+        :param matches: The matches returned by `get_cached_view_row_count_matches`.
+        :param sign: 1 if the rows have been created, -1 if they have been deleted.
+        """
+
+        for value_cache_key, count in matches.items():
+            if count == 0:
+                continue
+            try:
+                cache.incr(value_cache_key, sign * count)
+            except ValueError:
+                # The count has expired or has been invalidated in the meantime, it
+                # will be recomputed the next time it's requested.
+                pass
+
+    def clear_view_row_count_cache(self, view_ids: Iterable[int]):
+        """
+        Increments the row count version in cache for the specified views, forcing
+        their row count to be recomputed the next time it's requested.
+        """
+
+        for view_id in view_ids:
+            cache_key = self._get_row_count_version_cache_key(view_id)
+            try:
+                cache.incr(cache_key, 1)
+            except ValueError:
+                # No cache key, we create one
+                cache.set(cache_key, 2)
+
+    def clear_view_row_count_cache_for_fields(
+        self, fields: Iterable[Field], only_indirectly_updated: bool = False
+    ):
+        """
+        Invalidates the cached row count of the views filtering on one of the
+        provided fields, because the values of these fields have changed and rows
+        might have entered or left these views.
+
+        :param fields: The fields of which the values have changed.
+        :param only_indirectly_updated: If True, only the fields of which the values
+            can change without the row itself being created, updated or deleted are
+            considered, like formula, lookup or link row fields. The other changes are
+            already taken into account by the row signals.
+        """
+
+        if settings.BASEROW_VIEW_ROW_COUNT_CACHE_TIMEOUT <= 0:
+            return
+
+        field_ids = []
+        for field in fields:
+            specific_class = field.specific_class
+            if (
+                not only_indirectly_updated
+                or field_type_registry.get_by_model(specific_class).read_only
+                or issubclass(specific_class, LinkRowField)
+            ):
+                field_ids.append(field.id)
+        if len(field_ids) == 0:
+            return
+
+        view_ids = (
+            ViewFilter.objects.filter(field_id__in=field_ids)
+            .values_list("view_id", flat=True)
+            .distinct()
+        )
+        self.clear_view_row_count_cache(view_ids)
+
     def _get_aggregations_to_compute(
         self,
         view: View,
@@ -3259,6 +3486,34 @@ class ViewHandler(metaclass=baserow_trace_methods(tracer)):
         except jwt.InvalidTokenError:
             return False
 
+    def get_public_view_field_ids_to_generate(
+        self, view: View, view_type: Optional[ViewType] = None
+    ) -> List[int]:
+        """
+        Returns the ids of the fields that must be present in the table model to
+        compute the publicly visible rows of the provided view. These are the
+        visible fields and the fields that the view is filtered on, because the
+        filters of hidden fields must still be applied.
+
+        :param view: The public view to get the field ids for.
+        :param view_type: The view_type which can be passed if it's already
+            instantiated.
+        :return: A list of field ids.
+        """
+
+        if view_type is None:
+            view_type = view_type_registry.get_by_model(view)
+
+        field_ids = {
+            o.field_id for o in view_type.get_visible_field_options_in_order(view)
+        }
+        if not view.filters_disabled:
+            field_ids |= set(
+                ViewFilter.objects.filter(view=view).values_list("field_id", flat=True)
+            )
+
+        return list(field_ids)
+
     def get_public_rows_queryset_and_field_ids(
         self,
         view: View,
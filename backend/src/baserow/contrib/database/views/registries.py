@@ -874,6 +874,14 @@ class ViewFilterType(Instance):
     checked and returns True if compatible or False if not.
     """
 
+    depends_on_current_time: bool = False
+    """
+    Indicates whether the rows matching the filter can change over time without the
+    rows or the filter being modified, for example because the filter compares with
+    today's date. The cached row count of views using such a filter can't be
+    maintained incrementally.
+    """
+
     def default_filter_on_exception(self):
         """The default Q to use when the filter value is of an incompatible type."""
 
@@ -429,6 +429,7 @@ class TimezoneAwareDateViewFilterType(ViewFilterType):
         CreatedOnFieldType.type,
         FormulaFieldType.compatible_with_formula_types(BaserowFormulaDateType.type),
     ]
+    depends_on_current_time = True
 
     def is_empty_filter(self, filter_value: str) -> bool:
         return filter_value == DATE_FILTER_EMPTY_VALUE
@@ -1625,6 +1626,7 @@ class DateMultiStepViewFilterType(ViewFilterType):
         CreatedOnFieldType.type,
         FormulaFieldType.compatible_with_formula_types(BaserowFormulaDateType.type),
     ]
+    depends_on_current_time = True
 
     incompatible_operators = []
 
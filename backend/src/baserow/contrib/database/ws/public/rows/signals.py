@@ -1,6 +1,5 @@
 from typing import Any, Dict, List, Optional
 
-from django.db import transaction
 from django.dispatch import receiver
 
 from opentelemetry import trace
@@ -8,6 +7,7 @@ from opentelemetry import trace
 from baserow.contrib.database.api.constants import PUBLIC_PLACEHOLDER_ENTITY_ID
 from baserow.contrib.database.api.rows.serializers import serialize_rows_for_response
 from baserow.contrib.database.rows import signals as row_signals
+from baserow.contrib.database.rows.mutations import get_row_mutation_buffer
 from baserow.contrib.database.table.models import GeneratedTableModel
 from baserow.contrib.database.views.handler import PublicViewRows, ViewHandler
 from baserow.contrib.database.views.registries import view_type_registry
@@ -92,9 +92,12 @@ def public_rows_created(
     row_checker = ViewHandler().get_public_views_row_checker(
         table, model, only_include_views_which_want_realtime_events=True
     )
-    transaction.on_commit(
+    buffer = get_row_mutation_buffer()
+    mutation = buffer.get_mutation(table, model, rows)
+    buffer.add_consumer(
+        "ws_public_rows_created",
         lambda: _send_rows_created_event_to_views(
-            serialize_rows_for_response(rows, model),
+            mutation.get_serialized_rows(),
             before,
             row_checker.get_public_views_where_rows_are_visible(rows),
         ),
@@ -103,7 +106,12 @@ def public_rows_created(
 
 @receiver(row_signals.before_rows_delete)
 @baserow_trace(tracer)
-def public_before_rows_delete(sender, rows, user, table, model, **kwargs):
+def public_before_rows_delete(
+    sender, rows, user, table, model, send_realtime_update=True, **kwargs
+):
+    if not send_realtime_update:
+        return None
+
     row_checker = ViewHandler().get_public_views_row_checker(
         table, model, only_include_views_which_want_realtime_events=True
     )
@@ -117,15 +125,30 @@ def public_before_rows_delete(sender, rows, user, table, model, **kwargs):
 
 @receiver(row_signals.rows_deleted)
 @baserow_trace(tracer)
-def public_rows_deleted(sender, rows, user, table, model, before_return, **kwargs):
+def public_rows_deleted(
+    sender,
+    rows,
+    user,
+    table,
+    model,
+    before_return,
+    send_realtime_update=True,
+    **kwargs,
+):
+    if not send_realtime_update:
+        return
+
     public_views = dict(before_return)[public_before_rows_delete][
         "deleted_rows_public_views"
     ]
     serialized_deleted_rows = dict(before_return)[public_before_rows_delete][
         "deleted_rows"
     ]
-    transaction.on_commit(
-        lambda: _send_rows_deleted_event_to_views(serialized_deleted_rows, public_views)
+    get_row_mutation_buffer().add_consumer(
+        "ws_public_rows_deleted",
+        lambda: _send_rows_deleted_event_to_views(
+            serialized_deleted_rows, public_views
+        ),
     )
 
 
@@ -155,7 +178,8 @@ def public_rows_updated(
 ):
     before_return_dict = dict(before_return)[public_before_rows_update]
     serialized_old_rows = dict(before_return)[serialize_rows_values]
-    serialized_updated_rows = serialize_rows_for_response(rows, model)
+    buffer = get_row_mutation_buffer()
+    mutation = buffer.get_mutation(table, model, rows)
 
     old_row_public_views: List[PublicViewRows] = before_return_dict[
         "old_rows_public_views"
@@ -234,6 +258,7 @@ def public_rows_updated(
 
     @baserow_trace(tracer)
     def _send_created_updated_deleted_row_signals_to_views():
+        serialized_updated_rows = mutation.get_serialized_rows()
         _send_rows_deleted_event_to_views(
             serialized_old_rows, public_views_where_rows_were_deleted
         )
@@ -263,4 +288,6 @@ def public_rows_updated(
                 slug=public_view.slug,
             )
 
-    transaction.on_commit(_send_created_updated_deleted_row_signals_to_views)
+    buffer.add_consumer(
+        "ws_public_rows_updated", _send_created_updated_deleted_row_signals_to_views
+    )
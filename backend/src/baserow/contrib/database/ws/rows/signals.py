@@ -10,6 +10,7 @@ from baserow.contrib.database.api.rows.serializers import (
     serialize_rows_for_response,
 )
 from baserow.contrib.database.rows import signals as row_signals
+from baserow.contrib.database.rows.mutations import get_row_mutation_buffer
 from baserow.contrib.database.rows.registries import row_metadata_registry
 from baserow.contrib.database.table.models import GeneratedTableModel
 from baserow.ws.registries import page_registry
@@ -38,21 +39,22 @@ def rows_created(
         return
 
     table_page_type = page_registry.get("table")
-    transaction.on_commit(
+    buffer = get_row_mutation_buffer()
+    mutation = buffer.get_mutation(table, model, rows)
+    buffer.add_consumer(
+        "ws_rows_created",
         lambda: table_page_type.broadcast(
             RealtimeRowMessages.rows_created(
                 table_id=table.id,
-                serialized_rows=get_row_serializer_class(
-                    model, RowSerializer, is_response=True
-                )(rows, many=True).data,
+                serialized_rows=mutation.get_serialized_rows(),
                 metadata=row_metadata_registry.generate_and_merge_metadata_for_rows(
-                    user, table, [row.id for row in rows]
+                    user, table, mutation.row_ids
                 ),
                 before=before,
             ),
             getattr(user, "web_socket_id", None),
             table_id=table.id,
-        )
+        ),
     )
 
 
@@ -69,21 +71,22 @@ def rows_updated(
 ):
     table_page_type = page_registry.get("table")
     before_rows_values = dict(before_return)[serialize_rows_values]
-    transaction.on_commit(
+    buffer = get_row_mutation_buffer()
+    mutation = buffer.get_mutation(table, model, rows)
+    buffer.add_consumer(
+        "ws_rows_updated",
         lambda: table_page_type.broadcast(
             RealtimeRowMessages.rows_updated(
                 table_id=table.id,
                 serialized_rows_before_update=before_rows_values,
-                serialized_rows=get_row_serializer_class(
-                    model, RowSerializer, is_response=True
-                )(rows, many=True).data,
+                serialized_rows=mutation.get_serialized_rows(),
                 metadata=row_metadata_registry.generate_and_merge_metadata_for_rows(
-                    user, table, [row.id for row in rows]
+                    user, table, mutation.row_ids
                 ),
             ),
             getattr(user, "web_socket_id", None),
             table_id=table.id,
-        )
+        ),
     )
 
 
@@ -108,16 +111,34 @@ def rows_ai_values_generation_error(
 
 
 @receiver(row_signals.before_rows_delete)
-def before_rows_delete(sender, rows, user, table, model, **kwargs):
+def before_rows_delete(
+    sender, rows, user, table, model, send_realtime_update=True, **kwargs
+):
+    if not send_realtime_update:
+        return None
+
     return get_row_serializer_class(model, RowSerializer, is_response=True)(
         rows, many=True
     ).data
 
 
 @receiver(row_signals.rows_deleted)
-def rows_deleted(sender, rows, user, table, model, before_return, **kwargs):
+def rows_deleted(
+    sender,
+    rows,
+    user,
+    table,
+    model,
+    before_return,
+    send_realtime_update=True,
+    **kwargs,
+):
+    if not send_realtime_update:
+        return
+
     table_page_type = page_registry.get("table")
-    transaction.on_commit(
+    get_row_mutation_buffer().add_consumer(
+        "ws_rows_deleted",
         lambda: table_page_type.broadcast(
             RealtimeRowMessages.rows_deleted(
                 table_id=table.id,
@@ -125,7 +146,7 @@ def rows_deleted(sender, rows, user, table, model, before_return, **kwargs):
             ),
             getattr(user, "web_socket_id", None),
             table_id=table.id,
-        )
+        ),
     )
 
 
@@ -1,5 +1,7 @@
 import contextlib
+import io
 from collections import defaultdict
+from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 from functools import cache
 from math import ceil
@@ -20,7 +22,7 @@ from typing import (
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.db import DEFAULT_DB_ALIAS, connection, transaction
-from django.db.models import ForeignKey, ManyToManyField, Max, Model, QuerySet
+from django.db.models import Field, ForeignKey, ManyToManyField, Max, Model, Q, QuerySet
 from django.db.models.functions import Collate
 from django.db.models.sql.query import LOOKUP_SEP
 from django.db.transaction import Atomic, get_connection
@@ -408,6 +410,72 @@ def recalculate_full_orders(
         cursor.execute(sql_query)
 
 
+def rebalance_orders_around_item(
+    item: Model,
+    queryset: QuerySet,
+    window_size: int = 50,
+    min_step: Decimal = Decimal("0.001"),
+    field: str = "order",
+) -> bool:
+    """
+    Spreads the orders of the `window_size` items before and after the provided
+    `item` evenly between the orders of the items surrounding that window, so that
+    intermediate orders can be found again without recalculating the orders of all
+    the items. The orders are spread with a power of ten step, which keeps them
+    short, and the window is widened when the surrounding items are too close to
+    each other for a step of at least `min_step`.
+
+    :param item: The item around which the orders must be spread.
+    :param queryset: The queryset containing all the items that are ordered
+        together.
+    :param window_size: The number of items before and after the `item` that are
+        initially part of the window.
+    :param min_step: The minimum difference between the orders of the window.
+    :param field: The order field name.
+    :return: False if there is no room to spread the orders in the widest window,
+        in which case the full orders must be recalculated.
+    """
+
+    order = getattr(item, field)
+    before = queryset.filter(
+        Q(**{f"{field}__lt": order}) | Q(**{field: order, "id__lt": item.id})
+    ).order_by(f"-{field}", "-id")
+    after = queryset.filter(
+        Q(**{f"{field}__gt": order}) | Q(**{field: order, "id__gte": item.id})
+    ).order_by(field, "id")
+
+    for size in (window_size, window_size * 4, window_size * 16):
+        lower_items = list(before.values_list("id", field)[: size + 1])
+        upper_items = list(after.values_list("id", field)[: size + 1])
+        window = lower_items[:size][::-1] + upper_items[:size]
+
+        lower = lower_items[size][1] if len(lower_items) > size else Decimal("0")
+        if len(upper_items) > size:
+            spacing = (upper_items[size][1] - lower) / (len(window) + 1)
+            if spacing <= 0:
+                continue
+            step = Decimal(1).scaleb(min(0, spacing.adjusted()))
+        else:
+            # Nothing comes after the window, so there is room for whole numbers.
+            step = Decimal(1)
+
+        if step < min_step:
+            continue
+
+        first = (lower // step + 1) * step
+        values_bulk_update(
+            queryset.model,
+            [
+                queryset.model(id=item_id, **{field: first + step * index})
+                for index, (item_id, _) in enumerate(window)
+            ],
+            [field],
+        )
+        return True
+
+    return False
+
+
 @cache
 def get_collation_name() -> Optional[str]:
     """
@@ -444,6 +512,214 @@ def collate_expression(expression):
     return Collate(expression, coll_name) if coll_name else expression
 
 
+def fetch_sequence_values(sequence_name: str, amount: int) -> List[int]:
+    """
+    Reserves the provided amount of values of a sequence in a single query. This can
+    be used to know the ids of rows before they're inserted.
+
+    :param sequence_name: The name of the sequence, optionally schema qualified.
+    :param amount: The number of values to reserve.
+    :return: The reserved values in ascending order.
+    """
+
+    if amount <= 0:
+        return []
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(%s::regclass) FROM generate_series(1, %s)",
+            [sequence_name, amount],
+        )
+        return sorted(value for (value,) in cursor.fetchall())
+
+
+def get_primary_key_sequence_name(model: Model) -> Optional[str]:
+    """
+    Returns the name of the sequence generating the primary keys of the model, which
+    can either be a serial or an identity column.
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_get_serial_sequence(%s, %s)",
+            [
+                connection.ops.quote_name(model._meta.db_table),
+                model._meta.pk.column,
+            ],
+        )
+        return cursor.fetchone()[0]
+
+
+_COPY_TEXT_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "\n": "\\n", "\r": "\\r", "\t": "\\t"}
+)
+
+
+def _copy_array_element(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, (list, tuple)):
+        return "{" + ",".join(_copy_array_element(v) for v in value) + "}"
+    text = _copy_text_value(value)
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _copy_text_value(value: Any) -> str:
+    """
+    Converts a value prepared by `Field.get_db_prep_save` into the text
+    representation PostgreSQL expects for the column, without escaping.
+    """
+
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return (
+            f"{value.days} days {value.seconds} seconds "
+            f"{value.microseconds} microseconds"
+        )
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\x" + bytes(value).hex()
+    if isinstance(value, (list, tuple)):
+        return "{" + ",".join(_copy_array_element(v) for v in value) + "}"
+    if hasattr(value, "adapted") and hasattr(value, "dumps"):
+        # A psycopg2 `Json` adapter.
+        return value.dumps(value.adapted)
+    return str(value)
+
+
+def _encode_copy_row(values: Iterable[Any]) -> str:
+    return (
+        "\t".join(
+            "\\N"
+            if value is None
+            else _copy_text_value(value).translate(_COPY_TEXT_ESCAPES)
+            for value in values
+        )
+        + "\n"
+    )
+
+
+def copy_bulk_create(
+    model: Model, objs: List[Model], exclude: Iterable[str] = ()
+) -> List[Model]:
+    """
+    Inserts the provided instances with a single `COPY ... FROM STDIN` statement,
+    which is considerably faster than the `INSERT` executed by `bulk_create` for
+    large amounts of rows. The values are prepared like Django does when inserting
+    an instance, but nothing is returned by the database, so values generated by the
+    database, like the primary key, must be set on the instances beforehand if
+    they're needed. The primary key column is left out if none of the instances have
+    one, so that the database generates it.
+
+    :param model: The model of the instances.
+    :param objs: The unsaved instances to insert.
+    :param exclude: The names of fields that must not be inserted, so that they get
+        the default value of the column.
+    :raises ValueError: When the value of a field is an SQL expression, because it
+        can't be copied.
+    :return: The inserted instances.
+    """
+
+    if not objs:
+        return objs
+
+    exclude = set(exclude)
+    fields: List[Field] = [
+        field
+        for field in model._meta.local_concrete_fields
+        if field.name not in exclude
+        and not (
+            field.primary_key
+            and all(getattr(obj, field.attname) is None for obj in objs)
+        )
+    ]
+
+    buffer = io.StringIO()
+    for obj in objs:
+        values = []
+        for field in fields:
+            value = field.pre_save(obj, add=True)
+            if hasattr(value, "resolve_expression"):
+                raise ValueError(
+                    f"The value of {field.name} is an SQL expression which can't be "
+                    f"inserted with COPY."
+                )
+            values.append(field.get_db_prep_save(value, connection))
+        buffer.write(_encode_copy_row(values))
+    buffer.seek(0)
+
+    quote_name = connection.ops.quote_name
+    copy_sql = "COPY {table} ({columns}) FROM STDIN".format(
+        table=quote_name(model._meta.db_table),
+        columns=", ".join(quote_name(field.column) for field in fields),
+    )
+    with connection.cursor() as cursor:
+        cursor.copy_expert(copy_sql, buffer)
+
+    for obj in objs:
+        obj._state.adding = False
+        obj._state.db = connection.alias
+    return objs
+
+
+def values_bulk_update(model: Model, objs: List[Model], fields: Iterable[str]) -> int:
+    """
+    Updates the provided fields of the instances with a single
+    `UPDATE ... FROM (VALUES ...)` statement. Compared to `bulk_update`, which
+    generates a `CASE WHEN` expression with a branch per instance for every column,
+    PostgreSQL plans and executes it a lot faster when many rows and columns are
+    updated at once. Every value is cast to the type of its column because the types
+    of the `VALUES` columns would otherwise be inferred as text.
+
+    :param model: The model of the instances.
+    :param objs: The instances having the new values.
+    :param fields: The names of the fields that must be updated.
+    :raises ValueError: When the value of a field is an SQL expression, because it
+        can't be part of the `VALUES` list.
+    :return: The number of updated rows.
+    """
+
+    if not objs:
+        return 0
+
+    pk_field = model._meta.pk
+    columns: List[Field] = [pk_field] + [model._meta.get_field(name) for name in fields]
+
+    params = []
+    for obj in objs:
+        for field in columns:
+            value = getattr(obj, field.attname)
+            if hasattr(value, "resolve_expression"):
+                raise ValueError(
+                    f"The value of {field.name} is an SQL expression which can't be "
+                    f"part of a VALUES list."
+                )
+            params.append(field.get_db_prep_save(value, connection))
+
+    quote_name = connection.ops.quote_name
+    row_placeholder = "({})".format(
+        ", ".join(f"%s::{field.cast_db_type(connection)}" for field in columns)
+    )
+    update_sql = (
+        "UPDATE {table} SET {assignments} FROM (VALUES {values}) AS v ({columns}) "
+        "WHERE {table}.{pk} = v.{pk}"
+    ).format(
+        table=quote_name(model._meta.db_table),
+        assignments=", ".join(
+            f"{quote_name(field.column)} = v.{quote_name(field.column)}"
+            for field in columns[1:]
+        ),
+        values=", ".join([row_placeholder] * len(objs)),
+        columns=", ".join(quote_name(field.column) for field in columns),
+        pk=quote_name(pk_field.column),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(update_sql, params)
+        return cursor.rowcount
+
+
 class MultiFieldPrefetchQuerysetMixin(Generic[ModelInstance]):
     """
     This mixin introduces a `multi_field_prefetch` method that can be used to
@@ -794,3 +1070,103 @@ class CombinedForeignKeyAndManyToManyMultipleFieldPrefetch:
                 row_id_to_field_name_to_target_ids[result[0]][result[1]] = result[2]
 
         return row_id_to_field_name_to_target_ids
+
+
+class CombinedManyToManyMultipleFieldPrefetch(
+    CombinedForeignKeyAndManyToManyMultipleFieldPrefetch
+):
+    """
+    This prefetch class can be used as argument of the `multi_field_prefetch` method.
+    Contrary to the `CombinedForeignKeyAndManyToManyMultipleFieldPrefetch`, the many
+    to many fields can have different target models. The related ids of all the
+    fields are fetched in one single query, and the target instances with one query
+    per target model, instead of one query per field when using `prefetch_related`.
+
+    Example:
+
+    results = list(
+        model
+        .objects.all()
+        .multi_field_prefetch(
+            CombinedManyToManyMultipleFieldPrefetch()
+            .add_field_name("field_1", RelatedModel.objects.all())
+            .add_field_name("field_2", OtherRelatedModel.objects.only("id"))
+        )
+    )
+
+    results[0].field_1.all()  # is prefetched
+    results[0].field_2.all()  # is prefetched
+    """
+
+    def __init__(self):
+        super().__init__(target_model=None, skip_target_check=True)
+        self.target_querysets: Dict[str, QuerySet] = {}
+
+    def add_field_name(self, field_name: str, target_queryset: QuerySet):
+        """
+        Adds a many to many field to the prefetch.
+
+        :param field_name: The name of the many to many field.
+        :param target_queryset: The queryset used to fetch the related instances.
+            Fields having the same target model share the queryset of the first
+            added field.
+        :return: Self to allow chaining.
+        """
+
+        self.field_names.add(field_name)
+        self.target_querysets[field_name] = target_queryset
+        return self
+
+    def __call__(self, queryset: QuerySet, result_set: List[ModelInstance]):
+        row_id_to_field_name_to_target_ids = self.collect_many_to_many_key_target_ids(
+            queryset, result_set, defaultdict(lambda: defaultdict(list))
+        )
+
+        # Fields having the same target model share the same query.
+        target_ids_per_model = defaultdict(set)
+        target_queryset_per_model = {}
+        for target_queryset in self.target_querysets.values():
+            target_queryset_per_model.setdefault(target_queryset.model, target_queryset)
+        for field_names in row_id_to_field_name_to_target_ids.values():
+            for field_name, target_ids in field_names.items():
+                target_model = self.target_querysets[field_name].model
+                target_ids_per_model[target_model].update(target_ids)
+
+        target_instances_per_model = {}
+        for target_model, target_ids in target_ids_per_model.items():
+            target_queryset = target_queryset_per_model[target_model]
+            target_instances_per_model[target_model] = {
+                instance.id: (position, instance)
+                for position, instance in enumerate(
+                    target_queryset.filter(id__in=target_ids)
+                )
+            }
+
+        for result in result_set:
+            result._prefetched_objects_cache = getattr(
+                result, "_prefetched_objects_cache", {}
+            )
+            for field_name, target_queryset in self.target_querysets.items():
+                target_instances = target_instances_per_model.get(
+                    target_queryset.model, {}
+                )
+                target_ids = row_id_to_field_name_to_target_ids[result.id].get(
+                    field_name, []
+                )
+                # It could be that the target doesn't exist or is filtered out by the
+                # target queryset. In that case, it must not be in the result set.
+                found = [
+                    target_instances[target_id]
+                    for target_id in target_ids
+                    if target_id in target_instances
+                ]
+                # Like with `prefetch_related`, the related instances are in the order
+                # of the target queryset.
+                found.sort(key=lambda position_and_instance: position_and_instance[0])
+
+                qs = getattr(result, field_name).get_queryset()
+                qs._result_cache = [instance for _, instance in found]
+                qs._prefetch_done = True
+                result._prefetched_objects_cache[field_name] = qs
+
+        return result_set
@@ -0,0 +1,83 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from django.conf import settings
+
+from opentelemetry import metrics
+
+meter = metrics.get_meter(__name__)
+formula_cache_hits_counter = meter.create_counter(
+    "baserow.formula_cache_hits",
+    unit="1",
+    description="The number of formulas found in a compiled formula cache, by cache.",
+)
+formula_cache_misses_counter = meter.create_counter(
+    "baserow.formula_cache_misses",
+    unit="1",
+    description="The number of formulas that had to be compiled because they were not "
+    "found in a compiled formula cache, by cache.",
+)
+
+
+class FormulaLRUCache:
+    """
+    A thread safe, bounded, per process cache of compiled formulas, like parse trees
+    or typed expressions. The cached values are shared by all the callers, so they
+    must never be modified after they have been created.
+    """
+
+    def __init__(self, name: str, max_size: Optional[int] = None):
+        self.name = name
+        self._max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is None:
+            return settings.BASEROW_FORMULA_CACHE_SIZE
+        return self._max_size
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get_or_compile(self, key: Hashable, compile_value: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value of the key, or compiles and caches it if it's not in
+        the cache yet. Exceptions raised while compiling are not cached.
+
+        :param key: The formula and everything else the compiled value depends on.
+        :param compile_value: A function that compiles the value if needed.
+        :return: The compiled value.
+        """
+
+        if not self.enabled:
+            return compile_value()
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                formula_cache_hits_counter.add(1, {"cache": self.name})
+                return self._entries[key]
+            self.misses += 1
+
+        formula_cache_misses_counter.add(1, {"cache": self.name})
+        value = compile_value()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
@@ -2,6 +2,7 @@ from antlr4 import CommonTokenStream, InputStream
 from antlr4.BufferedTokenStream import BufferedTokenStream
 from antlr4.error.ErrorListener import ErrorListener
 
+from baserow.core.formula.cache import FormulaLRUCache
 from baserow.core.formula.parser.exceptions import BaserowFormulaSyntaxError
 from baserow.core.formula.parser.generated.BaserowFormula import BaserowFormula
 from baserow.core.formula.parser.generated.BaserowFormulaLexer import (
@@ -30,12 +31,21 @@ def get_token_stream_for_formula(formula: str) -> BufferedTokenStream:
     return stream
 
 
+# The parse trees are only ever visited and never modified, so the same tree can be
+# shared by all the callers parsing the same formula.
+parse_tree_cache = FormulaLRUCache("parse_tree")
+
+
 def get_parse_tree_for_formula(formula: str):
     """
     WARNING: This function is directly used by migration code. Please ensure
     backwards compatibility .
     """
 
+    return parse_tree_cache.get_or_compile(formula, lambda: _parse_formula(formula))
+
+
+def _parse_formula(formula: str):
     lexer = BaserowFormulaLexer(InputStream(formula))
     stream = CommonTokenStream(lexer)
     parser = BaserowFormula(stream)
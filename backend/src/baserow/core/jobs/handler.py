@@ -213,6 +213,8 @@ class JobHandler:
         limit_date = timezone.now() - timezone.timedelta(
             seconds=(settings.BASEROW_JOB_SOFT_TIME_LIMIT + 1)
         )
+        for job_type in job_type_registry.get_all():
+            job_type.before_jobs_expire(limit_date)
 
         (
             Job.objects.filter(created_on__lte=limit_date)
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Any, Dict
 
 from django.contrib.auth.models import AbstractUser
@@ -90,6 +91,29 @@ class JobType(
 
         raise NotImplementedError("The run method must be implemented.")
 
+    def finishes_asynchronously(self, job: AnyJob) -> bool:
+        """
+        Indicates whether the job continues in other tasks after the `run` method has
+        returned, for example when the work has been split into chunks that are
+        processed concurrently. If True, the job isn't marked as finished when the
+        `run` method returns and the other tasks are responsible for setting its
+        final state.
+
+        :param job: the specific instance of the related job instance
+        :return: Whether the job will be finished by other tasks.
+        """
+
+        return False
+
+    def before_jobs_expire(self, limit_date: datetime):
+        """
+        Called by the periodic clean up before the jobs created before the limit date
+        that are still pending or running are marked as failed. Job types that
+        continue in other tasks can use it to clean up after those tasks.
+
+        :param limit_date: The jobs created before this date are about to expire.
+        """
+
     def before_delete(self, job):
         """
         If a job type need to do something before a job deletion, can be done here.
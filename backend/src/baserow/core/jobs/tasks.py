@@ -33,10 +33,11 @@ def run_async_job(self, job_id: int):
         with job_type.transaction_atomic_context(job):
             JobHandler().run(job)
 
-        job.state = JOB_FINISHED
-        # Don't override the other properties that have been set during the
-        # progress update.
-        job.save(update_fields=("state",))
+        if not job_type.finishes_asynchronously(job):
+            job.state = JOB_FINISHED
+            # Don't override the other properties that have been set during the
+            # progress update.
+            job.save(update_fields=("state",))
     except BaseException as e:  # We also want to catch SystemExit exception here.
         error = f"Something went wrong during the {job_type.type} job execution."
 
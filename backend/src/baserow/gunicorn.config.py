@@ -3,3 +3,18 @@ from baserow.core.telemetry.telemetry import setup_telemetry
 
 def post_fork(server, worker):
     setup_telemetry(add_django_instrumentation=True)
+
+
+def post_worker_init(worker):
+    # The application is loaded at this point, so the models of the most recently
+    # used tables can be generated before the worker accepts requests.
+    from django.conf import settings
+    from django.db import connections
+
+    if settings.BASEROW_MODEL_WARM_UP_TABLE_COUNT > 0:
+        from baserow.contrib.database.table.handler import TableHandler
+
+        TableHandler().warm_up_models()
+        # The connections opened during the warm-up must not be shared with the
+        # threads handling the actual work.
+        connections.close_all()
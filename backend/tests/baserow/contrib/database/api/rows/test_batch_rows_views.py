@@ -2172,3 +2172,55 @@ def test_batch_delete_rows_num_of_queries(api_client, data_fixture):
     assert len(delete_one_row_ctx.captured_queries) == len(
         delete_multiple_rows_ctx.captured_queries
     )
+
+
+# Upsert
+
+
+@pytest.mark.django_db
+@pytest.mark.api_rows
+def test_batch_upsert_rows(api_client, data_fixture):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    key_field = data_fixture.create_text_field(table=table, name="Key", primary=True)
+    number_field = data_fixture.create_number_field(table=table, name="Number")
+    model = table.get_model()
+    existing_row = model.objects.create(
+        **{key_field.db_column: "a", number_field.db_column: 1}
+    )
+    url = reverse("api:database:rows:batch-upsert", kwargs={"table_id": table.id})
+
+    response = api_client.post(
+        f"{url}?key_field_id={key_field.id}&user_field_names",
+        {"items": [{"Key": "a", "Number": 10}, {"Key": "b", "Number": 20}]},
+        format="json",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+
+    assert response.status_code == HTTP_200_OK
+    response_json = response.json()
+    assert response_json["updated_row_ids"] == [existing_row.id]
+    assert len(response_json["created_row_ids"]) == 1
+    assert list(
+        model.objects.order_by("id").values_list(
+            key_field.db_column, number_field.db_column
+        )
+    ) == [("a", 10), ("b", 20)]
+
+    response = api_client.post(
+        f"{url}?key_field_id={key_field.id}",
+        {"items": [{key_field.db_column: "c"}, {key_field.db_column: "c"}]},
+        format="json",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json()["error"] == "ERROR_UPSERT_KEY_VALUES_NOT_UNIQUE"
+
+    response = api_client.post(
+        f"{url}?key_field_id=99999",
+        {"items": [{key_field.db_column: "c"}]},
+        format="json",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_404_NOT_FOUND
+    assert response.json()["error"] == "ERROR_FIELD_DOES_NOT_EXIST"
@@ -1,13 +1,20 @@
 import json
 
+from django.test.utils import override_settings
+
+import orjson
 import pytest
 from rest_framework import serializers
+from rest_framework.utils.encoders import JSONEncoder
 
 from baserow.contrib.database.api.rows.serializers import (
+    RowEncoder,
     RowSerializer,
     get_example_row_serializer_class,
+    get_row_encoder,
     get_row_serializer_class,
     remap_serialized_row_to_user_field_names,
+    row_serializer_class_cache,
 )
 from baserow.contrib.database.fields.handler import FieldHandler
 from baserow.contrib.database.fields.models import SelectOption
@@ -430,3 +437,105 @@ def test_remap_serialized_row_to_user_field_names(data_fixture):
         "Link": [{"id": 1, "value": "Lookup 1"}],
         "Test 1": "Test value",
     }
+
+
+@pytest.mark.django_db
+def test_get_row_serializer_class_is_cached_per_table_version_and_arguments(
+    data_fixture,
+):
+    row_serializer_class_cache.clear()
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user, name="Cars")
+    text_field = data_fixture.create_text_field(table=table, name="Color")
+    number_field = data_fixture.create_number_field(table=table, name="Horsepower")
+
+    model = table.get_model()
+    serializer_class = get_row_serializer_class(model, RowSerializer, is_response=True)
+    assert serializer_class is get_row_serializer_class(
+        model, RowSerializer, is_response=True
+    )
+    assert serializer_class is not get_row_serializer_class(
+        model, RowSerializer, is_response=False
+    )
+    assert serializer_class is not get_row_serializer_class(
+        model, RowSerializer, is_response=True, user_field_names=True
+    )
+    assert get_row_serializer_class(
+        model, field_ids=[text_field.id, number_field.id]
+    ) is get_row_serializer_class(model, field_ids=[number_field.id, text_field.id])
+
+    field_kwargs = {text_field.db_column: {"required": True}}
+    kwargs_serializer_class = get_row_serializer_class(model, field_kwargs=field_kwargs)
+    assert kwargs_serializer_class is get_row_serializer_class(
+        model, field_kwargs={text_field.db_column: {"required": True}}
+    )
+    assert field_kwargs == {text_field.db_column: {"required": True}}
+
+    # The models generated again for the same table version reuse the serializer.
+    assert serializer_class is get_row_serializer_class(
+        table.get_model(), RowSerializer, is_response=True
+    )
+
+    FieldHandler().update_field(user, text_field, name="Paint")
+    table.refresh_from_db()
+    new_serializer_class = get_row_serializer_class(
+        table.get_model(), RowSerializer, is_response=True, user_field_names=True
+    )
+    assert new_serializer_class is not serializer_class
+    assert "Paint" in new_serializer_class().fields
+
+
+@pytest.mark.django_db
+@override_settings(BASEROW_IN_PROCESS_MODEL_CACHE_SIZE=0)
+def test_row_serializer_class_cache_hits_without_the_in_process_model_cache(
+    data_fixture,
+):
+    row_serializer_class_cache.clear()
+    table = data_fixture.create_database_table(name="Cars")
+    data_fixture.create_text_field(table=table, name="Color")
+
+    for _ in range(3):
+        get_row_serializer_class(table.get_model(), RowSerializer, is_response=True)
+
+    assert row_serializer_class_cache.misses == 1
+    assert row_serializer_class_cache.hits == 2
+
+
+@pytest.mark.django_db
+@override_settings(BASEROW_ROW_SERIALIZER_CACHE_SIZE=1)
+def test_row_serializer_class_cache_is_bounded(data_fixture):
+    row_serializer_class_cache.clear()
+    table = data_fixture.create_database_table(name="Cars")
+    data_fixture.create_text_field(table=table, name="Color")
+    model = table.get_model()
+
+    serializer_class = get_row_serializer_class(model, RowSerializer, is_response=True)
+    get_row_serializer_class(model, RowSerializer, is_response=False)
+
+    assert serializer_class is not get_row_serializer_class(
+        model, RowSerializer, is_response=True
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("user_field_names", [False, True])
+def test_row_encoder_matches_row_serializer(data_fixture, user_field_names):
+    table, user, row, _, context = setup_interesting_test_table(data_fixture)
+    model = table.get_model()
+    rows = list(model.objects.all().enhance_by_fields())
+    serializer_class = get_row_serializer_class(
+        model, RowSerializer, is_response=True, user_field_names=user_field_names
+    )
+
+    expected = json.loads(
+        json.dumps(serializer_class(rows, many=True).data, cls=JSONEncoder)
+    )
+    encoder = RowEncoder(serializer_class)
+    assert json.loads(json.dumps(encoder.encode_many(rows), cls=JSONEncoder)) == (
+        expected
+    )
+    assert json.loads(json.dumps(encoder.encode(rows[0]), cls=JSONEncoder)) == (
+        expected[0]
+    )
+    assert orjson.loads(encoder.dumps(rows)) == expected
+    assert get_row_encoder(serializer_class) is get_row_encoder(serializer_class)
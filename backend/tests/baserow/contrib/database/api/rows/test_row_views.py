@@ -1,20 +1,29 @@
 import json
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
+from io import BytesIO
 
+from django.core.handlers.asgi import ASGIRequest
 from django.shortcuts import reverse
 from django.test import override_settings
 
 import pytest
 from freezegun import freeze_time
+from rest_framework.exceptions import APIException
 from rest_framework.status import (
     HTTP_200_OK,
     HTTP_204_NO_CONTENT,
+    HTTP_304_NOT_MODIFIED,
     HTTP_400_BAD_REQUEST,
     HTTP_401_UNAUTHORIZED,
     HTTP_404_NOT_FOUND,
 )
 
+from baserow.api.streaming import get_streaming_results_response
+from baserow.contrib.database.api.rows.serializers import (
+    RowSerializer,
+    get_row_serializer_class,
+)
 from baserow.contrib.database.fields.handler import FieldHandler
 from baserow.contrib.database.fields.registries import field_type_registry
 from baserow.contrib.database.rows.actions import UpdateRowsActionType
@@ -3139,3 +3148,150 @@ def test_list_row_history_endpoint_is_paginated(data_fixture, api_client):
             },
         ],
     }
+
+
+@pytest.mark.django_db
+@override_settings(BASEROW_STREAMING_CHUNK_SIZE=2)
+def test_list_rows_stream(api_client, data_fixture):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    related_table = data_fixture.create_database_table(database=table.database)
+    name_field = data_fixture.create_text_field(name="Name", table=table, primary=True)
+    data_fixture.create_text_field(name="Name", table=related_table, primary=True)
+    link_field = FieldHandler().create_field(
+        user, table, "link_row", name="Link", link_row_table=related_table
+    )
+    related_row = RowHandler().create_row(user, related_table, {})
+    RowHandler().create_rows(
+        user,
+        table,
+        [
+            {name_field.db_column: f"Row {i}", link_field.db_column: [related_row.id]}
+            for i in range(5)
+        ],
+    )
+
+    response = api_client.get(
+        reverse("api:database:rows:list", kwargs={"table_id": table.id})
+        + "?stream=true&user_field_names=true&order_by=-Name",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_200_OK
+    assert response.streaming
+    response_json = json.loads(b"".join(response.streaming_content))
+    assert list(response_json.keys()) == ["results"]
+    assert [row["Name"] for row in response_json["results"]] == [
+        "Row 4",
+        "Row 3",
+        "Row 2",
+        "Row 1",
+        "Row 0",
+    ]
+    assert all(
+        row["Link"][0]["id"] == related_row.id for row in response_json["results"]
+    )
+
+    response = api_client.get(
+        reverse("api:database:rows:list", kwargs={"table_id": table.id})
+        + f"?stream=true&filter__field_{name_field.id}__equal=nothing",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_200_OK
+    assert json.loads(b"".join(response.streaming_content)) == {"results": []}
+
+
+@pytest.mark.django_db
+def test_streaming_results_response_is_built_before_returning_under_asgi(
+    data_fixture,
+):
+    table = data_fixture.create_database_table()
+    name_field = data_fixture.create_text_field(table=table, primary=True)
+    model = table.get_model()
+    model.objects.create(**{name_field.db_column: "Row"})
+    serializer_class = get_row_serializer_class(model, RowSerializer, is_response=True)
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": []}
+
+    response = get_streaming_results_response(
+        ASGIRequest(scope, BytesIO()), model.objects.all(), serializer_class
+    )
+
+    assert not response.streaming
+    results = json.loads(response.content)["results"]
+    assert [row[name_field.db_column] for row in results] == ["Row"]
+
+
+@pytest.mark.django_db
+@override_settings(BASEROW_ASGI_STREAMING_MAX_ROWS=2, BASEROW_STREAMING_CHUNK_SIZE=1)
+def test_streaming_results_response_is_limited_under_asgi(data_fixture):
+    table = data_fixture.create_database_table()
+    name_field = data_fixture.create_text_field(table=table, primary=True)
+    model = table.get_model()
+    serializer_class = get_row_serializer_class(model, RowSerializer, is_response=True)
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": []}
+
+    model.objects.create(**{name_field.db_column: "A"})
+    model.objects.create(**{name_field.db_column: "B"})
+    response = get_streaming_results_response(
+        ASGIRequest(scope, BytesIO()), model.objects.all(), serializer_class
+    )
+    assert len(json.loads(response.content)["results"]) == 2
+
+    model.objects.create(**{name_field.db_column: "C"})
+    with pytest.raises(APIException) as exc_info:
+        get_streaming_results_response(
+            ASGIRequest(scope, BytesIO()), model.objects.all(), serializer_class
+        )
+    assert exc_info.value.status_code == HTTP_400_BAD_REQUEST
+    assert exc_info.value.detail["error"] == "ERROR_STREAMING_LIMIT_EXCEEDED"
+
+
+@pytest.mark.django_db
+def test_list_rows_if_none_match(
+    api_client, data_fixture, django_capture_on_commit_callbacks
+):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    name_field = data_fixture.create_text_field(name="Name", table=table, primary=True)
+    row = RowHandler().create_row(user, table, {name_field.db_column: "A"})
+    url = reverse("api:database:rows:list", kwargs={"table_id": table.id})
+
+    response = api_client.get(url, HTTP_AUTHORIZATION=f"JWT {jwt_token}")
+    assert response.status_code == HTTP_200_OK
+    etag = response["ETag"]
+
+    response = api_client.get(
+        url, HTTP_AUTHORIZATION=f"JWT {jwt_token}", HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+
+    # The query parameters are part of the ETag.
+    response = api_client.get(
+        url + "?size=1", HTTP_AUTHORIZATION=f"JWT {jwt_token}", HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == HTTP_200_OK
+
+    with django_capture_on_commit_callbacks(execute=True):
+        RowHandler().update_row_by_id(user, table, row.id, {name_field.db_column: "B"})
+
+    response = api_client.get(
+        url, HTTP_AUTHORIZATION=f"JWT {jwt_token}", HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == HTTP_200_OK
+    assert response.json()["results"][0][f"field_{name_field.id}"] == "B"
+    assert response["ETag"] != etag
+    etag = response["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        FieldHandler().create_field(user, table, "text", name="Other")
+
+    response = api_client.get(
+        url, HTTP_AUTHORIZATION=f"JWT {jwt_token}", HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == HTTP_200_OK
+
+    # Searching never results in a not modified response because the search index
+    # is updated in the background.
+    response = api_client.get(url + "?search=B", HTTP_AUTHORIZATION=f"JWT {jwt_token}")
+    assert response.status_code == HTTP_200_OK
+    assert "ETag" not in response
@@ -1,21 +1,28 @@
+import base64
 import json
+from datetime import date, datetime, time, timezone
 from decimal import Decimal
 from typing import Any, Dict, List
+from uuid import UUID
 
 from django.core.cache import cache
 from django.shortcuts import reverse
+from django.test.utils import override_settings
 
 import pytest
 from pytest_unordered import unordered
 from rest_framework import serializers
+from rest_framework.exceptions import APIException
 from rest_framework.fields import Field
 from rest_framework.status import (
     HTTP_200_OK,
+    HTTP_304_NOT_MODIFIED,
     HTTP_400_BAD_REQUEST,
     HTTP_401_UNAUTHORIZED,
     HTTP_404_NOT_FOUND,
 )
 
+from baserow.api.pagination import KeysetPagination
 from baserow.contrib.database.api.constants import PUBLIC_PLACEHOLDER_ENTITY_ID
 from baserow.contrib.database.fields.handler import FieldHandler
 from baserow.contrib.database.rows.handler import RowHandler
@@ -25,6 +32,7 @@ from baserow.contrib.database.rows.registries import (
 )
 from baserow.contrib.database.search.handler import ALL_SEARCH_MODES, SearchHandler
 from baserow.contrib.database.table.handler import TableHandler
+from baserow.contrib.database.table.models import TableUsage
 from baserow.contrib.database.views.handler import ViewHandler
 from baserow.contrib.database.views.models import GridView
 from baserow.contrib.database.views.registries import view_aggregation_type_registry
@@ -4917,3 +4925,202 @@ def test_list_grid_rows_adhoc_filtering_advanced_filters(api_client, data_fixtur
         response_json = response.json()
         assert response.status_code == HTTP_400_BAD_REQUEST
         assert response_json["error"] == "ERROR_FILTERS_PARAM_VALIDATION_ERROR"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("sort_order", [None, "ASC", "DESC"])
+def test_list_rows_with_cursor_pagination(api_client, data_fixture, sort_order):
+    user, token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    number_field = data_fixture.create_number_field(table=table)
+    grid = data_fixture.create_grid_view(table=table)
+    if sort_order:
+        data_fixture.create_view_sort(view=grid, field=number_field, order=sort_order)
+
+    values = [3, None, 1, 3, None, 2, 1]
+    RowHandler().create_rows(
+        user, table, [{number_field.db_column: value} for value in values]
+    )
+
+    url = reverse("api:database:views:grid:list", kwargs={"view_id": grid.id})
+    response = api_client.get(url, HTTP_AUTHORIZATION=f"JWT {token}")
+    expected_ids = [row["id"] for row in response.json()["results"]]
+
+    ids = []
+    next_url = f"{url}?cursor=&size=2"
+    while next_url:
+        response = api_client.get(next_url, HTTP_AUTHORIZATION=f"JWT {token}")
+        assert response.status_code == HTTP_200_OK
+        response_json = response.json()
+        assert "count" not in response_json
+        assert len(response_json["results"]) <= 2
+        ids += [row["id"] for row in response_json["results"]]
+        next_url = response_json["next"]
+
+    assert ids == expected_ids
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_keeps_the_index_ordering_of_not_nullable_columns(
+    data_fixture,
+):
+    table = data_fixture.create_database_table()
+    queryset = table.get_model().objects.all()
+
+    orders = KeysetPagination().get_order_bys(queryset)
+
+    assert [order.nullable for order in orders] == [False, False]
+    assert "NULLS" not in str(queryset.order_by(*[o.order_by for o in orders]).query)
+
+
+def test_cursor_values_keep_their_type():
+    values = [
+        None,
+        True,
+        1,
+        1.5,
+        "text",
+        Decimal("1.10"),
+        datetime(2023, 2, 27, 10, 0, tzinfo=timezone.utc),
+        date(2023, 2, 27),
+        time(10, 30),
+        UUID("b2d4a5a8-0c8e-4d5c-9d1c-0a8f7d8d1a2b"),
+    ]
+
+    decoded = KeysetPagination.decode_cursor(KeysetPagination.encode_cursor(values))
+
+    assert decoded == values
+    assert [type(value) for value in decoded] == [type(value) for value in values]
+
+
+def test_cursor_rejects_values_that_would_be_compared_as_text():
+    with pytest.raises(APIException) as exc_info:
+        KeysetPagination.encode_cursor([["a", "b"], 1])
+    assert exc_info.value.detail["error"] == "ERROR_CURSOR_ORDERING_NOT_SUPPORTED"
+
+    cursor = (
+        base64.urlsafe_b64encode(json.dumps([["value", ["a"]]]).encode())
+        .decode()
+        .rstrip("=")
+    )
+    with pytest.raises(APIException) as exc_info:
+        KeysetPagination.decode_cursor(cursor)
+    assert exc_info.value.detail["error"] == "ERROR_INVALID_CURSOR"
+
+
+@pytest.mark.django_db
+def test_list_rows_with_invalid_cursor(api_client, data_fixture):
+    user, token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    grid = data_fixture.create_grid_view(table=table)
+
+    url = reverse("api:database:views:grid:list", kwargs={"view_id": grid.id})
+    response = api_client.get(
+        f"{url}?cursor=invalid", HTTP_AUTHORIZATION=f"JWT {token}"
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json()["error"] == "ERROR_INVALID_CURSOR"
+
+
+@pytest.mark.django_db
+def test_list_rows_with_estimated_count(api_client, data_fixture):
+    user, token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    grid = data_fixture.create_grid_view(table=table)
+    RowHandler().create_rows(user, table, [{}, {}, {}])
+
+    url = reverse("api:database:views:grid:list", kwargs={"view_id": grid.id})
+    response = api_client.get(
+        f"{url}?count=true&estimate_count=true", HTTP_AUTHORIZATION=f"JWT {token}"
+    )
+    assert response.status_code == HTTP_200_OK
+    assert response.json() == {"count": 3, "count_is_estimate": False}
+
+    response = api_client.get(
+        f"{url}?estimate_count=true&size=2", HTTP_AUTHORIZATION=f"JWT {token}"
+    )
+    response_json = response.json()
+    assert response.status_code == HTTP_200_OK
+    assert response_json["count"] == 3
+    assert response_json["count_is_estimate"] is False
+    assert len(response_json["results"]) == 2
+    assert response_json["next"]
+
+    with override_settings(BASEROW_ESTIMATED_COUNT_EXACT_THRESHOLD=0):
+        TableUsage.objects.create(table=table, row_count=1)
+        response = api_client.get(
+            f"{url}?estimate_count=true&size=2", HTTP_AUTHORIZATION=f"JWT {token}"
+        )
+        response_json = response.json()
+        assert response_json["count"] == 1
+        assert response_json["count_is_estimate"] is True
+        # The next page is still available although the estimation is too low.
+        assert response_json["next"]
+        assert len(response_json["results"]) == 2
+
+        response = api_client.get(
+            f"{url}?estimate_count=true&size=2&page=2",
+            HTTP_AUTHORIZATION=f"JWT {token}",
+        )
+        assert response.status_code == HTTP_200_OK
+        assert len(response.json()["results"]) == 1
+        assert response.json()["next"] is None
+
+
+@pytest.mark.django_db
+def test_list_rows_if_none_match(
+    api_client, data_fixture, django_capture_on_commit_callbacks
+):
+    user, token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table, primary=True)
+    date_field = data_fixture.create_date_field(table=table)
+    grid = data_fixture.create_grid_view(table=table)
+    RowHandler().create_row(user, table, {text_field.db_column: "A"})
+    url = reverse("api:database:views:grid:list", kwargs={"view_id": grid.id})
+
+    response = api_client.get(url, HTTP_AUTHORIZATION=f"JWT {token}")
+    assert response.status_code == HTTP_200_OK
+    etag = response["ETag"]
+
+    response = api_client.get(
+        url, HTTP_AUTHORIZATION=f"JWT {token}", HTTP_IF_NONE_MATCH=f"W/{etag}"
+    )
+    assert response.status_code == HTTP_304_NOT_MODIFIED
+
+    # Another user never gets the ETag of the first one.
+    _, other_token = data_fixture.create_user_and_token(
+        workspace=table.database.workspace
+    )
+    response = api_client.get(
+        url, HTTP_AUTHORIZATION=f"JWT {other_token}", HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == HTTP_200_OK
+
+    with django_capture_on_commit_callbacks(execute=True):
+        ViewHandler().create_filter(user, grid, text_field, "equal", "B")
+
+    response = api_client.get(
+        url, HTTP_AUTHORIZATION=f"JWT {token}", HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == HTTP_200_OK
+    assert response.json()["count"] == 0
+    etag = response["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        RowHandler().create_row(user, table, {text_field.db_column: "B"})
+
+    response = api_client.get(
+        url, HTTP_AUTHORIZATION=f"JWT {token}", HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == HTTP_200_OK
+    assert response.json()["count"] == 1
+
+    # The rows of a view filtering on the current date can change at any time.
+    with django_capture_on_commit_callbacks(execute=True):
+        data_fixture.create_view_filter(
+            view=grid, field=date_field, type="date_equals_today", value="UTC?"
+        )
+    response = api_client.get(url, HTTP_AUTHORIZATION=f"JWT {token}")
+    assert response.status_code == HTTP_200_OK
+    assert "ETag" not in response
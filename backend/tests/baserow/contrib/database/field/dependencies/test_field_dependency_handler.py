@@ -1,11 +1,20 @@
+from unittest.mock import patch
+
 from django.contrib.contenttypes.models import ContentType
 
 import pytest
 from pytest_unordered import unordered
 
+from baserow.contrib.database.fields.dependencies.circular_reference_checker import (
+    get_all_field_dependencies,
+)
 from baserow.contrib.database.fields.dependencies.exceptions import (
     SelfReferenceFieldDependencyError,
 )
+from baserow.contrib.database.fields.dependencies.graph import (
+    FieldDependencyGraphCache,
+    field_dependency_graph_cache,
+)
 from baserow.contrib.database.fields.dependencies.handler import FieldDependencyHandler
 from baserow.contrib.database.fields.dependencies.models import FieldDependency
 from baserow.contrib.database.fields.field_cache import FieldCache
@@ -616,3 +625,178 @@ def test_get_dependant_fields_with_type_via_field_num_queries(
         str(dependant_field.table.id)
         str(path_to_starting_table[0].table.id)
         str(path_to_starting_table[0].link_row_table.id)
+
+
+@pytest.mark.django_db
+@pytest.mark.field_link_row
+def test_field_dependency_graph_matches_recursive_query(data_fixture, settings):
+    user = data_fixture.create_user()
+    table_a, table_b, table_a_to_b_link_field = data_fixture.create_two_linked_tables(
+        user=user
+    )
+    table_c, _, table_c_to_b_link_field = data_fixture.create_two_linked_tables(
+        user=user, table_b=table_b
+    )
+    table_b_to_c_link_field = table_c_to_b_link_field.link_row_related_field
+    table_b_primary = table_b.field_set.get(primary=True)
+    table_c_primary = table_c.field_set.get(primary=True)
+
+    lookup_field = FieldHandler().create_field(
+        user,
+        table=table_a,
+        type_name="formula",
+        name="lookup",
+        formula=f"lookup('{table_a_to_b_link_field.name}', "
+        f"'{table_b_to_c_link_field.name}')",
+    )
+    FieldHandler().create_field(
+        user,
+        table=table_a,
+        type_name="formula",
+        name="lookup_length",
+        formula=f"count(field('{lookup_field.name}'))",
+    )
+    FieldHandler().create_field(
+        user,
+        table=table_b,
+        type_name="formula",
+        name="primary_twice",
+        formula=f"concat(field('{table_b_primary.name}'), "
+        f"field('{table_b_primary.name}'))",
+    )
+
+    graph = field_dependency_graph_cache._build_graph(table_a.database_id)
+    for table_id, field_ids in [
+        (table_c.id, [table_c_primary.id]),
+        (table_b.id, [table_b_primary.id, table_b_to_c_link_field.id]),
+        (table_a.id, [table_a_to_b_link_field.id, lookup_field.id]),
+    ]:
+        for associated_relations_changed in [True, False]:
+            assert graph.get_all_dependants(
+                table_id,
+                field_ids,
+                associated_relations_changed,
+                settings.MAX_FIELD_REFERENCE_DEPTH,
+            ) == unordered(
+                FieldDependencyHandler._query_all_dependant_paths(
+                    table_id, field_ids, associated_relations_changed
+                )
+            )
+
+    for field in [lookup_field, table_b_primary, table_a_to_b_link_field]:
+        assert graph.get_all_dependencies(
+            field.id, settings.MAX_FIELD_REFERENCE_DEPTH
+        ) == {
+            field_id
+            for field_id in get_all_field_dependencies(field)
+            if field_id is not None
+        }
+
+
+@pytest.mark.django_db
+def test_field_dependency_graph_cache_is_invalidated(data_fixture, settings):
+    settings.BASEROW_FIELD_DEPENDENCY_GRAPH_CACHE = True
+    field_dependency_graph_cache.clear()
+
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table, name="text")
+    formula_field = FieldHandler().create_field(
+        user, table=table, type_name="formula", name="a", formula="field('text')"
+    )
+    # The dependencies have changed in this transaction, so the graph can't be used
+    # until it's committed.
+    assert field_dependency_graph_cache.get_graph(table.database_id) is None
+
+    with patch(
+        "baserow.contrib.database.fields.dependencies.graph.get_dirty_database_ids",
+        return_value=set(),
+    ), patch.object(
+        FieldDependencyGraphCache,
+        "_build_graph",
+        autospec=True,
+        side_effect=FieldDependencyGraphCache._build_graph,
+    ) as build_graph:
+        for _ in range(2):
+            results = FieldDependencyHandler.get_all_dependent_fields_with_type(
+                table.id,
+                field_ids=[text_field.id],
+                field_cache=FieldCache(),
+                associated_relations_changed=True,
+            )
+            assert [field.id for field, _, _ in results] == [formula_field.id]
+        assert build_graph.call_count == 1
+
+        field_dependency_graph_cache.invalidate(table.database_id)
+        FieldDependencyHandler.get_all_dependent_fields_with_type(
+            table.id,
+            field_ids=[text_field.id],
+            field_cache=FieldCache(),
+            associated_relations_changed=True,
+        )
+        assert build_graph.call_count == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.field_link_row
+def test_field_dependency_graph_cache_is_invalidated_when_dependant_type_changes(
+    data_fixture, settings
+):
+    settings.BASEROW_FIELD_DEPENDENCY_GRAPH_CACHE = True
+    field_dependency_graph_cache.clear()
+
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    related_table = data_fixture.create_database_table(
+        user=user, database=table.database
+    )
+    name_field = data_fixture.create_text_field(
+        table=related_table, name="name", primary=True
+    )
+    data_fixture.create_text_field(table=table, name="primary", primary=True)
+    field_handler = FieldHandler()
+    link_field = field_handler.create_field(
+        user, table, "link_row", name="link", link_row_table=related_table
+    )
+    dependant = field_handler.create_field(
+        user, table, "formula", name="dependant", formula="lookup('link', 'name')"
+    )
+
+    with patch(
+        "baserow.contrib.database.fields.dependencies.graph.get_dirty_database_ids",
+        return_value=set(),
+    ):
+        results = FieldDependencyHandler.get_all_dependent_fields_with_type(
+            related_table.id,
+            field_ids=[name_field.id],
+            field_cache=FieldCache(),
+            associated_relations_changed=True,
+        )
+        assert [field.id for field, _, _ in results] == [dependant.id]
+
+        # The lookup field has the same dependencies as the formula, so only the
+        # content type of the dependant changes.
+        field_handler.update_field(
+            user,
+            dependant,
+            new_type_name="lookup",
+            through_field_id=link_field.id,
+            target_field_id=name_field.id,
+        )
+
+        results = FieldDependencyHandler.get_all_dependent_fields_with_type(
+            related_table.id,
+            field_ids=[name_field.id],
+            field_cache=FieldCache(),
+            associated_relations_changed=True,
+        )
+        assert [(field.id, field_type.type) for field, field_type, _ in results] == [
+            (dependant.id, "lookup")
+        ]
+
+        # Updating the dependency also updates the dependant with its new type.
+        field_handler.update_field(user, name_field, new_type_name="number")
+
+    dependant = FieldHandler().get_field(dependant.id).specific
+    assert dependant.formula_type == "array"
+    assert dependant.array_formula_type == "number"
@@ -794,3 +794,54 @@ def test_can_force_recalculate_for_formulas_with_invalid_syntax_or_of_error_type
             f"{formula_of_type_number_to_recreate_col.db_column}'"
         )
         assert [r[0] for r in cursor.fetchall()] == ["numeric"]
+
+
+@pytest.mark.django_db
+def test_migrate_formulas_per_database_logs_and_skips_migrated_databases(
+    data_fixture, tmp_path
+):
+    formula_field_1 = data_fixture.create_formula_field(
+        formula="1", version=1, recalculate=False
+    )
+    formula_field_2 = data_fixture.create_formula_field(
+        formula="2", version=1, recalculate=False
+    )
+    database_ids = {
+        formula_field_1.table.database_id,
+        formula_field_2.table.database_id,
+    }
+    assert len(database_ids) == 2
+    progress_log_path = tmp_path / "formula_migrations.jsonl"
+    latest_version = FORMULA_MIGRATIONS.get_latest_version()
+
+    results = FormulaMigrationHandler.migrate_formulas_per_database(
+        progress_log_path=str(progress_log_path)
+    )
+
+    assert {result.database_id for result in results} == database_ids
+    assert all(result.error is None for result in results)
+    assert {
+        table_id for result in results for table_id in result.seconds_per_table
+    } == {formula_field_1.table_id, formula_field_2.table_id}
+    formula_field_1.refresh_from_db()
+    formula_field_2.refresh_from_db()
+    assert formula_field_1.version == latest_version
+    assert formula_field_2.version == latest_version
+
+    log_lines = progress_log_path.read_text().splitlines()
+    assert len(log_lines) == 2
+    assert (
+        FormulaMigrationHandler._read_migrated_database_ids(
+            str(progress_log_path), latest_version
+        )
+        == database_ids
+    )
+
+    # An interrupted migration is resumed by skipping the logged databases.
+    FormulaField.objects.update(version=1)
+    results = FormulaMigrationHandler.migrate_formulas_per_database(
+        progress_log_path=str(progress_log_path)
+    )
+    assert results == []
+    formula_field_1.refresh_from_db()
+    assert formula_field_1.version == 1
@@ -0,0 +1,201 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.utils import timezone
+
+import pytest
+from freezegun import freeze_time
+
+from baserow.contrib.database.fields.exceptions import (
+    OnlineFieldTypeConversionNotSupported,
+)
+from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.contrib.database.fields.job_types import ConvertFieldTypeJobType
+from baserow.contrib.database.fields.models import (
+    BooleanField,
+    ConvertFieldTypeJob,
+    NumberField,
+)
+from baserow.contrib.database.fields.online_type_conversion import (
+    OnlineFieldTypeConversion,
+)
+from baserow.contrib.database.rows.handler import RowHandler
+from baserow.contrib.database.views.handler import ViewIndexingHandler
+from baserow.core.jobs.constants import JOB_FAILED, JOB_FINISHED, JOB_STARTED
+from baserow.core.jobs.handler import JobHandler
+from baserow.core.jobs.tasks import clean_up_jobs
+
+
+def get_column_names(table):
+    with connection.cursor() as cursor:
+        return [
+            column.name
+            for column in connection.introspection.get_table_description(
+                cursor, table.get_database_table_name()
+            )
+        ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_can_submit_convert_field_type_job(data_fixture, settings):
+    settings.BASEROW_ONLINE_FIELD_CONVERSION_BATCH_SIZE = 2
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_text_field(table=table, name="Text")
+    rows = RowHandler().create_rows(
+        user,
+        table,
+        [{f"field_{field.id}": value} for value in ["1", "abc", "3.14", None, "5"]],
+    )
+
+    job = JobHandler().create_and_start_job(
+        user,
+        ConvertFieldTypeJobType.type,
+        field_id=field.id,
+        new_field_type="number",
+        field_values={"number_decimal_places": 1},
+    )
+
+    job.refresh_from_db()
+    assert job.state == JOB_FINISHED
+    assert job.progress_percentage == 100
+
+    field = FieldHandler().get_field(field.id).specific
+    assert isinstance(field, NumberField)
+    assert field.number_decimal_places == 1
+    model = table.get_model()
+    assert list(
+        model.objects.order_by("id").values_list(f"field_{field.id}", flat=True)
+    ) == [Decimal("1.0"), None, Decimal("3.1"), None, Decimal("5.0")]
+    assert [row.id for row in model.objects.order_by("id")] == [r.id for r in rows]
+    assert get_column_names(table).count(f"field_{field.id}") == 1
+    assert f"field_{field.id}_conversion" not in get_column_names(table)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_online_field_type_conversion_converts_concurrent_writes(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_text_field(table=table, name="Text")
+    row_handler = RowHandler()
+    row_1, row_2 = row_handler.create_rows(
+        user, table, [{f"field_{field.id}": "true"}, {f"field_{field.id}": "no"}]
+    )
+
+    conversion = OnlineFieldTypeConversion(user, field, "boolean", {})
+    conversion.check_supported()
+    conversion.add_shadow_column()
+    max_row_id = conversion._get_max_row_id()
+
+    # These changes happen while the existing rows are being converted, and must be
+    # converted by the trigger.
+    row_handler.update_row_by_id(user, table, row_2.id, {f"field_{field.id}": "yes"})
+    row_3 = row_handler.create_row(user, table, {f"field_{field.id}": "1"})
+    row_4 = row_handler.create_row(user, table, {f"field_{field.id}": "nope"})
+
+    conversion.convert_existing_rows(max_row_id)
+    field, _ = conversion.swap_columns_and_update_field()
+
+    assert isinstance(field, BooleanField)
+    model = table.get_model()
+    values = dict(model.objects.values_list("id", f"field_{field.id}"))
+    assert values == {row_1.id: True, row_2.id: True, row_3.id: True, row_4.id: False}
+
+
+@pytest.mark.django_db
+def test_online_field_type_conversion_not_supported(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table, name="Text")
+    formula_field = data_fixture.create_formula_field(
+        table=table, name="Formula", formula="'a'"
+    )
+
+    with pytest.raises(OnlineFieldTypeConversionNotSupported):
+        OnlineFieldTypeConversion(
+            user, text_field, "single_select", {}
+        ).check_supported()
+
+    with pytest.raises(OnlineFieldTypeConversionNotSupported):
+        OnlineFieldTypeConversion(user, formula_field, "text", {}).check_supported()
+
+    with pytest.raises(OnlineFieldTypeConversionNotSupported):
+        OnlineFieldTypeConversion(user, text_field, "text", {}).check_supported()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_online_field_type_conversion_recreates_the_view_indexes(
+    data_fixture, settings
+):
+    settings.AUTO_INDEX_VIEW_ENABLED = True
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_text_field(table=table, name="Text")
+    RowHandler().create_rows(user, table, [{f"field_{field.id}": "1"}])
+    views = []
+    for _ in range(2):
+        view = data_fixture.create_grid_view(table=table)
+        data_fixture.create_view_sort(view=view, field=field, order="DESC")
+        ViewIndexingHandler.update_index(view)
+        views.append(view)
+    old_index_name = views[0].db_index_name
+    assert ViewIndexingHandler.does_index_exist(old_index_name)
+
+    conversion = OnlineFieldTypeConversion(user, field, "number", {})
+    conversion.check_supported()
+    conversion.add_shadow_column()
+    conversion.convert_existing_rows(conversion._get_max_row_id())
+    conversion.swap_columns_and_update_field()
+
+    for view in views:
+        view.refresh_from_db()
+        assert view.db_index_name is not None
+        assert ViewIndexingHandler.does_index_exist(view.db_index_name)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_convert_field_type_job_leftovers_are_removed_when_it_expires(
+    data_fixture, settings
+):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_text_field(table=table, name="Text")
+    RowHandler().create_rows(user, table, [{f"field_{field.id}": "1"}])
+    now = timezone.now()
+    time_before_soft_limit = now - timezone.timedelta(
+        minutes=settings.BASEROW_JOB_SOFT_TIME_LIMIT + 1
+    )
+
+    with freeze_time(time_before_soft_limit):
+        job = ConvertFieldTypeJob.objects.create(
+            user=user, field=field, new_field_type="number", state=JOB_STARTED
+        )
+    # The worker running the conversion is killed after adding the shadow column.
+    conversion = OnlineFieldTypeConversion(user, field, "number", {})
+    conversion.add_shadow_column()
+    assert f"field_{field.id}_conversion" in get_column_names(table)
+
+    with freeze_time(now):
+        clean_up_jobs()
+
+    job.refresh_from_db()
+    assert job.state == JOB_FAILED
+    assert f"field_{field.id}_conversion" not in get_column_names(table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM pg_trigger WHERE tgname = %s",
+            [f"field_{field.id}_conversion"],
+        )
+        assert cursor.fetchone()[0] == 0
+        cursor.execute(
+            "SELECT count(*) FROM pg_proc WHERE proname IN (%s, %s)",
+            [
+                f"baserow_convert_field_{field.id}",
+                f"baserow_sync_field_{field.id}_conversion",
+            ],
+        )
+        assert cursor.fetchone()[0] == 0
+
+    # The field itself is left as it was.
+    model = table.get_model()
+    assert list(model.objects.values_list(f"field_{field.id}", flat=True)) == ["1"]
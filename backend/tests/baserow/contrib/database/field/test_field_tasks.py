@@ -1,14 +1,20 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
+from unittest.mock import patch
 
+from django.core.cache import cache
 from django.test import override_settings
 from django.utils import timezone as django_timezone
 
 import pytest
+from celery_singleton import DuplicateTaskError
 from freezegun import freeze_time
 
+from baserow.contrib.database.fields.dependencies.models import DeferredFieldUpdate
 from baserow.contrib.database.fields.field_types import FormulaFieldType
 from baserow.contrib.database.fields.tasks import (
+    _check_for_pending_deferred_field_updates,
     delete_mentions_marked_for_deletion,
+    get_periodic_update_failed_fields_cache_key,
     run_periodic_fields_updates,
 )
 from baserow.contrib.database.rows.handler import RowHandler
@@ -377,6 +383,114 @@ def test_run_periodic_field_type_doesnt_update_trashed_workspace(data_fixture):
         assert FormulaFieldType().get_fields_needing_periodic_update().count() == 0
 
 
+@pytest.mark.django_db
+def test_run_periodic_fields_updates_skips_date_only_formulas_on_the_same_day(
+    data_fixture,
+):
+    workspace = data_fixture.create_workspace()
+    database = data_fixture.create_database_application(workspace=workspace)
+    table = data_fixture.create_database_table(database=database)
+    with freeze_time("2023-02-27 10:00"):
+        today_field = data_fixture.create_formula_field(table=table, formula="today()")
+        now_field = data_fixture.create_formula_field(
+            table=table, formula="now()", date_include_time=True
+        )
+        table_model = table.get_model()
+        row = table_model.objects.create()
+
+    # Changing the value directly in the database reveals whether the field has been
+    # recalculated.
+    table_model.objects.update(**{f"field_{today_field.id}": date(2000, 1, 1)})
+
+    with freeze_time("2023-02-27 23:30"):
+        run_periodic_fields_updates()
+
+    row.refresh_from_db()
+    assert getattr(row, f"field_{today_field.id}") == date(2000, 1, 1)
+    assert getattr(row, f"field_{now_field.id}") == datetime(
+        2023, 2, 27, 23, 30, 0, tzinfo=timezone.utc
+    )
+
+    with freeze_time("2023-02-28 0:10"):
+        run_periodic_fields_updates()
+
+    row.refresh_from_db()
+    assert getattr(row, f"field_{today_field.id}") == date(2023, 2, 28)
+    assert getattr(row, f"field_{now_field.id}") == datetime(
+        2023, 2, 28, 0, 10, 0, tzinfo=timezone.utc
+    )
+
+
+@pytest.mark.django_db
+def test_run_periodic_fields_updates_doesnt_skip_formulas_that_failed(data_fixture):
+    workspace = data_fixture.create_workspace()
+    database = data_fixture.create_database_application(workspace=workspace)
+    table = data_fixture.create_database_table(database=database)
+    with freeze_time("2023-02-27 10:00"):
+        today_field = data_fixture.create_formula_field(table=table, formula="today()")
+        table_model = table.get_model()
+        row = table_model.objects.create()
+        run_periodic_fields_updates()
+    cache.delete(
+        get_periodic_update_failed_fields_cache_key(FormulaFieldType(), workspace.id)
+    )
+
+    with freeze_time("2023-02-28 0:10"), patch(
+        "baserow.contrib.database.fields.tasks._run_periodic_field_update",
+        side_effect=Exception("Failed"),
+    ):
+        run_periodic_fields_updates()
+
+    row.refresh_from_db()
+    assert getattr(row, f"field_{today_field.id}") == date(2023, 2, 27)
+
+    # The date hasn't changed since the previous update, but the field must be
+    # updated because it failed.
+    with freeze_time("2023-02-28 0:20"):
+        run_periodic_fields_updates()
+
+    row.refresh_from_db()
+    assert getattr(row, f"field_{today_field.id}") == date(2023, 2, 28)
+    assert (
+        cache.get(
+            get_periodic_update_failed_fields_cache_key(
+                FormulaFieldType(), workspace.id
+            )
+        )
+        is None
+    )
+
+
+@pytest.mark.django_db
+@override_settings(PERIODIC_FIELD_UPDATE_TASK_PER_WORKSPACE=True)
+@patch(
+    "baserow.contrib.database.fields.tasks"
+    ".run_periodic_fields_updates_for_workspace.delay"
+)
+def test_run_periodic_fields_updates_schedules_a_task_per_workspace(
+    mock_delay, data_fixture
+):
+    workspace_1 = data_fixture.create_workspace()
+    workspace_2 = data_fixture.create_workspace()
+    for workspace in [workspace_1, workspace_2]:
+        database = data_fixture.create_database_application(workspace=workspace)
+        table = data_fixture.create_database_table(database=database)
+        data_fixture.create_formula_field(
+            table=table, formula="now()", date_include_time=True
+        )
+    workspace_1.now = datetime(2023, 2, 27, 10, 0, 0, tzinfo=timezone.utc)
+    workspace_1.save()
+    workspace_2.now = datetime(2023, 2, 27, 9, 0, 0, tzinfo=timezone.utc)
+    workspace_2.save()
+
+    run_periodic_fields_updates(update_now=False)
+
+    assert [call.kwargs for call in mock_delay.call_args_list] == [
+        {"workspace_id": workspace_2.id, "update_now": False},
+        {"workspace_id": workspace_1.id, "update_now": False},
+    ]
+
+
 @override_settings(STALE_MENTIONS_CLEANUP_INTERVAL_MINUTES=60)
 @pytest.mark.django_db
 def test_run_delete_mentions_marked_for_deletion(data_fixture):
@@ -455,3 +569,32 @@ def test_run_delete_mentions_marked_for_deletion(data_fixture):
         delete_mentions_marked_for_deletion()
 
     assert RichTextFieldMention.objects.count() == 0
+
+
+@pytest.mark.django_db
+@patch("baserow.contrib.database.fields.tasks.run_deferred_field_updates.apply_async")
+@patch(
+    "baserow.contrib.database.fields.tasks._check_for_pending_deferred_field_updates"
+    ".apply_async"
+)
+def test_check_for_pending_deferred_field_updates_looks_at_the_table(
+    mock_check_apply_async, mock_run_apply_async, data_fixture
+):
+    _check_for_pending_deferred_field_updates()
+    mock_run_apply_async.assert_not_called()
+
+    # An update deferred while the previous task was draining the table.
+    DeferredFieldUpdate.objects.create(
+        starting_table=data_fixture.create_database_table(),
+        starting_row_ids=[1],
+        field_paths=[],
+    )
+    _check_for_pending_deferred_field_updates()
+    mock_run_apply_async.assert_called_once()
+    mock_check_apply_async.assert_not_called()
+
+    # The task that scheduled the check still holds the lock, so the check is
+    # repeated later instead of losing the update.
+    mock_run_apply_async.side_effect = DuplicateTaskError("duplicate", "task_id")
+    _check_for_pending_deferred_field_updates()
+    mock_check_apply_async.assert_called_once()
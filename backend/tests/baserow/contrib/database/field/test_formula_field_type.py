@@ -5,6 +5,7 @@ from zoneinfo import ZoneInfo
 
 from django.db import transaction
 from django.db.models import TextField
+from django.test.utils import override_settings
 from django.urls import reverse
 
 import pytest
@@ -25,6 +26,10 @@ from baserow.contrib.database.formula import (
     BaserowFormulaTextType,
 )
 from baserow.contrib.database.formula.ast.tree import BaserowFunctionDefinition
+from baserow.contrib.database.formula.parser.ast_mapper import (
+    raw_formula_to_untyped_expression,
+    untyped_expression_cache,
+)
 from baserow.contrib.database.formula.registries import formula_function_registry
 from baserow.contrib.database.formula.types.exceptions import InvalidFormulaType
 from baserow.contrib.database.management.commands.fill_table_rows import fill_table_rows
@@ -37,6 +42,7 @@ from baserow.contrib.database.views.exceptions import (
 from baserow.contrib.database.views.handler import ViewHandler
 from baserow.contrib.database.views.models import SORT_ORDER_ASC, SORT_ORDER_DESC
 from baserow.contrib.database.views.registries import view_filter_type_registry
+from baserow.core.formula.parser.parser import parse_tree_cache
 
 
 @pytest.mark.django_db
@@ -2179,3 +2185,44 @@ def test_formula_single_select_field_type_sorting(data_fixture):
     rows = view_handler.apply_sorting(grid_view, model.objects.all())
     row_ids = [row.id for row in rows]
     assert row_ids == [row_5.id, row_2.id, row_1.id, row_4.id, row_3.id]
+
+
+@pytest.mark.django_db
+@override_settings(BASEROW_FORMULA_CACHE_SIZE=10)
+def test_parsed_formulas_are_cached_but_never_shared(data_fixture):
+    parse_tree_cache.clear()
+    untyped_expression_cache.clear()
+
+    first = raw_formula_to_untyped_expression("concat('a', 1)")
+    second = raw_formula_to_untyped_expression("concat('a', 1)")
+    assert untyped_expression_cache.misses == 1
+    assert untyped_expression_cache.hits == 1
+    assert parse_tree_cache.misses == 1
+    assert first is not second
+    assert first.args[1] is not second.args[1]
+    assert first.function_def is second.function_def
+    assert str(first) == str(second)
+
+    first.with_type(BaserowFormulaTextType())
+    assert second.expression_type is None
+
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    number_field = data_fixture.create_number_field(table=table, name="number")
+    text_formula_field = FieldHandler().create_field(
+        user, table, "formula", name="text", formula="totext(field('number'))"
+    )
+    number_formula_field = FieldHandler().create_field(
+        user, table, "formula", name="double", formula="field('number') * 2"
+    )
+    RowHandler().create_row(
+        user=user, table=table, values={f"field_{number_field.id}": 2}
+    )
+
+    row = table.get_model().objects.get()
+    assert getattr(row, f"field_{text_formula_field.id}") == "2"
+    assert getattr(row, f"field_{number_formula_field.id}") == 4
+    assert untyped_expression_cache.hits > 1
+
+    untyped_expression_cache.clear()
+    parse_tree_cache.clear()
@@ -1,6 +1,8 @@
 from decimal import Decimal
 from io import BytesIO
+from unittest.mock import patch
 
+from django.test.utils import override_settings
 from django.urls import reverse
 
 import pytest
@@ -10,7 +12,13 @@ from rest_framework.status import HTTP_200_OK, HTTP_204_NO_CONTENT
 from baserow.contrib.database.fields.deferred_field_fk_updater import (
     DeferredFieldFkUpdater,
 )
-from baserow.contrib.database.fields.dependencies.models import FieldDependency
+from baserow.contrib.database.fields.dependencies.deferred_updates import (
+    run_deferred_field_updates_batch,
+)
+from baserow.contrib.database.fields.dependencies.models import (
+    DeferredFieldUpdate,
+    FieldDependency,
+)
 from baserow.contrib.database.fields.handler import FieldHandler
 from baserow.contrib.database.fields.models import FormulaField, LookupField
 from baserow.contrib.database.fields.registries import field_type_registry
@@ -2379,3 +2387,120 @@ def test_formula_referencing_lookup_with_same_name_field_in_linked_table_being_r
 
     assert table_2_lookup.error is None
     assert table_2_formula.error is None
+
+
+@pytest.mark.django_db
+@pytest.mark.field_lookup
+def test_lookup_field_recalculated_in_background(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    table2 = data_fixture.create_database_table(user=user, database=table.database)
+    data_fixture.create_text_field(name="tableprimary", table=table, primary=True)
+    table2_primary_field = data_fixture.create_text_field(
+        name="table2primary", table=table2, primary=True
+    )
+    link_row_field = FieldHandler().create_field(
+        user, table, "link_row", name="link", link_row_table=table2
+    )
+    lookup_field = FieldHandler().create_field(
+        user,
+        table,
+        "lookup",
+        name="lookup",
+        through_field_id=link_row_field.id,
+        target_field_id=table2_primary_field.id,
+        recalculate_in_background=True,
+    )
+    assert lookup_field.recalculate_in_background is True
+
+    table2_row = RowHandler().create_row(
+        user, table2, {table2_primary_field.db_column: "a"}
+    )
+    row = RowHandler().create_row(
+        user, table, {link_row_field.db_column: [table2_row.id]}
+    )
+    model = table.get_model()
+
+    def lookup_values():
+        row_values = getattr(model.objects.get(id=row.id), lookup_field.db_column)
+        return [value["value"] for value in row_values]
+
+    # The lookup is recalculated right away when the row of its own table changes.
+    assert lookup_values() == ["a"]
+
+    RowHandler().update_row_by_id(
+        user, table2, table2_row.id, {table2_primary_field.db_column: "b"}
+    )
+    assert lookup_values() == ["a"]
+    assert DeferredFieldUpdate.objects.count() == 1
+
+    assert run_deferred_field_updates_batch() == 1
+    assert lookup_values() == ["b"]
+    assert DeferredFieldUpdate.objects.count() == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.field_lookup
+@override_settings(BASEROW_DEFERRED_FIELD_UPDATES_MAX_ATTEMPTS=2)
+def test_failed_deferred_field_updates_are_retried(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    table2 = data_fixture.create_database_table(user=user, database=table.database)
+    data_fixture.create_text_field(name="tableprimary", table=table, primary=True)
+    table2_primary_field = data_fixture.create_text_field(
+        name="table2primary", table=table2, primary=True
+    )
+    link_row_field = FieldHandler().create_field(
+        user, table, "link_row", name="link", link_row_table=table2
+    )
+    lookup_field = FieldHandler().create_field(
+        user,
+        table,
+        "lookup",
+        name="lookup",
+        through_field_id=link_row_field.id,
+        target_field_id=table2_primary_field.id,
+        recalculate_in_background=True,
+    )
+    table2_row = RowHandler().create_row(
+        user, table2, {table2_primary_field.db_column: "a"}
+    )
+    row = RowHandler().create_row(
+        user, table, {link_row_field.db_column: [table2_row.id]}
+    )
+    RowHandler().update_row_by_id(
+        user, table2, table2_row.id, {table2_primary_field.db_column: "b"}
+    )
+    model = table.get_model()
+
+    def lookup_values():
+        row_values = getattr(model.objects.get(id=row.id), lookup_field.db_column)
+        return [value["value"] for value in row_values]
+
+    with patch(
+        "baserow.contrib.database.fields.dependencies.deferred_updates"
+        "._run_deferred_field_updates_for_table",
+        side_effect=Exception("Failed"),
+    ):
+        assert run_deferred_field_updates_batch() == 1
+
+    # The failed update is kept, so that it's executed again.
+    assert DeferredFieldUpdate.objects.get().failed_attempts == 1
+    assert run_deferred_field_updates_batch() == 1
+    assert lookup_values() == ["b"]
+    assert DeferredFieldUpdate.objects.count() == 0
+
+    RowHandler().update_row_by_id(
+        user, table2, table2_row.id, {table2_primary_field.db_column: "c"}
+    )
+    with patch(
+        "baserow.contrib.database.fields.dependencies.deferred_updates"
+        "._run_deferred_field_updates_for_table",
+        side_effect=Exception("Failed"),
+    ):
+        assert run_deferred_field_updates_batch() == 1
+        assert run_deferred_field_updates_batch() == 1
+
+    # The update is discarded once it has failed the maximum number of times.
+    assert DeferredFieldUpdate.objects.count() == 0
+    assert lookup_values() == ["b"]
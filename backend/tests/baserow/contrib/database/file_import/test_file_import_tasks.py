@@ -1,3 +1,6 @@
+from decimal import Decimal
+from unittest.mock import patch
+
 from django.conf import settings
 from django.test.utils import override_settings
 from django.utils import timezone
@@ -15,7 +18,13 @@ from baserow.contrib.database.fields.exceptions import (
 )
 from baserow.contrib.database.fields.field_cache import FieldCache
 from baserow.contrib.database.fields.models import SelectOption, TextField
+from baserow.contrib.database.file_import.job_types import FileImportJobType
+from baserow.contrib.database.rows.constants import (
+    ROW_IMPORT_CHUNKS,
+    ROW_IMPORT_FINALIZING,
+)
 from baserow.contrib.database.rows.exceptions import ReportMaxErrorCountExceeded
+from baserow.contrib.database.rows.handler import RowHandler
 from baserow.contrib.database.table.exceptions import (
     InitialTableDataDuplicateName,
     InitialTableDataLimitExceeded,
@@ -499,6 +508,66 @@ def test_run_file_import_test_chunk(data_fixture, patch_filefield_storage):
     assert job.progress_percentage == 100
 
 
+@pytest.mark.django_db(transaction=True)
+@override_settings(BASEROW_FILE_IMPORT_PARALLEL_CHUNK_SIZE=4)
+def test_run_file_import_in_parallel_chunks(data_fixture, patch_filefield_storage):
+    user = data_fixture.create_user()
+    database = data_fixture.create_database_application(user=user)
+
+    with patch_filefield_storage():
+        job = data_fixture.create_file_import_job(
+            user=user,
+            database=database,
+            first_row_header=True,
+            data=[["A", "B"]] + [[f"{i}-1", f"{i}-2"] for i in range(10)] + [["x"]],
+        )
+        run_async_job(job.id)
+
+    job.refresh_from_db()
+
+    assert job.state == JOB_FINISHED
+    assert job.progress_percentage == 100
+    assert job.report == {"failing_rows": {}}
+    with pytest.raises(ValueError):
+        job.data_file.path
+
+    text_fields = TextField.objects.filter(table=job.table)
+    assert [field.name for field in text_fields] == ["A", "B"]
+    rows = job.table.get_model().objects.all()
+    assert [getattr(row, f"field_{text_fields[0].id}") for row in rows] == [
+        f"{i}-1" for i in range(10)
+    ] + ["x"]
+
+    table, fields, _ = data_fixture.build_table(
+        columns=[("text", "text"), ("number", "number")], rows=[["a", 1]], user=user
+    )
+    data = [[f"{i}", i] for i in range(10)]
+    data[6] = ["bad", "bad"]
+
+    with patch_filefield_storage():
+        job = data_fixture.create_file_import_job(table=table, data=data, user=user)
+        run_async_job(job.id)
+
+    job.refresh_from_db()
+
+    assert job.state == JOB_FINISHED
+    assert list(job.report["failing_rows"].keys()) == ["6"]
+
+    model = table.get_model()
+    assert [getattr(row, f"field_{fields[0].id}") for row in model.objects.all()] == [
+        "a",
+        "0",
+        "1",
+        "2",
+        "3",
+        "4",
+        "5",
+        "7",
+        "8",
+        "9",
+    ]
+
+
 @pytest.mark.django_db()
 def test_run_file_import_limit(data_fixture, patch_filefield_storage):
     row_count = 2000
@@ -645,3 +714,121 @@ def test_cleanup_file_import_job(data_fixture, settings, patch_filefield_storage
     job3.refresh_from_db()
     assert job3.state == JOB_FINISHED
     assert job3.updated_on == time_before_soft_limit
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(BASEROW_FILE_IMPORT_PARALLEL_CHUNK_SIZE=4)
+def test_cleanup_fails_file_import_job_with_chunks_not_imported_in_time(
+    data_fixture, settings, patch_filefield_storage
+):
+    user = data_fixture.create_user()
+    database = data_fixture.create_database_application(user=user)
+    now = timezone.now()
+    time_before_soft_limit = now - timezone.timedelta(
+        minutes=settings.BASEROW_JOB_SOFT_TIME_LIMIT + 1
+    )
+
+    with patch_filefield_storage() as storage, patch(
+        "baserow.contrib.database.file_import.tasks.import_file_import_chunk.delay"
+    ) as mock_delay:
+        with freeze_time(time_before_soft_limit):
+            job = data_fixture.create_file_import_job(
+                user=user,
+                database=database,
+                first_row_header=False,
+                data=[[f"{i}-1", f"{i}-2"] for i in range(10)],
+            )
+            run_async_job(job.id)
+
+        job.refresh_from_db()
+        assert job.state == ROW_IMPORT_CHUNKS
+        chunk_files = job.report["chunks"]["files"]
+        assert mock_delay.call_count == len(chunk_files) == 2
+        assert all(storage.exists(chunk_file) for chunk_file in chunk_files)
+
+        with freeze_time(now):
+            clean_up_jobs()
+
+        assert not any(storage.exists(chunk_file) for chunk_file in chunk_files)
+
+    job.refresh_from_db()
+    assert job.state == JOB_FAILED
+    assert job.error == "The chunks haven't been imported in time."
+    assert "chunks" not in job.report
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(BASEROW_FILE_IMPORT_PARALLEL_CHUNK_SIZE=4)
+def test_file_import_job_in_chunks_is_finalized_once(
+    data_fixture, settings, patch_filefield_storage
+):
+    user = data_fixture.create_user()
+    table, fields, _ = data_fixture.build_table(
+        columns=[("text", "text")], rows=[["a"]], user=user
+    )
+    now = timezone.now()
+    time_before_soft_limit = now - timezone.timedelta(
+        minutes=settings.BASEROW_JOB_SOFT_TIME_LIMIT + 1
+    )
+
+    with patch_filefield_storage(), patch(
+        "baserow.contrib.database.file_import.tasks.import_file_import_chunk.delay"
+    ) as mock_delay, patch.object(
+        RowHandler,
+        "update_dependant_fields_of_created_rows",
+        autospec=True,
+        side_effect=RowHandler.update_dependant_fields_of_created_rows,
+    ) as mock_update_dependant_fields, patch.object(
+        FileImportJobType,
+        "finalize_chunks",
+        autospec=True,
+        side_effect=FileImportJobType.finalize_chunks,
+    ) as mock_finalize_chunks:
+        with freeze_time(time_before_soft_limit):
+            job = data_fixture.create_file_import_job(
+                table=table, data=[[f"{i}"] for i in range(10)], user=user
+            )
+            run_async_job(job.id)
+
+        assert mock_delay.call_count == 2
+        job_type = FileImportJobType()
+        for (
+            job_id,
+            chunk_file,
+            start,
+            end,
+            first_order,
+        ), _ in mock_delay.call_args_list:
+            job.refresh_from_db()
+            job_type.run_chunk(job, chunk_file, start, end, Decimal(first_order))
+
+        job.refresh_from_db()
+        assert job.state == JOB_FINISHED
+        assert mock_finalize_chunks.call_count == 1
+        # The dependant fields are updated once for the rows of all the chunks.
+        assert mock_update_dependant_fields.call_count == 1
+        _, updated_table, row_ids = mock_update_dependant_fields.call_args[0]
+        assert updated_table.id == table.id
+        assert len(row_ids) == 10
+
+        # A late chunk task doesn't finalize the job a second time.
+        job_type.run_chunk(job, "missing_chunk.json", 0, 4, Decimal("100"))
+        assert mock_finalize_chunks.call_count == 1
+
+        # A job that a chunk task is finalizing isn't finalized when it expires.
+        with freeze_time(time_before_soft_limit):
+            job = data_fixture.create_file_import_job(
+                table=table, data=[[f"{i}"] for i in range(10)], user=user
+            )
+            run_async_job(job.id)
+        job.refresh_from_db()
+        job.state = ROW_IMPORT_FINALIZING
+        job.save(update_fields=("state",))
+
+        with freeze_time(now):
+            clean_up_jobs()
+
+        assert mock_finalize_chunks.call_count == 1
+
+    job.refresh_from_db()
+    assert job.state == JOB_FAILED
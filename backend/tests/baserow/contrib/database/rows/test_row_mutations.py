@@ -0,0 +1,82 @@
+from unittest.mock import patch
+
+from django.db import transaction
+
+import pytest
+
+from baserow.contrib.database.api.rows import serializers as row_serializers
+from baserow.contrib.database.rows.handler import RowHandler
+from baserow.contrib.database.rows.mutations import get_row_mutation_buffer
+
+
+@pytest.mark.django_db
+def test_row_mutation_buffer_per_savepoint(django_capture_on_commit_callbacks):
+    calls = []
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        buffer = get_row_mutation_buffer()
+        buffer.add_consumer("first", lambda: calls.append("first"))
+        assert get_row_mutation_buffer() is buffer
+        buffer.add_consumer("second", lambda: calls.append("second"))
+
+        with transaction.atomic():
+            nested_buffer = get_row_mutation_buffer()
+            nested_buffer.add_consumer("nested", lambda: calls.append("nested"))
+        assert nested_buffer is not buffer
+
+        with pytest.raises(ValueError), transaction.atomic():
+            get_row_mutation_buffer().add_consumer(
+                "rolled_back", lambda: calls.append("rolled_back")
+            )
+            raise ValueError()
+
+        assert calls == []
+
+    assert len(callbacks) == 2
+    assert calls == ["first", "second", "nested"]
+
+
+@pytest.mark.django_db
+def test_row_mutation_buffer_keeps_order_of_on_commit_callbacks(
+    django_capture_on_commit_callbacks,
+):
+    calls = []
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        buffer = get_row_mutation_buffer()
+        buffer.add_consumer("first", lambda: calls.append("first"))
+        transaction.on_commit(lambda: calls.append("other"))
+
+        # The consumers of the next mutations must run after the other callback.
+        next_buffer = get_row_mutation_buffer()
+        assert next_buffer is not buffer
+        next_buffer.add_consumer("second", lambda: calls.append("second"))
+        assert get_row_mutation_buffer() is next_buffer
+        next_buffer.add_consumer("third", lambda: calls.append("third"))
+
+    assert len(callbacks) == 3
+    assert calls == ["first", "other", "second", "third"]
+
+
+@pytest.mark.django_db(transaction=True)
+@patch("baserow.ws.registries.broadcast_to_channel_group")
+def test_row_mutation_rows_serialized_once(
+    mock_broadcast_to_channel_group, data_fixture
+):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_text_field(table=table, primary=True)
+    data_fixture.create_grid_view(table=table, public=True)
+
+    with patch.object(
+        row_serializers,
+        "serialize_rows_for_response",
+        wraps=row_serializers.serialize_rows_for_response,
+    ) as serialize_rows_for_response:
+        RowHandler().create_rows(
+            user, table, [{f"field_{field.id}": "a"}, {f"field_{field.id}": "b"}]
+        )
+
+    # Both the table and the public view page receive the new rows.
+    assert len(mock_broadcast_to_channel_group.delay.mock_calls) == 2
+    serialize_rows_for_response.assert_called_once()
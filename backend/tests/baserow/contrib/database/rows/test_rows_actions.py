@@ -16,6 +16,7 @@ from baserow.contrib.database.rows.actions import (
     MoveRowActionType,
     UpdateRowActionType,
     UpdateRowsActionType,
+    UpsertRowsActionType,
 )
 from baserow.contrib.database.rows.handler import RowHandler
 from baserow.core.action.handler import ActionHandler
@@ -1299,3 +1300,54 @@ def test_can_undo_redo_update_rows_interesting_field_types(data_fixture):
         )
     ) == [multi_select_option_2.id]
     assert getattr(row_table_1, f"field_{formula_field.id}") == "New value"
+
+
+@pytest.mark.django_db
+@pytest.mark.undo_redo
+def test_can_undo_redo_upsert_rows(data_fixture):
+    session_id = "session-id"
+    user = data_fixture.create_user(session_id=session_id)
+    table = data_fixture.create_database_table(user=user)
+    key_field = data_fixture.create_text_field(table=table, name="Key", primary=True)
+    name_field = data_fixture.create_text_field(table=table, name="Name")
+
+    existing_row = RowHandler().create_row(
+        user, table, {key_field.id: "a", name_field.id: "Original value"}
+    )
+
+    created_rows, updated_rows = action_type_registry.get_by_type(
+        UpsertRowsActionType
+    ).do(
+        user,
+        table,
+        [
+            {key_field.db_column: "a", name_field.db_column: "New value"},
+            {key_field.db_column: "b", name_field.db_column: "Created"},
+        ],
+        key_field,
+    )
+
+    assert [row.id for row in updated_rows] == [existing_row.id]
+    assert len(created_rows) == 1
+    model = table.get_model()
+
+    def get_values():
+        return list(
+            model.objects.order_by("id").values_list(
+                key_field.db_column, name_field.db_column
+            )
+        )
+
+    assert get_values() == [("a", "New value"), ("b", "Created")]
+
+    actions_undone = ActionHandler.undo(
+        user, [TableActionScopeType.value(table_id=table.id)], session_id
+    )
+    assert_undo_redo_actions_are_valid(actions_undone, [UpsertRowsActionType])
+    assert get_values() == [("a", "Original value")]
+
+    actions_redone = ActionHandler.redo(
+        user, [TableActionScopeType.value(table_id=table.id)], session_id
+    )
+    assert_undo_redo_actions_are_valid(actions_redone, [UpsertRowsActionType])
+    assert get_values() == [("a", "New value"), ("b", "Created")]
@@ -3,20 +3,32 @@ from decimal import Decimal
 from unittest.mock import patch
 
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connection, models
+from django.test.utils import override_settings
 
 import pytest
 from freezegun import freeze_time
 from pyinstrument import Profiler
 
+from baserow.contrib.database.api.rows.serializers import serialize_rows_for_response
 from baserow.contrib.database.api.utils import (
     extract_field_ids_from_string,
     get_include_exclude_fields,
 )
-from baserow.contrib.database.rows.exceptions import RowDoesNotExist
+from baserow.contrib.database.fields.exceptions import IncompatibleField
+from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.contrib.database.rows.exceptions import (
+    RowDoesNotExist,
+    UpsertKeyValuesNotUnique,
+)
 from baserow.contrib.database.rows.handler import RowHandler
+from baserow.contrib.database.rows.tasks import rebalance_row_orders_around_row
 from baserow.core.exceptions import UserNotInWorkspace
 from baserow.core.trash.handler import TrashHandler
+from tests.baserow.contrib.database.utils import (
+    create_table_with_bulk_row_fields,
+    without_generated_values,
+)
 
 
 def test_get_field_ids_from_dict():
@@ -1437,3 +1449,380 @@ def test_recalculate_row_orders(send_mock, data_fixture):
 
     send_mock.assert_called_once()
     assert send_mock.call_args[1]["table"].id == table.id
+
+
+@pytest.mark.django_db
+@patch("baserow.contrib.database.rows.signals.row_orders_recalculated.send")
+def test_rebalance_row_orders_only_around_row(send_mock, data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    model = table.get_model()
+
+    first_rows = [model.objects.create(order=order) for order in range(1, 101)]
+    crowded_rows = [
+        model.objects.create(order=f"200.0000000000000000000{index}")
+        for index in range(1, 4)
+    ]
+    last_row = model.objects.create(order="300.00000000000000000000")
+
+    RowHandler().rebalance_row_orders(table, crowded_rows[2], model)
+
+    rows = list(model.objects.all())
+    assert [row.id for row in rows] == [
+        row.id for row in first_rows + crowded_rows + [last_row]
+    ]
+    # Only the 50 rows before and after the row are spread, starting right after
+    # the order of the first row outside of the window.
+    assert [row.order for row in rows] == [Decimal(order) for order in range(1, 105)]
+    send_mock.assert_called_once()
+
+    crowded_rows[2].refresh_from_db()
+    row = RowHandler().create_row(
+        user, table, {}, model=model, before_row=crowded_rows[2]
+    )
+    assert Decimal("102") < row.order < Decimal("103")
+
+
+@pytest.mark.django_db
+def test_rebalance_row_orders_only_in_window_in_middle_of_table(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    model = table.get_model()
+
+    first_rows = model.objects.bulk_create(
+        [model(order=order) for order in range(1, 201)]
+    )
+    crowded_rows = model.objects.bulk_create(
+        [model(order=f"200.0000000000000000000{index}") for index in range(1, 4)]
+    )
+    last_rows = model.objects.bulk_create(
+        [model(order=order) for order in range(201, 401)]
+    )
+
+    RowHandler().rebalance_row_orders(table, crowded_rows[2], model)
+
+    rows = list(model.objects.all())
+    assert [row.id for row in rows] == [
+        row.id for row in first_rows + crowded_rows + last_rows
+    ]
+    # The 50 rows before and after the row are spread with the power of ten step
+    # that fits between the orders 152 and 250 of the rows surrounding the window,
+    # the other rows keep their order.
+    assert [row.order for row in rows] == (
+        [Decimal(order) for order in range(1, 153)]
+        + [Decimal("152.1") + Decimal("0.1") * index for index in range(100)]
+        + [Decimal(order) for order in range(250, 401)]
+    )
+
+
+@pytest.mark.django_db
+def test_rebalance_row_orders_widens_window_when_orders_collide_at_edge(
+    data_fixture,
+):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    model = table.get_model()
+
+    first_rows = model.objects.bulk_create(
+        [model(order=order) for order in range(1, 11)]
+    )
+    colliding_rows = model.objects.bulk_create([model(order=50) for _ in range(120)])
+    last_rows = model.objects.bulk_create(
+        [model(order=order) for order in range(100, 400)]
+    )
+
+    RowHandler().rebalance_row_orders(table, colliding_rows[60], model)
+
+    rows = list(model.objects.all())
+    assert [row.id for row in rows] == [
+        row.id for row in first_rows + colliding_rows + last_rows
+    ]
+    # The rows right outside of the initial window have the same order as the rows
+    # in it, so the window is widened until the 140th row after the colliding rows.
+    assert [row.order for row in rows] == (
+        [Decimal("0.1") * index for index in range(1, 271)]
+        + [Decimal(order) for order in range(240, 400)]
+    )
+
+
+@pytest.mark.django_db
+@patch("baserow.contrib.database.rows.tasks.rebalance_row_orders_around_row.delay")
+def test_row_orders_are_rebalanced_in_background_before_running_out(
+    mock_delay, data_fixture, django_capture_on_commit_callbacks
+):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    model = table.get_model()
+    handler = RowHandler()
+
+    close_rows = [
+        model.objects.create(order=round(Decimal(1) / denominator, 20))
+        for denominator in (9999999, 9999998)
+    ]
+    row_1 = model.objects.create(order=1)
+    row_2 = model.objects.create(order=2)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        row_3 = handler.create_row(user, table, {}, model=model, before_row=row_2)
+    assert row_3.order == Decimal("1.5")
+    mock_delay.assert_not_called()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        row = handler.create_row(user, table, {}, model=model, before_row=close_rows[1])
+    assert close_rows[0].order < row.order < close_rows[1].order
+    mock_delay.assert_called_once_with(table.id, close_rows[1].id)
+
+    rebalance_row_orders_around_row(table.id, close_rows[1].id)
+
+    rows = list(model.objects.all())
+    assert [row.id for row in rows] == [
+        close_rows[0].id,
+        row.id,
+        close_rows[1].id,
+        row_1.id,
+        row_3.id,
+        row_2.id,
+    ]
+    assert [row.order for row in rows] == [Decimal(order) for order in range(1, 7)]
+
+
+@pytest.mark.django_db
+def test_create_rows_use_copy(data_fixture):
+    user = data_fixture.create_user()
+    table, fields, related_rows = create_table_with_bulk_row_fields(data_fixture, user)
+    name_field, number_field, boolean_field, date_field, link_field = (
+        fields[name] for name in ("Name", "Number", "Bool", "Date", "Link")
+    )
+    field_handler = FieldHandler()
+    multiple_select_field = field_handler.create_field(
+        user,
+        table,
+        "multiple_select",
+        name="Select",
+        select_options=[
+            {"value": "A", "color": "blue"},
+            {"value": "B", "color": "red"},
+        ],
+    )
+    autonumber_field = field_handler.create_field(
+        user, table, "autonumber", name="Number id"
+    )
+
+    handler = RowHandler()
+    options = list(multiple_select_field.select_options.order_by("id"))
+    rows_values = [
+        {
+            name_field.db_column: "Tab\there\\ and\nnew line",
+            number_field.db_column: "1.50",
+            boolean_field.db_column: True,
+            date_field.db_column: "2020-01-01T12:00:00Z",
+            link_field.db_column: [related_row.id for related_row in related_rows],
+            multiple_select_field.db_column: [option.id for option in options],
+        },
+        {},
+    ]
+
+    copied_rows = handler.create_rows(user, table, rows_values, use_copy=True)
+    inserted_rows = handler.create_rows(user, table, rows_values)
+
+    model = table.get_model()
+    serialized = serialize_rows_for_response(
+        model.objects.all().enhance_by_fields().order_by("id"),
+        model,
+        user_field_names=True,
+    )
+    assert [row["id"] for row in serialized] == [
+        row.id for row in copied_rows + inserted_rows
+    ]
+    assert [row["Number id"] for row in serialized] == [1, 2, 3, 4]
+    assert [row["Formula"] for row in serialized[:2]] == [
+        "Tab\there\\ and\nnew line!",
+        "!",
+    ]
+    assert serialized[0]["Lookup"] == "X,Y"
+    assert [row["order"] for row in serialized] == [
+        f"{order}.00000000000000000000" for order in range(1, 5)
+    ]
+
+    generated_keys = ("id", "order", autonumber_field.name)
+    assert [
+        without_generated_values(row, generated_keys) for row in serialized[:2]
+    ] == [without_generated_values(row, generated_keys) for row in serialized[2:]]
+
+
+@pytest.mark.django_db
+def test_create_rows_skip_dependant_fields_update(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    related_table = data_fixture.create_database_table(
+        user=user, database=table.database
+    )
+    related_primary_field = data_fixture.create_text_field(
+        table=related_table, primary=True, name="Name"
+    )
+    field_handler = FieldHandler()
+    field_handler.create_field(user, table, "text", name="Name", primary=True)
+    link_field = field_handler.create_field(
+        user, table, "link_row", name="Link", link_row_table=related_table
+    )
+    count_field = field_handler.create_field(
+        user,
+        related_table,
+        "count",
+        name="Count",
+        through_field_id=link_field.link_row_related_field_id,
+    )
+
+    handler = RowHandler()
+    related_row = handler.create_row(
+        user, related_table, {related_primary_field.db_column: "X"}
+    )
+    rows = handler.create_rows(
+        user,
+        table,
+        [{link_field.db_column: [related_row.id]} for _ in range(3)],
+        skip_dependant_fields_update=True,
+    )
+
+    related_row.refresh_from_db()
+    assert getattr(related_row, count_field.db_column) == 0
+
+    handler.update_dependant_fields_of_created_rows(table, [row.id for row in rows])
+
+    related_row.refresh_from_db()
+    assert getattr(related_row, count_field.db_column) == 3
+
+
+@pytest.mark.django_db
+def test_update_rows_use_values(data_fixture):
+    user = data_fixture.create_user()
+    table, fields, related_rows = create_table_with_bulk_row_fields(data_fixture, user)
+    name_field, number_field, boolean_field, date_field, link_field = (
+        fields[name] for name in ("Name", "Number", "Bool", "Date", "Link")
+    )
+
+    handler = RowHandler()
+    rows = handler.create_rows(user, table, [{name_field.db_column: "a"}] * 4)
+    rows_values = [
+        {
+            name_field.db_column: "Quote ' and\nnew line",
+            number_field.db_column: "1.50",
+            boolean_field.db_column: True,
+            date_field.db_column: "2020-01-01T12:00:00Z",
+            link_field.db_column: [related_row.id for related_row in related_rows],
+        },
+        {
+            name_field.db_column: None,
+            number_field.db_column: None,
+            date_field.db_column: None,
+        },
+    ]
+
+    with override_settings(BASEROW_ROWS_BULK_UPDATE_USE_VALUES=True):
+        handler.update_rows(
+            user,
+            table,
+            [{"id": row.id, **values} for row, values in zip(rows[:2], rows_values)],
+        )
+    handler.update_rows(
+        user,
+        table,
+        [{"id": row.id, **values} for row, values in zip(rows[2:], rows_values)],
+    )
+
+    model = table.get_model()
+    serialized = serialize_rows_for_response(
+        model.objects.all().enhance_by_fields().order_by("id"),
+        model,
+        user_field_names=True,
+    )
+    assert [row["Formula"] for row in serialized[:2]] == [
+        "Quote ' and\nnew line!",
+        "!",
+    ]
+    assert serialized[0]["Lookup"] == "X,Y"
+
+    assert [without_generated_values(row) for row in serialized[:2]] == [
+        without_generated_values(row) for row in serialized[2:]
+    ]
+
+
+@pytest.mark.django_db
+def test_upsert_rows(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    key_field = data_fixture.create_text_field(table=table, primary=True)
+    number_field = data_fixture.create_number_field(table=table)
+    formula_field = data_fixture.create_formula_field(
+        table=table, formula="1", formula_type="number"
+    )
+    handler = RowHandler()
+    existing_rows = handler.create_rows(
+        user,
+        table,
+        [
+            {key_field.db_column: "a", number_field.db_column: 1},
+            {key_field.db_column: "b", number_field.db_column: 2},
+            {key_field.db_column: "b", number_field.db_column: 3},
+        ],
+    )
+
+    created_rows, updated_rows_values, update_result = handler.upsert_rows(
+        user,
+        table,
+        [
+            {key_field.db_column: "b", number_field.db_column: 20},
+            {key_field.db_column: "c", number_field.db_column: 30},
+            {number_field.db_column: 40},
+        ],
+        key_field,
+    )
+
+    assert [row.id for row in update_result.updated_rows] == [existing_rows[1].id]
+    assert updated_rows_values == [
+        {
+            "id": existing_rows[1].id,
+            key_field.db_column: "b",
+            number_field.db_column: 20,
+        }
+    ]
+    assert len(created_rows) == 2
+    model = table.get_model()
+    assert list(
+        model.objects.order_by("id").values_list(
+            key_field.db_column, number_field.db_column
+        )
+    ) == [("a", 1), ("b", 20), ("b", 3), ("c", 30), (None, 40)]
+
+    with pytest.raises(UpsertKeyValuesNotUnique):
+        handler.upsert_rows(
+            user,
+            table,
+            [{key_field.db_column: "d"}, {key_field.db_column: "d"}],
+            key_field,
+        )
+
+    with pytest.raises(IncompatibleField):
+        handler.upsert_rows(user, table, [{}], formula_field)
+
+
+@pytest.mark.django_db
+def test_upsert_rows_locks_the_key_field_until_the_end_of_the_transaction(
+    data_fixture,
+):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    key_field = data_fixture.create_text_field(table=table, primary=True)
+
+    RowHandler().upsert_rows(user, table, [{key_field.db_column: "a"}], key_field)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT count(*) FROM pg_locks
+            WHERE locktype = 'advisory' AND classid = %s AND objid = %s
+            AND objsubid = 2 AND pid = pg_backend_pid() AND granted
+            """,
+            [table.id, key_field.id],
+        )
+        assert cursor.fetchone()[0] == 1
@@ -0,0 +1,67 @@
+from unittest.mock import patch
+
+from django.db import transaction
+from django.test.utils import override_settings
+
+import pytest
+
+from baserow.contrib.database.action.scopes import TableActionScopeType
+from baserow.contrib.database.rows.handler import RowHandler
+from baserow.contrib.database.rows.job_types import DeleteRowsJobType
+from baserow.core.action.handler import ActionHandler
+from baserow.core.jobs.constants import JOB_FINISHED
+from baserow.core.jobs.handler import JobHandler
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(BASEROW_DELETE_ROWS_JOB_CHUNK_SIZE=2)
+@patch("baserow.ws.registries.broadcast_to_channel_group")
+@patch("baserow.contrib.database.ws.table.signals.broadcast_to_permitted_users")
+def test_can_submit_delete_rows_job(
+    mock_broadcast_to_permitted_users, mock_broadcast_to_channel_group, data_fixture
+):
+    session_id = "session-id"
+    user = data_fixture.create_user(session_id=session_id)
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_text_field(table=table, primary=True)
+    rows = RowHandler().create_rows(
+        user, table, [{f"field_{field.id}": str(i)} for i in range(5)]
+    )
+    mock_broadcast_to_channel_group.reset_mock()
+
+    job = JobHandler().create_and_start_job(
+        user,
+        DeleteRowsJobType.type,
+        table_id=table.id,
+        row_ids=[row.id for row in rows[:4]] + [99999],
+        user_session_id=session_id,
+    )
+
+    job.refresh_from_db()
+    assert job.state == JOB_FINISHED
+    assert job.progress_percentage == 100
+    assert job.deleted_rows_count == 4
+
+    model = table.get_model()
+    assert list(model.objects.values_list("id", flat=True)) == [rows[4].id]
+
+    # A single table refresh is sent instead of the deleted rows of every chunk.
+    mock_broadcast_to_channel_group.delay.assert_not_called()
+    mock_broadcast_to_permitted_users.delay.assert_called_once()
+    assert mock_broadcast_to_permitted_users.delay.call_args[0][4] == {
+        "type": "table_updated",
+        "table_id": table.id,
+        "table": {
+            "id": table.id,
+            "name": table.name,
+            "order": table.order,
+            "database_id": table.database_id,
+        },
+        "force_table_refresh": True,
+    }
+
+    # The actions of all the chunks are undone together.
+    with transaction.atomic():
+        ActionHandler.undo(user, [TableActionScopeType.value(table.id)], session_id)
+
+    assert model.objects.count() == 5
@@ -3,7 +3,15 @@ from django.test.utils import override_settings
 import pytest
 
 from baserow.contrib.database.fields.handler import FieldHandler
-from baserow.contrib.database.table.cache import get_cached_model_field_attrs
+from baserow.contrib.database.table.cache import (
+    GeneratedModelLRUCache,
+    decode_field_attrs_snapshot,
+    encode_field_attrs_snapshot,
+    generated_models_cache,
+    get_cached_model_field_attrs,
+    local_generated_models_cache,
+    table_model_cache_entry_key,
+)
 from baserow.core.trash.handler import TrashHandler
 
 
@@ -204,3 +212,132 @@ def test_deleting_field_invalidates_tables_model_cache(data_fixture):
 
     table.refresh_from_db()
     assert get_cached_model_field_attrs(table) is None
+
+
+@pytest.mark.django_db
+@override_settings(BASEROW_IN_PROCESS_MODEL_CACHE_SIZE=10)
+def test_in_process_model_cache_returns_same_model_class(data_fixture):
+    local_generated_models_cache.clear()
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    data_fixture.create_text_field(table=table, primary=True)
+
+    model = table.get_model()
+    assert table.get_model() is model
+    assert table.get_model(field_ids=[]) is not model
+    assert table.get_model(field_ids=[]) is table.get_model(field_ids=[])
+
+    FieldHandler().create_field(user, table, "text", name="new")
+
+    new_model = table.get_model()
+    assert new_model is not model
+    assert len(new_model._field_objects) == 2
+
+
+@pytest.mark.django_db
+@override_settings(BASEROW_IN_PROCESS_MODEL_CACHE_SIZE=10)
+def test_in_process_model_cache_is_invalidated_by_related_table_change(
+    data_fixture,
+):
+    local_generated_models_cache.clear()
+    user = data_fixture.create_user()
+    table_a, table_b, link_field = data_fixture.create_two_linked_tables(user=user)
+
+    model_a = table_a.get_model()
+    assert table_a.get_model() is model_a
+
+    data_fixture.create_text_field(table=table_b, name="new")
+
+    new_model_a = table_a.get_model()
+    assert new_model_a is not model_a
+    field_name = f"field_{link_field.id}"
+    old_related_model = model_a._meta.get_field(field_name).related_model
+    new_related_model = new_model_a._meta.get_field(field_name).related_model
+    assert len(new_related_model._field_objects) == (
+        len(old_related_model._field_objects) + 1
+    )
+
+
+@pytest.mark.django_db
+@override_settings(BASEROW_IN_PROCESS_MODEL_CACHE_SIZE=0)
+def test_in_process_model_cache_can_be_disabled(data_fixture):
+    local_generated_models_cache.clear()
+    table = data_fixture.create_database_table()
+
+    assert table.get_model() is not table.get_model()
+
+
+def test_generated_model_lru_cache_evicts_least_recently_used():
+    cache = GeneratedModelLRUCache(max_size=2)
+
+    cache.set("a", "model_a", {1: "v1"})
+    cache.set("b", "model_b", {2: "v1"})
+    assert cache.get("a") == ("model_a", {1: "v1"})
+    cache.set("c", "model_c", {1: "v1", 3: "v1"})
+
+    assert cache.get("b") is None
+    assert cache.get("c") == ("model_c", {1: "v1", 3: "v1"})
+
+    cache.invalidate_table(1)
+    assert cache.get("a") is None
+    assert cache.get("c") is None
+
+    assert cache.get_stats() == {
+        "size": 0,
+        "max_size": 2,
+        "hits": 2,
+        "misses": 3,
+        "evictions": 1,
+        "invalidations": 2,
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("compress", [True, False])
+def test_field_attrs_snapshot_can_be_encoded_and_decoded(data_fixture, compress):
+    table = data_fixture.create_database_table()
+    text_field = data_fixture.create_text_field(table=table, primary=True)
+    number_field = data_fixture.create_number_field(
+        table=table, number_decimal_places=2
+    )
+    trashed_field = data_fixture.create_boolean_field(table=table, trashed=True)
+
+    model = table.get_model()
+    field_attrs = {
+        "_field_objects": model._field_objects,
+        "_trashed_field_objects": model._trashed_field_objects,
+    }
+    snapshot = encode_field_attrs_snapshot(field_attrs, compress=compress)
+    fields = decode_field_attrs_snapshot(snapshot)
+
+    assert [(f.id, f.__class__, f.trashed) for f in fields] == [
+        (text_field.id, text_field.__class__, False),
+        (number_field.id, number_field.__class__, False),
+        (trashed_field.id, trashed_field.__class__, True),
+    ]
+    assert fields[0].primary is True
+    assert fields[1].number_decimal_places == 2
+
+
+@pytest.mark.django_db
+@override_settings(
+    BASEROW_GENERATED_MODEL_CACHE_FORMAT="snapshot",
+    BASEROW_GENERATED_MODEL_CACHE_COMPRESSION=True,
+)
+def test_get_model_with_snapshot_cache_format(data_fixture, django_assert_num_queries):
+    table = data_fixture.create_database_table()
+    text_field = data_fixture.create_text_field(table=table, primary=True)
+    data_fixture.create_number_field(table=table)
+
+    model = table.get_model()
+    cache_entry = generated_models_cache.get(table_model_cache_entry_key(table.id))
+    assert "field_attrs" not in cache_entry
+    assert isinstance(cache_entry["snapshot"], bytes)
+
+    with django_assert_num_queries(1):
+        cached_model = table.get_model()
+
+    assert cached_model._field_objects.keys() == model._field_objects.keys()
+    row = cached_model.objects.create(**{text_field.db_column: "a"})
+    row.refresh_from_db()
+    assert str(row) == "a"
@@ -28,6 +28,7 @@ from baserow.contrib.database.fields.models import (
 )
 from baserow.contrib.database.management.commands.fill_table_rows import fill_table_rows
 from baserow.contrib.database.rows.handler import RowHandler
+from baserow.contrib.database.table.cache import local_generated_models_cache
 from baserow.contrib.database.table.constants import (
     LAST_MODIFIED_BY_COLUMN_NAME,
     ROW_NEEDS_BACKGROUND_UPDATE_COLUMN_NAME,
@@ -962,3 +963,60 @@ def test_get_database_table_storage_usage(data_fixture):
     )
 
     assert TableUsageHandler.calculate_table_storage_usage(table.id) == 10
+
+
+@pytest.mark.django_db
+def test_get_recently_used_tables(data_fixture):
+    database = data_fixture.create_database_application()
+    with freeze_time("2024-01-01"):
+        table_1 = data_fixture.create_database_table(database=database)
+    with freeze_time("2024-01-02"):
+        table_2 = data_fixture.create_database_table(database=database)
+    with freeze_time("2024-01-03"):
+        table_3 = data_fixture.create_database_table(database=database)
+    with freeze_time("2024-01-04"):
+        TableUsageHandler.mark_table_for_usage_update(table_1.id, 1)
+
+    handler = TableHandler()
+    assert list(handler.get_recently_used_tables(3)) == [table_1, table_3, table_2]
+    assert list(handler.get_recently_used_tables(1)) == [table_1]
+
+
+@pytest.mark.django_db
+@override_settings(BASEROW_IN_PROCESS_MODEL_CACHE_SIZE=10)
+def test_warm_up_models(data_fixture):
+    local_generated_models_cache.clear()
+    database = data_fixture.create_database_application()
+    for _ in range(3):
+        table = data_fixture.create_database_table(database=database)
+        data_fixture.create_text_field(table=table, primary=True)
+
+    handler = TableHandler()
+    warmed_up, duration = handler.warm_up_models(count=2, time_budget=10)
+    assert warmed_up == 2
+    assert duration >= 0
+
+    # The models of the warmed up tables are served from the in process cache.
+    stats = local_generated_models_cache.get_stats()
+    assert stats["size"] == 2
+    for table in handler.get_recently_used_tables(2):
+        table.get_model()
+    assert local_generated_models_cache.get_stats()["hits"] == stats["hits"] + 2
+    assert local_generated_models_cache.get_stats()["size"] == 2
+
+    assert handler.warm_up_models(count=3, time_budget=0)[0] <= 1
+
+    with override_settings(BASEROW_MODEL_WARM_UP_TABLE_COUNT=0):
+        assert handler.warm_up_models() == (0, 0.0)
+
+
+@pytest.mark.django_db
+@override_settings(BASEROW_IN_PROCESS_MODEL_CACHE_SIZE=0)
+def test_warm_up_models_is_skipped_without_the_in_process_model_cache(data_fixture):
+    table = data_fixture.create_database_table()
+    data_fixture.create_text_field(table=table, primary=True)
+
+    with patch.object(Table, "get_model") as mock_get_model:
+        assert TableHandler().warm_up_models(count=2, time_budget=10) == (0, 0.0)
+
+    mock_get_model.assert_not_called()
@@ -7,7 +7,7 @@ from django.conf import settings
 from django.core.cache import caches
 from django.db import connection, models
 from django.db.models import Field
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
 
 import pytest
 from cachalot.settings import cachalot_settings
@@ -28,7 +28,7 @@ from baserow.contrib.database.table.constants import (
     LAST_MODIFIED_BY_COLUMN_NAME,
     ROW_NEEDS_BACKGROUND_UPDATE_COLUMN_NAME,
 )
-from baserow.contrib.database.table.models import Table
+from baserow.contrib.database.table.models import Table, TableUsage
 from baserow.contrib.database.views.exceptions import (
     ViewFilterTypeDoesNotExist,
     ViewFilterTypeNotAllowedForField,
@@ -201,6 +201,41 @@ def test_get_table_model_with_fulltext_search_enabled(data_fixture):
     assert sorted(field_names) == sorted(expected_fields)
 
 
+@pytest.mark.django_db
+def test_get_projected_table_model(data_fixture):
+    user = data_fixture.create_user()
+    table_a, table_b, link_field = data_fixture.create_two_linked_tables(user=user)
+    text_field = data_fixture.create_text_field(table=table_a, name="text")
+    hidden_field = data_fixture.create_text_field(table=table_a, name="hidden")
+    formula_field = data_fixture.create_formula_field(
+        table=table_a, name="formula", formula="field('text')"
+    )
+    data_fixture.create_text_field(table=table_b, name="other")
+
+    model = table_a.get_model(
+        field_ids=[link_field.id, formula_field.id], projected=True
+    )
+    assert model._projected_model
+    assert set(model._field_objects.keys()) == {
+        link_field.id,
+        formula_field.id,
+        text_field.id,
+    }
+    assert hidden_field.id not in model._field_objects
+
+    related_model = model._meta.get_field(link_field.db_column).related_model
+    assert related_model._projected_model
+    assert [f["field"].primary for f in related_model._field_objects.values()] == [True]
+
+    row_b = related_model.objects.create()
+    row_a = model.objects.create(**{text_field.db_column: "value"})
+    getattr(row_a, link_field.db_column).set([row_b.id])
+
+    row = model.objects.all().enhance_by_fields().get(id=row_a.id)
+    assert [r.id for r in getattr(row, link_field.db_column).all()] == [row_b.id]
+    assert getattr(row, formula_field.db_column) == "value"
+
+
 @pytest.mark.django_db
 def test_get_table_model_to_str(data_fixture):
     table = data_fixture.create_database_table()
@@ -230,6 +265,68 @@ def test_enhance_by_fields_queryset(data_fixture):
     mocked_type.enhance_queryset_in_bulk.assert_called()
 
 
+@pytest.mark.django_db
+def test_enhance_by_fields_combine_many_to_many_prefetches(data_fixture):
+    user = data_fixture.create_user()
+    other_user = data_fixture.create_user()
+    workspace = data_fixture.create_workspace(users=[user, other_user])
+    database = data_fixture.create_database_application(workspace=workspace)
+    table = data_fixture.create_database_table(database=database)
+    related_table = data_fixture.create_database_table(database=database)
+    data_fixture.create_text_field(table=related_table, primary=True)
+    link_fields = [
+        FieldHandler().create_field(
+            user, table, "link_row", name=f"Link {i}", link_row_table=related_table
+        )
+        for i in range(3)
+    ]
+    collaborators_fields = [
+        data_fixture.create_multiple_collaborators_field(table=table) for _ in range(2)
+    ]
+
+    related_rows = RowHandler().create_rows(user, related_table, [{}, {}, {}])
+    RowHandler().create_rows(
+        user,
+        table,
+        [
+            {
+                link_fields[0].db_column: [related_rows[2].id, related_rows[0].id],
+                link_fields[1].db_column: [related_rows[1].id],
+                collaborators_fields[0].db_column: [
+                    {"id": user.id},
+                    {"id": other_user.id},
+                ],
+                collaborators_fields[1].db_column: [{"id": user.id}],
+            },
+            {},
+        ],
+    )
+
+    model = table.get_model()
+    field_names = [f.db_column for f in link_fields + collaborators_fields]
+
+    def fetch(combine):
+        queryset = model.objects.all().enhance_by_fields(
+            combine_many_to_many_prefetches=combine
+        )
+        with CaptureQueriesContext(connection) as captured:
+            values = [
+                [[r.id for r in getattr(row, name).all()] for name in field_names]
+                for row in queryset
+            ]
+        return values, len(captured.captured_queries)
+
+    default_values, default_queries = fetch(False)
+    combined_values, combined_queries = fetch(True)
+    assert combined_values == default_values
+    assert combined_values[0][0] == [related_rows[0].id, related_rows[2].id]
+    assert combined_values[1] == [[], [], [], [], []]
+    # One query for the rows and one per field, versus one query for the rows, one
+    # for the relationships of all the fields and one per related model.
+    assert default_queries == 1 + 5
+    assert combined_queries == 1 + 1 + 2
+
+
 @pytest.mark.django_db
 @patch("baserow.contrib.database.table.models.TableModelQuerySet.pg_search")
 @patch("baserow.contrib.database.table.models.TableModelQuerySet.compat_search")
@@ -1151,3 +1248,23 @@ def test_last_modified_by_reference_doesnt_prevent_user_deletion(data_fixture):
 
     row = model.objects.first()
     assert getattr(row, f"{LAST_MODIFIED_BY_COLUMN_NAME}_id") == user_id
+
+
+@pytest.mark.django_db
+def test_estimated_count(data_fixture):
+    table = data_fixture.create_database_table()
+    number_field = data_fixture.create_number_field(table=table)
+    model = table.get_model()
+    model.objects.bulk_create([model(**{number_field.db_column: i}) for i in range(10)])
+
+    # Small counts are always exact.
+    assert model.objects.all().estimated_count() == (10, False)
+
+    TableUsage.objects.create(table=table, row_count=1234)
+    assert model.objects.all().estimated_count(exact_threshold=0) == (1234, True)
+
+    filtered = model.objects.filter(**{f"{number_field.db_column}__gt": 5})
+    count, is_estimate = filtered.estimated_count(exact_threshold=0)
+    assert is_estimate is True
+    assert isinstance(count, int)
+    assert filtered.estimated_count(exact_threshold=10000) == (4, False)
@@ -2,6 +2,9 @@ import asyncio
 
 from channels.testing import WebsocketCommunicator
 
+from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.contrib.database.rows.handler import RowHandler
+
 
 async def received_message(communicator: WebsocketCommunicator, message_type: str):
     """
@@ -32,3 +35,70 @@ async def get_message(communicator: WebsocketCommunicator, message_type: str):
                 return message
         except asyncio.exceptions.TimeoutError:  # No more messages
             return None
+
+
+def create_table_with_bulk_row_fields(data_fixture, user):
+    """
+    Creates a table with the kinds of fields that the bulk row insert and update
+    statements have to handle, and two rows named X and Y in the linked table.
+
+    :return: The table, the fields by name and the related rows.
+    """
+
+    table = data_fixture.create_database_table(user=user)
+    related_table = data_fixture.create_database_table(database=table.database)
+    related_primary_field = data_fixture.create_text_field(
+        table=related_table, primary=True, name="Name"
+    )
+    field_handler = FieldHandler()
+    fields = {
+        "Name": field_handler.create_field(
+            user, table, "text", name="Name", primary=True
+        ),
+        "Number": field_handler.create_field(
+            user, table, "number", name="Number", number_decimal_places=2
+        ),
+        "Bool": field_handler.create_field(user, table, "boolean", name="Bool"),
+        "Date": field_handler.create_field(
+            user, table, "date", name="Date", date_include_time=True
+        ),
+        "Link": field_handler.create_field(
+            user, table, "link_row", name="Link", link_row_table=related_table
+        ),
+        "Formula": field_handler.create_field(
+            user,
+            table,
+            "formula",
+            name="Formula",
+            formula="concat(field('Name'), '!')",
+        ),
+        "Lookup": field_handler.create_field(
+            user,
+            table,
+            "formula",
+            name="Lookup",
+            formula="join(lookup('Link', 'Name'), ',')",
+        ),
+    }
+    related_rows = RowHandler().create_rows(
+        user,
+        related_table,
+        [
+            {related_primary_field.db_column: "X"},
+            {related_primary_field.db_column: "Y"},
+        ],
+    )
+    return table, fields, related_rows
+
+
+def without_generated_values(row, generated_keys=("id", "order")):
+    """
+    Removes the values generated by the database from a serialized row, so that rows
+    created or updated in different ways can be compared.
+
+    :param row: The serialized row.
+    :param generated_keys: The keys of the generated values.
+    :return: The serialized row without the generated values.
+    """
+
+    return {key: value for key, value in row.items() if key not in generated_keys}
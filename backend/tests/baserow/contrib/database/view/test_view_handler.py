@@ -4294,3 +4294,87 @@ def test_get_queryset_apply_sorts(data_fixture):
 
     row_ids = [row.id for row in rows]
     assert row_ids == [row_3.id, row_2.id, row_1.id]
+
+
+@override_settings(BASEROW_VIEW_ROW_COUNT_CACHE_TIMEOUT=60)
+@pytest.mark.django_db
+def test_get_view_row_count_is_cached_and_incrementally_updated(
+    data_fixture, django_capture_on_commit_callbacks
+):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table)
+    grid_view = data_fixture.create_grid_view(table=table)
+    filtered_view = data_fixture.create_grid_view(table=table)
+    view_filter = data_fixture.create_view_filter(
+        view=filtered_view, field=text_field, type="equal", value="a"
+    )
+    model = table.get_model()
+    model.objects.create(**{f"field_{text_field.id}": "a"})
+    model.objects.create(**{f"field_{text_field.id}": "b"})
+
+    handler = ViewHandler()
+
+    def get_count(view):
+        view.refresh_from_db()
+        queryset = handler.get_queryset(view, model=model)
+        return handler.get_view_row_count(view, queryset)
+
+    assert get_count(grid_view) == 2
+    assert get_count(filtered_view) == 1
+
+    # A row created without sending the signals isn't taken into account, which
+    # shows that the cached count is used.
+    model.objects.create(**{f"field_{text_field.id}": "a"})
+    assert get_count(grid_view) == 2
+    assert get_count(filtered_view) == 1
+
+    row_handler = RowHandler()
+    with django_capture_on_commit_callbacks(execute=True):
+        rows = row_handler.create_rows(
+            user,
+            table,
+            [{f"field_{text_field.id}": "a"}, {f"field_{text_field.id}": "b"}],
+            model=model,
+        )
+    assert get_count(grid_view) == 4
+    assert get_count(filtered_view) == 2
+
+    with django_capture_on_commit_callbacks(execute=True):
+        row_handler.delete_rows(user, table, [rows[1].id], model=model)
+    assert get_count(grid_view) == 3
+    assert get_count(filtered_view) == 2
+
+    # Updating the filtered field can move rows in or out of the view, so the count
+    # of the filtered view is recomputed, including the row created without signals.
+    with django_capture_on_commit_callbacks(execute=True):
+        row_handler.update_rows(
+            user, table, [{"id": rows[0].id, f"field_{text_field.id}": "b"}], model
+        )
+    assert get_count(grid_view) == 3
+    assert get_count(filtered_view) == 2
+
+    # Changing the filter changes the cache key.
+    handler.update_filter(user, view_filter, value="b")
+    assert get_count(filtered_view) == 2
+
+
+@override_settings(BASEROW_VIEW_ROW_COUNT_CACHE_TIMEOUT=60)
+@pytest.mark.django_db
+def test_get_view_row_count_is_not_cached_with_time_dependent_filters(data_fixture):
+    table = data_fixture.create_database_table()
+    date_field = data_fixture.create_date_field(table=table)
+    grid_view = data_fixture.create_grid_view(table=table)
+    data_fixture.create_view_filter(
+        view=grid_view, field=date_field, type="date_equals_today", value="UTC"
+    )
+    model = table.get_model()
+    today = datetime.datetime.now(tz=timezone.utc).date()
+    model.objects.create(**{f"field_{date_field.id}": today})
+
+    handler = ViewHandler()
+    queryset = handler.get_queryset(grid_view, model=model)
+    assert handler.get_view_row_count(grid_view, queryset) == 1
+
+    model.objects.create(**{f"field_{date_field.id}": today})
+    assert handler.get_view_row_count(grid_view, queryset) == 2
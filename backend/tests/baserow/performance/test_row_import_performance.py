@@ -0,0 +1,61 @@
+from time import perf_counter
+
+from django.test.utils import override_settings
+
+import pytest
+
+from baserow.contrib.database.api.rows.serializers import serialize_rows_for_response
+from baserow.contrib.database.rows.handler import RowHandler
+from tests.baserow.contrib.database.utils import (
+    create_table_with_bulk_row_fields,
+    without_generated_values,
+)
+
+
+@pytest.mark.django_db
+@pytest.mark.disabled_in_ci
+# You must add --run-disabled-in-ci -s to pytest to run this test, you can do this in
+# intellij by editing the run config for this test and adding --run-disabled-in-ci -s
+# to additional args.
+def test_import_rows_copy_benchmark(data_fixture):
+    user = data_fixture.create_user()
+    count = 50000
+
+    def import_rows(use_copy):
+        table, _, related_rows = create_table_with_bulk_row_fields(data_fixture, user)
+        data = [
+            [
+                f"Row {i}",
+                i,
+                i % 2 == 0,
+                "2020-01-01T12:00:00Z",
+                ",".join(str(row.id) for row in related_rows[: i % 3]),
+            ]
+            for i in range(count)
+        ]
+
+        with override_settings(BASEROW_ROWS_BULK_INSERT_USE_COPY=use_copy):
+            start = perf_counter()
+            rows, report = RowHandler().import_rows(
+                user, table, data, validate=False, send_realtime_update=False
+            )
+            duration = perf_counter() - start
+
+        assert report == {}
+        assert len(rows) == count
+
+        model = table.get_model()
+        serialized = serialize_rows_for_response(
+            model.objects.all().enhance_by_fields().order_by("id")[:100],
+            model,
+            user_field_names=True,
+        )
+        return count / duration, [without_generated_values(row) for row in serialized]
+
+    insert_rows_per_second, inserted_rows = import_rows(use_copy=False)
+    copy_rows_per_second, copied_rows = import_rows(use_copy=True)
+
+    assert copied_rows == inserted_rows
+    print(f"INSERT: {insert_rows_per_second:.0f} rows/sec")
+    print(f"COPY: {copy_rows_per_second:.0f} rows/sec")
+    print(f"Speedup: {copy_rows_per_second / insert_rows_per_second:.2f}x")
@@ -0,0 +1,91 @@
+from time import perf_counter
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+import pytest
+
+from baserow.contrib.database.api.rows.serializers import serialize_rows_for_response
+from baserow.contrib.database.rows.handler import RowHandler
+from tests.baserow.contrib.database.utils import (
+    create_table_with_bulk_row_fields,
+    without_generated_values,
+)
+
+
+@pytest.mark.django_db
+@pytest.mark.disabled_in_ci
+# You must add --run-disabled-in-ci -s to pytest to run this test, you can do this in
+# intellij by editing the run config for this test and adding --run-disabled-in-ci -s
+# to additional args.
+def test_update_rows_values_benchmark(data_fixture):
+    user = data_fixture.create_user()
+    row_count = 200
+
+    def update_rows(use_values):
+        table, fields, related_rows = create_table_with_bulk_row_fields(
+            data_fixture, user
+        )
+        rows = RowHandler().create_rows(user, table, [{}] * row_count)
+
+        durations, update_query_times = [], []
+        for iteration in range(10):
+            rows_values = [
+                {
+                    "id": row.id,
+                    fields["Name"].db_column: f"{iteration}-{index}",
+                    fields["Number"].db_column: iteration + index,
+                    fields["Bool"].db_column: (iteration + index) % 2 == 0,
+                    fields["Date"].db_column: (
+                        f"2020-01-{iteration % 28 + 1:02d}T12:00:00Z"
+                    ),
+                    fields["Link"].db_column: [
+                        related_row.id for related_row in related_rows[: index % 3]
+                    ],
+                }
+                for index, row in enumerate(rows)
+            ]
+            with override_settings(
+                BASEROW_ROWS_BULK_UPDATE_USE_VALUES=use_values
+            ), CaptureQueriesContext(connection) as queries:
+                start = perf_counter()
+                RowHandler().update_rows(user, table, rows_values)
+                durations.append(perf_counter() - start)
+
+            update_query_times.append(
+                max(
+                    float(query["time"])
+                    for query in queries.captured_queries
+                    if query["sql"].startswith("UPDATE")
+                )
+            )
+
+        model = table.get_model()
+        serialized = serialize_rows_for_response(
+            model.objects.all().enhance_by_fields().order_by("id"),
+            model,
+            user_field_names=True,
+        )
+        return (
+            sum(durations) / len(durations),
+            sum(update_query_times) / len(update_query_times),
+            [without_generated_values(row) for row in serialized],
+        )
+
+    bulk_update_duration, bulk_update_query_time, bulk_updated_rows = update_rows(
+        use_values=False
+    )
+    values_duration, values_query_time, values_updated_rows = update_rows(
+        use_values=True
+    )
+
+    assert values_updated_rows == bulk_updated_rows
+    print(
+        f"bulk_update: {bulk_update_duration * 1000:.1f} ms per batch, "
+        f"slowest UPDATE {bulk_update_query_time * 1000:.1f} ms"
+    )
+    print(
+        f"UPDATE FROM VALUES: {values_duration * 1000:.1f} ms per batch, "
+        f"slowest UPDATE {values_query_time * 1000:.1f} ms"
+    )
+    print(f"Speedup: {bulk_update_duration / values_duration:.2f}x")
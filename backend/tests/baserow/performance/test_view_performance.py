@@ -1,9 +1,17 @@
+from time import perf_counter
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 import pytest
 from pyinstrument import Profiler
 from rest_framework.status import HTTP_200_OK
 
+from baserow.contrib.database.api.rows.serializers import (
+    RowSerializer,
+    get_row_serializer_class,
+)
 from baserow.contrib.database.management.commands.fill_table_rows import fill_table_rows
 from baserow.test_utils.helpers import setup_interesting_test_table
 
@@ -33,3 +41,34 @@ def test_getting_rows_from_large_grid_view(data_fixture, api_client):
     assert len(response_json["results"]) == limit
     profiler.stop()
     print(profiler.output_text(unicode=True, color=True))
+
+
+@pytest.mark.django_db
+@pytest.mark.disabled_in_ci
+# You must add --run-disabled-in-ci -s to pytest to run this test, you can do this in
+# intellij by editing the run config for this test and adding --run-disabled-in-ci -s
+# to additional args.
+def test_combined_many_to_many_prefetch_benchmark(data_fixture):
+    table, user, row, _, context = setup_interesting_test_table(data_fixture)
+    fill_table_rows(10000, table)
+    model = table.get_model()
+    serializer_class = get_row_serializer_class(model, RowSerializer, is_response=True)
+
+    def fetch_page(combine):
+        queryset = model.objects.all().enhance_by_fields(
+            combine_many_to_many_prefetches=combine
+        )
+        with CaptureQueriesContext(connection) as captured:
+            start = perf_counter()
+            for offset in range(0, 2000, 200):
+                serializer_class(queryset[offset : offset + 200], many=True).data
+            duration = perf_counter() - start
+        return duration, len(captured.captured_queries)
+
+    default_duration, default_queries = fetch_page(False)
+    combined_duration, combined_queries = fetch_page(True)
+    print(
+        f"\nprefetch_related: {default_duration:.3f}s, {default_queries} queries"
+        f"\ncombined: {combined_duration:.3f}s, {combined_queries} queries"
+    )
+    assert combined_queries < default_queries